@@ -1,22 +1,21 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import os
+import queue
 import threading
 import cv2  # Untuk PSNR
 from PIL import Image  # Untuk menampilkan gambar hasil ekstraksi
 from cryptography.hazmat.primitives import serialization  # Untuk load/save kunci ECC
-import sys # Untuk redirect stdout
 
 # --- IMPOR MODUL DARI FILE ANDA ---
 try:
     import helpers as steg_helpers
     from config_and_setup import (
         buat_pasangan_kunci_ecc, 
-        serialisasi_kunci_publik_ecc_compressed,
         # Fungsi lain akan dipanggil oleh embed_process atau extract_process
     )
-    from embed_process import embed_gambar_ke_video_final
-    from extract_process import ekstraksi_gambar_video_final
+    from session import Embedder, Extractor
+    from job_queue import AntreanJob, MAKS_WORKER_POOL, JOB_BERSAMAAN_DEFAULT, STATUS_SELESAI, STATUS_BERJALAN, STATUS_AKHIR
     from evaluation import psnr as hitung_psnr_eval, calc_ssim as hitung_ssim_eval
 except ImportError as e:
     error_message = f"Modul tidak ditemukan: {e}"
@@ -35,27 +34,15 @@ except Exception as e_general:
     except: pass
     exit()
 
-class StdoutRedirector:
-    """ Kelas untuk mengarahkan stdout ke widget Teks Tkinter. """
-    def __init__(self, text_widget, gui_log_func):
-        self.text_widget = text_widget
-        self.gui_log_func = gui_log_func # Fungsi log GUI (misal self.log_pesan)
-
-    def write(self, string):
-        # Menulis ke widget teks GUI
-        self.gui_log_func(string.strip(), "PROSES-INTI") # Hapus newline tambahan
-        # Bisa juga ditulis ke stdout asli jika perlu
-        # sys.__stdout__.write(string) 
-
-    def flush(self):
-        # Tkinter Text widget tidak butuh flush eksplisit biasanya
-        pass
+# Widget Tk hanya boleh disentuh dari thread utama: thread job memasukkan log, event progres, dan dialog ke antrean,
+# lalu thread utama mengurasnya lewat after() (sekaligus membatasi pembaruan UI ke beberapa kali per detik).
+INTERVAL_UI_MS = 250
 
 class AppSteganografiGUI:
     def __init__(self, root_window):
         self.root = root_window
         self.root.title("Aplikasi Steganografi Video - Kelompok X (DCT, SHA3, ECC, AES)")
-        self.root.geometry("900x800") # Perbesar sedikit untuk log evaluasi
+        self.root.geometry("1000x900") # Perbesar untuk antrean job dan log evaluasi
 
         # Variabel UI
         self.video_input_path_var = tk.StringVar()
@@ -68,6 +55,11 @@ class AppSteganografiGUI:
         self.delta_qim_var = tk.IntVar(value=20)
         self.num_ac_coeffs_var = tk.IntVar(value=10)
         self.mode_var = tk.StringVar(value="embed")
+        self.job_bersamaan_var = tk.IntVar(value=JOB_BERSAMAAN_DEFAULT)
+        self.ringkasan_job_var = tk.StringVar(value="")
+        self.antrean_ui = queue.Queue()
+        # Worker pool tetap hidup selama aplikasi dibuka; job embed/ekstraksi dijalankan lewat antrean ini
+        self.antrean_job = AntreanJob(JOB_BERSAMAAN_DEFAULT, notifikasi=self.terima_notifikasi_job)
 
         self.base_dir = os.getcwd()
         self.input_dir = os.path.join(self.base_dir, "media", "input")
@@ -81,20 +73,119 @@ class AppSteganografiGUI:
         self.gambar_ekstraksi_output_path_var.set(os.path.join(self.output_dir, "extracted_image_gui.png"))
 
         self.buat_ui_utama()
-        
-        # Inisialisasi stdout redirector
-        self.stdout_redirector = StdoutRedirector(self.log_text, self.log_pesan)
+        self.root.protocol("WM_DELETE_WINDOW", self.tutup_aplikasi)
+        self.root.after(INTERVAL_UI_MS, self._proses_antrean_ui)
 
-
-    def log_pesan(self, pesan, type="INFO"):
-        self.log_text.config(state=tk.NORMAL)
+    def log_pesan(self, pesan, type="INFO", job=None):
         # Hapus newline ganda jika pesan sudah mengandung newline dari print
         pesan_cleaned = pesan.strip('\n')
-        if pesan_cleaned: # Hanya insert jika ada pesan setelah dibersihkan
-            self.log_text.insert(tk.END, f"[{type}] {pesan_cleaned}\n")
-        self.log_text.see(tk.END)
-        self.log_text.config(state=tk.DISABLED)
-        self.root.update_idletasks()
+        if pesan_cleaned: # Hanya masukkan jika ada pesan setelah dibersihkan
+            prefix_job = f"[JOB {job.id}]" if job is not None else ""
+            self.antrean_ui.put(("log", f"{prefix_job}[{type}] {pesan_cleaned}\n"))
+
+    def terima_notifikasi_job(self, job, jenis, isi):
+        """Notifikasi antrean job (dipanggil dari thread worker): log sesi dan perubahan job masuk ke antrean UI."""
+        if jenis == "log": self.log_pesan(isi, "PROSES-INTI", job)
+        else: self.antrean_ui.put(("job", job))
+
+    def _panggil_ui(self, fungsi, *args):
+        """Menjadwalkan pemanggilan widget/dialog Tk dari thread job ke thread utama."""
+        self.antrean_ui.put(("ui", (fungsi, args)))
+
+    def _proses_antrean_ui(self):
+        log_baru = []; job_berubah = {}; panggilan_ui = []
+        try:
+            while True:
+                jenis, isi = self.antrean_ui.get_nowait()
+                if jenis == "log": log_baru.append(isi)
+                elif jenis == "job": job_berubah[isi.id] = isi  # Satu pembaruan baris per job per interval
+                else: panggilan_ui.append(isi)
+        except queue.Empty:
+            pass
+        if log_baru:
+            self.log_text.config(state=tk.NORMAL)
+            self.log_text.insert(tk.END, "".join(log_baru))
+            self.log_text.see(tk.END)
+            self.log_text.config(state=tk.DISABLED)
+        if job_berubah:
+            for job in job_berubah.values(): self.perbarui_baris_job(job)
+            self.ringkasan_job_var.set(", ".join(f"{status}: {jumlah}" for status, jumlah in self.antrean_job.ringkasan().items()))
+        for fungsi, args in panggilan_ui: fungsi(*args)
+        self.root.after(INTERVAL_UI_MS, self._proses_antrean_ui)
+
+    # --- Daftar Job ---
+    @staticmethod
+    def teks_bar_progres(job, lebar=20):
+        event = job.progres_terakhir
+        if job.status == STATUS_SELESAI: fraksi = 1.0
+        elif event is not None and event["bit_total"]: fraksi = min(1.0, event["bit_selesai"] / event["bit_total"])
+        else: fraksi = 0.0
+        terisi = int(round(fraksi * lebar))
+        return f"{'█' * terisi}{'░' * (lebar - terisi)} {100 * fraksi:3.0f}%"
+
+    @staticmethod
+    def teks_detail_job(job):
+        if job.pesan_error: return f"Error: {job.pesan_error}"
+        event = job.progres_terakhir
+        if job.status == STATUS_BERJALAN and event is not None:
+            teks = f"Frame {event['frame']} | {event['frame_per_detik']:.1f} frame/s, {event['bit_per_detik']:.0f} bit/s"
+            if event["eta_detik"] is not None: teks += f" | ETA {event['eta_detik']:.0f} detik"
+            return teks
+        if job.status in STATUS_AKHIR and job.durasi_detik is not None:
+            return f"{job.durasi_detik:.1f} detik (percobaan {job.percobaan})"
+        return ""
+
+    def perbarui_baris_job(self, job):
+        if job.id not in self.antrean_job.jobs: return  # Sudah dihapus dari daftar
+        nama_input = os.path.basename(job.parameter.get("video_in") or job.parameter.get("stego_video") or "")
+        nilai = (job.id, job.jenis, nama_input, job.status, self.teks_bar_progres(job), self.teks_detail_job(job))
+        if self.tree_job.exists(str(job.id)): self.tree_job.item(str(job.id), values=nilai)
+        else: self.tree_job.insert("", tk.END, iid=str(job.id), values=nilai)
+
+    def job_terpilih(self):
+        return [int(iid) for iid in self.tree_job.selection()]
+
+    def batalkan_job_terpilih(self):
+        """Job menunggu langsung dibatalkan; job berjalan berhenti sebelum frame berikutnya."""
+        for id_job in self.job_terpilih():
+            if self.antrean_job.batalkan(id_job): self.log_pesan("Pembatalan diminta.", "ANTREAN", self.antrean_job.jobs[id_job])
+
+    def ulangi_job_terpilih(self):
+        for id_job in self.job_terpilih():
+            if self.antrean_job.ulangi(id_job): self.log_pesan("Job dimasukkan ulang ke antrean.", "ANTREAN", self.antrean_job.jobs[id_job])
+
+    def hapus_job_selesai(self):
+        for id_job in self.antrean_job.hapus_selesai():
+            if self.tree_job.exists(str(id_job)): self.tree_job.delete(str(id_job))
+
+    def atur_job_bersamaan(self):
+        try:
+            self.antrean_job.atur_maks_bersamaan(self.job_bersamaan_var.get())
+        except (tk.TclError, ValueError):
+            return  # Isi spinbox belum berupa angka
+
+    def buka_hasil_job(self, event=None):
+        """Klik ganda job ekstraksi yang selesai menampilkan gambar hasilnya."""
+        for id_job in self.job_terpilih():
+            job = self.antrean_job.jobs.get(id_job)
+            if job is None or job.jenis != "ekstraksi" or job.status != STATUS_SELESAI: continue
+            try:
+                Image.open(job.parameter["extracted_img_out"]).show()
+            except Exception as e_show: self.log_pesan(f"Tidak bisa tampilkan gambar: {e_show}", "WARNING", job)
+
+    def _output_unik(self, path_output, nama_parameter):
+        """Output job yang masih menunggu/berjalan tidak boleh sama (job bersamaan saling menimpa): tambahkan nomor."""
+        dipakai = {job.parameter.get(nama_parameter) for job in self.antrean_job.jobs.values() if job.status not in STATUS_AKHIR}
+        if path_output not in dipakai: return path_output
+        dasar, ekstensi = os.path.splitext(path_output)
+        nomor = 2
+        while f"{dasar}_{nomor}{ekstensi}" in dipakai: nomor += 1
+        return f"{dasar}_{nomor}{ekstensi}"
+
+    def tutup_aplikasi(self):
+        """Membatalkan job antrean (berhenti sebelum frame berikutnya) lalu menutup jendela."""
+        self.antrean_job.tutup()
+        self.root.destroy()
 
     def pilih_file_dialog(self, title, filetypes, path_variable, mode="open"):
         initial_dir_to_use = self.input_dir
@@ -142,12 +233,12 @@ class AppSteganografiGUI:
         if is_embed:
             set_visibility(self.embed_specific_widgets, True, r_next)
             self.param_frame.grid(row=2, column=0, columnspan=3, sticky=tk.EW, padx=5, pady=5)
-            self.btn_jalankan.config(text="Mulai Embedding")
+            self.btn_jalankan.config(text="Tambah Job Embedding")
             self.lbl_video_input.config(text="Video Input (Cover):")
         elif is_extract:
             set_visibility(self.extract_specific_widgets, True, r_next)
             self.param_frame.grid(row=2, column=0, columnspan=3, sticky=tk.EW, padx=5, pady=5)
-            self.btn_jalankan.config(text="Mulai Ekstraksi")
+            self.btn_jalankan.config(text="Tambah Job Ekstraksi")
             self.lbl_video_input.config(text="Video Input (Stego):")
         elif is_genkey:
             set_visibility(self.genkey_specific_widgets, True, r_next)
@@ -240,57 +331,98 @@ class AppSteganografiGUI:
         self.btn_jalankan = ttk.Button(action_frame, text="Jalankan Proses", command=self.jalankan_proses_utama_thread)
         self.btn_jalankan.grid_remove() # Sembunyikan awal, diatur oleh update_ui_visibility
 
+        job_frame = ttk.LabelFrame(main_frame, text="Antrean Job", padding="10")
+        job_frame.grid(row=4, column=0, columnspan=3, sticky=tk.NSEW, padx=5, pady=5)
+        main_frame.rowconfigure(4, weight=1)
+        job_frame.columnconfigure(0, weight=1); job_frame.rowconfigure(0, weight=1)
+        kolom_job = (("id", "ID", 40), ("jenis", "Jenis", 70), ("input", "Input", 170), ("status", "Status", 80),
+                     ("progres", "Progres", 190), ("detail", "Detail", 280))
+        self.tree_job = ttk.Treeview(job_frame, columns=[k for k, _, _ in kolom_job], show="headings", height=6)
+        for kolom, judul, lebar in kolom_job:
+            self.tree_job.heading(kolom, text=judul); self.tree_job.column(kolom, width=lebar, stretch=(kolom == "detail"))
+        self.tree_job.grid(row=0, column=0, sticky=tk.NSEW)
+        scroll_job = ttk.Scrollbar(job_frame, orient=tk.VERTICAL, command=self.tree_job.yview)
+        scroll_job.grid(row=0, column=1, sticky=tk.NS)
+        self.tree_job.config(yscrollcommand=scroll_job.set)
+        self.tree_job.bind("<Double-1>", self.buka_hasil_job)
+        kontrol_job = ttk.Frame(job_frame)
+        kontrol_job.grid(row=1, column=0, columnspan=2, sticky=tk.EW, pady=(5, 0))
+        ttk.Label(kontrol_job, text="Job bersamaan:").pack(side=tk.LEFT, padx=5)
+        ttk.Spinbox(kontrol_job, from_=1, to=MAKS_WORKER_POOL, textvariable=self.job_bersamaan_var, width=4,
+                    command=self.atur_job_bersamaan).pack(side=tk.LEFT, padx=5)
+        ttk.Button(kontrol_job, text="Batalkan Terpilih", command=self.batalkan_job_terpilih).pack(side=tk.LEFT, padx=5)
+        ttk.Button(kontrol_job, text="Ulangi Terpilih", command=self.ulangi_job_terpilih).pack(side=tk.LEFT, padx=5)
+        ttk.Button(kontrol_job, text="Hapus yang Selesai", command=self.hapus_job_selesai).pack(side=tk.LEFT, padx=5)
+        ttk.Label(kontrol_job, textvariable=self.ringkasan_job_var).pack(side=tk.RIGHT, padx=5)
+
         log_frame = ttk.LabelFrame(main_frame, text="Log Proses", padding="10")
-        log_frame.grid(row=4, column=0, columnspan=3, sticky=tk.NSEW, padx=5, pady=5) 
-        main_frame.rowconfigure(4, weight=1) 
+        log_frame.grid(row=5, column=0, columnspan=3, sticky=tk.NSEW, padx=5, pady=5) 
+        main_frame.rowconfigure(5, weight=1) 
         self.log_text = scrolledtext.ScrolledText(log_frame, wrap=tk.WORD, height=15, state=tk.DISABLED, font=("Consolas", 9))
         self.log_text.pack(expand=True, fill=tk.BOTH)
 
         self.update_ui_visibility() # Atur visibilitas awal yang benar
 
     def jalankan_proses_utama_thread(self):
-        self.btn_jalankan.config(state=tk.DISABLED)
-        self.log_text.config(state=tk.NORMAL); self.log_text.delete(1.0, tk.END); self.log_text.config(state=tk.DISABLED)
         mode = self.mode_var.get()
         delta = self.delta_qim_var.get()
         coeffs = self.num_ac_coeffs_var.get()
 
-        # Redirect stdout ke log_text selama proses background
-        original_stdout = sys.stdout
-        sys.stdout = self.stdout_redirector
-
+        # Embed/ekstraksi masuk antrean job (tombol tetap aktif); pembuatan kunci tetap satu thread langsung
         if mode == "embed":
-            threading.Thread(target=self.proses_embed_background_gui, args=(delta, coeffs, original_stdout), daemon=True).start()
+            self.tambah_job_embed(delta, coeffs)
         elif mode == "extract":
-            threading.Thread(target=self.proses_ekstrak_background_gui, args=(delta, coeffs, original_stdout), daemon=True).start()
+            self.tambah_job_ekstrak(delta, coeffs)
         elif mode == "genkey":
-            threading.Thread(target=self.proses_genkey_background_gui, args=(original_stdout,), daemon=True).start()
-        else: 
-            self.btn_jalankan.config(state=tk.NORMAL)
-            sys.stdout = original_stdout # Kembalikan stdout
-
-    def proses_selesai_gui(self, original_stdout):
-        """Dipanggil setelah proses background selesai."""
-        sys.stdout = original_stdout # Kembalikan stdout
+            if not self.konfirmasi_timpa_kunci(): return
+            self.btn_jalankan.config(state=tk.DISABLED)
+            threading.Thread(target=self.proses_genkey_background_gui, daemon=True).start()
+
+    def tambah_job_embed(self, delta, coeffs):
+        video_in = self.video_input_path_var.get()
+        video_out_base = self._output_unik(self.video_output_base_path_var.get(), "video_out_base")
+        job = self.antrean_job.tambah("embed", self.proses_embed_job_gui, video_in=video_in,
+                                      secret_img=self.gambar_rahasia_path_var.get(), video_out_base=video_out_base,
+                                      kunci_publik=self.kunci_publik_penerima_path_var.get(), delta=delta, coeffs=coeffs)
+        self.log_pesan(f"Job embed ditambahkan: {os.path.basename(video_in)} -> {video_out_base}", "ANTREAN", job)
+
+    def tambah_job_ekstrak(self, delta, coeffs):
+        stego_video = self.video_input_path_var.get()
+        extracted_img_out = self._output_unik(self.gambar_ekstraksi_output_path_var.get(), "extracted_img_out")
+        job = self.antrean_job.tambah("ekstraksi", self.proses_ekstrak_job_gui, stego_video=stego_video,
+                                      extracted_img_out=extracted_img_out, kunci_privat=self.kunci_privat_penerima_path_var.get(),
+                                      gambar_asli=self.gambar_rahasia_path_var.get(), delta=delta, coeffs=coeffs)
+        self.log_pesan(f"Job ekstraksi ditambahkan: {os.path.basename(stego_video)} -> {extracted_img_out}", "ANTREAN", job)
+
+    def _aktifkan_tombol(self):
         self.btn_jalankan.config(state=tk.NORMAL)
+
+    def proses_selesai_gui(self):
+        """Dipanggil (dari thread pembuatan kunci) setelah proses selesai."""
+        self._panggil_ui(self._aktifkan_tombol)
         self.log_pesan("Proses selesai.", "STATUS")
 
-    def proses_genkey_background_gui(self, original_stdout):
+    def konfirmasi_timpa_kunci(self):
+        """Dialog konfirmasi dijalankan di thread utama sebelum thread pembuatan kunci dimulai."""
+        paths = [os.path.abspath(p) for p in (self.kunci_privat_penerima_path_var.get(), self.kunci_publik_penerima_path_var.get()) if p]
+        if not any(os.path.exists(p) for p in paths): return True
+        if messagebox.askyesno("Konfirmasi", f"File kunci {' atau '.join(repr(os.path.basename(p)) for p in paths)} sudah ada. Timpa?"):
+            return True
+        self.log_pesan("Pembuatan kunci dibatalkan.", "INFO")
+        return False
+
+    def proses_genkey_background_gui(self):
         self.log_pesan("Memulai pembuatan kunci ECC...", "PROSES")
         try:
             pub_key_path = self.kunci_publik_penerima_path_var.get()
             priv_key_path = self.kunci_privat_penerima_path_var.get()
             if not pub_key_path or not priv_key_path:
                 self.log_pesan("Path untuk kunci publik dan privat harus ditentukan.", "ERROR")
-                messagebox.showerror("Error", "Harap tentukan path untuk menyimpan kunci.")
-                self.proses_selesai_gui(original_stdout); return
+                self._panggil_ui(messagebox.showerror, "Error", "Harap tentukan path untuk menyimpan kunci.")
+                self.proses_selesai_gui(); return
 
             abs_priv_key_path = os.path.abspath(priv_key_path)
             abs_pub_key_path = os.path.abspath(pub_key_path)
-            if os.path.exists(abs_priv_key_path) or os.path.exists(abs_pub_key_path):
-                if not messagebox.askyesno("Konfirmasi", f"File kunci '{os.path.basename(abs_priv_key_path)}' atau '{os.path.basename(abs_pub_key_path)}' sudah ada. Timpa?"):
-                    self.log_pesan("Pembuatan kunci dibatalkan.", "INFO"); self.proses_selesai_gui(original_stdout); return
-            
             private_key, public_key = buat_pasangan_kunci_ecc() 
             with open(abs_priv_key_path, "wb") as f:
                 f.write(private_key.private_bytes(
@@ -304,95 +436,90 @@ class AppSteganografiGUI:
                     format=serialization.PublicFormat.SubjectPublicKeyInfo
                 ))
             self.log_pesan(f"Kunci ECC berhasil dibuat:\n  Privat: {abs_priv_key_path}\n  Publik: {abs_pub_key_path}", "SUKSES")
-            messagebox.showinfo("Sukses", f"Kunci ECC berhasil dibuat:\nPrivat: {abs_priv_key_path}\nPublik: {abs_pub_key_path}")
+            self._panggil_ui(messagebox.showinfo, "Sukses", f"Kunci ECC berhasil dibuat:\nPrivat: {abs_priv_key_path}\nPublik: {abs_pub_key_path}")
         except Exception as e:
-            self.log_pesan(f"Error buat kunci: {e}", "ERROR"); messagebox.showerror("Error", f"Gagal membuat kunci: {e}")
+            self.log_pesan(f"Error buat kunci: {e}", "ERROR"); self._panggil_ui(messagebox.showerror, "Error", f"Gagal membuat kunci: {e}")
         finally: 
-            self.proses_selesai_gui(original_stdout)
+            self.proses_selesai_gui()
+
+    def proses_embed_job_gui(self, job):
+        """Badan job embed di worker pool antrean; parameter diambil dari form saat job ditambahkan."""
+        log = lambda pesan, type="INFO": self.log_pesan(pesan, type, job)
+        log("Memulai embedding...", "PROSES")
+        p = job.parameter
+        video_in, secret_img, video_out_base = p["video_in"], p["secret_img"], p["video_out_base"]
+        receiver_pub_key_path, delta, coeffs = p["kunci_publik"], p["delta"], p["coeffs"]
 
-    def proses_embed_background_gui(self, delta, coeffs, original_stdout):
-        self.log_pesan("Memulai embedding...", "PROSES")
-        video_in = self.video_input_path_var.get()
-        secret_img = self.gambar_rahasia_path_var.get()
-        video_out_base = self.video_output_base_path_var.get()
-        receiver_pub_key_path = self.kunci_publik_penerima_path_var.get()
-        
         try:
-            self.log_pesan(f"Video Input: {video_in}", "DETAIL")
-            self.log_pesan(f"Gambar Rahasia: {secret_img}", "DETAIL")
-            self.log_pesan(f"Output Video Base: {video_out_base}", "DETAIL")
-            self.log_pesan(f"Kunci Publik Penerima: {receiver_pub_key_path}", "DETAIL")
-            self.log_pesan(f"DELTA: {delta}, Koefisien AC: {coeffs}", "DETAIL")
-
-            with open(receiver_pub_key_path, "rb") as f:
-                bob_public_ecc_obj = serialization.load_pem_public_key(f.read())
-            bob_public_key_bytes_compressed = serialisasi_kunci_publik_ecc_compressed(bob_public_ecc_obj)
-            self.log_pesan("Kunci publik penerima dimuat.", "INFO")
+            log(f"Video Input: {video_in}", "DETAIL")
+            log(f"Gambar Rahasia: {secret_img}", "DETAIL")
+            log(f"Output Video Base: {video_out_base}", "DETAIL")
+            log(f"Kunci Publik Penerima: {receiver_pub_key_path}", "DETAIL")
+            log(f"DELTA: {delta}, Koefisien AC: {coeffs}", "DETAIL")
+
+            bob_public_key_bytes_compressed = self.antrean_job.kunci_publik(receiver_pub_key_path)
+            log("Kunci publik penerima dimuat.", "INFO")
             
-            self.log_pesan("Memanggil fungsi embedding inti...", "PROSES")
-            berhasil, first_orig_gray, first_stego_gray = embed_gambar_ke_video_final(
-                video_in, secret_img, video_out_base, delta, coeffs, bob_public_key_bytes_compressed
-            )
+            log("Memanggil fungsi embedding inti...", "PROSES")
+            embedder = Embedder(bob_public_key_bytes_compressed, delta, coeffs, log=job.log,
+                                progres=job.progres, batal=job.dibatalkan)
+            berhasil, first_orig_gray, first_stego_gray = embedder.embed(video_in, secret_img, video_out_base)
 
             if berhasil:
                 actual_stego_path = steg_helpers.get_avi_path(video_out_base)
-                self.log_pesan(f"EMBEDDING BERHASIL! Output: {actual_stego_path}", "SUKSES")
+                log(f"EMBEDDING BERHASIL! Output: {actual_stego_path}", "SUKSES")
                 if first_orig_gray is not None and first_stego_gray is not None:
                     try:
                         psnr = cv2.PSNR(first_orig_gray, first_stego_gray)
-                        self.log_pesan(f"PSNR Frame Pertama (Grayscale): {psnr:.2f} dB", "INFO")
+                        log(f"PSNR Frame Pertama (Grayscale): {psnr:.2f} dB", "INFO")
                     except Exception as e_psnr:
-                        self.log_pesan(f"Tidak bisa hitung PSNR: {e_psnr}", "WARNING")
-                messagebox.showinfo("Sukses", f"Embedding berhasil! Video: {actual_stego_path}")
+                        log(f"Tidak bisa hitung PSNR: {e_psnr}", "WARNING")
             else:
-                self.log_pesan("EMBEDDING GAGAL.", "ERROR"); messagebox.showerror("Gagal", "Embedding gagal.")
+                if job.dibatalkan(): log("EMBEDDING DIBATALKAN.", "STATUS")
+                else: log("EMBEDDING GAGAL.", "ERROR")
+            return berhasil
         except FileNotFoundError as fnf_error:
-            self.log_pesan(f"Error File Tidak Ditemukan: {fnf_error}", "ERROR")
-            messagebox.showerror("Error File", f"File tidak ditemukan: {fnf_error}")
+            log(f"Error File Tidak Ditemukan: {fnf_error}", "ERROR")
+            job.pesan_error = f"File tidak ditemukan: {fnf_error}"; return False
         except Exception as e:
-            self.log_pesan(f"Error embedding: {e}", "ERROR"); messagebox.showerror("Error", f"Error: {e}")
-        finally: 
-            self.proses_selesai_gui(original_stdout)
+            log(f"Error embedding: {e}", "ERROR")
+            job.pesan_error = str(e); return False
+
+    def proses_ekstrak_job_gui(self, job):
+        """Badan job ekstraksi di worker pool antrean; parameter diambil dari form saat job ditambahkan."""
+        log = lambda pesan, type="INFO": self.log_pesan(pesan, type, job)
+        log("Memulai ekstraksi...", "PROSES")
+        p = job.parameter
+        stego_video, extracted_img_out = p["stego_video"], p["extracted_img_out"]
+        receiver_priv_key_path, delta, coeffs = p["kunci_privat"], p["delta"], p["coeffs"]
+        original_secret_image_for_eval = p["gambar_asli"]
 
-    def proses_ekstrak_background_gui(self, delta, coeffs, original_stdout):
-        self.log_pesan("Memulai ekstraksi...", "PROSES")
-        stego_video = self.video_input_path_var.get() 
-        extracted_img_out = self.gambar_ekstraksi_output_path_var.get()
-        receiver_priv_key_path = self.kunci_privat_penerima_path_var.get()
-        
         try:
-            self.log_pesan(f"Stego Video: {stego_video}", "INFO") 
-            self.log_pesan(f"Output Gambar: {extracted_img_out}", "INFO")
-            self.log_pesan(f"Kunci Privat Penerima: {receiver_priv_key_path}", "INFO")
-            self.log_pesan(f"DELTA: {delta}, Koefisien AC: {coeffs}", "INFO")
-
-            with open(receiver_priv_key_path, "rb") as f:
-                bob_private_ecc = serialization.load_pem_private_key(f.read(), password=None)
-            self.log_pesan("Kunci privat penerima dimuat.", "INFO")
+            log(f"Stego Video: {stego_video}", "INFO") 
+            log(f"Output Gambar: {extracted_img_out}", "INFO")
+            log(f"Kunci Privat Penerima: {receiver_priv_key_path}", "INFO")
+            log(f"DELTA: {delta}, Koefisien AC: {coeffs}", "INFO")
+
+            bob_private_ecc = self.antrean_job.kunci_privat(receiver_priv_key_path)
+            log("Kunci privat penerima dimuat.", "INFO")
             
-            self.log_pesan("Memanggil fungsi ekstraksi inti...", "PROSES")
-            berhasil = ekstraksi_gambar_video_final(
-                stego_video, extracted_img_out, delta, coeffs, bob_private_ecc
-            )
+            log("Memanggil fungsi ekstraksi inti...", "PROSES")
+            extractor = Extractor(bob_private_ecc, delta, coeffs, log=job.log,
+                                  progres=job.progres, batal=job.dibatalkan)
+            berhasil = extractor.ekstrak(stego_video, extracted_img_out)
 
             if berhasil:
-                self.log_pesan(f"EKSTRAKSI BERHASIL! Gambar: {extracted_img_out}", "SUKSES")
-                messagebox.showinfo("Sukses", f"Ekstraksi berhasil! Gambar: {extracted_img_out}")
-                try: 
-                    img = Image.open(extracted_img_out)
-                    img.show()
-                except Exception as e_show: self.log_pesan(f"Tidak bisa tampilkan gambar: {e_show}", "WARNING")
+                log(f"EKSTRAKSI BERHASIL! Gambar: {extracted_img_out}", "SUKSES")
                 
                 # --- Integrasi Evaluasi ---
-                self.log_pesan("Memulai evaluasi gambar hasil ekstraksi...", "PROSES")
-                # Asumsi gambar asli ada di self.gambar_rahasia_path_var.get() jika mode embed pernah dijalankan
+                log("Memulai evaluasi gambar hasil ekstraksi...", "PROSES")
+                # Asumsi gambar asli ada di gambar_rahasia_path_var (disimpan saat job ditambahkan) jika mode embed pernah dijalankan
                 # atau pengguna harus memilihnya lagi. Untuk simplifikasi, kita coba path dari embed.
-                original_secret_image_for_eval = self.gambar_rahasia_path_var.get() # Ini mungkin kosong jika GUI baru dibuka di mode extract
                 if not original_secret_image_for_eval and os.path.exists(os.path.join(self.input_dir, "ini_adalah_rahasia_grayscale.png")):
                     original_secret_image_for_eval = os.path.join(self.input_dir, "ini_adalah_rahasia_grayscale.png")
                 
                 if os.path.exists(original_secret_image_for_eval) and os.path.exists(extracted_img_out):
-                    self.log_pesan(f"Membandingkan '{original_secret_image_for_eval}' dengan '{extracted_img_out}'", "INFO")
+                    log(f"Membandingkan '{original_secret_image_for_eval}' dengan '{extracted_img_out}'", "INFO")
                     
                     # Panggil fungsi dari evaluation.py (jika sudah diimpor sebagai 'eval_mod')
                     # Untuk sekarang, kita panggil fungsi PSNR dan SSIM langsung jika ada
@@ -402,41 +529,41 @@ class AppSteganografiGUI:
 
                         if img_asli_eval is not None and img_ekstrak_eval is not None:
                             if img_asli_eval.shape != img_ekstrak_eval.shape:
-                                self.log_pesan("Ukuran gambar asli dan ekstraksi berbeda, resize untuk evaluasi.", "WARNING")
+                                log("Ukuran gambar asli dan ekstraksi berbeda, resize untuk evaluasi.", "WARNING")
                                 img_ekstrak_eval = cv2.resize(img_ekstrak_eval, (img_asli_eval.shape[1], img_asli_eval.shape[0]))
 
                             psnr_img_val = hitung_psnr_eval(img_asli_eval, img_ekstrak_eval) # Dari evaluation.py
                             ssim_img_val = hitung_ssim_eval(img_asli_eval, img_ekstrak_eval) # Dari evaluation.py
                             
-                            self.log_pesan(f"  Evaluasi Gambar Ekstraksi:", "HASIL")
-                            self.log_pesan(f"    PSNR: {psnr_img_val:.2f} dB", "HASIL")
-                            self.log_pesan(f"    SSIM: {ssim_img_val:.4f}", "HASIL")
+                            log(f"  Evaluasi Gambar Ekstraksi:", "HASIL")
+                            log(f"    PSNR: {psnr_img_val:.2f} dB", "HASIL")
+                            log(f"    SSIM: {ssim_img_val:.4f}", "HASIL")
                             if psnr_img_val == float('inf') or psnr_img_val > 40 : # Dianggap sangat baik / identik
-                                self.log_pesan("    Kualitas Ekstraksi: SEMPURNA / SANGAT BAIK", "HASIL")
+                                log("    Kualitas Ekstraksi: SEMPURNA / SANGAT BAIK", "HASIL")
                             elif psnr_img_val > 30:
-                                self.log_pesan("    Kualitas Ekstraksi: BAIK", "HASIL")
+                                log("    Kualitas Ekstraksi: BAIK", "HASIL")
                             else:
-                                self.log_pesan("    Kualitas Ekstraksi: KURANG", "HASIL")
+                                log("    Kualitas Ekstraksi: KURANG", "HASIL")
                         else:
-                            self.log_pesan("Tidak bisa membaca gambar untuk evaluasi.", "ERROR")
+                            log("Tidak bisa membaca gambar untuk evaluasi.", "ERROR")
                     except Exception as e_eval:
-                        self.log_pesan(f"Error saat evaluasi gambar: {e_eval}", "ERROR")
+                        log(f"Error saat evaluasi gambar: {e_eval}", "ERROR")
                 else:
-                    self.log_pesan("Tidak bisa melakukan evaluasi gambar: file asli atau ekstraksi tidak ditemukan.", "WARNING")
+                    log("Tidak bisa melakukan evaluasi gambar: file asli atau ekstraksi tidak ditemukan.", "WARNING")
             else:
-                self.log_pesan("EKSTRAKSI GAGAL.", "ERROR"); messagebox.showerror("Gagal", "Ekstraksi gagal.")
+                if job.dibatalkan(): log("EKSTRAKSI DIBATALKAN.", "STATUS")
+                else: log("EKSTRAKSI GAGAL.", "ERROR")
+            return berhasil
         except FileNotFoundError as fnf_error:
-            self.log_pesan(f"Error File Tidak Ditemukan: {fnf_error}", "ERROR")
-            messagebox.showerror("Error File", f"File tidak ditemukan: {fnf_error}")
+            log(f"Error File Tidak Ditemukan: {fnf_error}", "ERROR")
+            job.pesan_error = f"File tidak ditemukan: {fnf_error}"; return False
         except Exception as e:
-            self.log_pesan(f"Error tidak terduga saat ekstraksi: {e}", "ERROR")
-            messagebox.showerror("Error Ekstraksi", f"Terjadi kesalahan: {e}")
-        finally: 
-            self.proses_selesai_gui(original_stdout)
+            log(f"Error tidak terduga saat ekstraksi: {e}", "ERROR")
+            job.pesan_error = str(e); return False
 
 
 if __name__ == '__main__':
-    module_files_to_check = ["helpers.py", "config_and_setup.py", "embed_process.py", "extract_process.py", "evaluation.py"]
+    module_files_to_check = ["helpers.py", "config_and_setup.py", "embed_process.py", "extract_process.py", "session.py", "progress.py", "job_queue.py", "evaluation.py"]
     missing_files_found = [f for f in module_files_to_check if not os.path.exists(f)]
     
     root_tk_main = tk.Tk() 
@@ -0,0 +1,154 @@
+import os
+import struct
+
+# --- Konfigurasi Kontainer AVI ---
+# AVI 1.0 memakai ukuran RIFF 32 bit; file yang lebih besar harus tetap berupa segmen terpisah.
+BATAS_UKURAN_AVI = 0xFFFFFFFF - (64 * 1024 ** 2)
+FLAG_AVIIF_KEYFRAME = 0x10
+FLAG_AVIF_HASINDEX = 0x10
+BIT_IX_BUKAN_KEYFRAME = 0x80000000  # Entri index OpenDML (ix##): bit 31 ukuran = bukan keyframe
+# Codec yang setiap framenya pasti intra; dipakai jika AVI tidak punya index (flag keyframe tidak diketahui).
+# FFV1 dari libavcodec memakai GOP (frame non-kunci meneruskan konteks range coder), jadi tidak termasuk.
+FOURCC_SELALU_INTRA = ("MJPG", "AVRN", "LJPG", "JPEG")
+
+# --- Pembacaan AVI (RIFF) ---
+def baca_indeks_avi(path_avi):
+    """
+    Membaca header dan posisi chunk frame stream video pertama dari AVI (termasuk RIFF AVIX OpenDML).
+    Mengembalikan (info, list (offset_data, ukuran, keyframe)); info memuat lebar, tinggi, rate, scale, fourcc,
+    dan strf (isi chunk strf mentah, termasuk extradata codec). Flag keyframe diambil dari index idx1 dan
+    index standar OpenDML (ix##); tanpa index, hanya codec di FOURCC_SELALU_INTRA yang dianggap keyframe.
+    """
+    info = {"lebar": 0, "tinggi": 0, "rate": 25, "scale": 1, "fourcc": "", "strf": None}
+    daftar_frame = []
+    jenis_stream = []
+    posisi_movi = []        # Posisi fourcc 'movi' (basis offset relatif idx1)
+    entri_idx1 = []         # (flags, offset chunk) entri video di idx1, berurutan
+    keyframe_per_offset = {}  # offset data -> keyframe, dari index OpenDML
+    ukuran_file = os.path.getsize(path_avi)
+    with open(path_avi, "rb") as f:
+        if f.read(4) != b"RIFF": raise ValueError(f"'{path_avi}' bukan file AVI (RIFF).")
+        f.seek(0)
+        def telusuri(akhir, id_video):
+            while f.tell() + 8 <= akhir:
+                id_chunk, ukuran = struct.unpack("<4sI", f.read(8))
+                awal = f.tell()
+                if id_chunk in (b"LIST", b"RIFF"):
+                    jenis = f.read(4)
+                    if jenis == b"strl": jenis_stream.append(None)
+                    elif jenis == b"movi": posisi_movi.append(awal)
+                    id_video = telusuri(min(awal + ukuran, akhir), id_video)
+                elif id_chunk == b"strh":
+                    isi = f.read(min(ukuran, 56))
+                    jenis_stream[-1] = isi[:4]
+                    if isi[:4] == b"vids" and id_video is None:
+                        id_video = f"{len(jenis_stream) - 1:02d}".encode()
+                        info["fourcc"] = isi[4:8].decode("latin-1")
+                        info["scale"], info["rate"] = struct.unpack("<II", isi[20:28])
+                elif id_chunk == b"strf" and jenis_stream and jenis_stream[-1] == b"vids" and info["strf"] is None:
+                    info["strf"] = f.read(ukuran)
+                    info["lebar"], tinggi = struct.unpack("<ii", info["strf"][4:12])
+                    info["tinggi"] = abs(tinggi)
+                elif id_video is not None and id_chunk[:2] == id_video and id_chunk[2:] in (b"dc", b"db"):
+                    daftar_frame.append((awal, ukuran))
+                elif id_video is not None and id_chunk == b"idx1":
+                    isi = f.read(ukuran - ukuran % 16)
+                    for ckid, flags, offset, _ in struct.iter_unpack("<4sIII", isi):
+                        if ckid[:2] == id_video and ckid[2:] in (b"dc", b"db"): entri_idx1.append((flags, offset))
+                elif id_video is not None and id_chunk == b"ix" + id_video:
+                    panjang_entri, _, tipe_index, jumlah_entri, _, basis = struct.unpack("<HBBI4sQ", f.read(20))
+                    if tipe_index == 0x01 and panjang_entri == 2:  # AVI_INDEX_OF_CHUNKS
+                        f.read(4)
+                        for offset, ukuran_entri in struct.iter_unpack("<II", f.read(8 * jumlah_entri)):
+                            keyframe_per_offset[basis + offset] = not ukuran_entri & BIT_IX_BUKAN_KEYFRAME
+                f.seek(awal + ukuran + (ukuran & 1))
+            return id_video
+        telusuri(ukuran_file, None)
+    if not daftar_frame: raise ValueError(f"Tidak ada frame video di '{path_avi}'.")
+    if entri_idx1:
+        # Offset idx1 menunjuk header chunk, relatif ke fourcc 'movi' pertama atau absolut (encoder lama).
+        offset_pertama = entri_idx1[0][1] + 8
+        basis = posisi_movi[0] if posisi_movi and posisi_movi[0] + offset_pertama == daftar_frame[0][0] else 0
+        if basis == 0 and offset_pertama != daftar_frame[0][0]:
+            # Offset tidak cocok dengan kedua basis: pasangkan entri dengan chunk berdasarkan urutan.
+            for (flags, _), (offset_data, _) in zip(entri_idx1, daftar_frame):
+                keyframe_per_offset.setdefault(offset_data, bool(flags & FLAG_AVIIF_KEYFRAME))
+        else:
+            for flags, offset in entri_idx1:
+                keyframe_per_offset.setdefault(basis + offset + 8, bool(flags & FLAG_AVIIF_KEYFRAME))
+    selalu_intra = info["fourcc"].upper() in FOURCC_SELALU_INTRA
+    return info, [(offset, ukuran, keyframe_per_offset.get(offset, selalu_intra)) for offset, ukuran in daftar_frame]
+
+# --- Penulisan AVI ---
+class PenulisAVI:
+    """
+    Penulis AVI 1.0 (satu stream video + idx1) yang menerima frame terkompresi apa adanya beserta flag keyframe-nya;
+    ukuran header diisi saat tutup(). `strf` mentah dari file sumber dipakai bila codec butuh extradata.
+    """
+    def __init__(self, path_avi, lebar, tinggi, rate, scale=1, fourcc="MJPG", strf=None):
+        self.f = open(path_avi, "wb")
+        self.lebar, self.tinggi, self.rate, self.scale = lebar, tinggi, rate, scale
+        self.fourcc = fourcc.encode("latin-1")
+        self.strf = strf if strf is not None else struct.pack(
+            "<IiiHH4sIiiII", 40, lebar, tinggi, 1, 24, self.fourcc, lebar * tinggi * 3, 0, 0, 0, 0)
+        self.indeks = []
+        self.ukuran_maks = 0
+        self.f.write(self._header(0))
+        self.posisi_movi = self.f.tell()
+        self.f.write(b"LIST\0\0\0\0movi")
+
+    def _header(self, jumlah_frame):
+        avih = struct.pack("<IIIIIIIIII16x", int(round(1e6 * self.scale / self.rate)), 0, 0, FLAG_AVIF_HASINDEX,
+                           jumlah_frame, 0, 1, self.ukuran_maks, self.lebar, self.tinggi)
+        strh = struct.pack("<4s4sIHHIIIIIIIIhhhh", b"vids", self.fourcc, 0, 0, 0, 0, self.scale, self.rate, 0,
+                           jumlah_frame, self.ukuran_maks, 0xFFFFFFFF, 0, 0, 0, self.lebar, self.tinggi)
+        strf = self.strf + (b"\0" if len(self.strf) & 1 else b"")
+        strl = b"LIST" + struct.pack("<I", 4 + 8 + len(strh) + 8 + len(strf)) + b"strl" + \
+               b"strh" + struct.pack("<I", len(strh)) + strh + b"strf" + struct.pack("<I", len(self.strf)) + strf
+        hdrl = b"hdrl" + b"avih" + struct.pack("<I", len(avih)) + avih + strl
+        return b"RIFF\0\0\0\0AVI " + b"LIST" + struct.pack("<I", len(hdrl)) + hdrl
+
+    def tulis(self, data_frame, keyframe=True):
+        if self.f.tell() + len(data_frame) + 16 * (len(self.indeks) + 1) > BATAS_UKURAN_AVI:
+            raise ValueError("Ukuran AVI 1.0 melebihi batas RIFF 32 bit.")
+        self.indeks.append((self.f.tell() - (self.posisi_movi + 8), len(data_frame), keyframe))
+        self.f.write(b"00dc" + struct.pack("<I", len(data_frame)) + data_frame + (b"\0" if len(data_frame) & 1 else b""))
+        self.ukuran_maks = max(self.ukuran_maks, len(data_frame))
+
+    def tutup(self):
+        akhir_movi = self.f.tell()
+        self.f.write(b"idx1" + struct.pack("<I", 16 * len(self.indeks)))
+        self.f.write(b"".join(struct.pack("<4sIII", b"00dc", FLAG_AVIIF_KEYFRAME if keyframe else 0, offset, ukuran)
+                              for offset, ukuran, keyframe in self.indeks))
+        akhir_file = self.f.tell()
+        self.f.seek(0); self.f.write(self._header(len(self.indeks)))
+        self.f.seek(4); self.f.write(struct.pack("<I", akhir_file - 8))
+        self.f.seek(self.posisi_movi + 4); self.f.write(struct.pack("<I", akhir_movi - self.posisi_movi - 8))
+        self.f.close()
+
+# --- Penyambungan Tanpa Encode Ulang ---
+def sambung_avi(daftar_sumber, path_output):
+    """
+    Menyambung chunk frame dari beberapa AVI menjadi satu AVI tanpa decode/encode; flag keyframe sumber dibawa.
+    daftar_sumber: list (path_avi, info, daftar_frame) dari baca_indeks_avi (daftar_frame boleh dipotong, tetapi
+    harus diawali keyframe karena frame non-kunci bergantung pada frame sebelumnya di file sumber).
+    ValueError jika header sumber tidak seragam, potongan tidak diawali keyframe, atau hasil melebihi batas AVI 1.0.
+    """
+    info_pertama = daftar_sumber[0][1]
+    for _, info, _ in daftar_sumber[1:]:
+        if any(info[k] != info_pertama[k] for k in ("lebar", "tinggi", "fourcc", "rate", "scale", "strf")):
+            raise ValueError("Header AVI sumber berbeda (dimensi/codec/extradata); chunk tidak bisa disambung.")
+    if any(daftar_frame and not daftar_frame[0][2] for _, _, daftar_frame in daftar_sumber):
+        raise ValueError("Potongan AVI sumber tidak diawali keyframe; chunk tidak bisa disambung.")
+    if sum(ukuran + 24 for _, _, daftar_frame in daftar_sumber for _, ukuran, _ in daftar_frame) > BATAS_UKURAN_AVI:
+        raise ValueError("Hasil sambungan melebihi batas AVI 1.0.")
+    penulis = PenulisAVI(path_output, info_pertama["lebar"], info_pertama["tinggi"], info_pertama["rate"],
+                         info_pertama["scale"], fourcc=info_pertama["fourcc"], strf=info_pertama["strf"])
+    try:
+        for path_avi, _, daftar_frame in daftar_sumber:
+            with open(path_avi, "rb") as f:
+                for offset, ukuran, keyframe in daftar_frame:
+                    f.seek(offset); penulis.tulis(f.read(ukuran), keyframe)
+    finally:
+        penulis.tutup()
+    return sum(len(daftar_frame) for _, _, daftar_frame in daftar_sumber)
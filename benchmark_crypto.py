@@ -0,0 +1,76 @@
+import os
+import json
+
+# Import fungsi-fungsi kriptografi dari config_and_setup
+from config_and_setup import (
+    buat_pasangan_kunci_ecc, buat_shared_secret_ecdh,
+    derive_kunci_aes_dari_shared_secret, enkripsi_aes_gcm, dekripsi_aes_gcm,
+    hitung_sha3_256
+)
+from instrumentation import ukur_fungsi, ITERASI_MINIMUM_DEFAULT, DURASI_MINIMUM_DETIK_DEFAULT
+
+# --- Konfigurasi Benchmark ---
+UKURAN_PAYLOAD_DEFAULT = (1024, 16 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024)
+
+# --- Benchmark Kriptografi ---
+def benchmark_kripto(ukuran_payload_bytes=UKURAN_PAYLOAD_DEFAULT, path_json_output=None,
+                     iterasi_minimum=ITERASI_MINIMUM_DEFAULT, durasi_minimum_detik=DURASI_MINIMUM_DETIK_DEFAULT):
+    """
+    Mengukur fungsi kriptografi yang sebenarnya dipakai pipeline:
+    pembuatan kunci ECC, ECDH, HKDF, AES-GCM (enkripsi/dekripsi), dan SHA3-256.
+    Operasi yang bergantung pada ukuran payload diukur untuk setiap ukuran.
+    Mengembalikan dict hasil dan (opsional) menyimpannya sebagai JSON.
+    """
+    print("\n=== BENCHMARK KRIPTOGRAFI (ECC, HKDF, AES-GCM, SHA3) ===")
+    opsi = dict(iterasi_minimum=iterasi_minimum, durasi_minimum_detik=durasi_minimum_detik)
+    hasil = {"operasi_kunci": {}, "operasi_payload": {}}
+
+    # Operasi kunci (tidak bergantung ukuran payload)
+    priv_pengirim, _ = buat_pasangan_kunci_ecc()
+    _, pub_penerima = buat_pasangan_kunci_ecc()
+    shared_secret = buat_shared_secret_ecdh(priv_pengirim, pub_penerima)
+    salt = os.urandom(16)
+
+    hasil["operasi_kunci"]["buat_pasangan_kunci_ecc"] = ukur_fungsi(buat_pasangan_kunci_ecc, **opsi)
+    hasil["operasi_kunci"]["buat_shared_secret_ecdh"] = ukur_fungsi(
+        lambda: buat_shared_secret_ecdh(priv_pengirim, pub_penerima), **opsi)
+    hasil["operasi_kunci"]["derive_kunci_aes_dari_shared_secret"] = ukur_fungsi(
+        lambda: derive_kunci_aes_dari_shared_secret(shared_secret, salt, 32), **opsi)
+    for nama, statistik in hasil["operasi_kunci"].items():
+        print(f"    {nama}: {statistik['ops_per_detik']:.1f} ops/s (p50 {statistik['p50_detik'] * 1e6:.1f} us)")
+
+    kunci_aes = derive_kunci_aes_dari_shared_secret(shared_secret, salt, 32)
+    for ukuran in ukuran_payload_bytes:
+        data = os.urandom(ukuran)
+        ciphertext, nonce, tag = enkripsi_aes_gcm(data, kunci_aes)
+        hasil_ukuran = {
+            "enkripsi_aes_gcm": ukur_fungsi(lambda: enkripsi_aes_gcm(data, kunci_aes), ukuran, **opsi),
+            "dekripsi_aes_gcm": ukur_fungsi(lambda: dekripsi_aes_gcm(ciphertext, kunci_aes, nonce, tag), ukuran, **opsi),
+            "hitung_sha3_256": ukur_fungsi(lambda: hitung_sha3_256(data), ukuran, **opsi),
+        }
+        hasil["operasi_payload"][str(ukuran)] = hasil_ukuran
+        print(f"    Payload {ukuran} bytes:")
+        for nama, statistik in hasil_ukuran.items():
+            print(f"      {nama}: {statistik['mb_per_detik']:.1f} MB/s, {statistik['ops_per_detik']:.1f} ops/s "
+                  f"(p50 {statistik['p50_detik'] * 1e3:.3f} ms, p99 {statistik['p99_detik'] * 1e3:.3f} ms)")
+
+    if path_json_output:
+        direktori = os.path.dirname(path_json_output)
+        if direktori: os.makedirs(direktori, exist_ok=True)
+        with open(path_json_output, "w") as f:
+            json.dump(hasil, f, indent=2)
+        print(f"  Hasil benchmark disimpan ke '{path_json_output}'.")
+    return hasil
+
+# --- Blok Utama untuk Menjalankan Benchmark ---
+if __name__ == "__main__":
+    print("="*70)
+    print("BENCHMARK KRIPTOGRAFI STEGANOGRAFI VIDEO (SHA3-ECC-AES)")
+    print("="*70)
+
+    output_dir = "media/output"
+    os.makedirs(output_dir, exist_ok=True)
+    benchmark_kripto(path_json_output=os.path.join(output_dir, "benchmark", "benchmark_kripto.json"))
+
+    print("\nPROGRAM SELESAI")
+    print("="*70)
@@ -0,0 +1,271 @@
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import cv2
+import numpy as np
+from PIL import Image
+
+try:
+    import resource  # Tidak tersedia di Windows
+except ImportError:
+    resource = None
+
+from config_and_setup import (
+    buat_pasangan_kunci_ecc, serialisasi_kunci_publik_ecc_compressed, proses_frame_qim_dct
+)
+from embed_process import embed_gambar_ke_video_final
+from extract_process import ekstraksi_gambar_video_final
+from instrumentation import MetrikPipeline
+
+# --- Konfigurasi Benchmark ---
+RESOLUSI_COVER = {
+    "240p": (426, 240),
+    "360p": (640, 360),
+    "480p": (854, 480),
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "4K": (3840, 2160),
+}
+JUMLAH_FRAME_DEFAULT = (5, 15)
+UKURAN_SECRET_DEFAULT = (32, 64, 128)  # Sisi gambar rahasia grayscale persegi (piksel)
+DELTA_DEFAULT = 20
+NUM_AC_COEFFS_DEFAULT = 10
+ULANGAN_FRAME_DEFAULT = 3
+AMBANG_REGRESI_PERSEN_DEFAULT = 10.0
+# Overhead header payload (bit) di luar ciphertext: metadata, kunci publik, salt, hash, nonce, tag, panjang.
+OVERHEAD_HEADER_BITS = 976
+
+# --- Fungsi Pembuat Data Sintetis ---
+def buat_frame_sintetis(lebar, tinggi, indeks_frame, rng):
+    """
+    Membuat frame BGR sintetis (gradien + objek bergerak + noise ringan) yang deterministik.
+    Nilai piksel dijaga di rentang 16..235 agar hasil benchmark tidak dipengaruhi clipping.
+    """
+    x = np.linspace(0, 219, lebar, dtype=np.float32)[None, :]
+    y = np.linspace(0, 219, tinggi, dtype=np.float32)[:, None]
+    dasar = 16 + (0.6 * x + 0.4 * y + 8 * indeks_frame) % 220
+    frame = np.repeat(dasar[:, :, None], 3, axis=2)
+    sisi = max(8, min(lebar, tinggi) // 6)
+    pos_x = (indeks_frame * 7) % max(1, lebar - sisi); pos_y = (indeks_frame * 5) % max(1, tinggi - sisi)
+    frame[pos_y:pos_y + sisi, pos_x:pos_x + sisi, :] = (200, 80, 40)
+    frame += rng.normal(0, 4, frame.shape).astype(np.float32)
+    return np.uint8(np.clip(frame, 16, 235))
+
+def buat_video_cover_sintetis(path_video, lebar, tinggi, jumlah_frame, fps=24.0, seed=0):
+    """Menulis video cover sintetis lossless (FFV1 AVI) agar hasil benchmark dapat direproduksi."""
+    rng = np.random.default_rng(seed)
+    out = cv2.VideoWriter(path_video, cv2.VideoWriter_fourcc(*'FFV1'), fps, (lebar, tinggi), isColor=True)
+    if not out.isOpened():
+        raise RuntimeError(f"Gagal membuat VideoWriter untuk cover sintetis '{path_video}'.")
+    for i in range(jumlah_frame):
+        out.write(buat_frame_sintetis(lebar, tinggi, i, rng))
+    out.release()
+    return path_video
+
+def buat_gambar_secret_sintetis(path_gambar, sisi, seed=0):
+    """Membuat gambar rahasia grayscale persegi yang deterministik."""
+    rng = np.random.default_rng(seed)
+    Image.fromarray(rng.integers(0, 256, (sisi, sisi), dtype=np.uint8), mode='L').save(path_gambar)
+    return path_gambar
+
+def kapasitas_bit_per_frame(lebar, tinggi, num_ac_coeffs):
+    return (lebar // 8) * (tinggi // 8) * min(num_ac_coeffs, 63)
+
+def peak_rss_mb():
+    """Peak resident set size proses saat ini dalam MB (None jika tidak didukung platform)."""
+    if resource is None: return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KB, macOS melaporkan byte.
+    return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+
+# --- Benchmark Per Frame ---
+def benchmark_proses_frame(lebar, tinggi, delta=DELTA_DEFAULT, num_ac_coeffs=NUM_AC_COEFFS_DEFAULT,
+                           ulangan=ULANGAN_FRAME_DEFAULT, seed=0):
+    """Mengukur proses_frame_qim_dct (mode embed kapasitas penuh dan mode extract) pada satu frame sintetis."""
+    rng = np.random.default_rng(seed)
+    frame = buat_frame_sintetis((lebar // 8) * 8, (tinggi // 8) * 8, 0, rng)
+    kapasitas = kapasitas_bit_per_frame(lebar, tinggi, num_ac_coeffs)
+    bits = ''.join(rng.choice(['0', '1'], kapasitas))
+    hasil = {}
+    for mode in ('embed', 'extract'):
+        durasi = []
+        for _ in range(ulangan):
+            mulai = time.perf_counter()
+            if mode == 'embed':
+                proses_frame_qim_dct(frame, 'embed', delta, bits, num_ac_coeffs_to_use=num_ac_coeffs)
+            else:
+                proses_frame_qim_dct(frame, 'extract', delta, num_ac_coeffs_to_use=num_ac_coeffs)
+            durasi.append(time.perf_counter() - mulai)
+        rata_rata = float(np.mean(durasi))
+        hasil[mode] = {
+            "detik_per_frame": rata_rata,
+            "frame_per_detik": 1.0 / rata_rata if rata_rata > 0 else float('inf'),
+            "bit_per_detik": kapasitas / rata_rata if rata_rata > 0 else float('inf'),
+        }
+    return hasil
+
+# --- Benchmark End-to-End Satu Kasus ---
+def _jalankan_kasus(kasus):
+    """Worker: menjalankan satu kasus (resolusi x jumlah frame x ukuran secret) di proses terpisah."""
+    lebar, tinggi = kasus["lebar"], kasus["tinggi"]
+    dir_kerja = tempfile.mkdtemp(prefix="bench_stego_")
+    try:
+        path_cover = buat_video_cover_sintetis(os.path.join(dir_kerja, "cover.avi"), lebar, tinggi,
+                                               kasus["jumlah_frame"], seed=kasus["seed"])
+        path_secret = buat_gambar_secret_sintetis(os.path.join(dir_kerja, "secret.png"), kasus["sisi_secret"], seed=kasus["seed"])
+        path_stego_base = os.path.join(dir_kerja, "stego")
+        path_hasil = os.path.join(dir_kerja, "extracted.png")
+        priv_penerima, pub_penerima = buat_pasangan_kunci_ecc()
+        pub_penerima_bytes = serialisasi_kunci_publik_ecc_compressed(pub_penerima)
+
+        metrik_embed = MetrikPipeline(nama_job="embed", rekam_trace=False)
+        metrik_ekstrak = MetrikPipeline(nama_job="ekstraksi", rekam_trace=False)
+        log = io.StringIO()
+        with contextlib.redirect_stdout(log):
+            mulai = time.perf_counter()
+            berhasil_embed, _, _ = embed_gambar_ke_video_final(
+                path_cover, path_secret, path_stego_base, kasus["delta"], kasus["num_ac_coeffs"], pub_penerima_bytes,
+                metrik=metrik_embed)
+            durasi_embed = time.perf_counter() - mulai
+            mulai = time.perf_counter()
+            berhasil_ekstrak = berhasil_embed and ekstraksi_gambar_video_final(
+                path_stego_base + ".avi", path_hasil, kasus["delta"], kasus["num_ac_coeffs"], priv_penerima,
+                metrik=metrik_ekstrak)
+            durasi_ekstrak = time.perf_counter() - mulai
+
+        identik = False
+        if berhasil_ekstrak:
+            identik = np.array_equal(np.array(Image.open(path_secret).convert('L')), np.array(Image.open(path_hasil).convert('L')))
+        payload_bits = kasus["sisi_secret"] ** 2 * 8 + OVERHEAD_HEADER_BITS
+        jumlah_frame = kasus["jumlah_frame"]
+        return dict(kasus,
+                    berhasil_embed=bool(berhasil_embed), berhasil_ekstrak=bool(berhasil_ekstrak), identik=bool(identik),
+                    payload_bits=payload_bits,
+                    embed_detik=durasi_embed, ekstrak_detik=durasi_ekstrak,
+                    embed_frame_per_detik=jumlah_frame / durasi_embed if durasi_embed > 0 else None,
+                    embed_bit_per_detik=payload_bits / durasi_embed if durasi_embed > 0 else None,
+                    ekstrak_bit_per_detik=payload_bits / durasi_ekstrak if durasi_ekstrak > 0 else None,
+                    peak_rss_mb=peak_rss_mb(),
+                    tahap_embed=metrik_embed.ringkasan()["tahap"], tahap_ekstrak=metrik_ekstrak.ringkasan()["tahap"])
+    finally:
+        shutil.rmtree(dir_kerja, ignore_errors=True)
+
+def _format_opsional(nilai, spesifikasi, satuan=""):
+    # Throughput bisa None (durasi nol) dan RSS None (tanpa resource); tampilkan 'n/a' agar log tidak gagal.
+    return f"{nilai:{spesifikasi}}{satuan}" if nilai is not None else "n/a"
+
+def kunci_kasus(kasus):
+    return f"{kasus['resolusi']}_f{kasus['jumlah_frame']}_s{kasus['sisi_secret']}_d{kasus['delta']}_c{kasus['num_ac_coeffs']}"
+
+def jalankan_benchmark_pipeline(daftar_resolusi=tuple(RESOLUSI_COVER), jumlah_frame_list=JUMLAH_FRAME_DEFAULT,
+                                ukuran_secret_list=UKURAN_SECRET_DEFAULT, delta=DELTA_DEFAULT,
+                                num_ac_coeffs=NUM_AC_COEFFS_DEFAULT, seed=0, path_json_output=None):
+    """
+    Menjalankan suite benchmark end-to-end (embed + ekstraksi) pada cover sintetis.
+    Setiap kasus dijalankan pada proses baru agar peak RSS terukur terpisah.
+    Kasus yang payload-nya tidak muat di cover ditandai 'dilewati'.
+    """
+    print("\n=== BENCHMARK PIPELINE EMBED/EKSTRAKSI ===")
+    hasil = {"konfigurasi": {"delta": delta, "num_ac_coeffs": num_ac_coeffs, "seed": seed},
+             "per_frame": {}, "kasus": {}}
+    ctx = multiprocessing.get_context("spawn")
+    for nama_resolusi in daftar_resolusi:
+        lebar, tinggi = RESOLUSI_COVER[nama_resolusi]
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as executor:
+            per_frame = executor.submit(benchmark_proses_frame, lebar, tinggi, delta, num_ac_coeffs, seed=seed).result()
+        hasil["per_frame"][nama_resolusi] = per_frame
+        print(f"  [{nama_resolusi} {lebar}x{tinggi}] proses_frame_qim_dct: "
+              f"embed {per_frame['embed']['frame_per_detik']:.2f} fps, extract {per_frame['extract']['frame_per_detik']:.2f} fps")
+
+        kapasitas = kapasitas_bit_per_frame(lebar, tinggi, num_ac_coeffs)
+        for jumlah_frame in jumlah_frame_list:
+            for sisi_secret in ukuran_secret_list:
+                kasus = dict(resolusi=nama_resolusi, lebar=lebar, tinggi=tinggi, jumlah_frame=jumlah_frame,
+                             sisi_secret=sisi_secret, delta=delta, num_ac_coeffs=num_ac_coeffs, seed=seed)
+                kunci = kunci_kasus(kasus)
+                if sisi_secret ** 2 * 8 + OVERHEAD_HEADER_BITS > kapasitas * jumlah_frame:
+                    hasil["kasus"][kunci] = dict(kasus, dilewati=True)
+                    print(f"    {kunci}: dilewati (payload melebihi kapasitas cover)")
+                    continue
+                with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as executor:
+                    hasil_kasus = executor.submit(_jalankan_kasus, kasus).result()
+                hasil["kasus"][kunci] = hasil_kasus
+                print(f"    {kunci}: embed {_format_opsional(hasil_kasus['embed_frame_per_detik'], '.2f', ' fps')} "
+                      f"({_format_opsional(hasil_kasus['embed_bit_per_detik'], '.0f', ' bit/s')}), "
+                      f"ekstraksi {hasil_kasus['ekstrak_detik']:.2f} s, "
+                      f"peak RSS {_format_opsional(hasil_kasus['peak_rss_mb'], '.1f', ' MB')}, identik={hasil_kasus['identik']}")
+
+    if path_json_output:
+        direktori = os.path.dirname(path_json_output)
+        if direktori: os.makedirs(direktori, exist_ok=True)
+        with open(path_json_output, "w") as f:
+            json.dump(hasil, f, indent=2)
+        print(f"  Hasil benchmark disimpan ke '{path_json_output}'.")
+    return hasil
+
+# --- Perbandingan dengan Baseline ---
+def bandingkan_dengan_baseline(hasil, hasil_baseline, ambang_persen=AMBANG_REGRESI_PERSEN_DEFAULT):
+    """
+    Membandingkan throughput hasil dengan baseline. Metrik yang turun lebih dari
+    `ambang_persen` persen dilaporkan sebagai regresi. Mengembalikan list regresi.
+    """
+    print(f"\n  [Perbandingan dengan Baseline (ambang {ambang_persen:.1f}%)]")
+    pasangan_metrik = []
+    for resolusi, per_frame in hasil.get("per_frame", {}).items():
+        for mode, statistik in per_frame.items():
+            nilai_baseline = hasil_baseline.get("per_frame", {}).get(resolusi, {}).get(mode, {}).get("frame_per_detik")
+            pasangan_metrik.append((f"per_frame/{resolusi}/{mode}/frame_per_detik", statistik["frame_per_detik"], nilai_baseline))
+    for kunci, kasus in hasil.get("kasus", {}).items():
+        kasus_baseline = hasil_baseline.get("kasus", {}).get(kunci, {})
+        for metrik in ("embed_frame_per_detik", "embed_bit_per_detik", "ekstrak_bit_per_detik"):
+            if metrik in kasus:
+                pasangan_metrik.append((f"kasus/{kunci}/{metrik}", kasus[metrik], kasus_baseline.get(metrik)))
+
+    regresi = []
+    for nama, nilai, nilai_baseline in pasangan_metrik:
+        if not nilai_baseline or nilai is None: continue
+        perubahan_persen = (nilai - nilai_baseline) / nilai_baseline * 100
+        if perubahan_persen < -ambang_persen:
+            regresi.append({"metrik": nama, "baseline": nilai_baseline, "sekarang": nilai, "perubahan_persen": perubahan_persen})
+            print(f"    REGRESI {nama}: {nilai_baseline:.2f} -> {nilai:.2f} ({perubahan_persen:+.1f}%)")
+    if not regresi:
+        print(f"    Tidak ada regresi di atas {ambang_persen:.1f}% ({len(pasangan_metrik)} metrik dibandingkan).")
+    return regresi
+
+# --- Blok Utama untuk Menjalankan Benchmark ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark end-to-end pipeline steganografi video.")
+    parser.add_argument("--resolusi", nargs="+", default=list(RESOLUSI_COVER), choices=list(RESOLUSI_COVER))
+    parser.add_argument("--frame", nargs="+", type=int, default=list(JUMLAH_FRAME_DEFAULT))
+    parser.add_argument("--secret", nargs="+", type=int, default=list(UKURAN_SECRET_DEFAULT), help="Sisi gambar rahasia (piksel)")
+    parser.add_argument("--delta", type=int, default=DELTA_DEFAULT)
+    parser.add_argument("--koefisien", type=int, default=NUM_AC_COEFFS_DEFAULT)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=os.path.join("media", "output", "benchmark", "benchmark_pipeline.json"))
+    parser.add_argument("--baseline", default=None, help="File JSON baseline untuk deteksi regresi")
+    parser.add_argument("--ambang", type=float, default=AMBANG_REGRESI_PERSEN_DEFAULT, help="Ambang regresi (persen)")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("BENCHMARK PIPELINE STEGANOGRAFI VIDEO (SHA3-ECC-AES)")
+    print("="*70)
+
+    hasil_benchmark = jalankan_benchmark_pipeline(args.resolusi, args.frame, args.secret, args.delta,
+                                                  args.koefisien, args.seed, args.output)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regresi_ditemukan = bandingkan_dengan_baseline(hasil_benchmark, json.load(f), args.ambang)
+        if regresi_ditemukan:
+            print("\nStatus: REGRESI PERFORMA TERDETEKSI")
+            sys.exit(1)
+
+    print("\nPROGRAM SELESAI")
+    print("="*70)
@@ -0,0 +1,224 @@
+import os
+import csv
+import json
+import time
+import argparse
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import cv2
+import numpy as np
+
+from config_and_setup import proses_frame_qim_dct, koefisien_dct_frame, qim_extract_koefisien
+from benchmark_pipeline import buat_frame_sintetis, kapasitas_bit_per_frame
+
+# --- Konfigurasi Benchmark Ketahanan ---
+DELTA_GRID_DEFAULT = (10, 20, 40, 60)
+KOEFISIEN_GRID_DEFAULT = (3, 10, 20)
+KUALITAS_JPEG_DEFAULT = (95, 85, 75, 50)
+SIGMA_NOISE_DEFAULT = (1.0, 2.0, 5.0)
+GESERAN_KECERAHAN_DEFAULT = (2, 5)
+SKALA_RESIZE_DEFAULT = (0.9, 0.5)
+RESOLUSI_DEFAULT = (640, 360)
+JUMLAH_FRAME_DEFAULT = 6
+
+# --- Serangan (Semua Dijalankan di Dalam Proses) ---
+def serangan_video_codec(frames_bgr, fourcc, kualitas=None, ekstensi=".avi", fps=24.0, api=cv2.CAP_ANY):
+    """
+    Re-encode melalui cv2.VideoWriter ke file sementara lalu dibaca kembali.
+    `kualitas` diteruskan lewat VIDEOWRITER_PROP_QUALITY; error jika backend tidak mendukungnya.
+    """
+    tinggi, lebar = frames_bgr[0].shape[:2]
+    fd, path_sementara = tempfile.mkstemp(suffix=ekstensi, prefix="serangan_")
+    os.close(fd)
+    try:
+        out = cv2.VideoWriter(path_sementara, api, cv2.VideoWriter_fourcc(*fourcc), fps, (lebar, tinggi), True)
+        if not out.isOpened(): raise RuntimeError(f"VideoWriter '{fourcc}' tidak tersedia.")
+        if kualitas is not None and not out.set(cv2.VIDEOWRITER_PROP_QUALITY, float(kualitas)):
+            out.release(); raise RuntimeError(f"VideoWriter '{fourcc}' tidak mendukung pengaturan kualitas.")
+        for frame in frames_bgr: out.write(frame)
+        out.release()
+        cap = cv2.VideoCapture(path_sementara)
+        hasil = []
+        while len(hasil) < len(frames_bgr):
+            ret, frame = cap.read()
+            if not ret: break
+            hasil.append(frame)
+        cap.release()
+        return hasil
+    finally:
+        os.remove(path_sementara)
+
+def serangan_noise_gaussian(frames_bgr, sigma, seed=0):
+    rng = np.random.default_rng(seed)
+    return [np.uint8(np.clip(frame + rng.normal(0, sigma, frame.shape), 0, 255)) for frame in frames_bgr]
+
+def serangan_kecerahan(frames_bgr, geseran):
+    return [np.uint8(np.clip(frame.astype(np.int16) + int(geseran), 0, 255)) for frame in frames_bgr]
+
+def serangan_resize(frames_bgr, skala):
+    """Downscale lalu upscale kembali ke ukuran asli (interpolasi bilinear)."""
+    hasil = []
+    for frame in frames_bgr:
+        tinggi, lebar = frame.shape[:2]
+        kecil = cv2.resize(frame, (max(8, int(round(lebar * skala))), max(8, int(round(tinggi * skala)))), interpolation=cv2.INTER_AREA)
+        hasil.append(cv2.resize(kecil, (lebar, tinggi), interpolation=cv2.INTER_LINEAR))
+    return hasil
+
+def daftar_serangan(kualitas_jpeg=KUALITAS_JPEG_DEFAULT, sigma_noise=SIGMA_NOISE_DEFAULT, geseran_kecerahan=GESERAN_KECERAHAN_DEFAULT,
+                    skala_resize=SKALA_RESIZE_DEFAULT):
+    """
+    List (nama_serangan, jenis, parameter); 'tanpa_serangan' setara dengan output FFV1 lossless.
+    Backend FFmpeg OpenCV tidak mengekspos kualitas/bitrate mp4v, sehingga mp4v hanya diuji pada setelan default encoder.
+    """
+    serangan = [("tanpa_serangan", "identitas", None)]
+    serangan += [(f"mjpg_q{q}", "mjpg", q) for q in kualitas_jpeg]
+    serangan += [("mp4v", "mp4v", None)]
+    serangan += [(f"noise_s{s:g}", "noise", s) for s in sigma_noise]
+    serangan += [(f"kecerahan_{g:+d}", "kecerahan", g) for g in geseran_kecerahan]
+    serangan += [(f"resize_{s:g}", "resize", s) for s in skala_resize]
+    return serangan
+
+def terapkan_serangan(frames_bgr, jenis, parameter, seed=0):
+    if jenis == "identitas": return list(frames_bgr)
+    if jenis == "mjpg": return serangan_video_codec(frames_bgr, "MJPG", parameter, api=cv2.CAP_OPENCV_MJPEG)
+    if jenis == "mp4v": return serangan_video_codec(frames_bgr, "mp4v", ekstensi=".mp4")
+    if jenis == "noise": return serangan_noise_gaussian(frames_bgr, parameter, seed)
+    if jenis == "kecerahan": return serangan_kecerahan(frames_bgr, parameter)
+    if jenis == "resize": return serangan_resize(frames_bgr, parameter)
+    raise ValueError(f"Jenis serangan tidak dikenal: {jenis}")
+
+# --- Ekstraksi dan BER Tervektorisasi ---
+def ekstrak_bit_frame(frame_bgr, delta, num_ac_coeffs):
+    """Bit QIM mentah satu frame (array uint8), aturan yang sama dengan proses_frame_qim_dct mode extract."""
+    gray = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2GRAY) if frame_bgr.ndim == 3 else frame_bgr
+    koef = koefisien_dct_frame(gray)
+    return qim_extract_koefisien(koef[:, 1:1 + min(num_ac_coeffs, 63)], delta).reshape(-1)
+
+def hitung_ber(bits_asli, frames_serangan, delta, num_ac_coeffs):
+    """Mengembalikan (BER total, BER per frame) dengan perbandingan array, bukan string."""
+    kesalahan_per_frame = np.full(len(bits_asli), bits_asli[0].size, dtype=np.int64)  # Frame hilang = semua bit salah
+    for i, frame in enumerate(frames_serangan[:len(bits_asli)]):
+        kesalahan_per_frame[i] = np.count_nonzero(ekstrak_bit_frame(frame, delta, num_ac_coeffs) != bits_asli[i])
+    ber_per_frame = kesalahan_per_frame / bits_asli[0].size
+    return float(kesalahan_per_frame.sum() / (bits_asli[0].size * len(bits_asli))), ber_per_frame
+
+# --- Satu Sel Grid (delta x koefisien), Semua Serangan ---
+def _jalankan_sel(sel):
+    """Worker: embed payload acak (kapasitas penuh) sekali, lalu ukur BER untuk setiap serangan."""
+    mulai = time.perf_counter()
+    frames_cover, delta, num_ac_coeffs = sel["frames_cover"], sel["delta"], sel["num_ac_coeffs"]
+    rng = np.random.default_rng(sel["seed"])
+    tinggi, lebar = frames_cover[0].shape[:2]
+    kapasitas = kapasitas_bit_per_frame(lebar, tinggi, num_ac_coeffs)
+    bits_asli, frames_stego = [], []
+    for frame in frames_cover:
+        bits = rng.integers(0, 2, kapasitas, dtype=np.uint8)
+        _, stego_gray, _ = proses_frame_qim_dct(frame, 'embed', delta, (bits + ord('0')).tobytes().decode('ascii'),
+                                                num_ac_coeffs_to_use=num_ac_coeffs)
+        bits_asli.append(bits)
+        frames_stego.append(cv2.cvtColor(stego_gray, cv2.COLOR_GRAY2BGR))  # Sama dengan frame yang ditulis embed
+
+    baris = []
+    for nama, jenis, parameter in sel["serangan"]:
+        try:
+            frames_serangan = terapkan_serangan(frames_stego, jenis, parameter, sel["seed"])
+        except RuntimeError as e:
+            baris.append({"serangan": nama, "delta": delta, "num_ac_coeffs": num_ac_coeffs, "error": str(e)})
+            continue
+        ber, ber_per_frame = hitung_ber(bits_asli, frames_serangan, delta, num_ac_coeffs)
+        baris.append({"serangan": nama, "delta": delta, "num_ac_coeffs": num_ac_coeffs,
+                      "bit_diuji": int(kapasitas * len(bits_asli)), "ber": ber,
+                      "ber_frame_maks": float(ber_per_frame.max()), "ber_frame_min": float(ber_per_frame.min())})
+    return baris, time.perf_counter() - mulai
+
+# --- Sumber Frame Cover ---
+def ambil_frame_cover(path_video=None, jumlah_frame=JUMLAH_FRAME_DEFAULT, resolusi=RESOLUSI_DEFAULT, seed=0):
+    """Frame BGR (dipotong ke kelipatan 8) dari video cover, atau frame sintetis jika path tidak diberikan."""
+    if path_video is None:
+        rng = np.random.default_rng(seed)
+        lebar, tinggi = (resolusi[0] // 8) * 8, (resolusi[1] // 8) * 8
+        return [buat_frame_sintetis(lebar, tinggi, i, rng) for i in range(jumlah_frame)]
+    cap = cv2.VideoCapture(path_video)
+    if not cap.isOpened(): raise IOError(f"Video '{path_video}' tidak bisa dibuka.")
+    frames = []
+    while len(frames) < jumlah_frame:
+        ret, frame = cap.read()
+        if not ret: break
+        frames.append(np.ascontiguousarray(frame[:(frame.shape[0] // 8) * 8, :(frame.shape[1] // 8) * 8]))
+    cap.release()
+    if not frames: raise IOError(f"Tidak ada frame yang terbaca dari '{path_video}'.")
+    return frames
+
+# --- Benchmark Utama ---
+def jalankan_benchmark_ketahanan(path_video=None, delta_grid=DELTA_GRID_DEFAULT, koefisien_grid=KOEFISIEN_GRID_DEFAULT,
+                                 serangan=None, jumlah_frame=JUMLAH_FRAME_DEFAULT, resolusi=RESOLUSI_DEFAULT,
+                                 jumlah_worker=None, seed=0, path_output=None):
+    """
+    Mengukur BER mentah (sebelum dekripsi) untuk grid (serangan x delta x jumlah koefisien AC).
+    Tiap sel (delta, koefisien) dijalankan paralel di ProcessPoolExecutor; payload acak mengisi penuh setiap frame.
+    """
+    print("\n=== BENCHMARK KETAHANAN (BER TERHADAP SERANGAN) ===")
+    serangan = serangan if serangan is not None else daftar_serangan()
+    frames_cover = ambil_frame_cover(path_video, jumlah_frame, resolusi, seed)
+    tinggi, lebar = frames_cover[0].shape[:2]
+    print(f"  Cover: {'sintetis' if path_video is None else path_video} ({lebar}x{tinggi}, {len(frames_cover)} frame), "
+          f"{len(serangan)} serangan x {len(delta_grid)} delta x {len(koefisien_grid)} koefisien")
+
+    daftar_sel = [{"frames_cover": frames_cover, "delta": delta, "num_ac_coeffs": num_koef,
+                   "serangan": serangan, "seed": seed}
+                  for delta in delta_grid for num_koef in koefisien_grid]
+    mulai = time.perf_counter()
+    baris_tabel = []
+    jumlah_worker = jumlah_worker or min(len(daftar_sel), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=jumlah_worker, mp_context=multiprocessing.get_context("spawn")) as executor:
+        for baris_sel, _ in executor.map(_jalankan_sel, daftar_sel):
+            baris_tabel.extend(baris_sel)
+    durasi = time.perf_counter() - mulai
+
+    urutan_serangan = {nama: i for i, (nama, _, _) in enumerate(serangan)}
+    baris_tabel.sort(key=lambda b: (urutan_serangan[b["serangan"]], b["delta"], b["num_ac_coeffs"]))
+    print(f"  Selesai dalam {durasi:.2f} detik ({jumlah_worker} worker)")
+    print(f"  {'SERANGAN':<16} {'DELTA':>6} {'KOEF':>5} {'BER':>9} {'BER MAKS':>9}")
+    for baris in baris_tabel:
+        if "error" in baris:
+            print(f"  {baris['serangan']:<16} {baris['delta']:>6} {baris['num_ac_coeffs']:>5}  error: {baris['error']}")
+        else:
+            print(f"  {baris['serangan']:<16} {baris['delta']:>6} {baris['num_ac_coeffs']:>5} "
+                  f"{baris['ber']:>9.5f} {baris['ber_frame_maks']:>9.5f}")
+
+    hasil = {"video": path_video or "sintetis", "lebar": lebar, "tinggi": tinggi, "jumlah_frame": len(frames_cover),
+             "seed": seed, "durasi_detik": durasi, "tabel": baris_tabel}
+    if path_output:
+        direktori = os.path.dirname(path_output)
+        if direktori: os.makedirs(direktori, exist_ok=True)
+        if path_output.endswith(".csv"):
+            kolom = ["serangan", "delta", "num_ac_coeffs", "bit_diuji", "ber", "ber_frame_maks", "ber_frame_min", "error"]
+            with open(path_output, "w", newline="") as f:
+                penulis = csv.DictWriter(f, fieldnames=kolom)
+                penulis.writeheader(); penulis.writerows(baris_tabel)
+        else:
+            with open(path_output, "w") as f:
+                json.dump(hasil, f, indent=2)
+        print(f"  Tabel BER disimpan ke '{path_output}'.")
+    return hasil
+
+# --- Blok Utama untuk Menjalankan Benchmark ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark ketahanan DCT-QIM: BER terhadap re-encode, noise, kecerahan, dan resize.")
+    parser.add_argument("--video", default=None, help="Video cover (default: frame sintetis)")
+    parser.add_argument("--delta", nargs="+", type=float, default=list(DELTA_GRID_DEFAULT))
+    parser.add_argument("--koefisien", nargs="+", type=int, default=list(KOEFISIEN_GRID_DEFAULT))
+    parser.add_argument("--frame", type=int, default=JUMLAH_FRAME_DEFAULT)
+    parser.add_argument("--worker", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=os.path.join("media", "output", "benchmark", "benchmark_ketahanan.json"), help="Path .json atau .csv")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("BENCHMARK KETAHANAN STEGANOGRAFI VIDEO (DCT-QIM)")
+    print("="*70)
+    jalankan_benchmark_ketahanan(args.video, args.delta, args.koefisien, jumlah_frame=args.frame,
+                                 jumlah_worker=args.worker, seed=args.seed, path_output=args.output)
+    print("\nPROGRAM SELESAI")
+    print("="*70)
@@ -0,0 +1,223 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+import threading
+import numpy as np
+
+# --- Konfigurasi Cache ---
+DIREKTORI_CACHE_DEFAULT = os.path.join("media", "cache")
+BATAS_UKURAN_CACHE_DEFAULT = 4 * 1024 ** 3  # 4 GiB
+UKURAN_CHUNK_HASH = 1024 * 1024
+NAMA_FILE_INDEX = "index.json"
+
+# --- Penulisan Atomik ---
+def _file_sementara(path_tujuan, akhiran=".tmp"):
+    """Path file sementara unik per penulisan (bukan hanya per proses) di direktori yang sama dengan tujuan."""
+    fd, path_sementara = tempfile.mkstemp(prefix=os.path.basename(path_tujuan) + ".", suffix=akhiran,
+                                          dir=os.path.dirname(path_tujuan))
+    os.close(fd)
+    return path_sementara
+
+# --- Hash Konten File ---
+def hash_file(path_file, cache=None):
+    """
+    SHA-256 dari isi file (dibaca per chunk). Jika `cache` (CacheLRU) diberikan, hash disimpan
+    per (path, ukuran, mtime) sehingga file yang tidak berubah tidak perlu dibaca ulang.
+    """
+    stat = os.stat(path_file)
+    kunci_stat = f"{os.path.abspath(path_file)}|{stat.st_size}|{stat.st_mtime_ns}"
+    if cache is not None:
+        with cache.kunci_index:
+            if kunci_stat in cache.index["hash_file"]: return cache.index["hash_file"][kunci_stat]
+    sha = hashlib.sha256()
+    with open(path_file, "rb") as f:
+        for chunk in iter(lambda: f.read(UKURAN_CHUNK_HASH), b""):
+            sha.update(chunk)
+    hasil = sha.hexdigest()
+    if cache is not None:
+        with cache.kunci_index:
+            cache.index["hash_file"][kunci_stat] = hasil
+            cache.simpan_index()
+    return hasil
+
+# --- Direktori Cache dengan Eviksi LRU ---
+class CacheLRU:
+    """
+    Direktori cache berisi entri (subdirektori) dengan index JSON yang mencatat ukuran dan waktu
+    akses terakhir tiap entri. Jika total ukuran melebihi batas, entri yang paling lama tidak
+    diakses dihapus lebih dulu.
+    Satu instance aman dipakai bersamaan dari beberapa thread (index dijaga kunci_index). Dua instance
+    (atau dua proses) pada direktori yang sama masing-masing memegang salinan index sendiri dan saling
+    menimpa index.json: penulis terakhir yang menang, sehingga catatan ukuran/akses instance lain hilang.
+    """
+    def __init__(self, direktori=DIREKTORI_CACHE_DEFAULT, batas_ukuran_bytes=BATAS_UKURAN_CACHE_DEFAULT):
+        self.direktori = direktori
+        self.batas_ukuran_bytes = batas_ukuran_bytes
+        os.makedirs(self.direktori, exist_ok=True)
+        self.kunci_index = threading.RLock()
+        self.index = self._muat_index()
+
+    def _muat_index(self):
+        path_index = os.path.join(self.direktori, NAMA_FILE_INDEX)
+        try:
+            with open(path_index) as f:
+                index = json.load(f)
+        except (FileNotFoundError, ValueError):
+            index = {}
+        index.setdefault("entri", {}); index.setdefault("hash_file", {})
+        return index
+
+    def simpan_index(self):
+        # Tulis ke file sementara lalu os.replace agar pembaca lain tidak melihat index setengah jadi.
+        path_index = os.path.join(self.direktori, NAMA_FILE_INDEX)
+        with self.kunci_index:
+            path_sementara = _file_sementara(path_index)
+            with open(path_sementara, "w") as f:
+                json.dump(self.index, f)
+            os.replace(path_sementara, path_index)
+
+    def path_entri(self, kunci):
+        return os.path.join(self.direktori, kunci)
+
+    def ada(self, kunci):
+        return kunci in self.index["entri"] and os.path.isdir(self.path_entri(kunci))
+
+    def sentuh(self, kunci):
+        """Menandai entri baru saja diakses (untuk urutan LRU)."""
+        with self.kunci_index:
+            entri = self.index["entri"].setdefault(kunci, {"ukuran": 0})
+            entri["akses"] = time.time()
+
+    def total_ukuran(self):
+        with self.kunci_index:
+            return sum(entri.get("ukuran", 0) for entri in self.index["entri"].values())
+
+    def tambah_ukuran(self, kunci, ukuran_bytes):
+        """
+        Mencatat penambahan `ukuran_bytes` pada entri, mengevict entri lain (LRU) bila perlu.
+        Mengembalikan False (tanpa mencatat) jika entri ini sendiri akan melebihi batas cache.
+        """
+        with self.kunci_index:
+            entri = self.index["entri"].setdefault(kunci, {"ukuran": 0, "akses": time.time()})
+            if entri["ukuran"] + ukuran_bytes > self.batas_ukuran_bytes:
+                return False
+            self.evict(self.batas_ukuran_bytes - ukuran_bytes, kecuali=kunci)
+            entri["ukuran"] += ukuran_bytes
+            entri["akses"] = time.time()
+            return True
+
+    def evict(self, target_ukuran_bytes, kecuali=None):
+        """Menghapus entri paling lama tidak diakses sampai total ukuran <= target."""
+        with self.kunci_index:
+            urutan = sorted((k for k in self.index["entri"] if k != kecuali),
+                            key=lambda k: self.index["entri"][k].get("akses", 0))
+            dihapus = []
+            for kunci in urutan:
+                if self.total_ukuran() <= target_ukuran_bytes: break
+                self.hapus(kunci, simpan=False)
+                dihapus.append(kunci)
+            if dihapus: self.simpan_index()
+            return dihapus
+
+    def hapus(self, kunci, simpan=True):
+        with self.kunci_index:
+            shutil.rmtree(self.path_entri(kunci), ignore_errors=True)
+            self.index["entri"].pop(kunci, None)
+            if simpan: self.simpan_index()
+
+# --- Entri Per Frame ---
+class EntriPerFrame:
+    """Satu entri cache berisi satu file .npy per frame (dibaca via mmap, ditulis secara atomik)."""
+    def __init__(self, cache, kunci):
+        self.cache = cache
+        self.kunci = kunci
+        self.direktori = cache.path_entri(kunci)
+        self.penuh = False
+        os.makedirs(self.direktori, exist_ok=True)
+        cache.sentuh(kunci)
+
+    def _path_frame(self, indeks_frame):
+        return os.path.join(self.direktori, f"{indeks_frame:08d}.npy")
+
+    def _baca(self, indeks_frame):
+        path_frame = self._path_frame(indeks_frame)
+        if not os.path.exists(path_frame): return None
+        try:
+            return np.load(path_frame, mmap_mode='r')
+        except (ValueError, OSError):
+            return None
+
+    def _tulis(self, indeks_frame, array):
+        """Menyimpan array satu frame; dilewati jika entri sudah melebihi batas ukuran cache."""
+        if self.penuh: return False
+        path_frame = self._path_frame(indeks_frame)
+        if os.path.exists(path_frame): return True
+        if not self.cache.tambah_ukuran(self.kunci, array.nbytes + 128):
+            self.penuh = True
+            return False
+        path_sementara = _file_sementara(path_frame, ".tmp.npy")
+        np.save(path_sementara, array)
+        os.replace(path_sementara, path_frame)
+        return True
+
+    def tutup(self):
+        self.cache.simpan_index()
+
+# --- Cache Koefisien DCT Per Frame ---
+class EntriKoefisienDCT(EntriPerFrame):
+    """Koefisien DCT blok per frame untuk satu cover."""
+    def ambil(self, indeks_frame):
+        """Array (jumlah_blok, 64) float32 read-only (memory-mapped) atau None jika belum ada."""
+        return self._baca(indeks_frame)
+
+    def simpan(self, indeks_frame, koefisien):
+        return self._tulis(indeks_frame, np.ascontiguousarray(koefisien, dtype=np.float32))
+
+class CacheKoefisienDCT(CacheLRU):
+    """
+    Cache koefisien DCT blok 8x8 (grayscale) per frame cover, dikunci oleh hash isi file cover,
+    resolusi asli, dan area crop. Dipakai embed dan alat parameter untuk melewati decode + DCT maju.
+    """
+    def kunci(self, hash_cover, lebar, tinggi, lebar_crop, tinggi_crop):
+        return f"dct_{hash_cover[:32]}_{lebar}x{tinggi}_crop{lebar_crop}x{tinggi_crop}"
+
+    def buka(self, path_video, lebar, tinggi, lebar_crop, tinggi_crop):
+        """Membuka (atau membuat) entri untuk cover; mengembalikan EntriKoefisienDCT."""
+        kunci = self.kunci(hash_file(path_video, self), lebar, tinggi, lebar_crop, tinggi_crop)
+        return EntriKoefisienDCT(self, kunci)
+
+# --- Cache Bit Hasil Ekstraksi QIM ---
+class EntriBitEkstraksi(EntriPerFrame):
+    """Bit mentah hasil ekstraksi QIM per frame, disimpan terkemas (np.packbits, 8 bit per byte)."""
+    def __init__(self, cache, kunci, bit_per_frame):
+        super().__init__(cache, kunci)
+        self.bit_per_frame = bit_per_frame
+
+    def ambil(self, indeks_frame):
+        """Bitstream '0'/'1' satu frame atau None jika belum ada."""
+        terkemas = self._baca(indeks_frame)
+        if terkemas is None: return None
+        bit = np.unpackbits(terkemas)[:self.bit_per_frame]
+        if bit.size != self.bit_per_frame: return None
+        return (bit + ord('0')).tobytes().decode('ascii')
+
+    def simpan(self, indeks_frame, bitstream):
+        bit = np.frombuffer(bitstream.encode('ascii'), dtype=np.uint8) - ord('0')
+        return self._tulis(indeks_frame, np.packbits(bit))
+
+class CacheBitEkstraksi(CacheLRU):
+    """
+    Cache bitstream QIM mentah per frame stego. Bit hanya bergantung pada isi video, delta, dan
+    jumlah koefisien AC, sehingga ekstraksi ulang dengan kunci lain langsung ke parsing header dan dekripsi.
+    """
+    def kunci(self, hash_video, delta, num_ac_coeffs, lebar_proses, tinggi_proses):
+        return f"bit_{hash_video[:32]}_d{float(delta):g}_k{num_ac_coeffs}_{lebar_proses}x{tinggi_proses}"
+
+    def buka(self, path_video, delta, num_ac_coeffs, lebar_proses, tinggi_proses):
+        """Membuka (atau membuat) entri untuk stego video; mengembalikan EntriBitEkstraksi."""
+        kunci = self.kunci(hash_file(path_video, self), delta, num_ac_coeffs, lebar_proses, tinggi_proses)
+        bit_per_frame = (lebar_proses // 8) * (tinggi_proses // 8) * min(num_ac_coeffs, 63)
+        return EntriBitEkstraksi(self, kunci, bit_per_frame)
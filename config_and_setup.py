@@ -2,6 +2,7 @@ import cv2
 import numpy as np
 from scipy.fftpack import dct, idct
 import os
+import functools
 from PIL import Image
 # Impor helper untuk grayscale
 import helpers as steg_helpers 
@@ -13,10 +14,7 @@ from cryptography.hazmat.primitives import hashes # Untuk SHA3
 from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives import serialization
-
-# --- Konfigurasi Global ---
-_g_debug_print_count = 0
-_MAX_DEBUG_PRINTS_PER_CALL = 0 # Set ke 0 untuk mematikan debug koefisien individual
+from instrumentation import METRIK_NONAKTIF
 
 # --- Fungsi Helper Bytes <-> Bitstream dan Int <-> Bitstream (SAMA) ---
 def bytes_ke_bitstream(data_bytes):
@@ -103,75 +101,287 @@ def hitung_sha3_256(data_bytes):
     return digest.finalize()
 
 # --- Fungsi proses_frame_qim_dct (Grayscale, dari versi terakhir yang berhasil) ---
+# Diproses per tahap (cvtColor, DCT, QIM, IDCT) atas semua blok 8x8 sekaligus (vektorisasi NumPy).
+# Urutan bit tetap sama: blok raster (kiri-atas ke kanan-bawah), koefisien AC 1..N per blok.
+def frame_ke_blok(img_float, block_size=8):
+    """Mengubah frame 2D menjadi array blok (jumlah_blok, 8, 8) dalam urutan raster (hanya blok penuh)."""
+    jumlah_blok_v, jumlah_blok_h = img_float.shape[0] // block_size, img_float.shape[1] // block_size
+    area = img_float[:jumlah_blok_v * block_size, :jumlah_blok_h * block_size]
+    return area.reshape(jumlah_blok_v, block_size, jumlah_blok_h, block_size).swapaxes(1, 2).reshape(-1, block_size, block_size)
+
+def blok_ke_frame(blok, height, width, block_size=8):
+    """Kebalikan frame_ke_blok: menyusun kembali array blok menjadi frame (jumlah_blok_v*8, jumlah_blok_h*8)."""
+    jumlah_blok_v, jumlah_blok_h = height // block_size, width // block_size
+    return blok.reshape(jumlah_blok_v, jumlah_blok_h, block_size, block_size).swapaxes(1, 2).reshape(
+        jumlah_blok_v * block_size, jumlah_blok_h * block_size)
+
+def dct_blok(blok):
+    return dct(dct(blok, axis=1, norm='ortho'), axis=2, norm='ortho')
+
+def idct_blok(blok_dct):
+    return idct(idct(blok_dct, axis=1, norm='ortho'), axis=2, norm='ortho')
+
+def qim_embed_koefisien(koefisien, bits_array, delta):
+    """Memaksa paritas indeks kuantisasi round(c/delta) sama dengan bit; mengembalikan koefisien baru."""
+    indeks = np.rint(koefisien / delta).astype(np.int64)
+    paritas = indeks % 2
+    indeks += np.where(paritas != bits_array, np.where(bits_array == 1, 1, -1), 0)
+    return indeks * delta
+
+def qim_extract_koefisien(koefisien, delta):
+    return (np.rint(koefisien / delta).astype(np.int64) % 2).astype(np.uint8)
+
+def psnr_prediksi_dari_sse(sse_koefisien, jumlah_piksel, max_pixel=255.0):
+    """
+    DCT ortonormal mempertahankan energi, sehingga MSE piksel (sebelum clipping/pembulatan)
+    sama dengan jumlah kuadrat error kuantisasi koefisien dibagi jumlah piksel.
+    """
+    if sse_koefisien <= 0: return float('inf')
+    return 10.0 * np.log10((max_pixel ** 2) * jumlah_piksel / sse_koefisien)
+
+# --- Permutasi Blok/Koefisien Berkunci ---
+# Tanpa kunci, bit payload mengisi blok dalam urutan raster (koefisien AC 1..N per blok), sehingga distorsi
+# terkumpul di bagian atas frame. Dengan kunci_permutasi (rahasia bersama pengirim dan penerima), urutan blok
+# dan urutan slot koefisien di tiap blok diacak dari seed HKDF. Tabel indeks dihitung sekali per
+# (jumlah blok, koefisien per blok, kunci) dan dipakai ulang untuk setiap frame sebagai gather/scatter NumPy.
+def _seed_permutasi(kunci_permutasi):
+    hkdf = HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=b'permutasi blok dan koefisien steganografi video')
+    return int.from_bytes(hkdf.derive(kunci_permutasi), 'big')
+
+@functools.lru_cache(maxsize=16)
+def _tabel_permutasi_cache(jumlah_blok, coeffs_per_block, kunci_permutasi):
+    rng = np.random.Generator(np.random.PCG64(_seed_permutasi(kunci_permutasi)))
+    urutan_blok = rng.permutation(jumlah_blok)
+    kolom_koef = 1 + rng.permuted(np.tile(np.arange(coeffs_per_block), (jumlah_blok, 1)), axis=1)
+    indeks_bit = (urutan_blok[:, None] * coeffs_per_block + kolom_koef - 1).reshape(-1)
+    for tabel in (urutan_blok, kolom_koef, indeks_bit): tabel.setflags(write=False)
+    return urutan_blok, kolom_koef, indeks_bit
+
+def tabel_permutasi(jumlah_blok, coeffs_per_block, kunci_permutasi):
+    """
+    Tabel permutasi berkunci (di-cache): (urutan_blok, kolom_koef, indeks_bit).
+    Bit ke-i payload frame ada di blok urutan_blok[i // N], koefisien kolom_koef[i // N, i % N] (N = coeffs_per_block);
+    indeks_bit[i] adalah posisi bit yang sama dalam urutan raster (untuk mengurutkan ulang bit hasil ekstraksi).
+    Mengembalikan None jika kunci_permutasi kosong.
+    """
+    if not kunci_permutasi or coeffs_per_block <= 0: return None
+    if isinstance(kunci_permutasi, str): kunci_permutasi = kunci_permutasi.encode('utf-8')
+    return _tabel_permutasi_cache(jumlah_blok, coeffs_per_block, bytes(kunci_permutasi))
+
+def urutkan_bit_permutasi(bits_raster, jumlah_blok, coeffs_per_block, kunci_permutasi):
+    """Mengubah bit ekstraksi urutan raster (misal dari cache bit) ke urutan payload berkunci."""
+    tabel = tabel_permutasi(jumlah_blok, coeffs_per_block, kunci_permutasi)
+    if tabel is None or not bits_raster: return bits_raster
+    return np.frombuffer(bits_raster.encode('ascii'), dtype=np.uint8)[tabel[2]].tobytes().decode('ascii')
+
+def _ambil_carrier(koef, kolom_koef, coeffs_per_block):
+    if kolom_koef is None: return koef[:, 1:1 + coeffs_per_block]
+    return np.take_along_axis(koef, kolom_koef, axis=1)
+
+def _tulis_carrier(koef, kolom_koef, coeffs_per_block, nilai):
+    if kolom_koef is None: koef[:, 1:1 + coeffs_per_block] = nilai
+    else: np.put_along_axis(koef, kolom_koef, nilai, axis=1)
+
+def koefisien_dct_frame(frame_gray):
+    """Satu DCT maju untuk semua blok 8x8 frame grayscale: array (jumlah_blok, 64) float32."""
+    semua_blok = frame_ke_blok(np.float32(frame_gray))
+    return dct_blok(semua_blok).reshape(semua_blok.shape[0], -1)
+
+def _rencana_embed(jumlah_blok, coeffs_per_block, delta, max_bits_to_embed_from_segment):
+    """Menentukan (jumlah blok yang diproses, jumlah bit yang disisipkan) untuk satu frame."""
+    if delta <= 0 or coeffs_per_block <= 0:
+        # Tidak ada bit yang bisa disisipkan; blok tetap melalui DCT/IDCT seperti versi per-blok.
+        return (jumlah_blok if max_bits_to_embed_from_segment > 0 else 0), 0
+    bits_embedded = min(max_bits_to_embed_from_segment, jumlah_blok * coeffs_per_block)
+    return -(-bits_embedded // coeffs_per_block), bits_embedded
+
+# --- Verifikasi Embed terhadap Clipping ---
+# Setelah IDCT, piksel di-clip ke 0..255 dan dibulatkan ke uint8; pada blok yang mendekati saturasi ini bisa
+# membalik paritas koefisien. Blok pembawa dibaca ulang dengan mesin ekstraksi (DCT + QIM), lalu blok yang
+# bitnya tidak terbaca disisipkan ulang: koefisien sebelum clipping digeser sebesar selisih titik lattice
+# dan hasil baca (umpan balik error). Jika masih gagal, koefisien yang salah dipindah ke titik lattice
+# berparitas sama yang terdekat dengan hasil baca, dan DC blok digeser agar piksel menjauhi batas 0/255.
+# Setiap blok memakai kandidat dengan bit gagal paling sedikit, dimulai dari hasil embed biasa, sehingga
+# verifikasi tidak pernah membuat blok lebih buruk daripada tanpa verifikasi.
+MAKS_ITERASI_VERIFIKASI = 8
+ITERASI_GESER_LATTICE = 3
+
+def _bit_tidak_terbaca(koef_baca, kolom_koef, target, aktif, coeffs_per_block, delta):
+    return (qim_extract_koefisien(_ambil_carrier(koef_baca, kolom_koef, coeffs_per_block), delta) != target) & aktif
+
+def _verifikasi_blok_stego(blok_float, koef_target, bits_array, coeffs_per_block, delta, kolom_koef=None):
+    """
+    Memverifikasi dan memperbaiki blok stego (blok_dipakai, 8, 8) hasil IDCT terhadap koefisien setelah QIM
+    (kolom_koef: posisi koefisien pembawa per blok jika memakai permutasi berkunci).
+    Mengembalikan (blok uint8 terverifikasi, jumlah blok salah sebelum perbaikan, indeks blok yang tetap gagal,
+    jumlah bit yang tetap gagal) dengan kandidat terbaik per blok.
+    """
+    blok_dipakai = koef_target.shape[0]
+    target = np.zeros(blok_dipakai * coeffs_per_block, dtype=np.uint8); target[:bits_array.size] = bits_array
+    aktif = np.zeros(target.size, dtype=bool); aktif[:bits_array.size] = True
+    target = target.reshape(blok_dipakai, coeffs_per_block); aktif = aktif.reshape(blok_dipakai, coeffs_per_block)
+    piksel = np.uint8(np.clip(blok_float, 0, 255))
+    koef_baca = dct_blok(np.float32(piksel)).reshape(blok_dipakai, -1)
+    gagal_awal = np.count_nonzero(_bit_tidak_terbaca(koef_baca, kolom_koef, target, aktif, coeffs_per_block, delta), axis=1)
+    indeks = np.flatnonzero(gagal_awal)
+    if indeks.size == 0: return piksel, 0, indeks, 0
+    target, aktif, koef_baca = target[indeks], aktif[indeks], koef_baca[indeks]
+    piksel_terbaik, gagal_terbaik = piksel[indeks].copy(), gagal_awal[indeks]
+    kolom = np.broadcast_to(np.arange(1, 1 + coeffs_per_block), target.shape) if kolom_koef is None else kolom_koef[indeks]
+    koef_pre = koef_target[indeks].astype(np.float64)
+    lattice = _ambil_carrier(koef_pre, kolom, coeffs_per_block).copy()
+    sisa = np.arange(indeks.size)
+    for iterasi in range(MAKS_ITERASI_VERIFIKASI):
+        baca_sisa = _ambil_carrier(koef_baca[sisa], kolom[sisa], coeffs_per_block)
+        if iterasi == ITERASI_GESER_LATTICE:
+            salah = _bit_tidak_terbaca(koef_baca[sisa], kolom[sisa], target[sisa], aktif[sisa], coeffs_per_block, delta)
+            lattice[sisa] = np.where(salah, qim_embed_koefisien(baca_sisa, target[sisa], delta), lattice[sisa])
+        koef_sisa = koef_pre[sisa]
+        _tulis_carrier(koef_sisa, kolom[sisa], coeffs_per_block,
+                       _ambil_carrier(koef_sisa, kolom[sisa], coeffs_per_block) + lattice[sisa] - baca_sisa)
+        koef_pre[sisa] = koef_sisa
+        if iterasi >= ITERASI_GESER_LATTICE:
+            # Geser DC (offset piksel x 8 pada DCT ortonormal) sejauh piksel melewati batas 0/255.
+            piksel_pre = idct_blok(koef_pre[sisa].reshape(-1, 8, 8))
+            maks, minim = piksel_pre.max(axis=(1, 2)), piksel_pre.min(axis=(1, 2))
+            koef_pre[sisa, 0] += 8 * (np.minimum(255 - maks, 0) + np.maximum(-minim, 0))
+        piksel_baru = np.uint8(np.clip(idct_blok(koef_pre[sisa].reshape(-1, 8, 8)), 0, 255))
+        koef_baca[sisa] = dct_blok(np.float32(piksel_baru)).reshape(sisa.size, -1)
+        gagal_baru = np.count_nonzero(_bit_tidak_terbaca(koef_baca[sisa], kolom[sisa], target[sisa], aktif[sisa],
+                                                         coeffs_per_block, delta), axis=1)
+        lebih_baik = gagal_baru < gagal_terbaik[sisa]
+        piksel_terbaik[sisa[lebih_baik]] = piksel_baru[lebih_baik]
+        gagal_terbaik[sisa[lebih_baik]] = gagal_baru[lebih_baik]
+        sisa = sisa[gagal_baru > 0]
+        if sisa.size == 0: break
+    piksel[indeks] = piksel_terbaik
+    return piksel, indeks.size, indeks[gagal_terbaik > 0], int(gagal_terbaik.sum())
+
+def _sisipkan_ke_blok(img_to_process_float, koef, bit_payload_segment, bits_embedded, coeffs_per_block, delta,
+                      metrik, info_frame, verifikasi=True, permutasi=None):
+    """
+    QIM + IDCT untuk `koef` (koefisien blok-blok awal, urutan raster) lalu menyusun frame stego.
+    Blok yang tidak diproses tetap memakai piksel img_to_process_float. Jika verifikasi, blok pembawa
+    dibaca ulang dan yang bitnya rusak karena clipping disisipkan ulang (_verifikasi_blok_stego).
+    Dengan permutasi (tabel_permutasi), `koef` adalah blok urutan_blok[:blok_dipakai] dan bit mengisi kolom_koef.
+    """
+    height, width = img_to_process_float.shape
+    block_size = 8
+    blok_dipakai = koef.shape[0]
+    output_pixel_data_float = img_to_process_float.copy()
+    sse_koefisien = 0.0
+    blok_salah, blok_gagal, bit_gagal = 0, np.empty(0, dtype=np.int64), 0
+    posisi_blok = np.arange(blok_dipakai) if permutasi is None else permutasi[0][:blok_dipakai]
+    kolom_koef = None if permutasi is None else permutasi[1][:blok_dipakai]
+    if blok_dipakai > 0:
+        if bits_embedded > 0:
+            with metrik.tahap('qim'):
+                bits_array = np.frombuffer(bit_payload_segment[:bits_embedded].encode('ascii'), dtype=np.uint8) - 48
+                carrier = _ambil_carrier(koef, kolom_koef, coeffs_per_block).reshape(-1)
+                carrier_baru = qim_embed_koefisien(carrier[:bits_embedded], bits_array, delta)
+                sse_koefisien = float(np.sum(np.square(carrier_baru - carrier[:bits_embedded].astype(np.float64))))
+                carrier[:bits_embedded] = carrier_baru
+                _tulis_carrier(koef, kolom_koef, coeffs_per_block, carrier.reshape(blok_dipakai, coeffs_per_block))
+        with metrik.tahap('idct'):
+            blok_output = frame_ke_blok(img_to_process_float, block_size).copy()
+            blok_output[posisi_blok] = idct_blok(koef.reshape(blok_dipakai, block_size, block_size))
+        if verifikasi and bits_embedded > 0 and delta > 0:
+            with metrik.tahap('verifikasi'):
+                blok_terverifikasi, blok_salah, blok_gagal, bit_gagal = _verifikasi_blok_stego(
+                    blok_output[posisi_blok], koef, bits_array, coeffs_per_block, delta, kolom_koef)
+                blok_output[posisi_blok] = blok_terverifikasi
+                blok_gagal = posisi_blok[blok_gagal]
+            metrik.tambah('blok_diperbaiki', blok_salah - blok_gagal.size)
+            metrik.tambah('bit_gagal_verifikasi', bit_gagal)
+        with metrik.tahap('idct'):
+            output_pixel_data_float[:(height // block_size) * block_size, :(width // block_size) * block_size] = \
+                blok_ke_frame(blok_output, height, width, block_size)
+    metrik.tambah('blok_embed', blok_dipakai)
+    metrik.tambah('bit_embed', bits_embedded)
+    if info_frame is not None:
+        info_frame['sse_koefisien'] = sse_koefisien
+        info_frame['mse_prediksi'] = sse_koefisien / (height * width)
+        info_frame['psnr_prediksi'] = psnr_prediksi_dari_sse(sse_koefisien, height * width)
+        info_frame['blok_diperbaiki'] = blok_salah - blok_gagal.size
+        info_frame['blok_gagal'] = blok_gagal.tolist()
+        info_frame['bit_gagal'] = bit_gagal
+    return np.uint8(np.clip(output_pixel_data_float, 0, 255))
+
+def embed_qim_dari_koefisien(koefisien_dct, height, width, delta, bit_payload_segment,
+                             num_ac_coeffs_to_use=63, gray_reference_uint8=None, metrik=None, info_frame=None,
+                             verifikasi=True, kunci_permutasi=None):
+    """
+    Sama dengan proses_frame_qim_dct mode 'embed', tetapi memakai koefisien DCT semua blok yang
+    sudah dihitung (misal dari cache) sehingga decode dan DCT maju dilewati. Jika gray_reference_uint8
+    tidak diberikan, frame asli direkonstruksi dari koefisien (IDCT lalu dibulatkan, identik untuk uint8).
+    Mengembalikan (gray_reference_uint8, stego_frame_uint8, bits_embedded).
+    """
+    metrik = metrik or METRIK_NONAKTIF
+    coeffs_per_block = min(num_ac_coeffs_to_use, 63)
+    if gray_reference_uint8 is None:
+        with metrik.tahap('idct'):
+            gray_float = blok_ke_frame(idct_blok(koefisien_dct.reshape(-1, 8, 8)), height, width)
+            gray_reference_uint8 = np.uint8(np.clip(np.rint(gray_float), 0, 255))
+    img_to_process_float = np.float32(gray_reference_uint8)
+    max_bits = len(bit_payload_segment) if bit_payload_segment else 0
+    blok_dipakai, bits_embedded = _rencana_embed(koefisien_dct.shape[0], coeffs_per_block, delta, max_bits)
+    permutasi = tabel_permutasi(koefisien_dct.shape[0], coeffs_per_block, kunci_permutasi)
+    if permutasi is None: koef = np.array(koefisien_dct[:blok_dipakai], dtype=np.float32)
+    else: koef = np.array(koefisien_dct[permutasi[0][:blok_dipakai]], dtype=np.float32)
+    stego_frame_uint8 = _sisipkan_ke_blok(img_to_process_float, koef, bit_payload_segment, bits_embedded,
+                                          coeffs_per_block, delta, metrik, info_frame, verifikasi, permutasi)
+    return gray_reference_uint8, stego_frame_uint8, bits_embedded
+
 def proses_frame_qim_dct(frame_bgr_input, mode, delta, 
                          bit_payload_segment=None, 
                          enable_debug_prints_extract=False,
-                         num_ac_coeffs_to_use=63):
-    global _g_debug_print_count 
-    if len(frame_bgr_input.shape) == 3 and frame_bgr_input.shape[2] == 3: 
-        gray_frame_reference_uint8 = cv2.cvtColor(frame_bgr_input, cv2.COLOR_BGR2GRAY)
-    elif len(frame_bgr_input.shape) == 2: 
-        gray_frame_reference_uint8 = frame_bgr_input.copy()
-    else:
-        raise ValueError("Format frame input tidak didukung.")
+                         num_ac_coeffs_to_use=63,
+                         metrik=None, info_frame=None, verifikasi=True, kunci_permutasi=None):
+    # info_frame: dict opsional; pada mode embed diisi distorsi prediksi dari error kuantisasi
+    # (sse_koefisien, mse_prediksi, psnr_prediksi) tanpa perlu membandingkan piksel, serta hasil
+    # verifikasi clipping (blok_diperbaiki, blok_gagal, bit_gagal).
+    # verifikasi: baca ulang blok pembawa setelah embed dan sisipkan ulang blok yang rusak karena clipping.
+    # kunci_permutasi: rahasia bersama (bytes/str) untuk urutan blok dan koefisien berkunci (tabel_permutasi);
+    # harus sama saat embed dan extract.
+    # enable_debug_prints_extract: dipertahankan untuk kompatibilitas pemanggil; tidak ada lagi state debug
+    # global, sehingga fungsi ini aman dipanggil bersamaan dari beberapa thread.
+    metrik = metrik or METRIK_NONAKTIF
+    with metrik.tahap('cvtColor'):
+        if len(frame_bgr_input.shape) == 3 and frame_bgr_input.shape[2] == 3: 
+            gray_frame_reference_uint8 = cv2.cvtColor(frame_bgr_input, cv2.COLOR_BGR2GRAY)
+        elif len(frame_bgr_input.shape) == 2: 
+            gray_frame_reference_uint8 = frame_bgr_input.copy()
+        else:
+            raise ValueError("Format frame input tidak didukung.")
     img_to_process_float = np.float32(gray_frame_reference_uint8) 
-    height, width = img_to_process_float.shape
     block_size = 8
-    output_pixel_data_float = img_to_process_float.copy() 
-    extracted_bits_list = [] 
-    current_payload_bit_idx = 0 
-    bits_processed_in_this_frame = 0 
-    max_bits_to_embed_from_segment = 0
-    if mode == 'embed' and bit_payload_segment:
-        max_bits_to_embed_from_segment = len(bit_payload_segment)
-    if mode == 'extract' and enable_debug_prints_extract:
-        _g_debug_print_count = 0 
-    for r_start in range(0, height, block_size):
-        if mode == 'embed' and current_payload_bit_idx >= max_bits_to_embed_from_segment: break 
-        for c_start in range(0, width, block_size):
-            if mode == 'embed' and current_payload_bit_idx >= max_bits_to_embed_from_segment: break
-            r_end = r_start + block_size; c_end = c_start + block_size
-            current_block_to_transform = img_to_process_float[r_start:r_end, c_start:c_end]
-            dct_block = dct(dct(current_block_to_transform, axis=0, norm='ortho'), axis=1, norm='ortho')
-            flat_dct_coeffs = dct_block.flatten()
-            modified_flat_coeffs = flat_dct_coeffs.copy() 
-            coeffs_this_block_can_process = min(num_ac_coeffs_to_use, len(flat_dct_coeffs) - 1)
-            for i_ac_idx in range(coeffs_this_block_can_process):
-                coeff_array_idx = i_ac_idx + 1
-                if mode == 'embed' and current_payload_bit_idx >= max_bits_to_embed_from_segment: break 
-                coeff_val_to_process = flat_dct_coeffs[coeff_array_idx] 
-                if delta <= 0: 
-                    if mode == 'extract': extracted_bits_list.append('0'); bits_processed_in_this_frame +=1
-                    continue
-                if mode == 'embed':
-                    bit_to_embed = int(bit_payload_segment[current_payload_bit_idx])
-                    quantized_index_from_original = int(round(coeff_val_to_process / delta))
-                    final_quantized_index = quantized_index_from_original
-                    current_parity = final_quantized_index % 2
-                    if current_parity != bit_to_embed:
-                        if bit_to_embed == 1: 
-                            if final_quantized_index % 2 == 0: final_quantized_index += 1 
-                        else: 
-                            if final_quantized_index % 2 != 0: final_quantized_index -=1 
-                    modified_flat_coeffs[coeff_array_idx] = float(final_quantized_index * delta)
-                    current_payload_bit_idx += 1
-                    bits_processed_in_this_frame +=1
-                elif mode == 'extract':
-                    quantized_index = int(round(coeff_val_to_process / delta)) 
-                    extracted_bit = int(quantized_index % 2)
-                    extracted_bits_list.append(str(extracted_bit))
-                    bits_processed_in_this_frame +=1
-                    if enable_debug_prints_extract and _g_debug_print_count < _MAX_DEBUG_PRINTS_PER_CALL:
-                        _g_debug_print_count += 1
-            if mode == 'embed':
-                dct_block_to_idct = modified_flat_coeffs.reshape((block_size, block_size))
-                idct_block = idct(idct(dct_block_to_idct, axis=0, norm='ortho'), axis=1, norm='ortho')
-                output_pixel_data_float[r_start:r_end, c_start:c_end] = idct_block
+    semua_blok = frame_ke_blok(img_to_process_float, block_size)
+    jumlah_blok = semua_blok.shape[0]
+    coeffs_per_block = min(num_ac_coeffs_to_use, block_size * block_size - 1)
+    permutasi = tabel_permutasi(jumlah_blok, coeffs_per_block, kunci_permutasi)
+
     if mode == 'embed':
-        stego_frame_uint8 = np.uint8(np.clip(output_pixel_data_float, 0, 255))
-        return gray_frame_reference_uint8, stego_frame_uint8, current_payload_bit_idx 
+        max_bits_to_embed_from_segment = len(bit_payload_segment) if bit_payload_segment else 0
+        blok_dipakai, bits_embedded = _rencana_embed(jumlah_blok, coeffs_per_block, delta, max_bits_to_embed_from_segment)
+        with metrik.tahap('dct'):
+            blok_pembawa = semua_blok[:blok_dipakai] if permutasi is None else semua_blok[permutasi[0][:blok_dipakai]]
+            koef = dct_blok(blok_pembawa).reshape(blok_dipakai, -1)
+        stego_frame_uint8 = _sisipkan_ke_blok(img_to_process_float, koef, bit_payload_segment, bits_embedded,
+                                              coeffs_per_block, delta, metrik, info_frame, verifikasi, permutasi)
+        return gray_frame_reference_uint8, stego_frame_uint8, bits_embedded 
     elif mode == 'extract':
-        return "".join(extracted_bits_list)
+        if coeffs_per_block <= 0 or jumlah_blok == 0: return ""
+        if delta <= 0:
+            return "0" * (jumlah_blok * coeffs_per_block)
+        with metrik.tahap('dct'):
+            koef = dct_blok(semua_blok).reshape(jumlah_blok, -1)
+        with metrik.tahap('qim'):
+            extracted_bits = qim_extract_koefisien(koef[:, 1:1 + coeffs_per_block], delta).reshape(-1)
+            if permutasi is not None: extracted_bits = extracted_bits[permutasi[2]]
+            hasil_bits = (extracted_bits + 48).tobytes().decode('ascii')
+        metrik.tambah('blok_extract', jumlah_blok)
+        metrik.tambah('bit_extract', extracted_bits.size)
+        return hasil_bits
 
 # --- Setup Kunci ECC ---
 def setup_kunci_ecc():
@@ -0,0 +1,182 @@
+import os
+import json
+import time
+import hashlib
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+from config_and_setup import (dct_blok, idct_blok, qim_embed_koefisien, qim_extract_koefisien,
+                              psnr_prediksi_dari_sse)
+from parameter_sweep import koefisien_frame_sampel, sweep_frame, JUMLAH_SAMPEL_DEFAULT
+from cache import CacheLRU, DIREKTORI_CACHE_DEFAULT
+from frame_store import EKSTENSI_Y4M, EKSTENSI_RAW, EKSTENSI_MANIFEST
+
+# --- Konfigurasi Peringkat Cover ---
+EKSTENSI_VIDEO = (".mp4", ".avi", ".mkv", ".mov", ".webm", EKSTENSI_Y4M, EKSTENSI_MANIFEST) + EKSTENSI_RAW
+VERSI_ANALISIS = 1
+SEED_BIT_SIMULASI = 0  # Bit payload simulasi tetap, agar hasil analisis bisa di-cache dan dibandingkan
+
+# --- Simulasi Clipping per Frame ---
+def simulasi_clipping_frame(koefisien, delta, num_ac_coeffs, rng):
+    """
+    Menyisipkan bit acak ke semua blok satu frame sampel (QIM pada koefisien DCT yang sudah dihitung), lalu
+    membulatkan seperti pipeline embed (clip + uint8). Blok yang terkena clipping di-DCT ulang untuk
+    menghitung bit yang berubah. Mengembalikan (rasio piksel ter-clip, rasio blok ter-clip, estimasi BER).
+    """
+    coeffs_per_block = min(num_ac_coeffs, 63)
+    koef = np.array(koefisien, dtype=np.float32)
+    bits = rng.integers(0, 2, size=(koef.shape[0], coeffs_per_block), dtype=np.uint8)
+    koef[:, 1:1 + coeffs_per_block] = qim_embed_koefisien(koef[:, 1:1 + coeffs_per_block], bits, delta)
+    piksel = idct_blok(koef.reshape(-1, 8, 8))
+    ter_clip = (piksel < 0) | (piksel > 255)
+    blok_clip = ter_clip.any(axis=(1, 2))
+    # Pembulatan uint8 (truncate) juga menggeser koefisien, tetapi hanya blok ter-clip yang cukup jauh untuk membalik bit.
+    piksel_blok = np.uint8(np.clip(piksel[blok_clip], 0, 255)).astype(np.float32)
+    bit_baru = qim_extract_koefisien(dct_blok(piksel_blok).reshape(-1, 64)[:, 1:1 + coeffs_per_block], delta)
+    bit_salah = int(np.count_nonzero(bit_baru != bits[blok_clip]))
+    return float(ter_clip.mean()), float(blok_clip.mean()), bit_salah / bits.size
+
+# --- Analisis Satu Cover ---
+def analisis_cover(path_video, delta_kuantisasi, num_ac_coeffs, jumlah_sampel=JUMLAH_SAMPEL_DEFAULT):
+    """
+    Analisis satu cover dari frame sampel (seek, satu DCT maju per frame): kapasitas, PSNR prediksi
+    (error kuantisasi harapan, tanpa IDCT), dan risiko clipping (simulasi embed bit acak + estimasi BER).
+    Bisa dijalankan di proses worker.
+    """
+    mulai = time.perf_counter()
+    sampel, info_video = koefisien_frame_sampel(path_video, jumlah_sampel)
+    if not sampel: raise IOError(f"Tidak ada frame sampel yang terbaca dari '{path_video}'.")
+    jumlah_piksel = info_video["lebar_proses"] * info_video["tinggi_proses"]
+    jumlah_blok = (info_video["lebar_proses"] // 8) * (info_video["tinggi_proses"] // 8)
+    sse = np.array([sweep_frame(koef, (delta_kuantisasi,), (num_ac_coeffs,))[0, 0] for _, koef in sampel])
+    rng = np.random.default_rng(SEED_BIT_SIMULASI)
+    clipping = np.array([simulasi_clipping_frame(koef, delta_kuantisasi, num_ac_coeffs, rng) for _, koef in sampel])
+    kapasitas_frame = jumlah_blok * min(num_ac_coeffs, 63)
+    return {"video": path_video, "info_video": info_video, "frame_sampel": [i for i, _ in sampel],
+            "delta": delta_kuantisasi, "num_ac_coeffs": num_ac_coeffs,
+            "kapasitas_bit_per_frame": kapasitas_frame,
+            "kapasitas_bit_video": kapasitas_frame * info_video["jumlah_frame"],
+            "psnr_prediksi_rata_rata_db": float(psnr_prediksi_dari_sse(sse.mean(), jumlah_piksel)),
+            "psnr_prediksi_min_db": float(psnr_prediksi_dari_sse(sse.max(), jumlah_piksel)),
+            "rasio_piksel_clipping": float(clipping[:, 0].mean()),
+            "rasio_blok_clipping": float(clipping[:, 1].mean()),
+            "estimasi_ber": float(clipping[:, 2].mean()),
+            "durasi_detik": time.perf_counter() - mulai}
+
+# --- Cache Hasil Analisis per File ---
+class CacheAnalisisCover(CacheLRU):
+    """
+    Hasil analisis_cover per file, dikunci oleh (path, ukuran, mtime) file dan parameter analisis, sehingga
+    peringkat ulang pustaka cover yang tidak berubah tidak membaca video sama sekali.
+    """
+    def kunci(self, path_video, delta_kuantisasi, num_ac_coeffs, jumlah_sampel):
+        stat = os.stat(path_video)
+        identitas = f"{os.path.abspath(path_video)}|{stat.st_size}|{stat.st_mtime_ns}"
+        return (f"cover_{hashlib.sha256(identitas.encode()).hexdigest()[:32]}"
+                f"_d{float(delta_kuantisasi):g}_k{num_ac_coeffs}_s{jumlah_sampel}_v{VERSI_ANALISIS}")
+
+    def ambil(self, kunci):
+        if not self.ada(kunci): return None
+        try:
+            with open(os.path.join(self.path_entri(kunci), "analisis.json")) as f:
+                hasil = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self.sentuh(kunci)
+        return hasil
+
+    def simpan(self, kunci, hasil):
+        data = json.dumps(hasil).encode()
+        os.makedirs(self.path_entri(kunci), exist_ok=True)
+        if not self.tambah_ukuran(kunci, len(data)): return False
+        with open(os.path.join(self.path_entri(kunci), "analisis.json"), "wb") as f:
+            f.write(data)
+        return True
+
+# --- Peringkat ---
+def _kunci_urut(hasil):
+    # Muat dulu, lalu estimasi BER (bit rusak karena clipping) terkecil, lalu PSNR prediksi tertinggi.
+    return (not hasil.get("muat", True), round(hasil["estimasi_ber"], 5), -hasil["psnr_prediksi_min_db"])
+
+def daftar_video(direktori):
+    return sorted(os.path.join(direktori, nama) for nama in os.listdir(direktori)
+                  if nama.lower().endswith(EKSTENSI_VIDEO) and os.path.isfile(os.path.join(direktori, nama)))
+
+def peringkat_cover(daftar_path_video, delta_kuantisasi, num_ac_coeffs, payload_bits=None,
+                    jumlah_sampel=JUMLAH_SAMPEL_DEFAULT, jumlah_worker=None, cache=None, path_output=None):
+    """
+    Menganalisis dan mengurutkan cover untuk parameter (delta, koefisien AC) dan ukuran payload tertentu.
+    Cover yang belum ada di `cache` (CacheAnalisisCover) dianalisis paralel, satu proses per video.
+    Mengembalikan list hasil analisis terurut (terbaik lebih dulu); cover yang gagal dibaca dilewati.
+    """
+    print("\n=== PERINGKAT COVER (SAMPEL DCT) ===")
+    print(f"  Kandidat: {len(daftar_path_video)} video, DELTA={delta_kuantisasi}, Koefisien AC={num_ac_coeffs}, Sampel={jumlah_sampel}")
+    mulai = time.perf_counter()
+    hasil_semua = []; perlu_analisis = []
+    for path_video in daftar_path_video:
+        kunci = cache.kunci(path_video, delta_kuantisasi, num_ac_coeffs, jumlah_sampel) if cache is not None else None
+        hasil = cache.ambil(kunci) if cache is not None else None
+        if hasil is not None: hasil_semua.append(hasil)
+        else: perlu_analisis.append((path_video, kunci))
+    print(f"  Dari cache: {len(hasil_semua)}, dianalisis: {len(perlu_analisis)}")
+    if perlu_analisis:
+        jumlah_worker = jumlah_worker or min(len(perlu_analisis), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=jumlah_worker, mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = [(path_video, kunci, executor.submit(analisis_cover, path_video, delta_kuantisasi, num_ac_coeffs, jumlah_sampel))
+                       for path_video, kunci in perlu_analisis]
+            for path_video, kunci, future in futures:
+                try:
+                    hasil = future.result()
+                except (IOError, OSError, ValueError) as e:
+                    print(f"    Warning: '{path_video}' dilewati: {e}"); continue
+                hasil_semua.append(hasil)
+                if cache is not None: cache.simpan(kunci, hasil)
+        if cache is not None: cache.simpan_index()
+
+    for hasil in hasil_semua:
+        if payload_bits:
+            hasil["frame_dibutuhkan"] = -(-payload_bits // hasil["kapasitas_bit_per_frame"])
+            hasil["muat"] = hasil["frame_dibutuhkan"] <= hasil["info_video"]["jumlah_frame"]
+    hasil_semua.sort(key=_kunci_urut)
+
+    print(f"  Selesai dalam {time.perf_counter() - mulai:.2f} detik")
+    print(f"  {'#':>3} {'BIT/FRAME':>10} {'PSNR MIN':>9} {'BLOK CLIP':>10} {'EST. BER':>9}" + ("  FRAME" if payload_bits else "") + "  VIDEO")
+    for peringkat, hasil in enumerate(hasil_semua, 1):
+        teks = (f"  {peringkat:>3} {hasil['kapasitas_bit_per_frame']:>10} {hasil['psnr_prediksi_min_db']:>7.2f}dB "
+                f"{100 * hasil['rasio_blok_clipping']:>9.2f}% {hasil['estimasi_ber']:>9.2e}")
+        if payload_bits: teks += f"  {hasil['frame_dibutuhkan']:>5}{'' if hasil['muat'] else '!'}"
+        print(teks + f"  {hasil['video']}")
+    if payload_bits and hasil_semua and not hasil_semua[0]["muat"]:
+        print("  Warning: Tidak ada cover dengan kapasitas cukup untuk payload ini.")
+    if path_output:
+        direktori = os.path.dirname(path_output)
+        if direktori: os.makedirs(direktori, exist_ok=True)
+        with open(path_output, "w") as f:
+            json.dump({"delta": delta_kuantisasi, "num_ac_coeffs": num_ac_coeffs, "payload_bits": payload_bits,
+                       "peringkat": hasil_semua}, f, indent=2)
+        print(f"  Peringkat disimpan ke '{path_output}'.")
+    return hasil_semua
+
+# --- Blok Utama ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Peringkat video cover berdasarkan kapasitas dan distorsi prediksi.")
+    parser.add_argument("direktori", nargs="?", default=os.path.join("media", "input"))
+    parser.add_argument("--delta", type=float, default=10)
+    parser.add_argument("--koefisien", type=int, default=10)
+    parser.add_argument("--payload-bits", type=int, default=None)
+    parser.add_argument("--sampel", type=int, default=JUMLAH_SAMPEL_DEFAULT)
+    parser.add_argument("--worker", type=int, default=None)
+    parser.add_argument("--cache", default=DIREKTORI_CACHE_DEFAULT, help="Direktori cache hasil analisis ('' = tanpa cache)")
+    parser.add_argument("--output", default=os.path.join("media", "output", "peringkat_cover.json"))
+    args = parser.parse_args()
+
+    print("="*70)
+    print("PERINGKAT COVER STEGANOGRAFI VIDEO (DCT-QIM)")
+    print("="*70)
+    cache = CacheAnalisisCover(args.cache) if args.cache else None
+    peringkat_cover(daftar_video(args.direktori), args.delta, args.koefisien, args.payload_bits, args.sampel,
+                    args.worker, cache, args.output)
+    print("\nPROGRAM SELESAI")
+    print("="*70)
@@ -1,8 +1,11 @@
 import os
+import struct
 import cv2
 import numpy as np
 from PIL import Image
 import helpers as steg_helpers
+import fec
+import frame_sync
 
 # Import fungsi-fungsi dari config_and_setup
 from config_and_setup import (
@@ -10,49 +13,106 @@ from config_and_setup import (
     enkripsi_aes_gcm, buat_pasangan_kunci_ecc, serialisasi_kunci_publik_ecc_compressed, 
     deserialisasi_kunci_publik_ecc_compressed, buat_shared_secret_ecdh, 
     derive_kunci_aes_dari_shared_secret, hitung_sha3_256, proses_frame_qim_dct,
-    setup_kunci_ecc, persiapkan_file_input
+    koefisien_dct_frame, embed_qim_dari_koefisien, setup_kunci_ecc, persiapkan_file_input
 )
+from instrumentation import MetrikPipeline, METRIK_NONAKTIF
+from cache import CacheKoefisienDCT
+from frame_store import buka_sumber_frame, buka_penulis_frame, adalah_frame_store
+from frame_ring import PoolRingFrame
+from avi_container import baca_indeks_avi, sambung_avi
+from progress import PelaporProgres, JobDibatalkan
+
+# --- Kebijakan Frame Setelah Payload ---
+# encode_ulang: sisa frame cover di-decode dan di-encode ulang (durasi sama, paling lambat).
+# salin: chunk sisa frame disalin dari AVI input tanpa decode/encode (butuh codec yang sama, tanpa crop); frame
+# sebelum keyframe input berikutnya tetap di-encode ulang karena chunk non-kunci bergantung pada frame sebelumnya.
+# potong: output berhenti setelah frame pembawa terakhir (paling cepat, tetapi durasi berbeda dari cover).
+KEBIJAKAN_EKOR = ("encode_ulang", "salin", "potong")
+FOURCC_SALIN_EKOR = ("FFV1", "MJPG")
 
 # --- Fungsi Embed Utama (Grayscale, SHA3, ECC-AES) ---
 def embed_gambar_ke_video_final(path_video_input, path_gambar_rahasia, path_video_output_base, 
                                 delta_kuantisasi, num_ac_coeffs, 
-                                kunci_publik_ecc_penerima_bytes_compressed):
-    print(f"\n=== MEMULAI PROSES EMBEDDING GAMBAR KE VIDEO ===")
-    print(f"  Gambar Rahasia: '{path_gambar_rahasia}'")
-    print(f"  Video Input: '{path_video_input}'")
-    print(f"  Parameter: DELTA={delta_kuantisasi}, Koefisien AC per Blok={num_ac_coeffs}")
-    
-    secret_lebar, secret_tinggi, bitstream_gambar_asli = steg_helpers.gambar_ke_bitstream(path_gambar_rahasia)
-    if bitstream_gambar_asli is None: return False, None, None
+                                kunci_publik_ecc_penerima_bytes_compressed,
+                                metrik=None, path_trace=None, cache_dct=None,
+                                skema_fec=None, parameter_fec=None, fourcc_output="FFV1", kualitas_output=None,
+                                jumlah_worker=1, sinkron_frame=False, payload_siap=None, kebijakan_ekor=None,
+                                kunci_permutasi=None, progres=None, batal=None, payload_ber_fec=False):
+    # metrik: MetrikPipeline opsional, diisi timer per tahap dan counter selama job berjalan.
+    # path_trace: jika diisi, metrik job diekspor sebagai Chrome trace (JSON) ke path ini.
+    # cache_dct: CacheKoefisienDCT opsional; frame pembawa yang sudah ada di cache tidak di-decode/DCT ulang.
+    # skema_fec: None, "repetisi", "hamming74", atau "reed_solomon"; skema dicatat di header agar ekstraksi otomatis.
+    # fourcc_output/kualitas_output: codec output (misal "MJPG" + kualitas 90) untuk file stego yang lebih kecil.
+    # jumlah_worker: > 1 membagi DCT/QIM/IDCT frame pembawa ke beberapa proses lewat ring frame di shared memory.
+    # sinkron_frame: setiap frame pembawa diawali header sinkronisasi (urutan, offset, CRC) agar bisa diekstrak acak.
+    # payload_siap: bitstream yang sudah disusun (misal arsip multi-item); gambar rahasia tidak dibaca lagi.
+    # payload_ber_fec: payload_siap sudah dilindungi FEC oleh pemanggil, sehingga bit yang rusak karena clipping
+    # boleh diserahkan ke dekoder FEC. Payload yang disusun di sini mengikuti skema_fec.
+    # kebijakan_ekor: perlakuan frame setelah payload selesai (lihat KEBIJAKAN_EKOR); None memilih "salin"
+    # jika memungkinkan, selain itu "encode_ulang" ("potong" hanya jika diminta karena mengubah durasi).
+    # kunci_permutasi: rahasia bersama (bytes/str) untuk mengacak urutan blok dan koefisien pembawa per frame;
+    # ekstraksi harus memakai kunci yang sama.
+    # progres/batal: callback event progres terstruktur dan pembatalan (lihat progress.py); jika progres
+    # diberikan, log per frame tidak dicetak.
+    if metrik is None: metrik = MetrikPipeline(nama_job="embed") if path_trace else METRIK_NONAKTIF
+    pelapor = PelaporProgres("embed", progres, batal)
+    try:
+        hasil = _embed_gambar_ke_video_inti(path_video_input, path_gambar_rahasia, path_video_output_base,
+                                            delta_kuantisasi, num_ac_coeffs,
+                                            kunci_publik_ecc_penerima_bytes_compressed, metrik, cache_dct,
+                                            skema_fec, parameter_fec, fourcc_output, kualitas_output, jumlah_worker,
+                                            sinkron_frame, payload_siap, kebijakan_ekor, kunci_permutasi, pelapor,
+                                            payload_ber_fec)
+        pelapor.selesai(hasil[0])
+        return hasil
+    finally:
+        if path_trace:
+            metrik.ekspor_chrome_trace(path_trace)
+            print(f"  Trace metrik embedding disimpan ke '{path_trace}'.")
+
+# --- Pembuatan Payload (Kripto + Header + FEC Opsional) ---
+def buat_payload_embed(path_gambar_rahasia, kunci_publik_ecc_penerima_bytes_compressed, metrik=METRIK_NONAKTIF,
+                       skema_fec=None, parameter_fec=None):
+    """
+    Membaca gambar rahasia, mengenkripsinya (SHA3-ECC-AES), dan menyusun bitstream payload lengkap
+    (header + ciphertext, lalu FEC jika diminta). Mengembalikan bitstream '0'/'1' atau None jika gagal.
+    Dipakai bersama oleh embed domain piksel dan embed domain MJPEG.
+    """
+    with metrik.tahap('baca_gambar'):
+        secret_lebar, secret_tinggi, bitstream_gambar_asli = steg_helpers.gambar_ke_bitstream(path_gambar_rahasia)
+    if bitstream_gambar_asli is None: return None
     try: bytes_gambar_asli = bitstream_ke_bytes(bitstream_gambar_asli)
-    except ValueError as e: print(f"  Error: Konversi bitstream gambar ke bytes gagal: {e}"); return False, None, None
+    except ValueError as e: print(f"  Error: Konversi bitstream gambar ke bytes gagal: {e}"); return None
 
     print("\n  [Tahap Embedding 1: Persiapan Kriptografi]")
     print("    Menghitung hash SHA3-256 dari gambar asli...")
-    hash_gambar_asli_bytes = hitung_sha3_256(bytes_gambar_asli)
+    with metrik.tahap('kripto'):
+        hash_gambar_asli_bytes = hitung_sha3_256(bytes_gambar_asli)
     bitstream_hash_gambar = bytes_ke_bitstream(hash_gambar_asli_bytes)
     print(f"      Hash SHA3-256 ({len(hash_gambar_asli_bytes)} bytes) dibuat.")
 
     print("    Setup ECC untuk pengirim dan menghitung shared secret...")
     try:
-        pengirim_priv_ecc_eph, pengirim_pub_ecc_eph = buat_pasangan_kunci_ecc()
-        kunci_publik_ecc_penerima = deserialisasi_kunci_publik_ecc_compressed(kunci_publik_ecc_penerima_bytes_compressed)
-        shared_secret_bytes = buat_shared_secret_ecdh(pengirim_priv_ecc_eph, kunci_publik_ecc_penerima)
-        salt_untuk_hkdf = os.urandom(16) 
-        kunci_aes_derived = derive_kunci_aes_dari_shared_secret(shared_secret_bytes, salt_untuk_hkdf, 32)
+        with metrik.tahap('kripto'):
+            pengirim_priv_ecc_eph, pengirim_pub_ecc_eph = buat_pasangan_kunci_ecc()
+            kunci_publik_ecc_penerima = deserialisasi_kunci_publik_ecc_compressed(kunci_publik_ecc_penerima_bytes_compressed)
+            shared_secret_bytes = buat_shared_secret_ecdh(pengirim_priv_ecc_eph, kunci_publik_ecc_penerima)
+            salt_untuk_hkdf = os.urandom(16) 
+            kunci_aes_derived = derive_kunci_aes_dari_shared_secret(shared_secret_bytes, salt_untuk_hkdf, 32)
         bytes_pengirim_pub_ecc_eph = serialisasi_kunci_publik_ecc_compressed(pengirim_pub_ecc_eph)
         bitstream_pengirim_pub_ecc_eph = bytes_ke_bitstream(bytes_pengirim_pub_ecc_eph)
         bitstream_salt_hkdf = bytes_ke_bitstream(salt_untuk_hkdf)
         print("      Kunci AES berhasil diderivasi dari shared secret ECC.")
     except Exception as e:
-        print(f"    Error: Setup ECC atau derivasi kunci AES gagal: {e}"); return False, None, None
+        print(f"    Error: Setup ECC atau derivasi kunci AES gagal: {e}"); return None
     
     print("    Mengenkripsi gambar rahasia dengan kunci AES yang diderivasi...")
     try:
-        ciphertext_bytes, nonce_bytes, tag_bytes = enkripsi_aes_gcm(bytes_gambar_asli, kunci_aes_derived)
+        with metrik.tahap('kripto'):
+            ciphertext_bytes, nonce_bytes, tag_bytes = enkripsi_aes_gcm(bytes_gambar_asli, kunci_aes_derived)
         print("      Gambar berhasil dienkripsi.")
     except Exception as e:
-        print(f"    Error: Enkripsi AES gagal: {e}"); return False, None, None
+        print(f"    Error: Enkripsi AES gagal: {e}"); return None
     bitstream_ciphertext = bytes_ke_bitstream(ciphertext_bytes)
     bitstream_nonce = bytes_ke_bitstream(nonce_bytes)
     bitstream_tag = bytes_ke_bitstream(tag_bytes)
@@ -81,69 +141,365 @@ def embed_gambar_ke_video_final(path_video_input, path_gambar_rahasia, path_vide
         print(f"      - Info Tag AES: {8 + len(bitstream_tag)} bits")
         print(f"      - Info Ciphertext: {32 + len(bitstream_ciphertext)} bits")
     except ValueError as e:
-        print(f"    Error: Gagal membuat payload: {e}"); return False, None, None
+        print(f"    Error: Gagal membuat payload: {e}"); return None
+
+    if skema_fec:
+        try:
+            panjang_sebelum_fec = len(total_payload_bitstream)
+            with metrik.tahap('fec'):
+                total_payload_bitstream = fec.enkode_fec(total_payload_bitstream, skema_fec, parameter_fec)
+            print(f"    FEC '{skema_fec}' diterapkan: {panjang_sebelum_fec} -> {len(total_payload_bitstream)} bits "
+                  f"(termasuk header FEC {fec.TOTAL_HEADER_FEC_BITS} bits).")
+        except ValueError as e:
+            print(f"    Error: Gagal menerapkan FEC: {e}"); return None
+    return total_payload_bitstream
+
+# --- Penolakan Output yang Tidak Bisa Diekstrak ---
+def output_bisa_diekstrak(bit_gagal, payload_ber_fec, nama_output):
+    """
+    Memeriksa total bit payload yang tetap tidak terbaca setelah verifikasi clipping (info_frame['bit_gagal']).
+    Tanpa FEC, satu bit gagal sudah membuat ekstraksi gagal: mengembalikan False dan pemanggil wajib membuang
+    output. Dengan FEC hanya dicetak peringatan dan koreksi diserahkan ke dekoder FEC.
+    """
+    if not bit_gagal: return True
+    if not payload_ber_fec:
+        print(f"  Error: {bit_gagal} bit payload tidak akan terbaca dan tidak ada FEC; output '{nama_output}' tidak bisa diekstrak"
+              " dan dibuang. Gunakan FEC atau DELTA/koefisien lain.")
+        return False
+    print(f"    Warning: {bit_gagal} bit payload rusak karena clipping; mengandalkan FEC untuk koreksi.")
+    return True
+
+# --- Sisa Frame Setelah Payload ---
+def _teks_verifikasi(blok_diperbaiki, bit_gagal):
+    """Keterangan hasil verifikasi clipping untuk log per frame (kosong jika semua blok langsung terbaca)."""
+    teks = f" [{blok_diperbaiki} blok disisipkan ulang]" if blok_diperbaiki else ""
+    return teks + (f" [{bit_gagal} bit tidak terbaca]" if bit_gagal else "")
+
+def _salin_sisa_frame(cap, out, output_w, output_h, metrik, jumlah_maks=None):
+    """Decode + encode ulang sisa frame cover (semua, atau paling banyak jumlah_maks). Mengembalikan jumlah frame."""
+    jumlah_frame = 0
+    while jumlah_maks is None or jumlah_frame < jumlah_maks:
+        with metrik.tahap('decode'):
+            ret_sisa, frame_sisa_bgr = cap.read()
+        if not ret_sisa: break
+        jumlah_frame += 1
+        cropped_frame_sisa_bgr = frame_sisa_bgr[0:output_h, 0:output_w]
+        if cropped_frame_sisa_bgr.ndim == 2: cropped_frame_sisa_bgr = cv2.cvtColor(cropped_frame_sisa_bgr, cv2.COLOR_GRAY2BGR)
+        with metrik.tahap('encode'):
+            out.write(cropped_frame_sisa_bgr)
+        metrik.tambah('frame_salin')
+    return jumlah_frame
+
+def _indeks_salin_ekor(path_video_input, output_w, output_h, fourcc_output, output_frame_store):
+    """Indeks (info, daftar_frame) AVI input jika sisa frame bisa disalin chunk-nya apa adanya, selain itu None."""
+    if output_frame_store or fourcc_output not in FOURCC_SALIN_EKOR: return None
+    try: info, daftar_frame = baca_indeks_avi(path_video_input)
+    except (OSError, ValueError, struct.error): return None
+    if info["fourcc"].upper() != fourcc_output or (info["lebar"], info["tinggi"]) != (output_w, output_h): return None
+    return info, daftar_frame
+
+def _keyframe_berikutnya(indeks_ekor, frame_mulai):
+    """Nomor frame (0-based) keyframe pertama AVI input pada/setelah frame_mulai, None jika tidak ada."""
+    return next((nomor for nomor in range(frame_mulai, len(indeks_ekor[1])) if indeks_ekor[1][nomor][2]), None)
+
+def _pilih_kebijakan_ekor(kebijakan_ekor, indeks_ekor):
+    if kebijakan_ekor is None: return "salin" if indeks_ekor is not None else "encode_ulang"
+    if kebijakan_ekor == "salin" and indeks_ekor is None:
+        print("    Warning: Sisa frame tidak bisa disalin (input bukan AVI dengan codec/dimensi yang sama); "
+              "memakai encode_ulang.")
+        return "encode_ulang"
+    return kebijakan_ekor
+
+def _sambung_ekor_salinan(path_pembawa, path_video_input, indeks_ekor, frame_mulai, path_output, output_w, output_h,
+                          fourcc_output, metrik):
+    """
+    Output akhir = chunk frame pembawa + chunk frame input mulai `frame_mulai` (harus keyframe input), tanpa
+    decode/encode. Jika extradata codec (strf) pembawa dan input berbeda, sisa frame di-encode ulang ke file
+    terpisah lalu disambung.
+    Mengembalikan jumlah frame ekor.
+    """
+    info_input, frame_input = indeks_ekor
+    info_pembawa, frame_pembawa = baca_indeks_avi(path_pembawa)
+    sumber_ekor = (path_video_input, info_input, frame_input[frame_mulai:])
+    path_ekor = None
+    if info_pembawa["strf"] != info_input["strf"] or (info_pembawa["rate"], info_pembawa["scale"]) != (info_input["rate"], info_input["scale"]):
+        print("    Info: Parameter codec input berbeda dari encoder; sisa frame di-encode ulang lalu disambung.")
+        path_ekor = os.path.splitext(path_pembawa)[0] + ".ekor.avi"
+        cap = buka_sumber_frame(path_video_input); cap.set(cv2.CAP_PROP_POS_FRAMES, frame_mulai)
+        out = cv2.VideoWriter(path_ekor, cv2.VideoWriter_fourcc(*fourcc_output), cap.get(cv2.CAP_PROP_FPS), (output_w, output_h), True)
+        try: _salin_sisa_frame(cap, out, output_w, output_h, metrik)
+        finally: cap.release(); out.release()
+        sumber_ekor = (path_ekor,) + baca_indeks_avi(path_ekor)
+    try:
+        with metrik.tahap('salin_ekor'):
+            sambung_avi([(path_pembawa, info_pembawa, frame_pembawa), sumber_ekor], path_output)
+    finally:
+        if path_ekor is not None: os.remove(path_ekor)
+    metrik.tambah('frame_salin_chunk', len(sumber_ekor[2]))
+    return len(sumber_ekor[2])
+
+# --- Embed Paralel dengan Ring Frame Shared Memory ---
+def _worker_embed_slot(frame_gray, rentang_bit, total_payload_bitstream, delta_kuantisasi, num_ac_coeffs, kunci_permutasi=None):
+    """Worker: QIM satu frame grayscale di slot ring secara in-place; mengembalikan (bit disisipkan, PSNR prediksi, info verifikasi)."""
+    bit_awal, bit_akhir = rentang_bit
+    info_frame = {}
+    _, stego_frame_gray, bits_embedded = proses_frame_qim_dct(
+        frame_gray, 'embed', delta_kuantisasi, total_payload_bitstream[bit_awal:bit_akhir],
+        num_ac_coeffs_to_use=num_ac_coeffs, info_frame=info_frame, kunci_permutasi=kunci_permutasi)
+    frame_gray[...] = stego_frame_gray
+    return bits_embedded, info_frame['psnr_prediksi'], (info_frame['blok_diperbaiki'], info_frame['bit_gagal'])
+
+def _embed_frame_paralel(cap, out, output_w, output_h, total_payload_bitstream, delta_kuantisasi, num_ac_coeffs,
+                         jumlah_worker, metrik, encode_ulang_ekor=True, kunci_permutasi=None, pelapor=None):
+    """
+    Decoder (proses ini) menulis frame grayscale langsung ke slot ring, worker menjalankan DCT/QIM/IDCT
+    in-place, lalu frame stego ditulis berurutan. Bit per frame pasti (jumlah blok x koefisien), sehingga
+    potongan payload tiap frame ditentukan saat frame dikirim. Sisa frame setelah payload di-encode ulang
+    jika encode_ulang_ekor (selain itu dibiarkan untuk kebijakan salin/potong).
+    Mengembalikan (bit disisipkan, jumlah frame, gray asli pertama, gray stego pertama, PSNR prediksi per frame,
+    (blok diperbaiki, bit gagal) verifikasi clipping per frame).
+    """
+    total_bits_to_embed = len(total_payload_bitstream)
+    bits_per_frame = (output_w // 8) * (output_h // 8) * min(num_ac_coeffs, 63)
+    pool = PoolRingFrame((output_h, output_w), jumlah_worker, _worker_embed_slot,
+                         (total_payload_bitstream, delta_kuantisasi, num_ac_coeffs, kunci_permutasi))
+    print(f"    Mode paralel: {jumlah_worker} worker, {pool.ring.jumlah_slot} slot frame di shared memory.")
+    bit_dikirim = 0; bit_disisipkan = 0; frame_num = 0; video_habis = False
+    first_original_gray = first_stego_gray = None
+    psnr_prediksi_per_frame = []; verifikasi_per_frame = []
+    try:
+        while True:
+            while not video_habis and bit_dikirim < total_bits_to_embed and pool.ada_slot_kosong():
+                if pelapor is not None: pelapor.periksa_batal()
+                with metrik.tahap('decode'):
+                    ret, frame_bgr = cap.read()
+                if not ret: video_habis = True; break
+                indeks_slot, slot = pool.ambil_slot_kosong()
+                with metrik.tahap('cvtColor'):
+                    cropped = frame_bgr[0:output_h, 0:output_w]
+                    if cropped.ndim == 3: cv2.cvtColor(cropped, cv2.COLOR_BGR2GRAY, dst=slot)
+                    else: slot[...] = cropped
+                if first_original_gray is None: first_original_gray = slot.copy()
+                bit_akhir = min(bit_dikirim + bits_per_frame, total_bits_to_embed)
+                pool.kirim(indeks_slot, (bit_dikirim, bit_akhir))
+                bit_dikirim = bit_akhir
+            if pool.jumlah_diproses() == 0: break
+            with metrik.tahap('tunggu_worker'):
+                indeks_slot, slot, (bits_embedded_this_frame, psnr_prediksi, verifikasi) = pool.ambil_hasil()
+            frame_num += 1
+            if first_stego_gray is None: first_stego_gray = slot.copy()
+            with metrik.tahap('cvtColor'):
+                stego_frame_bgr_to_write = cv2.cvtColor(slot, cv2.COLOR_GRAY2BGR)
+            pool.kembalikan_slot(indeks_slot)
+            with metrik.tahap('encode'):
+                out.write(stego_frame_bgr_to_write)
+            metrik.tambah('frame_embed'); metrik.tambah('bit_embed', bits_embedded_this_frame)
+            bit_disisipkan += bits_embedded_this_frame
+            psnr_prediksi_per_frame.append(psnr_prediksi); verifikasi_per_frame.append(verifikasi)
+            if pelapor is not None and pelapor.aktif: pelapor.frame_selesai(bit_disisipkan)
+            else: print(f"    Frame {frame_num}: {bits_embedded_this_frame} bits disisipkan. Total disisipkan: {bit_disisipkan}/{total_bits_to_embed}"
+                        f" (PSNR prediksi: {psnr_prediksi:.2f} dB){_teks_verifikasi(*verifikasi)}")
+    finally:
+        pool.tutup()
+    if bit_disisipkan >= total_bits_to_embed:
+        print("    Semua payload (SHA3-ECC-AES) berhasil disisipkan!")
+        if encode_ulang_ekor: frame_num += _salin_sisa_frame(cap, out, output_w, output_h, metrik)
+    return bit_disisipkan, frame_num, first_original_gray, first_stego_gray, psnr_prediksi_per_frame, verifikasi_per_frame
+
+def _embed_gambar_ke_video_inti(path_video_input, path_gambar_rahasia, path_video_output_base,
+                                delta_kuantisasi, num_ac_coeffs,
+                                kunci_publik_ecc_penerima_bytes_compressed, metrik, cache_dct=None,
+                                skema_fec=None, parameter_fec=None, fourcc_output="FFV1", kualitas_output=None,
+                                jumlah_worker=1, sinkron_frame=False, payload_siap=None, kebijakan_ekor=None,
+                                kunci_permutasi=None, pelapor=None, payload_ber_fec=False):
+    pelapor = pelapor or PelaporProgres("embed")
+    print(f"\n=== MEMULAI PROSES EMBEDDING GAMBAR KE VIDEO ===")
+    print(f"  Gambar Rahasia: '{path_gambar_rahasia}'")
+    print(f"  Video Input: '{path_video_input}'")
+    print(f"  Parameter: DELTA={delta_kuantisasi}, Koefisien AC per Blok={num_ac_coeffs}")
+    if kunci_permutasi: print("  Urutan blok/koefisien: permutasi berkunci")
     
+    if payload_siap is not None: total_payload_bitstream = payload_siap
+    else:
+        total_payload_bitstream = buat_payload_embed(path_gambar_rahasia, kunci_publik_ecc_penerima_bytes_compressed,
+                                                     metrik, skema_fec, parameter_fec)
+        payload_ber_fec = bool(skema_fec)
+    if total_payload_bitstream is None: return False, None, None
     total_bits_to_embed = len(total_payload_bitstream)
+    pelapor.bit_total = total_bits_to_embed
     
     print("\n  [Tahap Embedding 3: Menyisipkan Payload ke Frame Video]")
-    cap = cv2.VideoCapture(path_video_input)
+    cap = buka_sumber_frame(path_video_input)
     if not cap.isOpened(): print(f"    Error: Video input '{path_video_input}' tidak bisa dibuka."); return False, None, None
     
     frame_width_orig = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)); frame_height_orig = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
     fps = cap.get(cv2.CAP_PROP_FPS)
     output_w, output_h = (frame_width_orig // 8) * 8, (frame_height_orig // 8) * 8
     if output_w == 0 or output_h == 0: print("    Error: Dimensi video terlalu kecil."); cap.release(); return False, None, None
+    if sinkron_frame:
+        if delta_kuantisasi <= 0: print("    Error: Header sinkronisasi frame butuh DELTA positif."); cap.release(); return False, None, None
+        try:
+            total_payload_bitstream = frame_sync.bingkai_payload_sinkron(
+                total_payload_bitstream, frame_sync.kapasitas_frame_bits(output_w, output_h, num_ac_coeffs))
+        except ValueError as e:
+            print(f"    Error: {e}"); cap.release(); return False, None, None
+        print(f"    Header sinkronisasi per frame ditambahkan: {total_bits_to_embed} -> {len(total_payload_bitstream)} bits.")
+        total_bits_to_embed = pelapor.bit_total = len(total_payload_bitstream)
     
     base_name_output, _ = os.path.splitext(path_video_output_base)
-    actual_video_output_path = base_name_output + ".avi"
-    fourcc = cv2.VideoWriter_fourcc(*'F', 'F', 'V', '1') 
-    out = cv2.VideoWriter(actual_video_output_path, fourcc, fps, (output_w, output_h), isColor=True) 
-    if not out.isOpened(): print(f"    ERROR: Gagal VideoWriter FFV1 '{actual_video_output_path}'."); cap.release(); return False, None, None
+    # Output .y4m/.gray/.bgr24 ditulis sebagai frame store (lossless, dibaca ulang via mmap); selain itu AVI.
+    output_frame_store = adalah_frame_store(path_video_output_base)
+    actual_video_output_path = path_video_output_base if output_frame_store else base_name_output + ".avi"
+    if kebijakan_ekor not in (None,) + KEBIJAKAN_EKOR:
+        print(f"    Error: Kebijakan ekor tidak dikenal: {kebijakan_ekor}"); cap.release(); return False, None, None
+    indeks_ekor = None
+    if kebijakan_ekor in (None, "salin"):
+        indeks_ekor = _indeks_salin_ekor(path_video_input, output_w, output_h, fourcc_output, output_frame_store)
+    kebijakan_ekor = _pilih_kebijakan_ekor(kebijakan_ekor, indeks_ekor)
+    # Kebijakan salin: frame pembawa ditulis ke file sementara, lalu disambung dengan chunk sisa frame input.
+    path_tulis = base_name_output + ".pembawa.avi" if kebijakan_ekor == "salin" else actual_video_output_path
+    fourcc = cv2.VideoWriter_fourcc(*fourcc_output) 
+    # Encoder MJPEG bawaan OpenCV mendukung VIDEOWRITER_PROP_QUALITY; backend lain memakai setelan default.
+    api_writer = cv2.CAP_OPENCV_MJPEG if fourcc_output == "MJPG" and kualitas_output is not None else cv2.CAP_ANY
+    out = buka_penulis_frame(path_tulis, api_writer, fourcc, fps, (output_w, output_h), True)
+    if not out.isOpened(): print(f"    ERROR: Gagal VideoWriter {fourcc_output} '{path_tulis}'."); cap.release(); return False, None, None
+    if kualitas_output is not None and not out.set(cv2.VIDEOWRITER_PROP_QUALITY, float(kualitas_output)):
+        print(f"    Warning: Codec {fourcc_output} tidak mendukung pengaturan kualitas; memakai default encoder.")
+    if fourcc_output != "FFV1" and not output_frame_store and not payload_ber_fec:
+        print(f"    Warning: Codec {fourcc_output} bersifat lossy; tanpa FEC payload kemungkinan besar rusak.")
     
-    print(f"    Video output akan disimpan sebagai '{actual_video_output_path}' (Codec: FFV1).")
+    print(f"    Video output akan disimpan sebagai '{actual_video_output_path}' (Codec: {'frame store' if output_frame_store else fourcc_output}, "
+          f"sisa frame: {kebijakan_ekor}).")
     current_payload_bit_index = 0; frame_num = 0; embedded_all_payload = False
     first_stego_frame_gray_for_psnr = None 
     first_original_gray_for_psnr = None
+    psnr_prediksi_per_frame = []; verifikasi_per_frame = []
+    entri_cache = None
+    if jumlah_worker > 1 and delta_kuantisasi <= 0: jumlah_worker = 1  # Tanpa bit per frame yang pasti, payload tidak bisa dibagi di depan
+    if jumlah_worker > 1 and cache_dct is not None:
+        print("    Info: Cache koefisien DCT tidak dipakai pada mode paralel."); cache_dct = None
+    if cache_dct is not None:
+        entri_cache = cache_dct.buka(path_video_input, frame_width_orig, frame_height_orig, output_w, output_h)
+        print(f"    Cache koefisien DCT: '{entri_cache.direktori}'")
 
-    while True:
-        ret, frame_bgr = cap.read()
-        if not ret:
+    # Output setengah jadi (batal, ring gagal, error lain) dihapus agar tidak tertinggal di disk.
+    selesai_tulis = False
+    try:
+        if jumlah_worker > 1:
+            try:
+                (current_payload_bit_index, frame_num, first_original_gray_for_psnr, first_stego_frame_gray_for_psnr,
+                 psnr_prediksi_per_frame, verifikasi_per_frame) = _embed_frame_paralel(cap, out, output_w, output_h, total_payload_bitstream,
+                                                                 delta_kuantisasi, num_ac_coeffs, jumlah_worker, metrik,
+                                                                 kebijakan_ekor == "encode_ulang", kunci_permutasi, pelapor)
+            except RuntimeError as e:
+                print(f"    Error: {e}"); return False, None, None
+            embedded_all_payload = current_payload_bit_index >= total_bits_to_embed
             if not embedded_all_payload: print(f"    Warning: Video selesai sebelum semua payload ({total_bits_to_embed} bits) disisipkan.")
-            break
-        frame_num += 1; cropped_frame_bgr = frame_bgr[0:output_h, 0:output_w]
+        else:
+            while True:
+                try:
+                    pelapor.periksa_batal()
+                except JobDibatalkan as e:
+                    print(f"    Error: {e}"); return False, None, None
+                # Frame pembawa yang koefisiennya ada di cache cukup di-grab (tanpa retrieve/konversi warna).
+                koef_cache = None
+                if entri_cache is not None and current_payload_bit_index < total_bits_to_embed:
+                    koef_cache = entri_cache.ambil(frame_num)
+                with metrik.tahap('decode'):
+                    if koef_cache is not None: ret, frame_bgr = cap.grab(), None
+                    else: ret, frame_bgr = cap.read()
+                if not ret:
+                    if not embedded_all_payload: print(f"    Warning: Video selesai sebelum semua payload ({total_bits_to_embed} bits) disisipkan.")
+                    break
+                frame_num += 1
+                cropped_frame_bgr = frame_bgr[0:output_h, 0:output_w] if frame_bgr is not None else None
         
-        if current_payload_bit_index < total_bits_to_embed:
-            bits_to_embed_in_this_frame_segment = total_payload_bitstream[current_payload_bit_index:]
-            original_gray_ref_uint8, stego_frame_gray_output, bits_embedded_this_frame = proses_frame_qim_dct(
-                cropped_frame_bgr, 'embed', delta_kuantisasi, 
-                bits_to_embed_in_this_frame_segment, 
-                num_ac_coeffs_to_use=num_ac_coeffs
-            )
-            if frame_num == 1: 
-                first_original_gray_for_psnr = original_gray_ref_uint8.copy()
-                first_stego_frame_gray_for_psnr = stego_frame_gray_output.copy()
+                if current_payload_bit_index < total_bits_to_embed:
+                    bits_to_embed_in_this_frame_segment = total_payload_bitstream[current_payload_bit_index:]
+                    info_frame = {}
+                    if koef_cache is not None:
+                        metrik.tambah('frame_cache_hit')
+                        original_gray_ref_uint8, stego_frame_gray_output, bits_embedded_this_frame = embed_qim_dari_koefisien(
+                            koef_cache, output_h, output_w, delta_kuantisasi, bits_to_embed_in_this_frame_segment,
+                            num_ac_coeffs, metrik=metrik, info_frame=info_frame, kunci_permutasi=kunci_permutasi)
+                    elif entri_cache is not None:
+                        with metrik.tahap('cvtColor'):
+                            gray_frame = cv2.cvtColor(cropped_frame_bgr, cv2.COLOR_BGR2GRAY) if cropped_frame_bgr.ndim == 3 else cropped_frame_bgr
+                        with metrik.tahap('dct'):
+                            koef_frame = koefisien_dct_frame(gray_frame)
+                        entri_cache.simpan(frame_num - 1, koef_frame)
+                        original_gray_ref_uint8, stego_frame_gray_output, bits_embedded_this_frame = embed_qim_dari_koefisien(
+                            koef_frame, output_h, output_w, delta_kuantisasi, bits_to_embed_in_this_frame_segment,
+                            num_ac_coeffs, gray_reference_uint8=gray_frame, metrik=metrik, info_frame=info_frame,
+                            kunci_permutasi=kunci_permutasi)
+                    else:
+                        original_gray_ref_uint8, stego_frame_gray_output, bits_embedded_this_frame = proses_frame_qim_dct(
+                            cropped_frame_bgr, 'embed', delta_kuantisasi, 
+                            bits_to_embed_in_this_frame_segment, 
+                            num_ac_coeffs_to_use=num_ac_coeffs,
+                            metrik=metrik, info_frame=info_frame, kunci_permutasi=kunci_permutasi
+                        )
+                    psnr_prediksi_per_frame.append(info_frame['psnr_prediksi'])
+                    verifikasi_per_frame.append((info_frame['blok_diperbaiki'], info_frame['bit_gagal']))
+                    if frame_num == 1: 
+                        first_original_gray_for_psnr = original_gray_ref_uint8.copy()
+                        first_stego_frame_gray_for_psnr = stego_frame_gray_output.copy()
             
-            stego_frame_bgr_to_write = cv2.cvtColor(stego_frame_gray_output, cv2.COLOR_GRAY2BGR)
-            out.write(stego_frame_bgr_to_write)
-            current_payload_bit_index += bits_embedded_this_frame
-            print(f"    Frame {frame_num}: {bits_embedded_this_frame} bits disisipkan. Total disisipkan: {current_payload_bit_index}/{total_bits_to_embed}")
+                    with metrik.tahap('cvtColor'):
+                        stego_frame_bgr_to_write = cv2.cvtColor(stego_frame_gray_output, cv2.COLOR_GRAY2BGR)
+                    with metrik.tahap('encode'):
+                        out.write(stego_frame_bgr_to_write)
+                    metrik.tambah('frame_embed')
+                    current_payload_bit_index += bits_embedded_this_frame
+                    if pelapor.aktif: pelapor.frame_selesai(current_payload_bit_index)
+                    else: print(f"    Frame {frame_num}: {bits_embedded_this_frame} bits disisipkan. Total disisipkan: {current_payload_bit_index}/{total_bits_to_embed}"
+                                f" (PSNR prediksi: {info_frame['psnr_prediksi']:.2f} dB){_teks_verifikasi(*verifikasi_per_frame[-1])}")
             
-            if current_payload_bit_index >= total_bits_to_embed:
-                embedded_all_payload = True; print("    Semua payload (SHA3-ECC-AES) berhasil disisipkan!")
-                # Salin sisa frame asli jika payload sudah selesai sebelum video habis
-                while True: 
-                    ret_sisa, frame_sisa_bgr = cap.read()
-                    if not ret_sisa: break
-                    frame_num +=1
-                    cropped_frame_sisa_bgr = frame_sisa_bgr[0:output_h, 0:output_w]
-                    out.write(cropped_frame_sisa_bgr) 
-                break 
-        else: # Seharusnya tidak pernah sampai sini jika logika di atas benar
-            if len(cropped_frame_bgr.shape) == 2: cropped_frame_bgr_to_write = cv2.cvtColor(cropped_frame_bgr, cv2.COLOR_GRAY2BGR)
-            else: cropped_frame_bgr_to_write = cropped_frame_bgr
-            out.write(cropped_frame_bgr_to_write)
+                    if current_payload_bit_index >= total_bits_to_embed:
+                        embedded_all_payload = True; print("    Semua payload (SHA3-ECC-AES) berhasil disisipkan!")
+                        # Salin sisa frame asli jika payload sudah selesai sebelum video habis
+                        if kebijakan_ekor == "encode_ulang": frame_num += _salin_sisa_frame(cap, out, output_w, output_h, metrik)
+                        break 
+                else: # Seharusnya tidak pernah sampai sini jika logika di atas benar
+                    if len(cropped_frame_bgr.shape) == 2: cropped_frame_bgr_to_write = cv2.cvtColor(cropped_frame_bgr, cv2.COLOR_GRAY2BGR)
+                    else: cropped_frame_bgr_to_write = cropped_frame_bgr
+                    out.write(cropped_frame_bgr_to_write)
             
-    cap.release(); out.release()
+        frame_kunci = None
+        if kebijakan_ekor == "salin" and embedded_all_payload:
+            # Chunk input hanya bisa disalin mulai keyframe; frame sebelum keyframe berikutnya di-encode ulang.
+            frame_kunci = _keyframe_berikutnya(indeks_ekor, frame_num)
+            if frame_kunci is None: print("    Info: Tidak ada keyframe input setelah frame pembawa; sisa frame di-encode ulang.")
+            frame_num += _salin_sisa_frame(cap, out, output_w, output_h, metrik,
+                                           None if frame_kunci is None else frame_kunci - frame_num)
+        selesai_tulis = True
+    finally:
+        cap.release(); out.release()
+        if entri_cache is not None: entri_cache.tutup()
+        if not selesai_tulis and os.path.exists(path_tulis): os.remove(path_tulis)
+    if kebijakan_ekor == "salin":
+        if frame_kunci is not None:
+            try:
+                frame_num += _sambung_ekor_salinan(path_tulis, path_video_input, indeks_ekor, frame_num, actual_video_output_path,
+                                                   output_w, output_h, fourcc_output, metrik)
+                os.remove(path_tulis)
+            except (OSError, ValueError, struct.error) as e:
+                print(f"    Error: Gagal menyambung sisa frame: {e}")
+                for path_sisa in (path_tulis, actual_video_output_path):
+                    if os.path.exists(path_sisa): os.remove(path_sisa)
+                return False, None, None
+        else: os.replace(path_tulis, actual_video_output_path)
+    if kebijakan_ekor != "potong": print(f"    Total frame output: {frame_num}.")
+    else: print(f"    Output dipotong setelah frame pembawa terakhir ({frame_num} frame).")
+    if psnr_prediksi_per_frame:
+        print(f"    PSNR prediksi frame pembawa (domain DCT, sebelum clipping): min {min(psnr_prediksi_per_frame):.2f} dB, "
+              f"rata-rata {np.mean(np.minimum(psnr_prediksi_per_frame, 100.0)):.2f} dB")
+    if verifikasi_per_frame:
+        blok_diperbaiki, bit_gagal = (int(x) for x in np.sum(verifikasi_per_frame, axis=0))
+        print(f"    Verifikasi clipping: {blok_diperbaiki} blok disisipkan ulang, {bit_gagal} bit tetap tidak terbaca.")
+        if not output_bisa_diekstrak(bit_gagal, payload_ber_fec, actual_video_output_path):
+            if os.path.exists(actual_video_output_path): os.remove(actual_video_output_path)
+            return False, None, None
     if embedded_all_payload: 
         print(f"  Proses embedding (SHA3-ECC-AES) selesai. Video output: '{actual_video_output_path}'.")
         return True, first_original_gray_for_psnr, first_stego_frame_gray_for_psnr
@@ -192,7 +548,8 @@ if __name__ == "__main__":
             stego_video_file_path_final, 
             DELTA_UNTUK_TES,
             JUMLAH_AC_KOEFISIEN_DIPAKAI,
-            bob_public_key_bytes_compressed 
+            bob_public_key_bytes_compressed,
+            cache_dct=CacheKoefisienDCT()  # Embed ulang pada cover yang sama melewati decode + DCT maju
         )
 
         if berhasil_embed_final:
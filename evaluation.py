@@ -1,17 +1,29 @@
 import os
+import csv
 import cv2
 import numpy as np
 from PIL import Image
 import math
-from skimage.metrics import structural_similarity as ssim
+try:
+    from skimage.metrics import structural_similarity as skimage_ssim  # Hanya untuk validasi ssim_cepat
+except ImportError:
+    skimage_ssim = None
 import time
+from concurrent.futures import ProcessPoolExecutor
+from config_and_setup import (
+    buat_pasangan_kunci_ecc, buat_shared_secret_ecdh, enkripsi_aes_gcm, dekripsi_aes_gcm, proses_frame_qim_dct
+)
+from instrumentation import ukur_fungsi
+from frame_store import buka_sumber_frame
  
 def psnr(original, compressed):
     """
     Menghitung Peak Signal-to-Noise Ratio (PSNR) antara dua gambar/frame.
     Semakin tinggi nilai PSNR, semakin mirip kedua gambar.
     """
-    mse = np.mean((original - compressed) ** 2)
+    # Hitung dalam float agar selisih negatif tidak wrap-around pada uint8.
+    selisih = np.asarray(original, dtype=np.float64) - np.asarray(compressed, dtype=np.float64)
+    mse = np.mean(selisih ** 2)
     if mse == 0:  # Gambar identik
         return float('inf')
     max_pixel = 255.0
@@ -22,8 +34,89 @@ def calc_ssim(original, compressed):
     """
     Menghitung Structural Similarity Index (SSIM) antara dua gambar/frame.
     Nilai mendekati 1 menandakan kemiripan struktural yang tinggi.
+    Memakai ssim_cepat (jendela 7x7 seperti skimage) dengan data_range tetap 255.
     """
-    return ssim(original, compressed, data_range=compressed.max() - compressed.min())
+    return ssim_cepat(original, compressed, data_range=255.0)
+ 
+# --- SSIM Cepat (Filter OpenCV) ---
+SSIM_K1, SSIM_K2 = 0.01, 0.03
+SSIM_WIN_BOX = 7  # Sama dengan default skimage (jendela uniform 7x7, kovarians sampel)
+SSIM_WIN_GAUSSIAN, SSIM_SIGMA_GAUSSIAN = 11, 1.5  # Setelan Wang et al. (2004)
+ 
+def ssim_cepat(original, compressed, data_range=255.0, gaussian=False):
+    """
+    SSIM berbasis filter terpisah OpenCV (boxFilter/GaussianBlur) pada float32 dengan data_range tetap.
+    Menerima satu frame 2D (mengembalikan float) atau batch (N, H, W) (mengembalikan array N nilai).
+    Batch diproses sebagai satu citra tinggi; tepi tiap frame dibuang (seperti skimage) sehingga
+    filter tidak bercampur antar frame.
+    """
+    x = np.asarray(original, dtype=np.float32); y = np.asarray(compressed, dtype=np.float32)
+    if x.shape != y.shape: raise ValueError(f"Ukuran frame berbeda: {x.shape} vs {y.shape}.")
+    tunggal = x.ndim == 2
+    if tunggal: x = x[None]; y = y[None]
+    jumlah, tinggi, lebar = x.shape
+    win = SSIM_WIN_GAUSSIAN if gaussian else SSIM_WIN_BOX
+    pad = (win - 1) // 2
+    if tinggi <= 2 * pad or lebar <= 2 * pad:
+        raise ValueError(f"Frame terlalu kecil untuk jendela SSIM {win}x{win}.")
+    x = x.reshape(jumlah * tinggi, lebar); y = y.reshape(jumlah * tinggi, lebar)
+ 
+    if gaussian:
+        filt = lambda img: cv2.GaussianBlur(img, (win, win), SSIM_SIGMA_GAUSSIAN, borderType=cv2.BORDER_REFLECT)
+        cov_norm = 1.0
+    else:
+        filt = lambda img: cv2.boxFilter(img, -1, (win, win), normalize=True, borderType=cv2.BORDER_REFLECT)
+        cov_norm = win * win / (win * win - 1.0)
+    ux, uy = filt(x), filt(y)
+    uxx, uyy, uxy = filt(x * x), filt(y * y), filt(x * y)
+    vx = cov_norm * (uxx - ux * ux)
+    vy = cov_norm * (uyy - uy * uy)
+    vxy = cov_norm * (uxy - ux * uy)
+    c1 = (SSIM_K1 * data_range) ** 2; c2 = (SSIM_K2 * data_range) ** 2
+    peta = ((2 * ux * uy + c1) * (2 * vxy + c2)) / ((ux * ux + uy * uy + c1) * (vx + vy + c2))
+    peta = peta.reshape(jumlah, tinggi, lebar)[:, pad:tinggi - pad, pad:lebar - pad]
+    nilai = peta.mean(axis=(1, 2), dtype=np.float64)
+    return float(nilai[0]) if tunggal else nilai
+ 
+def validasi_ssim_cepat(jumlah_frame=8, tinggi=240, lebar=320, toleransi=1e-3, seed=0):
+    """
+    Membandingkan ssim_cepat dengan skimage (jika terpasang) pada frame acak yang sudah diberi distorsi,
+    dan mengukur kecepatannya. Mengembalikan dict berisi selisih maksimum dan waktu per frame.
+    """
+    print("\n=== VALIDASI DAN BENCHMARK SSIM CEPAT ===")
+    rng = np.random.default_rng(seed)
+    dasar = cv2.GaussianBlur(rng.integers(0, 256, (jumlah_frame * tinggi, lebar)).astype(np.uint8), (9, 9), 3)
+    asli = dasar.reshape(jumlah_frame, tinggi, lebar)
+    distorsi = np.uint8(np.clip(asli.astype(np.float32) + rng.normal(0, 6, asli.shape), 0, 255))
+ 
+    hasil = {}
+    ssim_cepat(asli[0], distorsi[0])  # Pemanasan
+    mulai = time.perf_counter()
+    nilai_batch = ssim_cepat(asli, distorsi)
+    hasil["cepat_batch_detik_per_frame"] = (time.perf_counter() - mulai) / jumlah_frame
+    mulai = time.perf_counter()
+    nilai_tunggal = np.array([ssim_cepat(a, b) for a, b in zip(asli, distorsi)])
+    hasil["cepat_tunggal_detik_per_frame"] = (time.perf_counter() - mulai) / jumlah_frame
+    hasil["selisih_batch_vs_tunggal"] = float(np.max(np.abs(nilai_batch - nilai_tunggal)))
+    print(f"    ssim_cepat (batch): {hasil['cepat_batch_detik_per_frame'] * 1e3:.3f} ms/frame")
+    print(f"    ssim_cepat (per frame): {hasil['cepat_tunggal_detik_per_frame'] * 1e3:.3f} ms/frame")
+ 
+    if skimage_ssim is None:
+        print("    skimage tidak terpasang; validasi terhadap skimage dilewati.")
+        return hasil
+    mulai = time.perf_counter()
+    nilai_skimage = np.array([skimage_ssim(a, b, data_range=255) for a, b in zip(asli, distorsi)])
+    hasil["skimage_detik_per_frame"] = (time.perf_counter() - mulai) / jumlah_frame
+    nilai_skimage_gauss = np.array([skimage_ssim(a, b, data_range=255, gaussian_weights=True, sigma=SSIM_SIGMA_GAUSSIAN,
+                                                 use_sample_covariance=False) for a, b in zip(asli, distorsi)])
+    hasil["selisih_maks_box"] = float(np.max(np.abs(nilai_batch - nilai_skimage)))
+    hasil["selisih_maks_gaussian"] = float(np.max(np.abs(ssim_cepat(asli, distorsi, gaussian=True) - nilai_skimage_gauss)))
+    hasil["lolos"] = hasil["selisih_maks_box"] <= toleransi and hasil["selisih_maks_gaussian"] <= toleransi
+    print(f"    skimage: {hasil['skimage_detik_per_frame'] * 1e3:.3f} ms/frame "
+          f"(percepatan {hasil['skimage_detik_per_frame'] / hasil['cepat_batch_detik_per_frame']:.1f}x)")
+    print(f"    Selisih maksimum vs skimage: box {hasil['selisih_maks_box']:.2e}, gaussian {hasil['selisih_maks_gaussian']:.2e} "
+          f"(toleransi {toleransi:.0e}) -> {'LOLOS' if hasil['lolos'] else 'GAGAL'}")
+    return hasil
  
 def bandingkan_frame_video(frame_original, frame_stego):
     """
@@ -164,8 +257,8 @@ def evaluasi_hasil_steganografi(path_video_original, path_video_stego, path_gamb
     print(f"    Video Stego: '{path_video_stego}'")
  
     # Baca video original dan stego
-    cap_original = cv2.VideoCapture(path_video_original)
-    cap_stego = cv2.VideoCapture(path_video_stego)
+    cap_original = buka_sumber_frame(path_video_original)
+    cap_stego = buka_sumber_frame(path_video_stego)
  
     if not cap_original.isOpened() or not cap_stego.isOpened():
         print("    Error: Tidak dapat membuka file video untuk evaluasi.")
@@ -184,8 +277,8 @@ def evaluasi_hasil_steganografi(path_video_original, path_video_stego, path_gamb
         return None, None
  
     # Konversi ke grayscale untuk evaluasi
-    frame_orig_gray = cv2.cvtColor(frame_orig, cv2.COLOR_BGR2GRAY)
-    frame_stego_gray = cv2.cvtColor(frame_stego, cv2.COLOR_BGR2GRAY)
+    frame_orig_gray = _ke_grayscale(frame_orig)
+    frame_stego_gray = _ke_grayscale(frame_stego)
  
     # Evaluasi frame pertama
     print("\n    Evaluasi Frame Pertama:")
@@ -232,45 +325,176 @@ def evaluasi_hasil_steganografi(path_video_original, path_video_stego, path_gamb
  
     return (psnr_video, ssim_video), (psnr_img, ssim_img)
  
+# --- Evaluasi Streaming Seluruh Frame Video ---
+PSNR_MAKS_STATISTIK = 100.0  # PSNR frame identik (inf) dibatasi ke nilai ini saat menghitung statistik agregat
+STRIDE_MULAI_SEEK = 30  # Jika stride >= nilai ini, frame dilompati dengan seek; jika tidak, dengan grab()
+ 
+def psnr_dari_mse(mse, max_pixel=255.0):
+    """PSNR (dB) dari MSE; array MSE diproses secara vektor, MSE nol menghasilkan inf."""
+    mse = np.asarray(mse, dtype=np.float64)
+    with np.errstate(divide='ignore'):
+        return 10.0 * np.log10((max_pixel ** 2) / mse)
+ 
+def _ke_grayscale(frame):
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+ 
+def _evaluasi_rentang_frame(path_video_original, path_video_stego, frame_mulai, frame_akhir, stride, hitung_ssim=True):
+    """
+    Worker: membaca kedua video secara streaming pada rentang [frame_mulai, frame_akhir) dan
+    mengembalikan (indeks_frame, mse, ssim) untuk setiap frame sampel. frame_akhir=None berarti sampai habis.
+    """
+    cap_original = buka_sumber_frame(path_video_original)
+    cap_stego = buka_sumber_frame(path_video_stego)
+    indeks_list, mse_list, ssim_list = [], [], []
+    try:
+        if not cap_original.isOpened() or not cap_stego.isOpened():
+            raise IOError("Tidak dapat membuka file video untuk evaluasi.")
+        if frame_mulai > 0:
+            cap_original.set(cv2.CAP_PROP_POS_FRAMES, frame_mulai)
+            cap_stego.set(cv2.CAP_PROP_POS_FRAMES, frame_mulai)
+        indeks = frame_mulai
+        while frame_akhir is None or indeks < frame_akhir:
+            ret_orig, frame_orig = cap_original.read()
+            ret_stego, frame_stego = cap_stego.read()
+            if not ret_orig or not ret_stego: break
+            gray_orig = _ke_grayscale(frame_orig); gray_stego = _ke_grayscale(frame_stego)
+            # Video stego dipotong ke kelipatan 8; bandingkan pada area yang sama.
+            h = min(gray_orig.shape[0], gray_stego.shape[0]); w = min(gray_orig.shape[1], gray_stego.shape[1])
+            gray_orig = gray_orig[:h, :w]; gray_stego = gray_stego[:h, :w]
+            selisih = gray_orig.astype(np.float32) - gray_stego.astype(np.float32)
+            indeks_list.append(indeks)
+            mse_list.append(float(np.mean(selisih * selisih, dtype=np.float64)))
+            ssim_list.append(float(calc_ssim(gray_orig, gray_stego)) if hitung_ssim else np.nan)
+            # Lompati frame di antara sampel.
+            lompat = stride - 1
+            if frame_akhir is not None: lompat = min(lompat, frame_akhir - indeks - 1)
+            if lompat >= STRIDE_MULAI_SEEK:
+                cap_original.set(cv2.CAP_PROP_POS_FRAMES, indeks + stride)
+                cap_stego.set(cv2.CAP_PROP_POS_FRAMES, indeks + stride)
+            else:
+                for _ in range(max(0, lompat)):
+                    if not cap_original.grab() or not cap_stego.grab(): break
+            indeks += stride
+    finally:
+        cap_original.release(); cap_stego.release()
+    return (np.asarray(indeks_list, dtype=np.int64), np.asarray(mse_list, dtype=np.float64),
+            np.asarray(ssim_list, dtype=np.float64))
+ 
+def _statistik_agregat(nilai):
+    nilai = np.asarray(nilai, dtype=np.float64)
+    nilai = nilai[~np.isnan(nilai)]
+    if nilai.size == 0: return None
+    return {"min": float(nilai.min()), "rata_rata": float(nilai.mean()), "p5": float(np.percentile(nilai, 5)),
+            "maks": float(nilai.max())}
+ 
+def evaluasi_video_streaming(path_video_original, path_video_stego, stride=1, path_csv=None,
+                             jumlah_worker=1, hitung_ssim=True):
+    """
+    Mengevaluasi PSNR/SSIM (grayscale, dihitung dalam float) pada SELURUH frame video, atau setiap
+    `stride` frame. Kedua video dibaca frame demi frame sehingga memori tetap datar untuk video panjang.
+    Jika `jumlah_worker` > 1, rentang frame dibagi ke beberapa proses.
+    Menulis CSV per frame (opsional) dan mengembalikan statistik agregat (min/rata-rata/p5).
+    """
+    print("\n=== EVALUASI STREAMING SELURUH FRAME VIDEO ===")
+    print(f"    Video Original: '{path_video_original}'")
+    print(f"    Video Stego: '{path_video_stego}'")
+    print(f"    Stride: {stride}, Worker: {jumlah_worker}")
+    if stride < 1: raise ValueError("Stride minimal 1.")
+    if not os.path.exists(path_video_original) or not os.path.exists(path_video_stego):
+        print("    Error: Video asli atau stego tidak ditemukan.")
+        return None
+ 
+    mulai = time.perf_counter()
+    if jumlah_worker > 1:
+        cap = buka_sumber_frame(path_video_stego)
+        jumlah_frame = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)); cap.release()
+        jumlah_sampel = -(-jumlah_frame // stride)
+        sampel_per_worker = -(-jumlah_sampel // jumlah_worker)
+        batas = [i * sampel_per_worker * stride for i in range(jumlah_worker)] + [None]
+        with ProcessPoolExecutor(max_workers=jumlah_worker) as executor:
+            futures = [executor.submit(_evaluasi_rentang_frame, path_video_original, path_video_stego,
+                                       batas[i], batas[i + 1], stride, hitung_ssim)
+                       for i in range(jumlah_worker) if jumlah_frame == 0 or batas[i] < jumlah_frame]
+            bagian = [f.result() for f in futures]
+        indeks = np.concatenate([b[0] for b in bagian]); mse = np.concatenate([b[1] for b in bagian])
+        nilai_ssim = np.concatenate([b[2] for b in bagian])
+    else:
+        indeks, mse, nilai_ssim = _evaluasi_rentang_frame(path_video_original, path_video_stego, 0, None, stride, hitung_ssim)
+    durasi = time.perf_counter() - mulai
+ 
+    if indeks.size == 0:
+        print("    Error: Tidak ada frame yang bisa dibandingkan.")
+        return None
+    nilai_psnr = psnr_dari_mse(mse)
+ 
+    if path_csv:
+        direktori = os.path.dirname(path_csv)
+        if direktori: os.makedirs(direktori, exist_ok=True)
+        with open(path_csv, "w", newline="") as f:
+            penulis = csv.writer(f)
+            penulis.writerow(["frame", "mse", "psnr_db", "ssim"])
+            for baris in zip(indeks.tolist(), mse.tolist(), nilai_psnr.tolist(), nilai_ssim.tolist()):
+                penulis.writerow(baris)
+        print(f"    CSV per frame disimpan ke '{path_csv}'.")
+ 
+    psnr_global = float(psnr_dari_mse(mse.mean()))
+    hasil = {
+        "jumlah_frame_dievaluasi": int(indeks.size),
+        "stride": stride,
+        "durasi_detik": durasi,
+        "psnr_db": _statistik_agregat(np.minimum(nilai_psnr, PSNR_MAKS_STATISTIK)),
+        "psnr_global_db": psnr_global,
+        "ssim": _statistik_agregat(nilai_ssim),
+    }
+    print(f"    Frame dievaluasi: {indeks.size} dalam {durasi:.2f} detik ({indeks.size / durasi:.1f} frame/s)")
+    print(f"    PSNR: min {hasil['psnr_db']['min']:.2f} dB, rata-rata {hasil['psnr_db']['rata_rata']:.2f} dB, "
+          f"p5 {hasil['psnr_db']['p5']:.2f} dB (global {psnr_global:.2f} dB)")
+    if hasil["ssim"]:
+        print(f"    SSIM: min {hasil['ssim']['min']:.4f}, rata-rata {hasil['ssim']['rata_rata']:.4f}, p5 {hasil['ssim']['p5']:.4f}")
+    return hasil
+ 
 def evaluasi_keamanan_ecc():
     """
-    Evaluasi keamanan ECC melalui simulasi pengujian brute-force.
-    (Simulasi: melakukan perulangan dan pengukuran waktu sebagai representasi ketahanan.)
+    Evaluasi keamanan ECC berdasarkan pengukuran nyata operasi kunci SECP256R1
+    (pembuatan kunci dan ECDH) serta estimasi biaya brute-force (Pollard's rho ~ 2^128 operasi grup).
     """
-    print("\n=== EVALUASI KEAMANAN ECC (Pengujian Brute-Force) ===")
-    start_time = time.perf_counter()
-    # Simulasi brute-force dengan perulangan dummy
-    for i in range(1000000):
-        pass
-    elapsed = time.perf_counter() - start_time
-    print(f"    Waktu simulasi brute-force: {elapsed:.4f} detik")
-    print("    Hasil: ECC dianggap aman terhadap serangan brute-force (simulasi)")
- 
-def evaluasi_waktu_enkripsi_dekripsi():
+    print("\n=== EVALUASI KEAMANAN ECC (Estimasi Brute-Force) ===")
+    priv_a, _ = buat_pasangan_kunci_ecc()
+    _, pub_b = buat_pasangan_kunci_ecc()
+    stat_keygen = ukur_fungsi(buat_pasangan_kunci_ecc)
+    stat_ecdh = ukur_fungsi(lambda: buat_shared_secret_ecdh(priv_a, pub_b))
+    print(f"    Pembuatan kunci ECC: {stat_keygen['ops_per_detik']:.1f} ops/s (p50 {stat_keygen['p50_detik'] * 1e3:.3f} ms)")
+    print(f"    ECDH shared secret: {stat_ecdh['ops_per_detik']:.1f} ops/s (p50 {stat_ecdh['p50_detik'] * 1e3:.3f} ms)")
+    # Satu percobaan brute-force minimal setara satu operasi grup; ECDH diukur sebagai batas atas kecepatan.
+    estimasi_tahun = (2 ** 128) / stat_ecdh['ops_per_detik'] / (3600 * 24 * 365)
+    print(f"    Estimasi brute-force (2^128 operasi pada kecepatan ECDH terukur): {estimasi_tahun:.2e} tahun")
+    print("    Hasil: ECC (SECP256R1, keamanan ~128-bit) aman terhadap serangan brute-force")
+    return stat_keygen, stat_ecdh
+ 
+def evaluasi_waktu_enkripsi_dekripsi(ukuran_payload_bytes=64 * 64):
     """
-    Evaluasi waktu enkripsi dan dekripsi (simulasi) untuk algoritma kriptografi.
+    Evaluasi waktu enkripsi dan dekripsi AES-GCM yang sebenarnya untuk payload
+    sebesar `ukuran_payload_bytes` (default: gambar grayscale 64x64).
     """
     print("\n=== EVALUASI WAKTU ENKRIPSI/DEKRIPSI ===")
-    # Simulasi enkripsi
-    start_enc = time.perf_counter()
-    time.sleep(0.05)  # simulasi proses enkripsi
-    enc_time = time.perf_counter() - start_enc
-    print(f"    Waktu Enkripsi: {enc_time:.4f} detik")
- 
-    # Simulasi dekripsi
-    start_dec = time.perf_counter()
-    time.sleep(0.04)  # simulasi proses dekripsi
-    dec_time = time.perf_counter() - start_dec
-    print(f"    Waktu Dekripsi: {dec_time:.4f} detik")
+    data = os.urandom(ukuran_payload_bytes)
+    kunci_aes = os.urandom(32)
+    ciphertext, nonce, tag = enkripsi_aes_gcm(data, kunci_aes)
+    stat_enc = ukur_fungsi(lambda: enkripsi_aes_gcm(data, kunci_aes), ukuran_payload_bytes)
+    print(f"    Waktu Enkripsi: {stat_enc['rata_rata_detik']:.6f} detik ({stat_enc['mb_per_detik']:.1f} MB/s)")
+ 
+    stat_dec = ukur_fungsi(lambda: dekripsi_aes_gcm(ciphertext, kunci_aes, nonce, tag), ukuran_payload_bytes)
+    print(f"    Waktu Dekripsi: {stat_dec['rata_rata_detik']:.6f} detik ({stat_dec['mb_per_detik']:.1f} MB/s)")
+    return stat_enc, stat_dec
  
 def evaluasi_capacity_bit_per_frame(video_path):
     """
     Evaluasi kapasitas penyisipan (dalam bit per frame) dengan asumsi 1 bit per piksel.
     """
-    cap = cv2.VideoCapture(video_path)
+    cap = buka_sumber_frame(video_path)
     ret, frame = cap.read()
     if ret:
-        frame_gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        frame_gray = _ke_grayscale(frame)
         capacity = frame_gray.shape[0] * frame_gray.shape[1]
         print("\n=== EVALUASI CAPACITY PER FRAME ===")
         print(f"    Dimensi Frame: {frame_gray.shape[1]}x{frame_gray.shape[0]}")
@@ -283,6 +507,41 @@ def evaluasi_capacity_bit_per_frame(video_path):
         return None
  
 # --- Blok Utama untuk Menjalankan Evaluasi ---
+def validasi_verifikasi_clipping(delta_grid=(20, 40), num_ac_coeffs=63, tinggi=240, lebar=320, seed=0):
+    """
+    Regresi verifikasi clipping: pada frame acak dan frame tersaturasi (hitam/putih) dengan semua koefisien AC,
+    embed dengan verifikasi tidak boleh menghasilkan bit salah per blok lebih banyak daripada tanpa verifikasi,
+    dan bit_gagal yang dilaporkan harus sama dengan bit salah hasil ekstraksi. Mengembalikan list hasil per kasus.
+    """
+    print("\n=== VALIDASI VERIFIKASI CLIPPING (REGRESI) ===")
+    rng = np.random.default_rng(seed)
+    frame_uji = {
+        "acak": rng.integers(0, 256, (tinggi, lebar), dtype=np.uint8),
+        "hitam_putih": np.uint8(rng.integers(0, 2, (tinggi, lebar)) * 255),
+        "hitam_putih_blok": np.uint8(np.kron(rng.integers(0, 2, (tinggi // 8, lebar // 8)), np.ones((8, 8))) * 255),
+    }
+    bit_per_blok = min(num_ac_coeffs, 63)
+    hasil = []
+    for nama, frame in frame_uji.items():
+        for delta in delta_grid:
+            bits = "".join(rng.choice(("0", "1"), (tinggi // 8) * (lebar // 8) * bit_per_blok))
+            salah_per_blok = {}
+            for verifikasi in (False, True):
+                info_frame = {}
+                _, stego, jumlah_bit = proses_frame_qim_dct(frame, 'embed', delta, bits, num_ac_coeffs_to_use=num_ac_coeffs,
+                                                            info_frame=info_frame, verifikasi=verifikasi)
+                baca = proses_frame_qim_dct(stego, 'extract', delta, num_ac_coeffs_to_use=num_ac_coeffs)
+                salah = np.frombuffer(bits[:jumlah_bit].encode('ascii'), dtype=np.uint8) != \
+                        np.frombuffer(baca[:jumlah_bit].encode('ascii'), dtype=np.uint8)
+                salah_per_blok[verifikasi] = salah.reshape(-1, bit_per_blok).sum(axis=1)
+            lolos = bool(np.all(salah_per_blok[True] <= salah_per_blok[False])) and \
+                    info_frame['bit_gagal'] == int(salah_per_blok[True].sum())
+            hasil.append({"frame": nama, "delta": delta, "bit_salah_tanpa_verifikasi": int(salah_per_blok[False].sum()),
+                          "bit_salah_dengan_verifikasi": int(salah_per_blok[True].sum()), "lolos": lolos})
+            print(f"    {nama}, DELTA={delta}, k={num_ac_coeffs}: bit salah {hasil[-1]['bit_salah_tanpa_verifikasi']} -> "
+                  f"{hasil[-1]['bit_salah_dengan_verifikasi']} -> {'LOLOS' if lolos else 'GAGAL'}")
+    return hasil
+ 
 if __name__ == "__main__":
     print("="*70)
     print("EVALUASI HASIL STEGANOGRAFI VIDEO (SHA3-ECC-AES)")
@@ -318,7 +577,16 @@ if __name__ == "__main__":
         path_gambar_ekstraksi
     )
  
+    # Evaluasi seluruh frame (streaming)
+    evaluasi_video_streaming(
+        path_video_original,
+        path_video_stego,
+        path_csv=os.path.join(output_dir, "evaluasi_per_frame.csv")
+    )
+ 
     # Evaluasi tambahan:
     evaluasi_keamanan_ecc()
     evaluasi_waktu_enkripsi_dekripsi()
-    evaluasi_capacity_bit_per_frame(path_video_original)
\ No newline at end of file
+    evaluasi_capacity_bit_per_frame(path_video_original)
+    validasi_ssim_cepat()
+    validasi_verifikasi_clipping()
\ No newline at end of file
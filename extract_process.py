@@ -3,6 +3,8 @@ import cv2
 import numpy as np
 from PIL import Image
 import helpers as steg_helpers
+import fec
+import frame_sync
 from cryptography.hazmat.primitives import serialization
 
 # Import fungsi-fungsi dari config_and_setup
@@ -10,33 +12,204 @@ from config_and_setup import (
     bytes_ke_bitstream, bitstream_ke_bytes, bitstream_ke_int,
     dekripsi_aes_gcm, deserialisasi_kunci_publik_ecc_compressed, buat_shared_secret_ecdh, 
     derive_kunci_aes_dari_shared_secret, hitung_sha3_256, proses_frame_qim_dct,
-    setup_kunci_ecc
+    urutkan_bit_permutasi, setup_kunci_ecc
 )
+from instrumentation import MetrikPipeline, METRIK_NONAKTIF
+from frame_store import buka_sumber_frame
+from frame_ring import PoolRingFrame
+from cache import CacheBitEkstraksi
+from progress import PelaporProgres, SumberBitBerprogres, JobDibatalkan
 
 # --- Helper Function untuk Error ---
-def print_error_and_exit_extract(message, cap_to_release=None): 
+def print_error_and_exit_extract(message):
     print(f"  Error Kritis Ekstraksi: {message}")
-    if cap_to_release and cap_to_release.isOpened(): cap_to_release.release()
+
+# --- Sumber Bit per Frame (dengan Cache Opsional) ---
+class _SumberBitStego:
+    """
+    Menghasilkan bitstream QIM per frame secara berurutan. Frame yang bitnya sudah ada di cache
+    tidak di-decode; posisi VideoCapture baru dimajukan (grab) saat ada frame yang belum ter-cache.
+    Cache menyimpan bit urutan raster; permutasi berkunci diterapkan sesudahnya, sehingga ekstraksi ulang
+    dengan kunci permutasi lain tetap memakai cache yang sama.
+    """
+    def __init__(self, cap, processed_w, processed_h, delta_kuantisasi, num_ac_coeffs, metrik, entri_cache=None,
+                 kunci_permutasi=None):
+        self.cap = cap
+        self.processed_w, self.processed_h = processed_w, processed_h
+        self.delta_kuantisasi = delta_kuantisasi
+        self.num_ac_coeffs = num_ac_coeffs
+        self.metrik = metrik
+        self.entri_cache = entri_cache
+        self.kunci_permutasi = kunci_permutasi
+        self.indeks_frame = 0  # Frame berikutnya yang akan diekstrak
+        self.posisi_cap = 0    # Jumlah frame yang sudah dikonsumsi dari VideoCapture
+
+    def frame_berikutnya(self):
+        """Bitstream frame berikutnya, atau None jika video habis."""
+        bits = self._bit_raster_berikutnya()
+        if not bits or not self.kunci_permutasi: return bits
+        return urutkan_bit_permutasi(bits, (self.processed_w // 8) * (self.processed_h // 8), min(self.num_ac_coeffs, 63),
+                                     self.kunci_permutasi)
+
+    def _bit_raster_berikutnya(self):
+        indeks = self.indeks_frame
+        if self.entri_cache is not None:
+            bits = self.entri_cache.ambil(indeks)
+            if bits is not None:
+                self.indeks_frame += 1
+                self.metrik.tambah('frame_cache_hit')
+                return bits
+        with self.metrik.tahap('decode'):
+            while self.posisi_cap < indeks:
+                if not self.cap.grab(): return None
+                self.posisi_cap += 1
+            ret, frame_bgr = self.cap.read()
+        if not ret: return None
+        self.posisi_cap += 1; self.indeks_frame += 1
+        bits = proses_frame_qim_dct(
+            frame_bgr[0:self.processed_h, 0:self.processed_w], 'extract', self.delta_kuantisasi,
+            enable_debug_prints_extract=False, # Matikan debug detail koefisien
+            num_ac_coeffs_to_use=self.num_ac_coeffs,
+            metrik=self.metrik
+        )
+        if bits and self.entri_cache is not None: self.entri_cache.simpan(indeks, bits)
+        return bits
+
+    def tutup(self):
+        if self.entri_cache is not None: self.entri_cache.tutup(); self.entri_cache = None
+        self.cap.release()
+
+# --- Sumber Bit Paralel (Ring Frame Shared Memory) ---
+def _worker_ekstrak_slot(frame_gray, _, delta_kuantisasi, num_ac_coeffs, kunci_permutasi=None):
+    """Worker: bit QIM satu frame di slot ring, dikemas (np.packbits) agar antrean hasil tetap kecil."""
+    bits = proses_frame_qim_dct(frame_gray, 'extract', delta_kuantisasi, num_ac_coeffs_to_use=num_ac_coeffs,
+                                kunci_permutasi=kunci_permutasi)
+    return np.packbits(np.frombuffer(bits.encode('ascii'), dtype=np.uint8) - 48).tobytes(), len(bits)
+
+class _SumberBitParalel:
+    """
+    Seperti _SumberBitStego, tetapi DCT/QIM dijalankan di beberapa worker. Proses ini men-decode frame
+    langsung ke slot ring kosong (hingga semua slot terisi) lalu mengambil bit sesuai urutan frame.
+    """
+    def __init__(self, cap, processed_w, processed_h, delta_kuantisasi, num_ac_coeffs, metrik, jumlah_worker,
+                 kunci_permutasi=None):
+        self.cap = cap
+        self.processed_w, self.processed_h = processed_w, processed_h
+        self.metrik = metrik
+        self.video_habis = False
+        self.pool = PoolRingFrame((processed_h, processed_w), jumlah_worker, _worker_ekstrak_slot,
+                                  (delta_kuantisasi, num_ac_coeffs, kunci_permutasi))
+        print(f"  Mode paralel: {jumlah_worker} worker, {self.pool.ring.jumlah_slot} slot frame di shared memory.")
+
+    def _isi_slot(self):
+        while not self.video_habis and self.pool.ada_slot_kosong():
+            with self.metrik.tahap('decode'):
+                ret, frame_bgr = self.cap.read()
+            if not ret: self.video_habis = True; return
+            indeks_slot, slot = self.pool.ambil_slot_kosong()
+            with self.metrik.tahap('cvtColor'):
+                cropped = frame_bgr[0:self.processed_h, 0:self.processed_w]
+                if cropped.ndim == 3: cv2.cvtColor(cropped, cv2.COLOR_BGR2GRAY, dst=slot)
+                else: slot[...] = cropped
+            self.pool.kirim(indeks_slot)
+
+    def frame_berikutnya(self):
+        if self.pool is None: return None
+        self._isi_slot()
+        if self.pool.jumlah_diproses() == 0: return None
+        try:
+            with self.metrik.tahap('tunggu_worker'):
+                indeks_slot, _, (bit_terkemas, jumlah_bit) = self.pool.ambil_hasil()
+        except RuntimeError as e:
+            print(f"  Error: {e}"); return None
+        self.pool.kembalikan_slot(indeks_slot)
+        self.metrik.tambah('bit_extract', jumlah_bit)
+        bits = np.unpackbits(np.frombuffer(bit_terkemas, dtype=np.uint8))[:jumlah_bit]
+        return (bits + 48).tobytes().decode('ascii')
+
+    def tutup(self):
+        if self.pool is not None: self.pool.tutup(); self.pool = None
+        self.cap.release()
 
 # --- Fungsi Ekstraksi Utama (Grayscale, SHA3, ECC-AES) ---
 def ekstraksi_gambar_video_final(path_stego_video, path_gambar_output, 
                                  delta_kuantisasi, num_ac_coeffs, 
                                  kunci_privat_ecc_penerima, 
-                                 bits_untuk_dimensi=16):
+                                 bits_untuk_dimensi=16,
+                                 metrik=None, path_trace=None, cache_bit=None, jumlah_worker=1, kunci_permutasi=None,
+                                 progres=None, batal=None):
+    # metrik: MetrikPipeline opsional, diisi timer per tahap dan counter selama job berjalan.
+    # path_trace: jika diisi, metrik job diekspor sebagai Chrome trace (JSON) ke path ini.
+    # cache_bit: CacheBitEkstraksi opsional; ekstraksi ulang (misal dengan kunci lain) tidak men-decode video lagi.
+    # jumlah_worker: > 1 membagi DCT/QIM frame ke beberapa proses lewat ring frame di shared memory.
+    # kunci_permutasi: kunci yang sama dengan saat embed jika urutan blok/koefisien diacak.
+    # progres/batal: callback event progres terstruktur dan pembatalan (lihat progress.py); jika progres
+    # diberikan, log per frame tidak dicetak.
+    if metrik is None: metrik = MetrikPipeline(nama_job="ekstraksi") if path_trace else METRIK_NONAKTIF
+    pelapor = PelaporProgres("ekstraksi", progres, batal)
+    try:
+        berhasil = _ekstraksi_gambar_video_inti(path_stego_video, path_gambar_output, delta_kuantisasi, num_ac_coeffs,
+                                                kunci_privat_ecc_penerima, bits_untuk_dimensi, metrik, cache_bit, jumlah_worker,
+                                                kunci_permutasi, pelapor)
+    except JobDibatalkan as e:
+        print(f"  Error: {e}"); berhasil = False
+    finally:
+        if cache_bit is not None: cache_bit.simpan_index()  # Bit frame yang sudah terbaca tetap tercatat walau ekstraksi gagal
+        if path_trace:
+            metrik.ekspor_chrome_trace(path_trace)
+            print(f"  Trace metrik ekstraksi disimpan ke '{path_trace}'.")
+    pelapor.selesai(berhasil)
+    return berhasil
+
+def _ekstraksi_gambar_video_inti(path_stego_video, path_gambar_output, delta_kuantisasi, num_ac_coeffs,
+                                 kunci_privat_ecc_penerima, bits_untuk_dimensi, metrik, cache_bit=None, jumlah_worker=1,
+                                 kunci_permutasi=None, pelapor=None):
     print(f"\n=== MEMULAI PROSES EKSTRAKSI GAMBAR DARI VIDEO ===")
     print(f"  Stego Video: '{path_stego_video}'")
     print(f"  Parameter: DELTA={delta_kuantisasi}, Koefisien AC per Blok={num_ac_coeffs}")
+    if kunci_permutasi: print("  Urutan blok/koefisien: permutasi berkunci")
 
-    cap = cv2.VideoCapture(path_stego_video)
+    cap = buka_sumber_frame(path_stego_video)
     if not cap.isOpened(): print(f"  Error: Tidak bisa membuka stego-video '{path_stego_video}'."); return False
     
     frame_width_orig = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)); frame_height_orig = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
     processed_w, processed_h = (frame_width_orig // 8) * 8, (frame_height_orig // 8) * 8
     if processed_w == 0 or processed_h == 0: print("  Error: Dimensi video terlalu kecil."); cap.release(); return False
 
+    if jumlah_worker > 1 and delta_kuantisasi > 0:
+        if cache_bit is not None: print("  Info: Cache bit ekstraksi tidak dipakai pada mode paralel.")
+        sumber_bit = _SumberBitParalel(cap, processed_w, processed_h, delta_kuantisasi, num_ac_coeffs, metrik, jumlah_worker,
+                                       kunci_permutasi)
+        return _ekstraksi_dari_sumber_bit(sumber_bit, path_gambar_output, kunci_privat_ecc_penerima, bits_untuk_dimensi, metrik,
+                                          pelapor)
+
+    entri_cache = None
+    if cache_bit is not None:
+        entri_cache = cache_bit.buka(path_stego_video, delta_kuantisasi, num_ac_coeffs, processed_w, processed_h)
+        print(f"  Cache bit ekstraksi: '{entri_cache.direktori}'")
+    sumber_bit = _SumberBitStego(cap, processed_w, processed_h, delta_kuantisasi, num_ac_coeffs, metrik, entri_cache,
+                                 kunci_permutasi)
+    return _ekstraksi_dari_sumber_bit(sumber_bit, path_gambar_output, kunci_privat_ecc_penerima, bits_untuk_dimensi, metrik,
+                                      pelapor)
+
+def _ekstraksi_dari_sumber_bit(sumber_bit, path_gambar_output, kunci_privat_ecc_penerima, bits_untuk_dimensi, metrik,
+                               pelapor=None):
+    """
+    Parsing header, dekripsi, dan rekonstruksi gambar dari sumber bit per frame apa pun
+    (domain piksel atau domain MJPEG) yang menyediakan frame_berikutnya() dan tutup().
+    Dengan pelapor (PelaporProgres), setiap frame dilaporkan dan pembatalan diperiksa (JobDibatalkan).
+    Sumber bit selalu ditutup (VideoCapture, file MJPEG, cache bit, worker paralel), termasuk pada jalur error.
+    """
+    if pelapor is not None: sumber_bit = SumberBitBerprogres(sumber_bit, pelapor)
+    try:
+        return _urai_payload_dari_sumber_bit(sumber_bit, path_gambar_output, kunci_privat_ecc_penerima, bits_untuk_dimensi,
+                                             metrik, pelapor)
+    finally:
+        sumber_bit.tutup()
+
+def _urai_payload_dari_sumber_bit(sumber_bit, path_gambar_output, kunci_privat_ecc_penerima, bits_untuk_dimensi, metrik, pelapor):
+    cetak_per_frame = pelapor is None or not pelapor.aktif
     all_extracted_bits_from_video = ""
-    # Perkirakan jumlah bit maksimum yang bisa diekstrak dari satu frame
-    max_bits_per_frame = (processed_w // 8) * (processed_h // 8) * num_ac_coeffs
     
     print("\n  [Tahap Ekstraksi 1: Membaca Bit Awal dari Video]")
     # Baca frame pertama, seharusnya cukup untuk semua metadata dan info kunci
@@ -54,27 +227,21 @@ def ekstraksi_gambar_video_final(path_stego_video, path_gambar_output,
     
     while True: # Loop untuk membaca frame jika payload tersebar (untuk masa depan)
         frame_num_extract += 1
-        ret, frame_bgr = cap.read() 
-        if not ret: 
+        if cetak_per_frame: print(f"    Mengekstrak bit dari frame video ke-{frame_num_extract}...")
+        bits_from_current_frame = sumber_bit.frame_berikutnya()
+        if bits_from_current_frame is None: 
             print(f"  Error: Video habis sebelum cukup bit diekstrak (setelah {frame_num_extract-1} frame).")
-            cap.release(); return False
-        
-        cropped_stego_frame_bgr = frame_bgr[0:processed_h, 0:processed_w]
-        print(f"    Mengekstrak bit dari frame video ke-{frame_num_extract}...")
-        bits_from_current_frame = proses_frame_qim_dct(
-            cropped_stego_frame_bgr, 'extract', delta_kuantisasi, 
-            enable_debug_prints_extract=False, # Matikan debug detail koefisien
-            num_ac_coeffs_to_use=num_ac_coeffs
-        )
+            return False
+        metrik.tambah('frame_extract')
         if not bits_from_current_frame: 
             print(f"  Error: Tidak ada bit diekstrak dari frame ke-{frame_num_extract}.")
             # Ini bisa jadi masalah jika kita belum mendapatkan semua payload
             if len(all_extracted_bits_from_video) < 976: # Perkiraan minimal header
-                 cap.release(); return False
+                 return False
             break # Keluar jika tidak ada bit lagi dan payload mungkin sudah cukup
 
         all_extracted_bits_from_video += bits_from_current_frame
-        print(f"      Bit dari frame ini: {len(bits_from_current_frame)}. Total bit terkumpul: {len(all_extracted_bits_from_video)}")
+        if cetak_per_frame: print(f"      Bit dari frame ini: {len(bits_from_current_frame)}. Total bit terkumpul: {len(all_extracted_bits_from_video)}")
         
         # Cek apakah sudah cukup untuk semua header + panjang ciphertext
         # Ini akan jadi kondisi keluar jika payload muat di beberapa frame awal
@@ -85,116 +252,154 @@ def ekstraksi_gambar_video_final(path_stego_video, path_gambar_output,
             # Logika ini perlu disempurnakan untuk payload besar yang tersebar.
             break 
 
+    # Payload bersinkron: setiap frame membawa header sendiri, sehingga potongan disusun berdasarkan offset
+    # (frame hilang, ganda, atau rusak tidak menggeser bit frame lain).
+    info_sinkron = frame_sync.baca_bingkai_frame(bits_from_current_frame)
+    if info_sinkron is not None:
+        penyusun = frame_sync.PenyusunPayloadSinkron()
+        penyusun.tambah(info_sinkron)
+        print(f"    Header sinkronisasi frame terdeteksi: payload {info_sinkron['panjang_total']} bits.")
+        while not penyusun.lengkap():
+            bits_from_current_frame = sumber_bit.frame_berikutnya()
+            if bits_from_current_frame is None: break
+            frame_num_extract += 1
+            metrik.tambah('frame_extract')
+            if not penyusun.tambah(frame_sync.baca_bingkai_frame(bits_from_current_frame)): metrik.tambah('frame_tanpa_sinkron')
+        all_extracted_bits_from_video = _payload_dari_penyusun(penyusun, frame_num_extract)
+
+    # Payload dengan FEC diawali header FEC (diulang, voting mayoritas); payload lama langsung diparse.
+    info_fec = fec.baca_header_fec(all_extracted_bits_from_video)
+    if info_fec is not None:
+        total_fec_bits = fec.TOTAL_HEADER_FEC_BITS + info_fec["panjang_terkirim"]
+        if pelapor is not None and info_sinkron is None: pelapor.bit_total = total_fec_bits
+        print(f"    Header FEC terdeteksi: skema '{info_fec['skema']}' (parameter {info_fec['parameter']}), "
+              f"{info_fec['panjang_terkirim']} bits terkode.")
+        while len(all_extracted_bits_from_video) < total_fec_bits:
+            frame_num_extract += 1
+            bits_from_current_frame = sumber_bit.frame_berikutnya()
+            if bits_from_current_frame is None: print_error_and_exit_extract("Video habis sebelum semua bit FEC diekstrak."); return False
+            metrik.tambah('frame_extract')
+            all_extracted_bits_from_video += bits_from_current_frame
+        with metrik.tahap('fec'):
+            payload_terkoreksi = fec.dekode_fec(all_extracted_bits_from_video[fec.TOTAL_HEADER_FEC_BITS:total_fec_bits], info_fec)
+        if payload_terkoreksi is None: print_error_and_exit_extract("FEC gagal mengoreksi error pada payload."); return False
+        print(f"    Payload FEC didekode dari {frame_num_extract} frame: {len(payload_terkoreksi)} bits.")
+        all_extracted_bits_from_video = payload_terkoreksi
 
     current_read_idx = 0
     print("\n  [Tahap Ekstraksi 2: Parsing Metadata dan Kunci]")
     # 1. Parse Metadata Gambar Asli
     panjang_metadata_img = 2 * bits_untuk_dimensi 
-    if len(all_extracted_bits_from_video) < current_read_idx + panjang_metadata_img: print_error_and_exit_extract("Bit tidak cukup untuk metadata gambar.", cap); return False
+    if len(all_extracted_bits_from_video) < current_read_idx + panjang_metadata_img: print_error_and_exit_extract("Bit tidak cukup untuk metadata gambar."); return False
     metadata_img_bits = all_extracted_bits_from_video[current_read_idx : current_read_idx + panjang_metadata_img]; current_read_idx += panjang_metadata_img
     try:
         secret_lebar, secret_tinggi = steg_helpers.parse_metadata_bitstream(metadata_img_bits, bits_untuk_dimensi)
         print(f"    Metadata gambar diurai: Lebar={secret_lebar}, Tinggi={secret_tinggi}")
-    except ValueError as e: print_error_and_exit_extract(f"Error parse metadata gambar: {e}", cap); return False
-    if secret_lebar == 0 or secret_tinggi == 0: print_error_and_exit_extract("Error: Metadata gambar 0x0.", cap); return False
+    except ValueError as e: print_error_and_exit_extract(f"Error parse metadata gambar: {e}"); return False
+    if secret_lebar == 0 or secret_tinggi == 0: print_error_and_exit_extract("Error: Metadata gambar 0x0."); return False
 
     # 2. Parse Kunci Publik ECC Pengirim Ephemeral
     len_pengirim_pub_ecc_bits_len = 8 
-    if len(all_extracted_bits_from_video) < current_read_idx + len_pengirim_pub_ecc_bits_len: print_error_and_exit_extract("Bit tidak cukup untuk panjang kunci publik ECC pengirim.", cap); return False
+    if len(all_extracted_bits_from_video) < current_read_idx + len_pengirim_pub_ecc_bits_len: print_error_and_exit_extract("Bit tidak cukup untuk panjang kunci publik ECC pengirim."); return False
     len_pengirim_pub_ecc_bytes = bitstream_ke_int(all_extracted_bits_from_video[current_read_idx : current_read_idx + len_pengirim_pub_ecc_bits_len]); current_read_idx += len_pengirim_pub_ecc_bits_len
     pengirim_pub_ecc_bits_actual_len = len_pengirim_pub_ecc_bytes * 8
-    if len(all_extracted_bits_from_video) < current_read_idx + pengirim_pub_ecc_bits_actual_len: print_error_and_exit_extract("Bit tidak cukup untuk kunci publik ECC pengirim.", cap); return False
+    if len(all_extracted_bits_from_video) < current_read_idx + pengirim_pub_ecc_bits_actual_len: print_error_and_exit_extract("Bit tidak cukup untuk kunci publik ECC pengirim."); return False
     pengirim_pub_ecc_bits = all_extracted_bits_from_video[current_read_idx : current_read_idx + pengirim_pub_ecc_bits_actual_len]; current_read_idx += pengirim_pub_ecc_bits_actual_len
     try: pengirim_pub_ecc_bytes_extracted = bitstream_ke_bytes(pengirim_pub_ecc_bits)
-    except ValueError as e: print_error_and_exit_extract(f"Error konversi kunci publik ECC bits ke bytes: {e}", cap); return False
+    except ValueError as e: print_error_and_exit_extract(f"Error konversi kunci publik ECC bits ke bytes: {e}"); return False
     print(f"    Kunci Publik ECC Pengirim ({len(pengirim_pub_ecc_bytes_extracted)} bytes) diekstrak.")
     
     # 3. Parse Salt HKDF
     len_salt_hkdf_bits_len = 8
-    if len(all_extracted_bits_from_video) < current_read_idx + len_salt_hkdf_bits_len: print_error_and_exit_extract("Bit tidak cukup untuk panjang salt HKDF.", cap); return False
+    if len(all_extracted_bits_from_video) < current_read_idx + len_salt_hkdf_bits_len: print_error_and_exit_extract("Bit tidak cukup untuk panjang salt HKDF."); return False
     len_salt_hkdf_bytes = bitstream_ke_int(all_extracted_bits_from_video[current_read_idx : current_read_idx + len_salt_hkdf_bits_len]); current_read_idx += len_salt_hkdf_bits_len
     salt_hkdf_bits_actual_len = len_salt_hkdf_bytes * 8
-    if len(all_extracted_bits_from_video) < current_read_idx + salt_hkdf_bits_actual_len: print_error_and_exit_extract("Bit tidak cukup untuk salt HKDF.", cap); return False
+    if len(all_extracted_bits_from_video) < current_read_idx + salt_hkdf_bits_actual_len: print_error_and_exit_extract("Bit tidak cukup untuk salt HKDF."); return False
     salt_hkdf_bits = all_extracted_bits_from_video[current_read_idx : current_read_idx + salt_hkdf_bits_actual_len]; current_read_idx += salt_hkdf_bits_actual_len
     try: salt_hkdf_bytes_extracted = bitstream_ke_bytes(salt_hkdf_bits)
-    except ValueError as e: print_error_and_exit_extract(f"Error konversi salt HKDF bits ke bytes: {e}", cap); return False
+    except ValueError as e: print_error_and_exit_extract(f"Error konversi salt HKDF bits ke bytes: {e}"); return False
     print(f"    Salt HKDF ({len(salt_hkdf_bytes_extracted)} bytes) diekstrak.")
 
     # 4. Hitung Shared Secret dan Derivasi Kunci AES
     try:
-        pengirim_pub_ecc_obj_remote = deserialisasi_kunci_publik_ecc_compressed(pengirim_pub_ecc_bytes_extracted)
-        shared_secret_penerima_bytes = buat_shared_secret_ecdh(kunci_privat_ecc_penerima, pengirim_pub_ecc_obj_remote)
-        kunci_aes_derived_penerima = derive_kunci_aes_dari_shared_secret(shared_secret_penerima_bytes, salt_hkdf_bytes_extracted, 32)
+        with metrik.tahap('kripto'):
+            pengirim_pub_ecc_obj_remote = deserialisasi_kunci_publik_ecc_compressed(pengirim_pub_ecc_bytes_extracted)
+            shared_secret_penerima_bytes = buat_shared_secret_ecdh(kunci_privat_ecc_penerima, pengirim_pub_ecc_obj_remote)
+            kunci_aes_derived_penerima = derive_kunci_aes_dari_shared_secret(shared_secret_penerima_bytes, salt_hkdf_bytes_extracted, 32)
         print("    Shared secret dan kunci AES berhasil diderivasi oleh penerima.")
     except Exception as e:
-        print_error_and_exit_extract(f"Error saat ECDH atau derivasi kunci AES penerima: {e}", cap); return False
+        print_error_and_exit_extract(f"Error saat ECDH atau derivasi kunci AES penerima: {e}"); return False
 
     # 5. Parse Hash SHA3-256
     len_hash_gambar_bits_len = 8 
-    if len(all_extracted_bits_from_video) < current_read_idx + len_hash_gambar_bits_len: print_error_and_exit_extract("Bit tidak cukup untuk panjang hash gambar.", cap); return False
+    if len(all_extracted_bits_from_video) < current_read_idx + len_hash_gambar_bits_len: print_error_and_exit_extract("Bit tidak cukup untuk panjang hash gambar."); return False
     len_hash_gambar_bytes_extracted = bitstream_ke_int(all_extracted_bits_from_video[current_read_idx : current_read_idx + len_hash_gambar_bits_len]); current_read_idx += len_hash_gambar_bits_len
     hash_gambar_bits_actual_len = len_hash_gambar_bytes_extracted * 8
-    if len(all_extracted_bits_from_video) < current_read_idx + hash_gambar_bits_actual_len: print_error_and_exit_extract("Bit tidak cukup untuk hash gambar.", cap); return False
+    if len(all_extracted_bits_from_video) < current_read_idx + hash_gambar_bits_actual_len: print_error_and_exit_extract("Bit tidak cukup untuk hash gambar."); return False
     hash_gambar_bits_stego = all_extracted_bits_from_video[current_read_idx : current_read_idx + hash_gambar_bits_actual_len]; current_read_idx += hash_gambar_bits_actual_len
     try: hash_gambar_bytes_stego = bitstream_ke_bytes(hash_gambar_bits_stego)
-    except ValueError as e: print_error_and_exit_extract(f"Error konversi hash gambar bits ke bytes: {e}", cap); return False
+    except ValueError as e: print_error_and_exit_extract(f"Error konversi hash gambar bits ke bytes: {e}"); return False
     print(f"    Hash SHA3-256 gambar dari stego ({len(hash_gambar_bytes_stego)} bytes) diekstrak.")
 
     # 6. Parse Info AES (Nonce, Tag, Panjang Ciphertext)
     len_nonce_bits_len = 8
-    if len(all_extracted_bits_from_video) < current_read_idx + len_nonce_bits_len: print_error_and_exit_extract("Bit tidak cukup untuk panjang nonce.", cap); return False
+    if len(all_extracted_bits_from_video) < current_read_idx + len_nonce_bits_len: print_error_and_exit_extract("Bit tidak cukup untuk panjang nonce."); return False
     len_nonce_bytes = bitstream_ke_int(all_extracted_bits_from_video[current_read_idx : current_read_idx + len_nonce_bits_len]); current_read_idx += len_nonce_bits_len
     nonce_bits_len = len_nonce_bytes * 8
-    if len(all_extracted_bits_from_video) < current_read_idx + nonce_bits_len: print_error_and_exit_extract("Bit tidak cukup untuk nonce.", cap); return False
+    if len(all_extracted_bits_from_video) < current_read_idx + nonce_bits_len: print_error_and_exit_extract("Bit tidak cukup untuk nonce."); return False
     nonce_bits = all_extracted_bits_from_video[current_read_idx : current_read_idx + nonce_bits_len]; current_read_idx += nonce_bits_len
     try: nonce_bytes_extracted = bitstream_ke_bytes(nonce_bits)
-    except ValueError as e: print_error_and_exit_extract(f"Error konversi nonce: {e}", cap); return False
+    except ValueError as e: print_error_and_exit_extract(f"Error konversi nonce: {e}"); return False
     
     len_tag_bits_len = 8
-    if len(all_extracted_bits_from_video) < current_read_idx + len_tag_bits_len: print_error_and_exit_extract("Bit tidak cukup untuk panjang tag.", cap); return False
+    if len(all_extracted_bits_from_video) < current_read_idx + len_tag_bits_len: print_error_and_exit_extract("Bit tidak cukup untuk panjang tag."); return False
     len_tag_bytes = bitstream_ke_int(all_extracted_bits_from_video[current_read_idx : current_read_idx + len_tag_bits_len]); current_read_idx += len_tag_bits_len
     tag_bits_len = len_tag_bytes * 8
-    if len(all_extracted_bits_from_video) < current_read_idx + tag_bits_len: print_error_and_exit_extract("Bit tidak cukup untuk tag.", cap); return False
+    if len(all_extracted_bits_from_video) < current_read_idx + tag_bits_len: print_error_and_exit_extract("Bit tidak cukup untuk tag."); return False
     tag_bits = all_extracted_bits_from_video[current_read_idx : current_read_idx + tag_bits_len]; current_read_idx += tag_bits_len
     try: tag_bytes_extracted = bitstream_ke_bytes(tag_bits)
-    except ValueError as e: print_error_and_exit_extract(f"Error konversi tag: {e}", cap); return False
+    except ValueError as e: print_error_and_exit_extract(f"Error konversi tag: {e}"); return False
     
     len_ciphertext_bits_len = 32
-    if len(all_extracted_bits_from_video) < current_read_idx + len_ciphertext_bits_len: print_error_and_exit_extract("Bit tidak cukup untuk panjang ciphertext.", cap); return False
+    if len(all_extracted_bits_from_video) < current_read_idx + len_ciphertext_bits_len: print_error_and_exit_extract("Bit tidak cukup untuk panjang ciphertext."); return False
     len_ciphertext_bytes = bitstream_ke_int(all_extracted_bits_from_video[current_read_idx : current_read_idx + len_ciphertext_bits_len]); current_read_idx += len_ciphertext_bits_len
     print(f"    Panjang Ciphertext diharapkan: {len_ciphertext_bytes} bytes.")
 
     # 7. Ekstrak Ciphertext Gambar (lanjutkan baca frame jika perlu)
     ciphertext_bits_len_needed = len_ciphertext_bytes * 8
     ciphertext_bits_collected = all_extracted_bits_from_video[current_read_idx:] 
+    if pelapor is not None and info_fec is None and info_sinkron is None:
+        pelapor.bit_total = current_read_idx + ciphertext_bits_len_needed
     
     # Jika payload tersebar di banyak frame, loop ini akan berjalan
     # (Untuk gambar kecil kita, ini mungkin tidak berjalan)
     if len(ciphertext_bits_collected) < ciphertext_bits_len_needed:
         print(f"    Ciphertext belum lengkap ({len(ciphertext_bits_collected)}/{ciphertext_bits_len_needed} bits). Melanjutkan ke frame berikutnya...")
         while len(ciphertext_bits_collected) < ciphertext_bits_len_needed:
-            frame_num_extract += 1; ret, frame = cap.read()
-            if not ret: print(f"    Warning: Video selesai sebelum semua ciphertext diekstrak."); break
-            cropped_stego_frame = frame[0:processed_h, 0:processed_w]
-            print(f"    Mengekstrak sisa ciphertext dari frame {frame_num_extract}...")
-            bits_from_current_frame = proses_frame_qim_dct(cropped_stego_frame, 'extract', delta_kuantisasi, num_ac_coeffs_to_use=num_ac_coeffs)
+            frame_num_extract += 1
+            bits_from_current_frame = sumber_bit.frame_berikutnya()
+            if bits_from_current_frame is None: print(f"    Warning: Video selesai sebelum semua ciphertext diekstrak."); break
+            if cetak_per_frame: print(f"    Mengekstrak sisa ciphertext dari frame {frame_num_extract}...")
+            metrik.tambah('frame_extract')
             ciphertext_bits_collected += bits_from_current_frame
-            print(f"      Bit dari frame ini: {len(bits_from_current_frame)}. Total bit ciphertext terkumpul: {len(ciphertext_bits_collected)}")
+            if cetak_per_frame: print(f"      Bit dari frame ini: {len(bits_from_current_frame)}. Total bit ciphertext terkumpul: {len(ciphertext_bits_collected)}")
     
-    if len(ciphertext_bits_collected) < ciphertext_bits_len_needed: print("  Ekstraksi GAGAL: Ciphertext tidak lengkap."); cap.release(); return False
+    if len(ciphertext_bits_collected) < ciphertext_bits_len_needed: print("  Ekstraksi GAGAL: Ciphertext tidak lengkap."); return False
     
     final_ciphertext_bits = ciphertext_bits_collected[:ciphertext_bits_len_needed]
     try: final_ciphertext_bytes = bitstream_ke_bytes(final_ciphertext_bits)
-    except ValueError as e: print_error_and_exit_extract(f"Error konversi ciphertext: {e}", cap); return False
+    except ValueError as e: print_error_and_exit_extract(f"Error konversi ciphertext: {e}"); return False
 
     print("\n  [Tahap Ekstraksi 3: Dekripsi dan Verifikasi]")
     print("    Mendekripsi gambar dengan kunci AES yang diderivasi...")
-    plaintext_gambar_bytes = dekripsi_aes_gcm(final_ciphertext_bytes, kunci_aes_derived_penerima, nonce_bytes_extracted, tag_bytes_extracted)
-    if plaintext_gambar_bytes is None: print("    Dekripsi GAGAL."); cap.release(); return False
+    with metrik.tahap('kripto'):
+        plaintext_gambar_bytes = dekripsi_aes_gcm(final_ciphertext_bytes, kunci_aes_derived_penerima, nonce_bytes_extracted, tag_bytes_extracted)
+    if plaintext_gambar_bytes is None: print("    Dekripsi GAGAL."); return False
     print("    Dekripsi berhasil.")
 
     print("    Memverifikasi hash SHA3-256 dari gambar yang didekripsi...")
-    hash_gambar_dekripsi_bytes = hitung_sha3_256(plaintext_gambar_bytes)
+    with metrik.tahap('kripto'):
+        hash_gambar_dekripsi_bytes = hitung_sha3_256(plaintext_gambar_bytes)
     if hash_gambar_dekripsi_bytes == hash_gambar_bytes_stego:
         print("    Verifikasi Hash SHA3-256 BERHASIL: Gambar tidak korup.")
     else:
@@ -203,17 +408,54 @@ def ekstraksi_gambar_video_final(path_stego_video, path_gambar_output,
 
     print("\n  [Tahap Ekstraksi 4: Rekonstruksi Gambar]")
     try: bitstream_gambar_dekripsi = bytes_ke_bitstream(plaintext_gambar_bytes)
-    except Exception as e: print_error_and_exit_extract(f"Error konversi plaintext: {e}", cap); return False
+    except Exception as e: print_error_and_exit_extract(f"Error konversi plaintext: {e}"); return False
     
-    gambar_hasil_ekstraksi = steg_helpers.bitstream_ke_gambar(bitstream_gambar_dekripsi, secret_lebar, secret_tinggi)
+    with metrik.tahap('rekonstruksi'):
+        gambar_hasil_ekstraksi = steg_helpers.bitstream_ke_gambar(bitstream_gambar_dekripsi, secret_lebar, secret_tinggi)
     if gambar_hasil_ekstraksi:
         try: 
             gambar_hasil_ekstraksi.save(path_gambar_output)
             print(f"    Gambar (SHA3-ECC-AES) berhasil diekstrak dan disimpan sebagai '{path_gambar_output}'.")
-        except Exception as e: print_error_and_exit_extract(f"Error simpan gambar: {e}", cap); return False
-    else: print_error_and_exit_extract("Gagal merekonstruksi gambar.", cap); return False
+        except Exception as e: print_error_and_exit_extract(f"Error simpan gambar: {e}"); return False
+    else: print_error_and_exit_extract("Gagal merekonstruksi gambar."); return False
     
-    cap.release(); print("--- Proses Ekstraksi (SHA3-ECC-AES) Selesai ---"); return True
+    print("--- Proses Ekstraksi (SHA3-ECC-AES) Selesai ---"); return True
+
+def _payload_dari_penyusun(penyusun, jumlah_frame):
+    """Payload tersusun dari PenyusunPayloadSinkron, dengan laporan bagian yang hilang/rusak."""
+    rentang_hilang = penyusun.rentang_hilang()
+    if rentang_hilang:
+        print(f"    Warning: {sum(akhir - awal for awal, akhir in rentang_hilang)} bits payload tidak ditemukan di frame mana pun "
+              f"(rentang {rentang_hilang[:3]}{'...' if len(rentang_hilang) > 3 else ''}); diisi nol.")
+    if penyusun.frame_rusak:
+        print(f"    Warning: {penyusun.frame_rusak} frame dengan CRC data tidak cocok dipakai apa adanya.")
+    print(f"    Payload bersinkron disusun dari {jumlah_frame} frame: {penyusun.bit_terkumpul()}/{penyusun.panjang_total} bits.")
+    return penyusun.bitstream()
+
+# --- Ekstraksi Akses Acak (Payload Bersinkron) ---
+def ekstraksi_sinkron(path_stego_video, path_gambar_output, delta_kuantisasi, num_ac_coeffs, kunci_privat_ecc_penerima,
+                      bits_untuk_dimensi=16, jumlah_worker=1, frame_mulai=0, frame_akhir=None, metrik=None,
+                      kunci_permutasi=None):
+    """
+    Ekstraksi payload yang disisipkan dengan sinkron_frame=True. Setiap frame didekode sendiri (seek langsung
+    ke frame_mulai, rentang frame dibagi ke beberapa proses), lalu potongan disusun berdasarkan offset.
+    """
+    metrik = metrik or METRIK_NONAKTIF
+    print(f"\n=== MEMULAI PROSES EKSTRAKSI GAMBAR DARI VIDEO (AKSES ACAK) ===")
+    print(f"  Stego Video: '{path_stego_video}' (frame {frame_mulai}..{'akhir' if frame_akhir is None else frame_akhir - 1})")
+    print(f"  Parameter: DELTA={delta_kuantisasi}, Koefisien AC per Blok={num_ac_coeffs}, Worker={jumlah_worker}")
+    try:
+        with metrik.tahap('ekstrak_frame'):
+            penyusun = frame_sync.kumpulkan_payload_sinkron(path_stego_video, delta_kuantisasi, num_ac_coeffs,
+                                                            jumlah_worker, frame_mulai, frame_akhir,
+                                                            kunci_permutasi=kunci_permutasi)
+    except (IOError, OSError) as e:
+        print(f"  Error: {e}"); return False
+    if penyusun.panjang_total is None: print("  Error: Tidak ada frame dengan header sinkronisasi di rentang ini."); return False
+    jumlah_frame = len(penyusun.potongan)
+    payload = _payload_dari_penyusun(penyusun, jumlah_frame)
+    return _ekstraksi_dari_sumber_bit(frame_sync.SumberBitPayload(payload), path_gambar_output, kunci_privat_ecc_penerima,
+                                      bits_untuk_dimensi, metrik)
 
 # --- Blok Utama untuk Menjalankan Ekstraksi ---
 if __name__ == "__main__":
@@ -250,7 +492,8 @@ if __name__ == "__main__":
             path_gambar_hasil_ekstraksi_final, 
             DELTA_UNTUK_TES,
             JUMLAH_AC_KOEFISIEN_DIPAKAI,
-            bob_private_ecc 
+            bob_private_ecc,
+            cache_bit=CacheBitEkstraksi()  # Ekstraksi ulang (misal kunci lain) tanpa decode + QIM lagi
         )
         
         print("\n--- HASIL EKSTRAKSI ---")
@@ -0,0 +1,161 @@
+import numpy as np
+
+try:
+    import reedsolo  # Opsional, hanya dibutuhkan untuk skema Reed-Solomon
+except ImportError:
+    reedsolo = None
+
+# --- Konfigurasi FEC ---
+# Header FEC (72 bit) diulang beberapa kali dan dibaca dengan voting mayoritas per bit:
+# magic (8) + id skema (8) + parameter skema (8) + kedalaman interleaver (16) + panjang data asli dalam bit (32).
+MAGIC_FEC = 0xA5
+SALINAN_HEADER_FEC = 5
+PANJANG_HEADER_FEC_BITS = 72
+TOTAL_HEADER_FEC_BITS = PANJANG_HEADER_FEC_BITS * SALINAN_HEADER_FEC
+
+SKEMA_FEC = {"repetisi": 1, "hamming74": 2, "reed_solomon": 3}
+PARAMETER_DEFAULT = {"repetisi": 3, "hamming74": 0, "reed_solomon": 32}  # Faktor repetisi / simbol paritas RS
+KEDALAMAN_INTERLEAVER_DEFAULT = 64
+
+# Hamming(7,4) sistematis: codeword = [d1 d2 d3 d4 p1 p2 p3]
+_G_HAMMING = np.array([[1, 0, 0, 0, 1, 1, 0],
+                       [0, 1, 0, 0, 1, 0, 1],
+                       [0, 0, 1, 0, 0, 1, 1],
+                       [0, 0, 0, 1, 1, 1, 1]], dtype=np.uint8)
+_H_HAMMING = np.array([[1, 1, 0, 1, 1, 0, 0],
+                       [1, 0, 1, 1, 0, 1, 0],
+                       [0, 1, 1, 1, 0, 0, 1]], dtype=np.uint8)
+# Sindrom (sebagai integer 3 bit) -> posisi bit yang dibalik (-1 = tidak ada error)
+_POSISI_SINDROM = np.full(8, -1, dtype=np.int64)
+for _kolom in range(7):
+    _POSISI_SINDROM[_H_HAMMING[0, _kolom] * 4 + _H_HAMMING[1, _kolom] * 2 + _H_HAMMING[2, _kolom]] = _kolom
+
+# --- Konversi Bitstream <-> Array ---
+def bitstream_ke_array(bitstream):
+    return np.frombuffer(bitstream.encode('ascii'), dtype=np.uint8) - ord('0')
+
+def array_ke_bitstream(bits):
+    return (np.asarray(bits, dtype=np.uint8) + ord('0')).tobytes().decode('ascii')
+
+# --- Repetisi ---
+def enkode_repetisi(bits, faktor):
+    return np.repeat(bits, faktor)
+
+def dekode_repetisi(bits, faktor):
+    return (bits.reshape(-1, faktor).sum(axis=1, dtype=np.int64) * 2 > faktor).astype(np.uint8)
+
+# --- Hamming(7,4) ---
+def enkode_hamming74(bits):
+    data = np.concatenate([bits, np.zeros(-len(bits) % 4, dtype=np.uint8)]).reshape(-1, 4)
+    return ((data @ _G_HAMMING) % 2).astype(np.uint8).reshape(-1)
+
+def dekode_hamming74(bits, panjang_data):
+    """Mengoreksi maksimal 1 bit salah per codeword 7 bit (semua codeword sekaligus)."""
+    codeword = bits.reshape(-1, 7).copy()
+    sindrom = (codeword @ _H_HAMMING.T) % 2
+    posisi = _POSISI_SINDROM[sindrom[:, 0] * 4 + sindrom[:, 1] * 2 + sindrom[:, 2]]
+    baris_error = np.nonzero(posisi >= 0)[0]
+    codeword[baris_error, posisi[baris_error]] ^= 1
+    return codeword[:, :4].reshape(-1)[:panjang_data]
+
+# --- Reed-Solomon (GF(256), via reedsolo) ---
+def _codec_rs(simbol_paritas):
+    if reedsolo is None:
+        raise ValueError("Skema reed_solomon membutuhkan paket 'reedsolo' (pip install reedsolo).")
+    return reedsolo.RSCodec(simbol_paritas)
+
+def panjang_rs_bytes(panjang_data_bytes, simbol_paritas):
+    data_per_blok = 255 - simbol_paritas
+    return panjang_data_bytes + -(-panjang_data_bytes // data_per_blok) * simbol_paritas
+
+def enkode_reed_solomon(bits, simbol_paritas):
+    data = np.packbits(bits).tobytes()
+    return np.unpackbits(np.frombuffer(bytes(_codec_rs(simbol_paritas).encode(data)), dtype=np.uint8))
+
+def dekode_reed_solomon(bits, panjang_data, simbol_paritas):
+    try:
+        data = _codec_rs(simbol_paritas).decode(np.packbits(bits).tobytes())[0]
+    except reedsolo.ReedSolomonError:
+        return None
+    return np.unpackbits(np.frombuffer(bytes(data), dtype=np.uint8))[:panjang_data]
+
+# --- Interleaver Blok ---
+def interleave(bits, kedalaman, ukuran_simbol=1):
+    """
+    Menulis simbol per baris (lebar `kedalaman`) lalu membaca per kolom, sehingga error beruntun
+    tersebar ke banyak codeword. Reed-Solomon memakai simbol 8 bit agar burst tetap jatuh di sedikit byte.
+    """
+    padded = np.concatenate([bits, np.zeros(-len(bits) % (kedalaman * ukuran_simbol), dtype=np.uint8)])
+    return padded.reshape(-1, kedalaman, ukuran_simbol).transpose(1, 0, 2).reshape(-1)
+
+def deinterleave(bits, kedalaman, panjang_asli, ukuran_simbol=1):
+    return bits.reshape(kedalaman, -1, ukuran_simbol).transpose(1, 0, 2).reshape(-1)[:panjang_asli]
+
+def ukuran_simbol_skema(nama_skema):
+    return 8 if nama_skema == "reed_solomon" else 1
+
+# --- Panjang dan Header ---
+def panjang_terkode(panjang_data, nama_skema, parameter):
+    """Panjang bit hasil enkode FEC (sebelum padding interleaver)."""
+    if nama_skema == "repetisi": return panjang_data * parameter
+    if nama_skema == "hamming74": return -(-panjang_data // 4) * 7
+    if nama_skema == "reed_solomon": return panjang_rs_bytes(-(-panjang_data // 8), parameter) * 8
+    raise ValueError(f"Skema FEC tidak dikenal: {nama_skema}")
+
+def panjang_terkirim(panjang_data, nama_skema, parameter, kedalaman):
+    """Jumlah bit yang disisipkan setelah header FEC (termasuk padding interleaver)."""
+    panjang = panjang_terkode(panjang_data, nama_skema, parameter)
+    return panjang + (-panjang % (kedalaman * ukuran_simbol_skema(nama_skema)))
+
+def buat_header_fec(nama_skema, parameter, kedalaman, panjang_data):
+    header = (f"{MAGIC_FEC:08b}{SKEMA_FEC[nama_skema]:08b}{parameter:08b}"
+              f"{kedalaman:016b}{panjang_data:032b}")
+    return header * SALINAN_HEADER_FEC
+
+def baca_header_fec(bitstream):
+    """
+    Membaca header FEC dari awal bitstream dengan voting mayoritas per bit antar salinan.
+    Mengembalikan dict (skema, parameter, kedalaman, panjang_data) atau None untuk payload
+    lama tanpa FEC (magic tidak cocok).
+    """
+    if len(bitstream) < TOTAL_HEADER_FEC_BITS: return None
+    salinan = bitstream_ke_array(bitstream[:TOTAL_HEADER_FEC_BITS]).reshape(SALINAN_HEADER_FEC, PANJANG_HEADER_FEC_BITS)
+    # Minimal mayoritas salinan harus memuat magic, agar payload lama tidak salah terdeteksi.
+    magic_cocok = np.count_nonzero((salinan[:, :8] == bitstream_ke_array(f"{MAGIC_FEC:08b}")).all(axis=1))
+    if magic_cocok * 2 <= SALINAN_HEADER_FEC: return None
+    header = array_ke_bitstream(dekode_repetisi(salinan.T.reshape(-1), SALINAN_HEADER_FEC))
+    id_skema = int(header[8:16], 2)
+    nama_skema = next((nama for nama, id_ in SKEMA_FEC.items() if id_ == id_skema), None)
+    if nama_skema is None: return None
+    info = {"skema": nama_skema, "parameter": int(header[16:24], 2),
+            "kedalaman": int(header[24:40], 2), "panjang_data": int(header[40:72], 2)}
+    if info["kedalaman"] == 0: return None
+    info["panjang_terkirim"] = panjang_terkirim(info["panjang_data"], nama_skema, info["parameter"], info["kedalaman"])
+    return info
+
+# --- Enkode/Dekode Lengkap ---
+def enkode_fec(bitstream_payload, nama_skema, parameter=None, kedalaman=KEDALAMAN_INTERLEAVER_DEFAULT):
+    """Header FEC + payload terkode dan ter-interleave, sebagai bitstream '0'/'1'."""
+    if nama_skema not in SKEMA_FEC: raise ValueError(f"Skema FEC tidak dikenal: {nama_skema}")
+    parameter = PARAMETER_DEFAULT[nama_skema] if parameter is None else parameter
+    if nama_skema == "repetisi" and (parameter < 1 or parameter % 2 == 0):
+        raise ValueError("Faktor repetisi harus bilangan ganjil positif.")
+    if nama_skema == "reed_solomon" and not 0 < parameter < 255:
+        raise ValueError("Jumlah simbol paritas Reed-Solomon harus 1..254.")
+    bits = bitstream_ke_array(bitstream_payload)
+    if nama_skema == "repetisi": terkode = enkode_repetisi(bits, parameter)
+    elif nama_skema == "hamming74": terkode = enkode_hamming74(bits)
+    else: terkode = enkode_reed_solomon(bits, parameter)
+    terkirim = interleave(terkode, kedalaman, ukuran_simbol_skema(nama_skema))
+    return buat_header_fec(nama_skema, parameter, kedalaman, len(bits)) + array_ke_bitstream(terkirim)
+
+def dekode_fec(bitstream_terkirim, info_fec):
+    """Kebalikan enkode_fec (tanpa header). Mengembalikan bitstream payload atau None jika tidak bisa dikoreksi."""
+    nama_skema, parameter = info_fec["skema"], info_fec["parameter"]
+    panjang = panjang_terkode(info_fec["panjang_data"], nama_skema, parameter)
+    bits = deinterleave(bitstream_ke_array(bitstream_terkirim[:info_fec["panjang_terkirim"]]), info_fec["kedalaman"], panjang,
+                        ukuran_simbol_skema(nama_skema))
+    if nama_skema == "repetisi": data = dekode_repetisi(bits, parameter)
+    elif nama_skema == "hamming74": data = dekode_hamming74(bits, info_fec["panjang_data"])
+    else: data = dekode_reed_solomon(bits, info_fec["panjang_data"], parameter)
+    return None if data is None else array_ke_bitstream(data)
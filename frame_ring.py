@@ -0,0 +1,114 @@
+import queue
+import traceback
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+
+# --- Konfigurasi Ring ---
+SLOT_PER_WORKER_DEFAULT = 2  # Slot per worker: satu diproses, satu menunggu di antrean
+INTERVAL_CEK_WORKER_DETIK = 1.0
+
+# --- Ring Buffer Frame di Shared Memory ---
+class RingFrameBersama:
+    """
+    Sejumlah slot frame berukuran tetap dalam satu blok multiprocessing.shared_memory. Proses lain
+    menyambung lewat nama blok, sehingga antar proses cukup mengirim indeks slot (bukan isi frame).
+    """
+    def __init__(self, jumlah_slot, bentuk_frame, dtype=np.uint8, nama=None):
+        self.jumlah_slot = jumlah_slot
+        self.bentuk_frame = tuple(bentuk_frame)
+        self.dtype = np.dtype(dtype)
+        ukuran = jumlah_slot * int(np.prod(self.bentuk_frame)) * self.dtype.itemsize
+        self.pemilik = nama is None
+        self.shm = shared_memory.SharedMemory(create=True, size=ukuran) if self.pemilik else shared_memory.SharedMemory(name=nama)
+        self.slot = np.ndarray((jumlah_slot,) + self.bentuk_frame, dtype=self.dtype, buffer=self.shm.buf)
+
+    def deskriptor(self):
+        """Argumen (picklable) untuk RingFrameBersama(*deskriptor) di proses lain."""
+        return self.jumlah_slot, self.bentuk_frame, self.dtype.str, self.shm.name
+
+    def tutup(self):
+        del self.slot  # View harus dilepas sebelum shared memory ditutup
+        try: self.shm.close()
+        except BufferError: pass  # Pemanggil masih memegang view slot; mapping dilepas bersama view tersebut
+        if self.pemilik: self.shm.unlink()
+
+def _loop_worker(deskriptor_ring, fungsi_worker, argumen_worker, antrean_tugas, antrean_hasil):
+    """Worker: memproses slot in-place dengan fungsi_worker(frame, data_tugas, *argumen_worker)."""
+    ring = RingFrameBersama(*deskriptor_ring)
+    try:
+        while True:
+            tugas = antrean_tugas.get()
+            if tugas is None: break
+            urutan, indeks_slot, data_tugas = tugas
+            try:
+                antrean_hasil.put((urutan, indeks_slot, fungsi_worker(ring.slot[indeks_slot], data_tugas, *argumen_worker), None))
+            except Exception:
+                antrean_hasil.put((urutan, indeks_slot, None, traceback.format_exc()))
+    finally:
+        # Hasil prefetch yang tidak pernah diambil tidak boleh menahan proses saat keluar.
+        antrean_hasil.cancel_join_thread()
+        ring.tutup()
+
+class PoolRingFrame:
+    """
+    Pipeline decoder -> worker -> penulis di atas RingFrameBersama. Proses utama menulis frame ke slot
+    kosong (ambil_slot_kosong + kirim), worker mengubah slot in-place, lalu proses utama mengambil hasil
+    sesuai urutan kirim (ambil_hasil) dan mengembalikan slot (kembalikan_slot). Hanya indeks slot dan
+    data tugas kecil yang melewati antrean.
+    """
+    def __init__(self, bentuk_frame, jumlah_worker, fungsi_worker, argumen_worker=(), jumlah_slot=None, dtype=np.uint8):
+        konteks = mp.get_context("spawn")
+        self.ring = RingFrameBersama(jumlah_slot or jumlah_worker * SLOT_PER_WORKER_DEFAULT, bentuk_frame, dtype)
+        self.slot_kosong = list(range(self.ring.jumlah_slot))
+        self.antrean_tugas = konteks.Queue()
+        self.antrean_hasil = konteks.Queue()
+        self.urutan_kirim = 0
+        self.urutan_ambil = 0
+        self.hasil_tertunda = {}
+        self.worker = [konteks.Process(target=_loop_worker, daemon=True,
+                                       args=(self.ring.deskriptor(), fungsi_worker, argumen_worker,
+                                             self.antrean_tugas, self.antrean_hasil))
+                       for _ in range(jumlah_worker)]
+        for proses in self.worker: proses.start()
+
+    def ada_slot_kosong(self):
+        return bool(self.slot_kosong)
+
+    def jumlah_diproses(self):
+        """Jumlah frame yang sudah dikirim tetapi hasilnya belum diambil."""
+        return self.urutan_kirim - self.urutan_ambil
+
+    def ambil_slot_kosong(self):
+        """(indeks_slot, view frame) untuk diisi decoder."""
+        indeks_slot = self.slot_kosong.pop()
+        return indeks_slot, self.ring.slot[indeks_slot]
+
+    def kirim(self, indeks_slot, data_tugas=None):
+        self.antrean_tugas.put((self.urutan_kirim, indeks_slot, data_tugas))
+        self.urutan_kirim += 1
+
+    def ambil_hasil(self):
+        """(indeks_slot, view frame hasil, hasil fungsi_worker) untuk frame berikutnya sesuai urutan kirim."""
+        while self.urutan_ambil not in self.hasil_tertunda:
+            try:
+                urutan, indeks_slot, hasil, error = self.antrean_hasil.get(timeout=INTERVAL_CEK_WORKER_DETIK)
+            except queue.Empty:
+                if not all(proses.is_alive() for proses in self.worker):
+                    raise RuntimeError("Worker ring frame berhenti tanpa mengembalikan hasil.")
+                continue
+            if error is not None: raise RuntimeError(f"Worker gagal memproses frame:\n{error}")
+            self.hasil_tertunda[urutan] = (indeks_slot, hasil)
+        indeks_slot, hasil = self.hasil_tertunda.pop(self.urutan_ambil)
+        self.urutan_ambil += 1
+        return indeks_slot, self.ring.slot[indeks_slot], hasil
+
+    def kembalikan_slot(self, indeks_slot):
+        self.slot_kosong.append(indeks_slot)
+
+    def tutup(self):
+        for _ in self.worker: self.antrean_tugas.put(None)
+        for proses in self.worker:
+            proses.join(timeout=5)
+            if proses.is_alive(): proses.terminate()
+        self.ring.tutup()
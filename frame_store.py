@@ -0,0 +1,269 @@
+import os
+import re
+import json
+import mmap
+import bisect
+from fractions import Fraction
+import cv2
+import numpy as np
+
+# Sumber/penulis frame dengan antarmuka yang sama seperti cv2.VideoCapture / cv2.VideoWriter
+# (isOpened, read, grab, get, set, release / write). File .y4m dan raw (.gray/.bgr24) dibaca via mmap:
+# frame yang dikembalikan adalah view NumPy read-only ke mmap (tanpa salinan), sehingga akses acak murah
+# dan beberapa proses pembaca berbagi page cache. File lain memakai OpenCV seperti sebelumnya.
+
+# --- Konfigurasi Frame Store ---
+FORMAT_PIKSEL = {"gray": 1, "bgr24": 3}  # Nama pix_fmt ffmpeg -> jumlah kanal
+EKSTENSI_Y4M = ".y4m"
+EKSTENSI_RAW = tuple(f".{nama}" for nama in FORMAT_PIKSEL)
+EKSTENSI_MANIFEST = ".manifest.json"  # Daftar segmen video (embed per segmen) yang dibaca sebagai satu video
+FPS_DEFAULT = 25.0
+# Ukuran plane warna Y4M relatif terhadap (lebar, tinggi); hanya 8 bit yang didukung.
+_UKURAN_FRAME_Y4M = {
+    "mono": lambda w, h: w * h,
+    "420": lambda w, h: w * h + 2 * ((w + 1) // 2) * ((h + 1) // 2),
+    "422": lambda w, h: w * h + 2 * ((w + 1) // 2) * h,
+    "444": lambda w, h: 3 * w * h,
+    "444alpha": lambda w, h: 4 * w * h,
+}
+_POLA_DIMENSI_RAW = re.compile(r"_(\d+)x(\d+)$")
+
+def adalah_frame_store(path_video):
+    """True jika path memakai backend mmap (Y4M/raw), bukan OpenCV."""
+    return os.path.splitext(path_video)[1].lower() in (EKSTENSI_Y4M,) + EKSTENSI_RAW
+
+def dimensi_dari_nama_raw(path_raw):
+    """File raw tidak punya header: dimensi diambil dari nama file 'nama_LEBARxTINGGI.gray|.bgr24'."""
+    cocok = _POLA_DIMENSI_RAW.search(os.path.splitext(os.path.basename(path_raw))[0])
+    if not cocok: raise ValueError(f"Nama file raw harus berakhiran _LEBARxTINGGI: '{path_raw}'")
+    return int(cocok.group(1)), int(cocok.group(2))
+
+def _fps_ke_rasional(fps):
+    pecahan = Fraction(float(fps) if fps and fps > 0 else FPS_DEFAULT).limit_denominator(1001)
+    return pecahan.numerator, pecahan.denominator
+
+# --- Sumber Frame mmap ---
+class SumberFrameMmap:
+    """
+    Pembaca frame dari file yang di-mmap. Subclass mengisi lebar, tinggi, fps, bentuk_frame,
+    dan offset (posisi byte awal data setiap frame).
+    """
+    def __init__(self, path_video):
+        self.path_video = path_video
+        self.lebar = self.tinggi = 0
+        self.fps = FPS_DEFAULT
+        self.bentuk_frame = None
+        self.offset = []
+        self.posisi = 0
+        self._file = open(path_video, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(path_video) else None
+
+    def isOpened(self):
+        return self._mmap is not None and bool(self.offset)
+
+    def frame(self, indeks):
+        """View read-only ke frame ke-`indeks` (akses acak tanpa salinan)."""
+        return np.frombuffer(self._mmap, dtype=np.uint8, count=int(np.prod(self.bentuk_frame)),
+                             offset=self.offset[indeks]).reshape(self.bentuk_frame)
+
+    def read(self):
+        if self.posisi >= len(self.offset): return False, None
+        self.posisi += 1
+        return True, self.frame(self.posisi - 1)
+
+    def grab(self):
+        if self.posisi >= len(self.offset): return False
+        self.posisi += 1
+        return True
+
+    def get(self, properti):
+        nilai = {cv2.CAP_PROP_FRAME_WIDTH: self.lebar, cv2.CAP_PROP_FRAME_HEIGHT: self.tinggi,
+                 cv2.CAP_PROP_FPS: self.fps, cv2.CAP_PROP_FRAME_COUNT: len(self.offset),
+                 cv2.CAP_PROP_POS_FRAMES: self.posisi}
+        return float(nilai.get(properti, 0))
+
+    def set(self, properti, nilai):
+        if properti != cv2.CAP_PROP_POS_FRAMES: return False
+        self.posisi = min(max(int(nilai), 0), len(self.offset))
+        return True
+
+    def release(self):
+        if self._mmap is not None:
+            try: self._mmap.close()
+            except BufferError: pass  # Masih ada view frame yang dipakai; mmap ditutup saat view dilepas
+            self._mmap = None
+        self._file.close()
+
+class SumberFrameY4M(SumberFrameMmap):
+    """YUV4MPEG2 8 bit; read() mengembalikan plane Y (grayscale) karena embed/ekstraksi bekerja pada luma."""
+    def __init__(self, path_video):
+        super().__init__(path_video)
+        if self._mmap is None or not self._mmap[:10] == b"YUV4MPEG2 ": raise ValueError(f"Bukan file Y4M: '{path_video}'")
+        akhir_header = self._mmap.find(b"\n")
+        parameter = {token[:1]: token[1:] for token in self._mmap[10:akhir_header].decode("ascii").split()}
+        self.lebar, self.tinggi = int(parameter["W"]), int(parameter["H"])
+        if "F" in parameter:
+            pembilang, penyebut = parameter["F"].split(":")
+            self.fps = int(pembilang) / int(penyebut)
+        ruang_warna = parameter.get("C", "420jpeg")
+        kunci_warna = "mono" if ruang_warna.startswith("mono") else next(
+            (k for k in ("444alpha", "444", "422", "420") if ruang_warna.startswith(k)), None)
+        if kunci_warna is None or re.search(r"p\d+$", ruang_warna):
+            raise ValueError(f"Ruang warna Y4M tidak didukung: C{ruang_warna}")
+        ukuran_frame = _UKURAN_FRAME_Y4M[kunci_warna](self.lebar, self.tinggi)
+        self.bentuk_frame = (self.tinggi, self.lebar)
+        posisi = akhir_header + 1
+        while posisi < len(self._mmap):
+            if self._mmap[posisi:posisi + 5] != b"FRAME": raise ValueError(f"Header FRAME Y4M tidak valid pada byte {posisi}.")
+            awal_data = self._mmap.find(b"\n", posisi) + 1
+            if awal_data + ukuran_frame > len(self._mmap): break  # Frame terakhir terpotong
+            self.offset.append(awal_data)
+            posisi = awal_data + ukuran_frame
+
+class SumberFrameRaw(SumberFrameMmap):
+    """Frame mentah tanpa header (ffmpeg -f rawvideo) dengan format dari ekstensi dan dimensi dari nama file."""
+    def __init__(self, path_video, lebar=None, tinggi=None, fps=FPS_DEFAULT):
+        super().__init__(path_video)
+        if lebar is None or tinggi is None: lebar, tinggi = dimensi_dari_nama_raw(path_video)
+        self.lebar, self.tinggi, self.fps = lebar, tinggi, fps
+        kanal = FORMAT_PIKSEL[os.path.splitext(path_video)[1].lower()[1:]]
+        self.bentuk_frame = (tinggi, lebar) if kanal == 1 else (tinggi, lebar, kanal)
+        ukuran_frame = lebar * tinggi * kanal
+        jumlah_frame = (len(self._mmap) // ukuran_frame) if self._mmap is not None else 0
+        self.offset = [i * ukuran_frame for i in range(jumlah_frame)]
+
+# --- Sumber Frame dari Manifest Segmen ---
+class SumberFrameManifest:
+    """
+    Beberapa file segmen (misal hasil embed per segmen) yang dibaca berurutan sebagai satu video.
+    Manifest JSON memuat lebar, tinggi, fps, dan daftar segmen {file, frame_mulai, jumlah_frame};
+    path file relatif terhadap direktori manifest. Segmen dibuka saat dibutuhkan dengan buka_sumber_frame.
+    """
+    def __init__(self, path_manifest):
+        with open(path_manifest) as f:
+            self.manifest = json.load(f)
+        self.direktori = os.path.dirname(os.path.abspath(path_manifest))
+        self.segmen = self.manifest["segmen"]
+        self.mulai_segmen = [segmen["frame_mulai"] for segmen in self.segmen]
+        self.jumlah_frame = sum(segmen["jumlah_frame"] for segmen in self.segmen)
+        self.lebar, self.tinggi = self.manifest["lebar"], self.manifest["tinggi"]
+        self.fps = self.manifest.get("fps", FPS_DEFAULT)
+        self.posisi = 0
+        self._indeks_segmen = None
+        self._sumber = None
+
+    def path_segmen(self, indeks_segmen):
+        return os.path.join(self.direktori, self.segmen[indeks_segmen]["file"])
+
+    def isOpened(self):
+        return bool(self.segmen)
+
+    def _siapkan_posisi(self):
+        """Membuka segmen yang memuat self.posisi; False jika posisi sudah di akhir video."""
+        if self.posisi >= self.jumlah_frame: return False
+        indeks_segmen = bisect.bisect_right(self.mulai_segmen, self.posisi) - 1
+        if indeks_segmen != self._indeks_segmen:
+            if self._sumber is not None: self._sumber.release()
+            self._sumber = buka_sumber_frame(self.path_segmen(indeks_segmen))
+            self._indeks_segmen = indeks_segmen
+            posisi_dalam = self.posisi - self.mulai_segmen[indeks_segmen]
+            if posisi_dalam > 0: self._sumber.set(cv2.CAP_PROP_POS_FRAMES, posisi_dalam)
+        return self._sumber.isOpened()
+
+    def read(self):
+        if not self._siapkan_posisi(): return False, None
+        ret, frame = self._sumber.read()
+        if ret: self.posisi += 1
+        return ret, frame
+
+    def grab(self):
+        if not self._siapkan_posisi(): return False
+        ret = self._sumber.grab()
+        if ret: self.posisi += 1
+        return ret
+
+    def get(self, properti):
+        nilai = {cv2.CAP_PROP_FRAME_WIDTH: self.lebar, cv2.CAP_PROP_FRAME_HEIGHT: self.tinggi,
+                 cv2.CAP_PROP_FPS: self.fps, cv2.CAP_PROP_FRAME_COUNT: self.jumlah_frame,
+                 cv2.CAP_PROP_POS_FRAMES: self.posisi}
+        return float(nilai.get(properti, 0))
+
+    def set(self, properti, nilai):
+        if properti != cv2.CAP_PROP_POS_FRAMES: return False
+        self.posisi = min(max(int(nilai), 0), self.jumlah_frame)
+        if self._sumber is not None: self._sumber.release()
+        self._sumber = None; self._indeks_segmen = None
+        return True
+
+    def release(self):
+        if self._sumber is not None: self._sumber.release()
+        self._sumber = None; self._indeks_segmen = None
+
+# --- Penulis Frame ---
+class PenulisFrameY4M:
+    """Penulis Y4M mono (plane Y saja); frame BGR dikonversi ke grayscale seperti jalur embed."""
+    def __init__(self, path_video, fps, ukuran):
+        self.lebar, self.tinggi = ukuran
+        pembilang, penyebut = _fps_ke_rasional(fps)
+        self._file = open(path_video, "wb")
+        self._file.write(f"YUV4MPEG2 W{self.lebar} H{self.tinggi} F{pembilang}:{penyebut} Ip A1:1 Cmono\n".encode("ascii"))
+
+    def isOpened(self):
+        return not self._file.closed
+
+    def set(self, properti, nilai):
+        return False  # Tidak ada pengaturan kualitas (lossless)
+
+    def write(self, frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        if gray.shape != (self.tinggi, self.lebar): raise ValueError(f"Ukuran frame {gray.shape} tidak sesuai header Y4M.")
+        self._file.write(b"FRAME\n")
+        self._file.write(np.ascontiguousarray(gray, dtype=np.uint8).data)
+
+    def release(self):
+        self._file.close()
+
+class PenulisFrameRaw:
+    """Penulis frame mentah (.gray/.bgr24); frame dikonversi ke format sesuai ekstensi."""
+    def __init__(self, path_video, ukuran):
+        self.lebar, self.tinggi = ukuran
+        self.kanal = FORMAT_PIKSEL[os.path.splitext(path_video)[1].lower()[1:]]
+        self._file = open(path_video, "wb")
+
+    def isOpened(self):
+        return not self._file.closed
+
+    def set(self, properti, nilai):
+        return False
+
+    def write(self, frame):
+        if self.kanal == 1 and frame.ndim == 3: frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        elif self.kanal == 3 and frame.ndim == 2: frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+        self._file.write(np.ascontiguousarray(frame, dtype=np.uint8).data)
+
+    def release(self):
+        self._file.close()
+
+# --- Fungsi Pembuka ---
+def buka_sumber_frame(path_video):
+    """
+    Sumber frame sesuai ekstensi: .y4m / .gray / .bgr24 via mmap, .manifest.json sebagai rangkaian
+    segmen, selain itu cv2.VideoCapture.
+    """
+    ekstensi = os.path.splitext(path_video)[1].lower()
+    try:
+        if path_video.lower().endswith(EKSTENSI_MANIFEST): return SumberFrameManifest(path_video)
+        if ekstensi == EKSTENSI_Y4M: return SumberFrameY4M(path_video)
+        if ekstensi in EKSTENSI_RAW: return SumberFrameRaw(path_video)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        # Sama seperti cv2.VideoCapture untuk file yang tidak valid: pemanggil cukup memeriksa isOpened().
+        print(f"  Warning: Frame store '{path_video}' tidak bisa dibuka: {e}")
+        return cv2.VideoCapture()
+    return cv2.VideoCapture(path_video)
+
+def buka_penulis_frame(path_video, api, fourcc, fps, ukuran, is_color=True):
+    """Penulis frame sesuai ekstensi: .y4m / .gray / .bgr24 ditulis langsung, selain itu cv2.VideoWriter."""
+    ekstensi = os.path.splitext(path_video)[1].lower()
+    if ekstensi == EKSTENSI_Y4M: return PenulisFrameY4M(path_video, fps, ukuran)
+    if ekstensi in EKSTENSI_RAW: return PenulisFrameRaw(path_video, ukuran)
+    return cv2.VideoWriter(path_video, api, fourcc, fps, ukuran, is_color)
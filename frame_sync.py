@@ -0,0 +1,181 @@
+import zlib
+import binascii
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import cv2
+import numpy as np
+
+from config_and_setup import proses_frame_qim_dct
+from frame_store import buka_sumber_frame
+from fec import bitstream_ke_array, array_ke_bitstream, dekode_repetisi
+
+# --- Konfigurasi Header Sinkronisasi per Frame ---
+# Setiap frame pembawa diawali header (176 bit) yang diulang beberapa kali dan dibaca dengan voting
+# mayoritas per bit: magic (16) + nomor urut frame (24) + offset data dalam payload (32) + panjang data
+# frame ini (24) + panjang total payload (32) + CRC-32 data frame (32) + CRC-16 header (16).
+# Dengan header ini setiap frame bisa dibaca sendiri: urutan, frame hilang/ganda, dan frame rusak terdeteksi.
+MAGIC_SINKRON = 0x5E6C
+SALINAN_HEADER_SINKRON = 3
+PANJANG_HEADER_SINKRON_BITS = 176
+TOTAL_HEADER_SINKRON_BITS = PANJANG_HEADER_SINKRON_BITS * SALINAN_HEADER_SINKRON
+# Kapasitas frame minimal 2x header; header frame pertama juga selalu muat dalam bit yang dibaca ekstraksi awal.
+KAPASITAS_MIN_SINKRON_BITS = 2 * TOTAL_HEADER_SINKRON_BITS
+FRAME_PER_TUGAS_DEFAULT = 8
+
+# --- Kapasitas Frame ---
+def kapasitas_frame_bits(lebar, tinggi, num_ac_coeffs):
+    """Bit QIM per frame (domain piksel) untuk area kelipatan 8 dari lebar x tinggi."""
+    return (lebar // 8) * (tinggi // 8) * min(num_ac_coeffs, 63)
+
+# --- Header ---
+def _crc_data(bits_data):
+    return zlib.crc32(bits_data.encode('ascii')) & 0xFFFFFFFF
+
+def buat_header_sinkron(nomor_urut, offset, panjang_data, panjang_total, crc_data):
+    isi = f"{MAGIC_SINKRON:016b}{nomor_urut:024b}{offset:032b}{panjang_data:024b}{panjang_total:032b}{crc_data:032b}"
+    header = isi + f"{binascii.crc_hqx(isi.encode('ascii'), 0xFFFF):016b}"
+    return header * SALINAN_HEADER_SINKRON
+
+def baca_bingkai_frame(bits_frame):
+    """
+    Membaca header sinkronisasi di awal bit satu frame (voting mayoritas antar salinan, lalu CRC header).
+    Mengembalikan dict (nomor_urut, offset, panjang_data, panjang_total, data, data_valid) atau None jika
+    frame tidak membawa header yang valid (payload lama tanpa sinkronisasi, atau header rusak).
+    """
+    if len(bits_frame) < TOTAL_HEADER_SINKRON_BITS: return None
+    salinan = bitstream_ke_array(bits_frame[:TOTAL_HEADER_SINKRON_BITS]).reshape(SALINAN_HEADER_SINKRON, PANJANG_HEADER_SINKRON_BITS)
+    header = array_ke_bitstream(dekode_repetisi(salinan.T.reshape(-1), SALINAN_HEADER_SINKRON))
+    if int(header[:16], 2) != MAGIC_SINKRON: return None
+    if int(header[160:176], 2) != binascii.crc_hqx(header[:160].encode('ascii'), 0xFFFF): return None
+    info = {"nomor_urut": int(header[16:40], 2), "offset": int(header[40:72], 2), "panjang_data": int(header[72:96], 2),
+            "panjang_total": int(header[96:128], 2)}
+    data = bits_frame[TOTAL_HEADER_SINKRON_BITS:TOTAL_HEADER_SINKRON_BITS + info["panjang_data"]]
+    if len(data) < info["panjang_data"] or info["offset"] + info["panjang_data"] > info["panjang_total"]: return None
+    info["data"] = data
+    info["data_valid"] = _crc_data(data) == int(header[128:160], 2)
+    return info
+
+# --- Pembingkaian Payload ---
+def bingkai_payload_sinkron(bitstream_payload, kapasitas_frame):
+    """
+    Memecah payload menjadi potongan per frame dan mendahului tiap potongan dengan header sinkronisasi.
+    Hasilnya disisipkan seperti payload biasa: setiap frame pembawa terisi penuh (kapasitas_frame bit),
+    sehingga setiap frame diawali header-nya sendiri.
+    """
+    if kapasitas_frame < KAPASITAS_MIN_SINKRON_BITS:
+        raise ValueError(f"Kapasitas frame ({kapasitas_frame} bits) terlalu kecil untuk header sinkronisasi "
+                         f"(minimal {KAPASITAS_MIN_SINKRON_BITS} bits).")
+    data_per_frame = kapasitas_frame - TOTAL_HEADER_SINKRON_BITS
+    panjang_total = len(bitstream_payload)
+    potongan = []
+    for nomor_urut, offset in enumerate(range(0, panjang_total, data_per_frame)):
+        data = bitstream_payload[offset:offset + data_per_frame]
+        potongan.append(buat_header_sinkron(nomor_urut, offset, len(data), panjang_total, _crc_data(data)) + data)
+    return "".join(potongan)
+
+# --- Penyusunan Ulang Payload ---
+class PenyusunPayloadSinkron:
+    """
+    Mengumpulkan potongan payload dari frame dalam urutan apa pun dan menyusunnya berdasarkan offset.
+    Frame ganda diabaikan; potongan dengan CRC data valid menggantikan potongan yang rusak.
+    """
+    def __init__(self):
+        self.panjang_total = None
+        self.potongan = {}  # offset -> (data, data_valid)
+        self.frame_rusak = 0
+
+    def tambah(self, info):
+        if info is None: return False
+        if self.panjang_total is None: self.panjang_total = info["panjang_total"]
+        elif info["panjang_total"] != self.panjang_total: return False  # Frame dari payload lain
+        if not info["data_valid"]: self.frame_rusak += 1
+        lama = self.potongan.get(info["offset"])
+        if lama is None or (info["data_valid"] and not lama[1]):
+            self.potongan[info["offset"]] = (info["data"], info["data_valid"])
+        return True
+
+    def bit_terkumpul(self):
+        return sum(len(data) for data, _ in self.potongan.values())
+
+    def lengkap(self):
+        return (self.panjang_total is not None and self.bit_terkumpul() >= self.panjang_total
+                and all(valid for _, valid in self.potongan.values()))
+
+    def rentang_hilang(self):
+        """Daftar (awal, akhir) bit payload yang belum ada di potongan mana pun."""
+        hilang = []; posisi = 0
+        for offset in sorted(self.potongan):
+            if offset > posisi: hilang.append((posisi, offset))
+            posisi = max(posisi, offset + len(self.potongan[offset][0]))
+        if self.panjang_total is not None and posisi < self.panjang_total: hilang.append((posisi, self.panjang_total))
+        return hilang
+
+    def bitstream(self):
+        """Payload tersusun; bagian yang hilang diisi '0' (FEC, jika ada, masih bisa mengoreksinya)."""
+        if self.panjang_total is None: return None
+        bits = np.full(self.panjang_total, ord('0'), dtype=np.uint8)
+        for offset, (data, _) in self.potongan.items():
+            bits[offset:offset + len(data)] = np.frombuffer(data.encode('ascii'), dtype=np.uint8)
+        return bits.tobytes().decode('ascii')
+
+# --- Ekstraksi Akses Acak ---
+def ekstrak_rentang_frame(path_video, frame_mulai, frame_akhir, delta_kuantisasi, num_ac_coeffs, kunci_permutasi=None):
+    """
+    Membaca frame [frame_mulai, frame_akhir) secara mandiri (seek langsung) dan mengembalikan header +
+    potongan payload setiap frame yang header sinkronisasinya valid. Bisa dijalankan di proses worker.
+    """
+    cap = buka_sumber_frame(path_video)
+    if not cap.isOpened(): raise IOError(f"Video '{path_video}' tidak bisa dibuka.")
+    processed_w = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) // 8) * 8
+    processed_h = (int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) // 8) * 8
+    hasil = []
+    try:
+        if frame_mulai > 0: cap.set(cv2.CAP_PROP_POS_FRAMES, frame_mulai)
+        for indeks_frame in range(frame_mulai, frame_akhir):
+            ret, frame = cap.read()
+            if not ret: break
+            info = baca_bingkai_frame(proses_frame_qim_dct(frame[0:processed_h, 0:processed_w], 'extract', delta_kuantisasi,
+                                                           num_ac_coeffs_to_use=num_ac_coeffs,
+                                                           kunci_permutasi=kunci_permutasi))
+            if info is not None:
+                info["indeks_frame"] = indeks_frame
+                hasil.append(info)
+    finally:
+        cap.release()
+    return hasil
+
+def kumpulkan_payload_sinkron(path_video, delta_kuantisasi, num_ac_coeffs, jumlah_worker=1, frame_mulai=0, frame_akhir=None,
+                              frame_per_tugas=FRAME_PER_TUGAS_DEFAULT, kunci_permutasi=None):
+    """
+    Mengumpulkan payload bersinkron dari rentang frame video, dibagi per tugas ke beberapa proses
+    (jumlah_worker > 1) karena setiap frame bisa didekode tanpa frame sebelumnya.
+    Mengembalikan PenyusunPayloadSinkron berisi semua potongan yang terbaca.
+    """
+    if frame_akhir is None:
+        cap = buka_sumber_frame(path_video)
+        if not cap.isOpened(): raise IOError(f"Video '{path_video}' tidak bisa dibuka.")
+        frame_akhir = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)); cap.release()
+        if frame_akhir <= 0: raise IOError("Jumlah frame video tidak diketahui; berikan frame_akhir.")
+    daftar_tugas = [(path_video, awal, min(awal + frame_per_tugas, frame_akhir), delta_kuantisasi, num_ac_coeffs, kunci_permutasi)
+                    for awal in range(frame_mulai, frame_akhir, frame_per_tugas)]
+    penyusun = PenyusunPayloadSinkron()
+    if jumlah_worker > 1:
+        with ProcessPoolExecutor(max_workers=jumlah_worker, mp_context=multiprocessing.get_context("spawn")) as executor:
+            for hasil in executor.map(ekstrak_rentang_frame, *zip(*daftar_tugas)):
+                for info in hasil: penyusun.tambah(info)
+    else:
+        for tugas in daftar_tugas:
+            for info in ekstrak_rentang_frame(*tugas): penyusun.tambah(info)
+    return penyusun
+
+class SumberBitPayload:
+    """Sumber bit untuk _ekstraksi_dari_sumber_bit yang menyerahkan payload tersusun sebagai satu 'frame'."""
+    def __init__(self, bitstream_payload):
+        self.bitstream_payload = bitstream_payload
+
+    def frame_berikutnya(self):
+        bits, self.bitstream_payload = self.bitstream_payload, None
+        return bits
+
+    def tutup(self):
+        pass
@@ -0,0 +1,164 @@
+import os
+import json
+import time
+import threading
+import contextlib
+from collections import defaultdict
+import numpy as np
+
+# --- Konfigurasi Instrumentasi ---
+MAKS_EVENT_TRACE_DEFAULT = 200000  # Batas event trace yang disimpan per job (agar memori tetap terbatas)
+ITERASI_MINIMUM_DEFAULT = 20
+ITERASI_MAKSIMUM_DEFAULT = 2000
+DURASI_MINIMUM_DETIK_DEFAULT = 0.5
+PEMANASAN_DEFAULT = 3
+
+class _TimerTahap:
+    """Context manager yang mencatat durasi satu tahap ke MetrikPipeline."""
+    __slots__ = ("metrik", "nama", "mulai")
+
+    def __init__(self, metrik, nama):
+        self.metrik = metrik
+        self.nama = nama
+
+    def __enter__(self):
+        self.mulai = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrik.catat_durasi(self.nama, self.mulai, time.perf_counter() - self.mulai)
+        return False
+
+_TIMER_NONAKTIF = contextlib.nullcontext()
+
+class MetrikPipeline:
+    """
+    Wadah metrik per job: timer per tahap (decode, cvtColor, DCT, QIM, IDCT, encode, kripto)
+    dan counter (frame, bit, blok). Jika `aktif=False`, tahap() mengembalikan context manager
+    kosong sehingga biaya instrumentasi mendekati nol.
+    """
+    def __init__(self, aktif=True, nama_job="job", rekam_trace=True, maks_event_trace=MAKS_EVENT_TRACE_DEFAULT):
+        self.aktif = aktif
+        self.nama_job = nama_job
+        self.rekam_trace = rekam_trace
+        self.maks_event_trace = maks_event_trace
+        self.total_detik = defaultdict(float)
+        self.jumlah_panggilan = defaultdict(int)
+        self.counter = defaultdict(int)
+        self.event_trace = []
+        self.event_dibuang = 0
+        self._t0 = time.perf_counter()
+
+    def tahap(self, nama):
+        """Context manager untuk mengukur satu tahap: `with metrik.tahap('dct'): ...`."""
+        if not self.aktif: return _TIMER_NONAKTIF
+        return _TimerTahap(self, nama)
+
+    def catat_durasi(self, nama, mulai, durasi):
+        self.total_detik[nama] += durasi
+        self.jumlah_panggilan[nama] += 1
+        if self.rekam_trace:
+            if len(self.event_trace) < self.maks_event_trace:
+                self.event_trace.append((nama, mulai - self._t0, durasi, threading.get_ident()))
+            else:
+                self.event_dibuang += 1
+
+    def tambah(self, nama, nilai=1):
+        """Menambah counter (misal jumlah frame atau bit)."""
+        if self.aktif: self.counter[nama] += nilai
+
+    def ringkasan(self):
+        """Mengembalikan dict ringkasan: total detik, jumlah panggilan, dan porsi tiap tahap."""
+        total_semua = sum(self.total_detik.values())
+        tahap = {}
+        for nama, detik in sorted(self.total_detik.items(), key=lambda item: -item[1]):
+            tahap[nama] = {
+                "total_detik": detik,
+                "jumlah_panggilan": self.jumlah_panggilan[nama],
+                "rata_rata_detik": detik / self.jumlah_panggilan[nama],
+                "porsi_persen": detik / total_semua * 100 if total_semua > 0 else 0.0,
+            }
+        return {"nama_job": self.nama_job, "tahap": tahap, "counter": dict(self.counter),
+                "durasi_job_detik": time.perf_counter() - self._t0}
+
+    def cetak_ringkasan(self):
+        ringkas = self.ringkasan()
+        print(f"\n  [Metrik Tahap: {self.nama_job}]")
+        for nama, statistik in ringkas["tahap"].items():
+            print(f"    {nama:<14} {statistik['total_detik']:.4f} s ({statistik['porsi_persen']:5.1f}%), "
+                  f"{statistik['jumlah_panggilan']} panggilan")
+        for nama, nilai in ringkas["counter"].items():
+            print(f"    {nama:<14} {nilai}")
+
+    def ekspor_json(self, path_json):
+        _buat_direktori_induk(path_json)
+        with open(path_json, "w") as f:
+            json.dump(self.ringkasan(), f, indent=2)
+        return path_json
+
+    def ekspor_chrome_trace(self, path_trace):
+        """Menulis event dalam format Chrome Trace (buka dengan chrome://tracing atau Perfetto)."""
+        pid = os.getpid()
+        events = [{"name": nama, "cat": self.nama_job, "ph": "X", "ts": mulai * 1e6, "dur": durasi * 1e6,
+                   "pid": pid, "tid": tid} for nama, mulai, durasi, tid in self.event_trace]
+        for nama, nilai in self.counter.items():
+            events.append({"name": nama, "ph": "C", "ts": 0, "pid": pid, "args": {nama: nilai}})
+        _buat_direktori_induk(path_trace)
+        with open(path_trace, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms",
+                       "otherData": {"nama_job": self.nama_job, "event_dibuang": self.event_dibuang}}, f)
+        return path_trace
+
+def _buat_direktori_induk(path_file):
+    direktori = os.path.dirname(path_file)
+    if direktori: os.makedirs(direktori, exist_ok=True)
+
+# Instance bersama untuk pemanggil yang tidak meminta metrik (tidak pernah mencatat apa pun).
+METRIK_NONAKTIF = MetrikPipeline(aktif=False, rekam_trace=False)
+
+# --- Fungsi Statistik Waktu ---
+def ringkas_durasi(durasi_detik_list, byte_per_operasi=None):
+    """
+    Meringkas daftar durasi (detik) menjadi statistik: ops/s, persentil, dan MB/s.
+    MB dihitung sebagai 10^6 byte.
+    """
+    durasi = np.asarray(durasi_detik_list, dtype=np.float64)
+    if durasi.size == 0:
+        raise ValueError("Daftar durasi kosong.")
+    total_detik = float(durasi.sum())
+    p50, p90, p99 = np.percentile(durasi, [50, 90, 99])
+    hasil = {
+        "iterasi": int(durasi.size),
+        "total_detik": total_detik,
+        "rata_rata_detik": float(durasi.mean()),
+        "min_detik": float(durasi.min()),
+        "maks_detik": float(durasi.max()),
+        "p50_detik": float(p50),
+        "p90_detik": float(p90),
+        "p99_detik": float(p99),
+        "ops_per_detik": durasi.size / total_detik if total_detik > 0 else float('inf'),
+    }
+    if byte_per_operasi:
+        hasil["byte_per_operasi"] = int(byte_per_operasi)
+        hasil["mb_per_detik"] = (byte_per_operasi * durasi.size / 1e6) / total_detik if total_detik > 0 else float('inf')
+    return hasil
+
+def ukur_fungsi(fungsi, byte_per_operasi=None, iterasi_minimum=ITERASI_MINIMUM_DEFAULT,
+                iterasi_maksimum=ITERASI_MAKSIMUM_DEFAULT, durasi_minimum_detik=DURASI_MINIMUM_DETIK_DEFAULT,
+                pemanasan=PEMANASAN_DEFAULT):
+    """
+    Menjalankan fungsi tanpa argumen berulang kali dan mengukur durasi tiap panggilan.
+    Berhenti setelah minimal `iterasi_minimum` iterasi DAN `durasi_minimum_detik` terlewati,
+    atau setelah `iterasi_maksimum` iterasi.
+    """
+    for _ in range(pemanasan):
+        fungsi()
+    durasi_list = []
+    mulai_total = time.perf_counter()
+    while len(durasi_list) < iterasi_maksimum:
+        mulai = time.perf_counter()
+        fungsi()
+        durasi_list.append(time.perf_counter() - mulai)
+        if len(durasi_list) >= iterasi_minimum and time.perf_counter() - mulai_total >= durasi_minimum_detik:
+            break
+    return ringkas_durasi(durasi_list, byte_per_operasi)
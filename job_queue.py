@@ -0,0 +1,217 @@
+import os
+import time
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from cryptography.hazmat.primitives import serialization
+
+from config_and_setup import serialisasi_kunci_publik_ecc_compressed
+
+# --- Konfigurasi Antrean Job ---
+# Worker pool berupa thread yang hidup selama antrean dibuka: modul sudah terimpor dan kunci dimuat sekali,
+# dan sesi Embedder/Extractor aman dipakai bersamaan (satu sesi per job). Batas job bersamaan diatur penjadwal,
+# bukan ukuran pool, sehingga bisa diubah saat antrean berjalan.
+MAKS_WORKER_POOL = 8
+JOB_BERSAMAAN_DEFAULT = max(1, min(MAKS_WORKER_POOL, (os.cpu_count() or 1) // 2))
+
+STATUS_MENUNGGU = "menunggu"
+STATUS_BERJALAN = "berjalan"
+STATUS_SELESAI = "selesai"
+STATUS_GAGAL = "gagal"
+STATUS_DIBATALKAN = "dibatalkan"
+STATUS_AKHIR = (STATUS_SELESAI, STATUS_GAGAL, STATUS_DIBATALKAN)
+
+# --- Job ---
+class Job:
+    """
+    Satu job antrean: fungsi(job) dijalankan di worker pool dan mengembalikan True/False (berhasil).
+    Fungsi job memakai job.progres sebagai callback progres, job.dibatalkan sebagai callback batal,
+    dan job.log untuk baris log; parameter disimpan saat job ditambahkan agar retry memakai nilai yang sama.
+    """
+    def __init__(self, id_job, jenis, fungsi, parameter, antrean):
+        self.id = id_job
+        self.jenis = jenis
+        self.fungsi = fungsi
+        self.parameter = parameter
+        self.antrean = antrean
+        self.status = STATUS_MENUNGGU
+        self.percobaan = 0
+        self.progres_terakhir = None
+        self.pesan_error = None
+        self.durasi_detik = None
+        self.event_batal = threading.Event()
+
+    def dibatalkan(self):
+        return self.event_batal.is_set()
+
+    def progres(self, event):
+        self.progres_terakhir = event
+        self.antrean._kabari(self, "progres", event)
+
+    def log(self, baris):
+        self.antrean._kabari(self, "log", baris)
+
+# --- Antrean Job ---
+class AntreanJob:
+    """
+    Antrean FIFO job dengan batas job bersamaan, pembatalan, dan retry.
+    notifikasi(job, jenis, isi) dipanggil dari thread worker untuk jenis "status", "progres", dan "log";
+    konsumen GUI sebaiknya hanya memasukkannya ke antrean UI.
+    """
+    def __init__(self, maks_bersamaan=JOB_BERSAMAAN_DEFAULT, notifikasi=None):
+        self.maks_bersamaan = maks_bersamaan
+        self.notifikasi = notifikasi
+        self.jobs = {}
+        self._menunggu = deque()
+        self._jumlah_berjalan = 0
+        self._id_berikutnya = itertools.count(1)
+        self._kunci = threading.Lock()
+        self._cache_kunci = {}
+        self._kunci_cache = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=MAKS_WORKER_POOL, thread_name_prefix="job-stego")
+
+    def _kabari(self, job, jenis, isi=None):
+        if self.notifikasi is not None: self.notifikasi(job, jenis, isi)
+
+    # --- Cache Kunci ---
+    def _muat_kunci(self, path, pemuat):
+        path = os.path.abspath(path)
+        identitas = (path, os.stat(path).st_mtime_ns)  # File kunci yang ditimpa dimuat ulang
+        with self._kunci_cache:
+            if identitas not in self._cache_kunci:
+                with open(path, "rb") as f:
+                    self._cache_kunci[identitas] = pemuat(f.read())
+            return self._cache_kunci[identitas]
+
+    def kunci_publik(self, path):
+        """Kunci publik penerima (bytes terkompresi) dari file PEM, dimuat sekali per isi file."""
+        return self._muat_kunci(path, lambda data: serialisasi_kunci_publik_ecc_compressed(serialization.load_pem_public_key(data)))
+
+    def kunci_privat(self, path):
+        """Kunci privat penerima dari file PEM, dimuat sekali per isi file."""
+        return self._muat_kunci(path, lambda data: serialization.load_pem_private_key(data, password=None))
+
+    # --- Operasi Antrean ---
+    def tambah(self, jenis, fungsi, **parameter):
+        with self._kunci:
+            job = Job(next(self._id_berikutnya), jenis, fungsi, parameter, self)
+            self.jobs[job.id] = job
+            self._menunggu.append(job)
+        self._kabari(job, "status")
+        self._jadwalkan()
+        return job
+
+    def atur_maks_bersamaan(self, maks_bersamaan):
+        self.maks_bersamaan = max(1, min(int(maks_bersamaan), MAKS_WORKER_POOL))
+        self._jadwalkan()
+
+    def batalkan(self, id_job):
+        """Job menunggu langsung dibatalkan; job berjalan berhenti sebelum frame berikutnya."""
+        with self._kunci:
+            job = self.jobs.get(id_job)
+            if job is None or job.status in STATUS_AKHIR: return False
+            job.event_batal.set()
+            if job.status == STATUS_MENUNGGU:
+                self._menunggu.remove(job); job.status = STATUS_DIBATALKAN
+            else:
+                return True
+        self._kabari(job, "status")
+        return True
+
+    def ulangi(self, id_job):
+        """Memasukkan kembali job gagal/dibatalkan ke akhir antrean dengan parameter yang sama."""
+        with self._kunci:
+            job = self.jobs.get(id_job)
+            if job is None or job.status not in (STATUS_GAGAL, STATUS_DIBATALKAN): return False
+            job.status = STATUS_MENUNGGU; job.event_batal.clear()
+            job.progres_terakhir = None; job.pesan_error = None; job.durasi_detik = None
+            self._menunggu.append(job)
+        self._kabari(job, "status")
+        self._jadwalkan()
+        return True
+
+    def hapus_selesai(self):
+        """Menghapus job berstatus akhir dari daftar; mengembalikan id yang dihapus."""
+        with self._kunci:
+            id_dihapus = [id_job for id_job, job in self.jobs.items() if job.status in STATUS_AKHIR]
+            for id_job in id_dihapus: del self.jobs[id_job]
+        return id_dihapus
+
+    def ringkasan(self):
+        with self._kunci:
+            hitung = {}
+            for job in self.jobs.values(): hitung[job.status] = hitung.get(job.status, 0) + 1
+        return hitung
+
+    def tutup(self, tunggu=False):
+        """Membatalkan semua job dan mematikan worker pool."""
+        with self._kunci:
+            for job in self.jobs.values():
+                job.event_batal.set()
+                if job.status == STATUS_MENUNGGU: job.status = STATUS_DIBATALKAN
+            self._menunggu.clear()
+        self._executor.shutdown(wait=tunggu)
+
+    # --- Penjadwal ---
+    def _jadwalkan(self):
+        dimulai = []
+        with self._kunci:
+            while self._menunggu and self._jumlah_berjalan < self.maks_bersamaan:
+                job = self._menunggu.popleft()
+                job.status = STATUS_BERJALAN; job.percobaan += 1
+                self._jumlah_berjalan += 1
+                dimulai.append(job)
+        for job in dimulai:
+            self._kabari(job, "status")
+            self._executor.submit(self._jalankan, job)
+
+    def _jalankan(self, job):
+        mulai = time.perf_counter()
+        try:
+            berhasil = job.fungsi(job)
+        except Exception as e:
+            berhasil = False; job.pesan_error = str(e)
+            job.log(f"Error: {e}")
+        with self._kunci:
+            self._jumlah_berjalan -= 1
+            job.durasi_detik = time.perf_counter() - mulai
+            if berhasil: job.status = STATUS_SELESAI
+            else: job.status = STATUS_DIBATALKAN if job.dibatalkan() else STATUS_GAGAL
+        self._kabari(job, "status")
+        self._jadwalkan()
+
+# --- Blok Utama untuk Demonstrasi Antrean ---
+if __name__ == "__main__":
+    from config_and_setup import setup_kunci_ecc
+    from session import Embedder, Extractor
+    print("="*70)
+    print("ANTREAN JOB EMBED/EKSTRAKSI (WORKER POOL)")
+    print("="*70)
+    input_dir = os.path.join("media", "input"); output_dir = os.path.join("media", "output")
+    os.makedirs(output_dir, exist_ok=True)
+    bob_private_ecc, _ = setup_kunci_ecc()
+    if bob_private_ecc is None: raise SystemExit(1)
+    path_kunci_publik, path_kunci_privat = "bob_public_key.pem", "bob_private_key.pem"
+
+    def job_embed_ekstrak(job):
+        p = job.parameter
+        embedder = Embedder(antrean.kunci_publik(path_kunci_publik), 20, 10, log=job.log, progres=job.progres, batal=job.dibatalkan)
+        if not embedder.embed(p["video"], p["gambar"], p["output"])[0]: return False
+        extractor = Extractor(antrean.kunci_privat(path_kunci_privat), 20, 10, log=job.log, batal=job.dibatalkan)
+        return extractor.ekstrak(p["output"] + ".avi", p["output"] + "_extracted.png")
+
+    def cetak_status(job, jenis, isi):
+        if jenis == "status": print(f"  Job {job.id}: {job.status}")
+
+    antrean = AntreanJob(maks_bersamaan=2, notifikasi=cetak_status)
+    for i in range(3):
+        antrean.tambah("embed", job_embed_ekstrak, video=os.path.join(input_dir, "cover.mp4"),
+                       gambar=os.path.join(input_dir, "ini_adalah_rahasia_grayscale.png"),
+                       output=os.path.join(output_dir, f"stego_antrean_{i + 1}"))
+    while any(job.status not in STATUS_AKHIR for job in list(antrean.jobs.values())): time.sleep(0.2)
+    print(f"  Ringkasan: {antrean.ringkasan()}")
+    antrean.tutup()
+    print("\nPROGRAM SELESAI")
+    print("="*70)
@@ -0,0 +1,468 @@
+import os
+import re
+import struct
+import argparse
+import cv2
+import numpy as np
+
+from config_and_setup import setup_kunci_ecc
+from embed_process import buat_payload_embed
+from extract_process import _ekstraksi_dari_sumber_bit
+from instrumentation import METRIK_NONAKTIF
+from avi_container import baca_indeks_avi, PenulisAVI, FOURCC_SELALU_INTRA
+
+# --- Tabel Huffman Standar JPEG (ITU-T T.81 Annex K.3) ---
+# Dipakai untuk enkode ulang setiap frame stego: tabel standar memuat semua simbol baseline,
+# sehingga koefisien yang diubah QIM selalu dapat dikodekan (tabel hasil optimasi belum tentu).
+BITS_DC_LUMA = (0, 1, 5, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0)
+VALS_DC_LUMA = tuple(range(12))
+BITS_DC_KROMA = (0, 3, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0)
+VALS_DC_KROMA = tuple(range(12))
+BITS_AC_LUMA = (0, 2, 1, 3, 3, 2, 4, 3, 5, 5, 4, 4, 0, 0, 1, 0x7d)
+VALS_AC_LUMA = (
+    0x01, 0x02, 0x03, 0x00, 0x04, 0x11, 0x05, 0x12, 0x21, 0x31, 0x41, 0x06, 0x13, 0x51, 0x61, 0x07,
+    0x22, 0x71, 0x14, 0x32, 0x81, 0x91, 0xa1, 0x08, 0x23, 0x42, 0xb1, 0xc1, 0x15, 0x52, 0xd1, 0xf0,
+    0x24, 0x33, 0x62, 0x72, 0x82, 0x09, 0x0a, 0x16, 0x17, 0x18, 0x19, 0x1a, 0x25, 0x26, 0x27, 0x28,
+    0x29, 0x2a, 0x34, 0x35, 0x36, 0x37, 0x38, 0x39, 0x3a, 0x43, 0x44, 0x45, 0x46, 0x47, 0x48, 0x49,
+    0x4a, 0x53, 0x54, 0x55, 0x56, 0x57, 0x58, 0x59, 0x5a, 0x63, 0x64, 0x65, 0x66, 0x67, 0x68, 0x69,
+    0x6a, 0x73, 0x74, 0x75, 0x76, 0x77, 0x78, 0x79, 0x7a, 0x83, 0x84, 0x85, 0x86, 0x87, 0x88, 0x89,
+    0x8a, 0x92, 0x93, 0x94, 0x95, 0x96, 0x97, 0x98, 0x99, 0x9a, 0xa2, 0xa3, 0xa4, 0xa5, 0xa6, 0xa7,
+    0xa8, 0xa9, 0xaa, 0xb2, 0xb3, 0xb4, 0xb5, 0xb6, 0xb7, 0xb8, 0xb9, 0xba, 0xc2, 0xc3, 0xc4, 0xc5,
+    0xc6, 0xc7, 0xc8, 0xc9, 0xca, 0xd2, 0xd3, 0xd4, 0xd5, 0xd6, 0xd7, 0xd8, 0xd9, 0xda, 0xe1, 0xe2,
+    0xe3, 0xe4, 0xe5, 0xe6, 0xe7, 0xe8, 0xe9, 0xea, 0xf1, 0xf2, 0xf3, 0xf4, 0xf5, 0xf6, 0xf7, 0xf8,
+    0xf9, 0xfa)
+BITS_AC_KROMA = (0, 2, 1, 2, 4, 4, 3, 4, 7, 5, 4, 4, 0, 1, 2, 0x77)
+VALS_AC_KROMA = (
+    0x00, 0x01, 0x02, 0x03, 0x11, 0x04, 0x05, 0x21, 0x31, 0x06, 0x12, 0x41, 0x51, 0x07, 0x61, 0x71,
+    0x13, 0x22, 0x32, 0x81, 0x08, 0x14, 0x42, 0x91, 0xa1, 0xb1, 0xc1, 0x09, 0x23, 0x33, 0x52, 0xf0,
+    0x15, 0x62, 0x72, 0xd1, 0x0a, 0x16, 0x24, 0x34, 0xe1, 0x25, 0xf1, 0x17, 0x18, 0x19, 0x1a, 0x26,
+    0x27, 0x28, 0x29, 0x2a, 0x35, 0x36, 0x37, 0x38, 0x39, 0x3a, 0x43, 0x44, 0x45, 0x46, 0x47, 0x48,
+    0x49, 0x4a, 0x53, 0x54, 0x55, 0x56, 0x57, 0x58, 0x59, 0x5a, 0x63, 0x64, 0x65, 0x66, 0x67, 0x68,
+    0x69, 0x6a, 0x73, 0x74, 0x75, 0x76, 0x77, 0x78, 0x79, 0x7a, 0x82, 0x83, 0x84, 0x85, 0x86, 0x87,
+    0x88, 0x89, 0x8a, 0x92, 0x93, 0x94, 0x95, 0x96, 0x97, 0x98, 0x99, 0x9a, 0xa2, 0xa3, 0xa4, 0xa5,
+    0xa6, 0xa7, 0xa8, 0xa9, 0xaa, 0xb2, 0xb3, 0xb4, 0xb5, 0xb6, 0xb7, 0xb8, 0xb9, 0xba, 0xc2, 0xc3,
+    0xc4, 0xc5, 0xc6, 0xc7, 0xc8, 0xc9, 0xca, 0xd2, 0xd3, 0xd4, 0xd5, 0xd6, 0xd7, 0xd8, 0xd9, 0xda,
+    0xe2, 0xe3, 0xe4, 0xe5, 0xe6, 0xe7, 0xe8, 0xe9, 0xea, 0xf2, 0xf3, 0xf4, 0xf5, 0xf6, 0xf7, 0xf8,
+    0xf9, 0xfa)
+# Tabel standar kelas DC (0) dan AC (1) untuk tujuan 0 (luma) dan 1 (kroma)
+TABEL_HUFFMAN_STANDAR = {(0, 0): (BITS_DC_LUMA, VALS_DC_LUMA), (1, 0): (BITS_AC_LUMA, VALS_AC_LUMA),
+                         (0, 1): (BITS_DC_KROMA, VALS_DC_KROMA), (1, 1): (BITS_AC_KROMA, VALS_AC_KROMA)}
+MAKS_KOEFISIEN_AC_BASELINE = 1023  # Kategori magnitudo AC baseline maksimal 10 bit
+
+# Marker SOF selain baseline/extended Huffman (progressive, lossless, aritmetika) tidak didukung.
+_SOF_TIDAK_DIDUKUNG = {0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+_POLA_AKHIR_SCAN = re.compile(rb'\xff[^\x00\xd0-\xd7]')
+_POLA_RST = re.compile(rb'\xff[\xd0-\xd7]')
+
+# --- Tabel Huffman ---
+_cache_lut = {}
+
+def _lut_huffman(bits, vals):
+    """LUT 16 bit untuk dekode: (panjang kode, simbol) per jendela 16 bit; panjang 0 = kode tidak valid."""
+    kunci = (tuple(bits), tuple(vals))
+    if kunci not in _cache_lut:
+        panjang = np.zeros(65536, dtype=np.int64); simbol = np.zeros(65536, dtype=np.int64)
+        kode = 0; k = 0
+        for L in range(1, 17):
+            for _ in range(bits[L - 1]):
+                panjang[kode << (16 - L):(kode + 1) << (16 - L)] = L
+                simbol[kode << (16 - L):(kode + 1) << (16 - L)] = vals[k]
+                kode += 1; k += 1
+            kode <<= 1
+        _cache_lut[kunci] = (panjang.tolist(), simbol.tolist())
+    return _cache_lut[kunci]
+
+def _kode_huffman(bits, vals):
+    """Tabel enkode: list 256 (kode, panjang) per simbol."""
+    tabel = [(0, 0)] * 256
+    kode = 0; k = 0
+    for L in range(1, 17):
+        for _ in range(bits[L - 1]):
+            tabel[vals[k]] = (kode, L)
+            kode += 1; k += 1
+        kode <<= 1
+    return tabel
+
+_KODE_STANDAR = {kunci: _kode_huffman(*nilai) for kunci, nilai in TABEL_HUFFMAN_STANDAR.items()}
+
+def _segmen_dht_standar():
+    isi = b""
+    for (kelas, tujuan), (bits, vals) in sorted(TABEL_HUFFMAN_STANDAR.items(), key=lambda item: (item[0][1], item[0][0])):
+        isi += bytes([(kelas << 4) | tujuan]) + bytes(bits) + bytes(vals)
+    return b"\xff\xc4" + struct.pack(">H", len(isi) + 2) + isi
+
+_DHT_STANDAR = _segmen_dht_standar()
+
+# --- Struktur Frame JPEG ---
+class FrameJPEG:
+    """
+    Frame JPEG baseline yang sudah di-dekode sampai koefisien terkuantisasi.
+    `koefisien[i]` berbentuk (jumlah_blok_komponen, 64) int32 dengan urutan zigzag (urutan bitstream),
+    blok diurutkan raster pada grid blok komponen (termasuk padding MCU).
+    """
+    def __init__(self):
+        self.segmen = []           # (marker, bytes segmen lengkap) sebelum SOS, selain DHT
+        self.lebar = self.tinggi = 0
+        self.komponen = []         # dict: id, h, v, tq, blok_w, blok_h
+        self.interval_restart = 0
+        self.koefisien = []
+        self.urutan_blok = None    # (indeks_komponen, indeks_blok) per blok dalam urutan scan
+        self.blok_per_mcu = 1
+
+def _jendela_16bit(data):
+    """Nilai 16 bit mulai dari setiap posisi bit (list), dengan padding bit 1 di akhir."""
+    b = np.frombuffer(data + b"\xff" * 4, dtype=np.uint8).astype(np.int64)
+    t = (b[:-2] << 16) | (b[1:-1] << 8) | b[2:]
+    return ((t[:, None] >> (8 - np.arange(8))[None, :]) & 0xFFFF).reshape(-1).tolist()
+
+def _susun_urutan_blok(frame, interleaved):
+    komponen_idx, blok_idx = [], []
+    if interleaved:
+        h_maks = max(c["h"] for c in frame.komponen); v_maks = max(c["v"] for c in frame.komponen)
+        mcu_x = -(-frame.lebar // (8 * h_maks)); mcu_y = -(-frame.tinggi // (8 * v_maks))
+        for c in frame.komponen:
+            c["blok_w"], c["blok_h"] = mcu_x * c["h"], mcu_y * c["v"]
+        for my in range(mcu_y):
+            for mx in range(mcu_x):
+                for i, c in enumerate(frame.komponen):
+                    for v in range(c["v"]):
+                        for h in range(c["h"]):
+                            komponen_idx.append(i); blok_idx.append((my * c["v"] + v) * c["blok_w"] + mx * c["h"] + h)
+        frame.blok_per_mcu = sum(c["h"] * c["v"] for c in frame.komponen)
+    else:
+        c = frame.komponen[0]
+        c["blok_w"] = -(-frame.lebar // 8); c["blok_h"] = -(-frame.tinggi // 8)
+        jumlah = c["blok_w"] * c["blok_h"]
+        komponen_idx = [0] * jumlah; blok_idx = list(range(jumlah))
+        frame.blok_per_mcu = 1
+    frame.urutan_blok = (np.array(komponen_idx, dtype=np.int64), np.array(blok_idx, dtype=np.int64))
+
+def _dekode_entropi(frame, data_scan, tabel_dc, tabel_ac):
+    """Dekode Huffman seluruh scan (dengan interval restart) menjadi koefisien per komponen."""
+    komponen_idx = frame.urutan_blok[0].tolist()
+    segmen_scan = _POLA_RST.split(data_scan) if frame.interval_restart else [data_scan]
+    blok_per_segmen = frame.interval_restart * frame.blok_per_mcu if frame.interval_restart else len(komponen_idx)
+    semua_blok = []
+    for nomor_segmen, segmen in enumerate(segmen_scan):
+        awal = nomor_segmen * blok_per_segmen
+        if awal >= len(komponen_idx): break
+        win = _jendela_16bit(segmen.replace(b"\xff\x00", b"\xff"))
+        pos = 0
+        prediktor = [0] * len(frame.komponen)
+        try:
+            for ci in komponen_idx[awal:awal + blok_per_segmen]:
+                dc_len, dc_sym = tabel_dc[ci]; ac_len, ac_sym = tabel_ac[ci]
+                w = win[pos]; L = dc_len[w]
+                if L == 0: raise ValueError("kode Huffman DC tidak valid")
+                s = dc_sym[w]; pos += L
+                nilai = 0
+                if s:
+                    nilai = win[pos] >> (16 - s); pos += s
+                    if nilai < (1 << (s - 1)): nilai -= (1 << s) - 1
+                prediktor[ci] += nilai
+                blok = [0] * 64; blok[0] = prediktor[ci]
+                k = 1
+                while k < 64:
+                    w = win[pos]; L = ac_len[w]
+                    if L == 0: raise ValueError("kode Huffman AC tidak valid")
+                    rs = ac_sym[w]; pos += L
+                    s = rs & 15
+                    if s == 0:
+                        if rs == 0xF0: k += 16; continue
+                        break  # EOB
+                    k += rs >> 4
+                    nilai = win[pos] >> (16 - s); pos += s
+                    if nilai < (1 << (s - 1)): nilai -= (1 << s) - 1
+                    blok[k] = nilai; k += 1
+                semua_blok.append(blok)
+        except IndexError:
+            raise ValueError("Data scan JPEG terpotong.")
+    if len(semua_blok) != len(komponen_idx):
+        raise ValueError(f"Jumlah blok scan tidak sesuai ({len(semua_blok)}/{len(komponen_idx)}).")
+    semua_blok = np.array(semua_blok, dtype=np.int32)
+    komponen_arr, blok_arr = frame.urutan_blok
+    frame.koefisien = []
+    for i, c in enumerate(frame.komponen):
+        koef = np.zeros((c["blok_w"] * c["blok_h"], 64), dtype=np.int32)
+        mask = komponen_arr == i
+        koef[blok_arr[mask]] = semua_blok[mask]
+        frame.koefisien.append(koef)
+
+def parse_jpeg(data):
+    """Parsing + dekode entropi satu frame JPEG baseline (Huffman, 8 bit, satu scan). ValueError jika tidak didukung."""
+    if data[:2] != b"\xff\xd8": raise ValueError("Bukan data JPEG (SOI tidak ditemukan).")
+    frame = FrameJPEG()
+    tabel_huffman = {}
+    i = 2
+    while i < len(data):
+        if data[i] != 0xFF: raise ValueError(f"Marker JPEG tidak valid pada offset {i}.")
+        marker = data[i + 1]
+        if marker == 0xFF: i += 1; continue  # Byte pengisi
+        if marker == 0xD9: raise ValueError("EOI sebelum SOS.")
+        panjang = struct.unpack(">H", data[i + 2:i + 4])[0]
+        isi = data[i + 4:i + 2 + panjang]
+        segmen_lengkap = data[i:i + 2 + panjang]
+        if marker in _SOF_TIDAK_DIDUKUNG:
+            raise ValueError(f"SOF 0x{marker:02X} (progressive/lossless/aritmetika) tidak didukung.")
+        if marker in (0xC0, 0xC1):
+            if isi[0] != 8: raise ValueError("Hanya JPEG 8 bit yang didukung.")
+            frame.tinggi, frame.lebar = struct.unpack(">HH", isi[1:5])
+            frame.komponen = [{"id": isi[6 + 3 * k], "h": isi[7 + 3 * k] >> 4, "v": isi[7 + 3 * k] & 15, "tq": isi[8 + 3 * k]}
+                              for k in range(isi[5])]
+            frame.segmen.append((marker, segmen_lengkap))
+        elif marker == 0xC4:
+            j = 0
+            while j < len(isi):
+                kelas, tujuan = isi[j] >> 4, isi[j] & 15
+                bits = tuple(isi[j + 1:j + 17]); jumlah = sum(bits)
+                tabel_huffman[(kelas, tujuan)] = (bits, tuple(isi[j + 17:j + 17 + jumlah]))
+                j += 17 + jumlah
+        elif marker == 0xDD:
+            frame.interval_restart = struct.unpack(">H", isi[:2])[0]
+            frame.segmen.append((marker, segmen_lengkap))
+        elif marker == 0xDA:
+            if not frame.komponen: raise ValueError("SOS sebelum SOF.")
+            jumlah_scan = isi[0]
+            if jumlah_scan != len(frame.komponen):
+                raise ValueError("JPEG multi-scan (non-interleaved banyak komponen) tidak didukung.")
+            id_ke_indeks = {c["id"]: k for k, c in enumerate(frame.komponen)}
+            urutan_scan = [id_ke_indeks[isi[1 + 2 * k]] for k in range(jumlah_scan)]
+            if urutan_scan != list(range(len(frame.komponen))):
+                raise ValueError("Urutan komponen scan berbeda dari SOF tidak didukung.")
+            pilihan_tabel = [(isi[2 + 2 * k] >> 4, isi[2 + 2 * k] & 15) for k in range(jumlah_scan)]
+            awal_data = i + 2 + panjang
+            akhir = _POLA_AKHIR_SCAN.search(data, awal_data)
+            akhir_data = akhir.start() if akhir else len(data)
+            tabel_huffman = {**{k: v for k, v in TABEL_HUFFMAN_STANDAR.items() if k not in tabel_huffman}, **tabel_huffman}
+            tabel_dc = [_lut_huffman(*tabel_huffman[(0, td)]) for td, _ in pilihan_tabel]
+            tabel_ac = [_lut_huffman(*tabel_huffman[(1, ta)]) for _, ta in pilihan_tabel]
+            _susun_urutan_blok(frame, interleaved=jumlah_scan > 1)
+            _dekode_entropi(frame, data[awal_data:akhir_data], tabel_dc, tabel_ac)
+            return frame
+        else:
+            frame.segmen.append((marker, segmen_lengkap))  # APPn, COM, DQT, dll. disalin apa adanya
+        i += 2 + panjang
+    raise ValueError("SOS tidak ditemukan.")
+
+# --- Enkode Ulang ---
+def _kemas_bit(nilai, panjang):
+    """Mengemas pasangan (nilai, panjang bit) menjadi byte dengan padding bit 1 dan byte stuffing 0xFF00."""
+    nilai = np.asarray(nilai, dtype=np.int64); panjang = np.asarray(panjang, dtype=np.int64)
+    total = int(panjang.sum())
+    indeks = np.repeat(np.arange(len(panjang)), panjang)
+    geser = np.cumsum(panjang)[indeks] - 1 - np.arange(total)
+    bits = ((nilai[indeks] >> geser) & 1).astype(np.uint8)
+    data = np.packbits(np.concatenate([bits, np.ones(-total % 8, dtype=np.uint8)]))
+    return np.insert(data, np.nonzero(data == 0xFF)[0] + 1, 0).tobytes()
+
+def _enkode_entropi(frame):
+    komponen_arr, blok_arr = frame.urutan_blok
+    komponen_idx = komponen_arr.tolist()
+    blok_urut = np.empty((len(komponen_idx), 64), dtype=np.int32)
+    for i, koef in enumerate(frame.koefisien):
+        mask = komponen_arr == i
+        blok_urut[mask] = koef[blok_arr[mask]]
+    blok_urut = blok_urut.tolist()
+    kode_dc = [_KODE_STANDAR[(0, min(i, 1))] for i in range(len(frame.komponen))]
+    kode_ac = [_KODE_STANDAR[(1, min(i, 1))] for i in range(len(frame.komponen))]
+    blok_per_segmen = frame.interval_restart * frame.blok_per_mcu if frame.interval_restart else len(komponen_idx)
+
+    keluaran = b""
+    for nomor_segmen, awal in enumerate(range(0, len(komponen_idx), blok_per_segmen)):
+        nilai, panjang = [], []
+        prediktor = [0] * len(frame.komponen)
+        for ci, blok in zip(komponen_idx[awal:awal + blok_per_segmen], blok_urut[awal:awal + blok_per_segmen]):
+            selisih = blok[0] - prediktor[ci]; prediktor[ci] = blok[0]
+            s = abs(selisih).bit_length()
+            kode, L = kode_dc[ci][s]
+            nilai.append((kode << s) | ((selisih if selisih >= 0 else selisih + (1 << s) - 1))); panjang.append(L + s)
+            tabel_ac = kode_ac[ci]
+            run = 0
+            for k in range(1, 64):
+                v = blok[k]
+                if v == 0: run += 1; continue
+                while run > 15:
+                    kode, L = tabel_ac[0xF0]; nilai.append(kode); panjang.append(L); run -= 16
+                s = abs(v).bit_length()
+                kode, L = tabel_ac[(run << 4) | s]
+                nilai.append((kode << s) | (v if v >= 0 else v + (1 << s) - 1)); panjang.append(L + s)
+                run = 0
+            if run:
+                kode, L = tabel_ac[0x00]; nilai.append(kode); panjang.append(L)
+        if nomor_segmen > 0: keluaran += bytes([0xFF, 0xD0 + (nomor_segmen - 1) % 8])
+        keluaran += _kemas_bit(nilai, panjang)
+    return keluaran
+
+def tulis_jpeg(frame):
+    """Menyusun ulang JPEG: segmen asli (DQT, SOF, APPn, DRI) + DHT standar + SOS + data entropi baru."""
+    bagian = [b"\xff\xd8"] + [segmen for _, segmen in frame.segmen] + [_DHT_STANDAR]
+    isi_sos = bytes([len(frame.komponen)])
+    for i, c in enumerate(frame.komponen):
+        tabel = min(i, 1)
+        isi_sos += bytes([c["id"], (tabel << 4) | tabel])
+    isi_sos += bytes([0, 63, 0])
+    bagian.append(b"\xff\xda" + struct.pack(">H", len(isi_sos) + 2) + isi_sos)
+    bagian.append(_enkode_entropi(frame))
+    bagian.append(b"\xff\xd9")
+    return b"".join(bagian)
+
+# --- QIM Paritas pada Koefisien Terkuantisasi ---
+def sisipkan_paritas_koefisien(koef_luma, bitstream, num_ac_coeffs):
+    """
+    Memaksa paritas koefisien AC terkuantisasi (zigzag 1..N) sama dengan bit, aturan yang sama dengan
+    qim_embed_koefisien (bit 1 & genap: +1, bit 0 & ganjil: -1) dengan langkah kuantisasi tabel DQT
+    sebagai delta. Mengubah koef_luma in-place; mengembalikan jumlah bit yang disisipkan.
+    """
+    coeffs_per_block = min(num_ac_coeffs, 63)
+    jumlah_bit = min(len(bitstream), koef_luma.shape[0] * coeffs_per_block)
+    if jumlah_bit == 0: return 0
+    blok_dipakai = -(-jumlah_bit // coeffs_per_block)
+    carrier = koef_luma[:blok_dipakai, 1:1 + coeffs_per_block].reshape(-1)[:jumlah_bit].astype(np.int64)
+    bits = np.frombuffer(bitstream[:jumlah_bit].encode('ascii'), dtype=np.uint8) - 48
+    langkah = np.where((carrier & 1) != bits, np.where(bits == 1, 1, -1), 0)
+    baru = carrier + langkah
+    # Tetap di rentang baseline: arah sebaliknya juga membalik paritas.
+    di_luar = np.abs(baru) > MAKS_KOEFISIEN_AC_BASELINE
+    baru[di_luar] = carrier[di_luar] - langkah[di_luar]
+    area = koef_luma[:blok_dipakai, 1:1 + coeffs_per_block].reshape(-1)
+    area[:jumlah_bit] = baru
+    koef_luma[:blok_dipakai, 1:1 + coeffs_per_block] = area.reshape(blok_dipakai, coeffs_per_block)
+    return jumlah_bit
+
+def ekstrak_paritas_koefisien(koef_luma, num_ac_coeffs):
+    bits = (koef_luma[:, 1:1 + min(num_ac_coeffs, 63)] & 1).astype(np.uint8).reshape(-1)
+    return (bits + 48).tobytes().decode('ascii')
+
+# --- Embed Domain MJPEG ---
+def embed_gambar_ke_mjpeg_final(path_video_input, path_gambar_rahasia, path_video_output_base, num_ac_coeffs,
+                                kunci_publik_ecc_penerima_bytes_compressed, metrik=METRIK_NONAKTIF,
+                                skema_fec=None, parameter_fec=None):
+    """
+    Embed langsung pada koefisien luma terkuantisasi setiap frame MJPEG (tanpa IDCT/DCT dan tanpa
+    encode ulang lossless). Frame pembawa di-entropy-code ulang dengan tabel Huffman standar; frame
+    sisanya disalin byte-per-byte. Langkah kuantisasi DQT berperan sebagai DELTA.
+    Mengembalikan (berhasil, frame_gray_asli_pertama, frame_gray_stego_pertama) seperti embed domain piksel.
+    """
+    print(f"\n=== MEMULAI PROSES EMBEDDING GAMBAR KE VIDEO (DOMAIN MJPEG) ===")
+    print(f"  Gambar Rahasia: '{path_gambar_rahasia}'")
+    print(f"  Video Input: '{path_video_input}'")
+    print(f"  Parameter: Koefisien AC (zigzag) per Blok={num_ac_coeffs}")
+    try:
+        info, daftar_frame = baca_indeks_avi(path_video_input)
+    except (OSError, ValueError, struct.error) as e:
+        print(f"    Error: Gagal membaca AVI '{path_video_input}': {e}"); return False, None, None
+    if info["fourcc"].upper() not in FOURCC_SELALU_INTRA:
+        print(f"    Error: Stream video bukan MJPEG (fourcc '{info['fourcc']}')."); return False, None, None
+
+    total_payload_bitstream = buat_payload_embed(path_gambar_rahasia, kunci_publik_ecc_penerima_bytes_compressed,
+                                                 metrik, skema_fec, parameter_fec)
+    if total_payload_bitstream is None: return False, None, None
+    total_bits_to_embed = len(total_payload_bitstream)
+
+    print("\n  [Tahap Embedding 3: Menyisipkan Payload ke Koefisien JPEG]")
+    actual_video_output_path = os.path.splitext(path_video_output_base)[0] + ".avi"
+    penulis = PenulisAVI(actual_video_output_path, info["lebar"], info["tinggi"], info["rate"], info["scale"], fourcc="MJPG")
+    print(f"    Video output akan disimpan sebagai '{actual_video_output_path}' (Codec: MJPG, domain terkompresi).")
+    current_payload_bit_index = 0
+    first_original_gray_for_psnr = first_stego_frame_gray_for_psnr = None
+    try:
+        with open(path_video_input, "rb") as f:
+            for nomor_frame, (offset, ukuran, _) in enumerate(daftar_frame, start=1):
+                f.seek(offset); data = f.read(ukuran)
+                if current_payload_bit_index < total_bits_to_embed and ukuran > 0:
+                    with metrik.tahap('dekode_jpeg'):
+                        frame = parse_jpeg(data)
+                    with metrik.tahap('qim'):
+                        bits_embedded_this_frame = sisipkan_paritas_koefisien(
+                            frame.koefisien[0], total_payload_bitstream[current_payload_bit_index:], num_ac_coeffs)
+                    with metrik.tahap('enkode_jpeg'):
+                        data_stego = tulis_jpeg(frame)
+                    if first_original_gray_for_psnr is None:
+                        first_original_gray_for_psnr = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_GRAYSCALE)
+                        first_stego_frame_gray_for_psnr = cv2.imdecode(np.frombuffer(data_stego, np.uint8), cv2.IMREAD_GRAYSCALE)
+                    data = data_stego
+                    current_payload_bit_index += bits_embedded_this_frame
+                    metrik.tambah('frame_embed')
+                    print(f"    Frame {nomor_frame}: {bits_embedded_this_frame} bits disisipkan. "
+                          f"Total disisipkan: {current_payload_bit_index}/{total_bits_to_embed} ({len(data)} bytes)")
+                else:
+                    metrik.tambah('frame_salin')
+                with metrik.tahap('tulis_avi'):
+                    penulis.tulis(data)
+    except ValueError as e:
+        print(f"    Error: Frame JPEG tidak didukung: {e}"); return False, None, None
+    finally:
+        penulis.tutup()
+
+    if current_payload_bit_index < total_bits_to_embed:
+        print(f"  Proses embedding selesai, namun TIDAK semua data berhasil disisipkan "
+              f"({current_payload_bit_index}/{total_bits_to_embed} bits)."); return False, None, None
+    print(f"  Proses embedding (domain MJPEG) selesai. Video output: '{actual_video_output_path}'.")
+    return True, first_original_gray_for_psnr, first_stego_frame_gray_for_psnr
+
+# --- Ekstraksi Domain MJPEG ---
+class SumberBitMJPEG:
+    """Sumber bit per frame untuk _ekstraksi_dari_sumber_bit: paritas koefisien luma langsung dari bitstream JPEG."""
+    def __init__(self, path_avi, num_ac_coeffs, metrik=METRIK_NONAKTIF):
+        self.info, self.daftar_frame = baca_indeks_avi(path_avi)
+        self.f = open(path_avi, "rb")
+        self.num_ac_coeffs = num_ac_coeffs
+        self.metrik = metrik
+        self.indeks_frame = 0
+
+    def frame_berikutnya(self):
+        # Frame kosong (drop frame) dilewati, sama seperti saat embed.
+        while self.indeks_frame < len(self.daftar_frame) and self.daftar_frame[self.indeks_frame][1] == 0:
+            self.indeks_frame += 1
+        if self.indeks_frame >= len(self.daftar_frame): return None
+        offset, ukuran, _ = self.daftar_frame[self.indeks_frame]
+        self.indeks_frame += 1
+        self.f.seek(offset)
+        with self.metrik.tahap('dekode_jpeg'):
+            try:
+                frame = parse_jpeg(self.f.read(ukuran))
+            except ValueError as e:
+                print(f"    Error: Frame JPEG ke-{self.indeks_frame} tidak bisa di-dekode: {e}"); return None
+        return ekstrak_paritas_koefisien(frame.koefisien[0], self.num_ac_coeffs)
+
+    def tutup(self):
+        self.f.close()
+
+def ekstraksi_gambar_mjpeg_final(path_stego_video, path_gambar_output, num_ac_coeffs, kunci_privat_ecc_penerima,
+                                 bits_untuk_dimensi=16, metrik=METRIK_NONAKTIF):
+    print(f"\n=== MEMULAI PROSES EKSTRAKSI GAMBAR DARI VIDEO (DOMAIN MJPEG) ===")
+    print(f"  Stego Video: '{path_stego_video}'")
+    print(f"  Parameter: Koefisien AC (zigzag) per Blok={num_ac_coeffs}")
+    try:
+        sumber_bit = SumberBitMJPEG(path_stego_video, num_ac_coeffs, metrik)
+    except (OSError, ValueError, struct.error) as e:
+        print(f"  Error: Tidak bisa membaca stego-video MJPEG '{path_stego_video}': {e}"); return False
+    return _ekstraksi_dari_sumber_bit(sumber_bit, path_gambar_output, kunci_privat_ecc_penerima, bits_untuk_dimensi, metrik)
+
+# --- Blok Utama ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Embed/ekstraksi langsung di domain terkompresi MJPEG (AVI).")
+    sub = parser.add_subparsers(dest="mode", required=True)
+    p_embed = sub.add_parser("embed")
+    p_embed.add_argument("video"); p_embed.add_argument("gambar"); p_embed.add_argument("output")
+    p_extract = sub.add_parser("extract")
+    p_extract.add_argument("video"); p_extract.add_argument("output")
+    for p in (p_embed, p_extract):
+        p.add_argument("--koefisien", type=int, default=10)
+    p_embed.add_argument("--fec", default=None, choices=["repetisi", "hamming74", "reed_solomon"])
+    args = parser.parse_args()
+
+    print("="*70)
+    print("STEGANOGRAFI VIDEO DOMAIN MJPEG (SHA3-ECC-AES)")
+    print("="*70)
+    bob_private_ecc, bob_public_key_bytes_compressed = setup_kunci_ecc()
+    if args.mode == "embed":
+        berhasil, orig_gray, stego_gray = embed_gambar_ke_mjpeg_final(args.video, args.gambar, args.output, args.koefisien,
+                                                                      bob_public_key_bytes_compressed, skema_fec=args.fec)
+        if berhasil and orig_gray is not None:
+            print(f"  PSNR Frame Pertama (Asli vs Stego, grayscale): {cv2.PSNR(orig_gray, stego_gray):.2f} dB")
+    else:
+        berhasil = ekstraksi_gambar_mjpeg_final(args.video, args.output, args.koefisien, bob_private_ecc)
+    print(f"\n  Status: {'BERHASIL' if berhasil else 'GAGAL'}")
+    print("\nPROGRAM SELESAI")
+    print("="*70)
@@ -0,0 +1,180 @@
+import os
+import csv
+import json
+import time
+import argparse
+import cv2
+import numpy as np
+
+from config_and_setup import koefisien_dct_frame, psnr_prediksi_dari_sse
+from cache import CacheKoefisienDCT
+from frame_store import buka_sumber_frame
+
+# --- Konfigurasi Sweep ---
+DELTA_GRID_DEFAULT = (5, 10, 15, 20, 30, 40)
+KOEFISIEN_GRID_DEFAULT = (1, 3, 5, 10, 20, 40, 63)
+JUMLAH_SAMPEL_DEFAULT = 8
+
+# --- Pembacaan Frame Sampel ---
+def baca_frame_sampel(path_video, jumlah_sampel=JUMLAH_SAMPEL_DEFAULT, cache_dct=None):
+    """
+    Membaca `jumlah_sampel` frame grayscale (dipotong ke kelipatan 8) yang tersebar merata di video
+    dengan seek (CAP_PROP_POS_FRAMES), tanpa men-decode seluruh video.
+    Mengembalikan (list (indeks_frame, frame_gray), info_video). Jika `cache_dct` diberikan, frame
+    yang koefisiennya sudah ada di cache tidak dibaca (frame_gray bernilai None).
+    """
+    cap = buka_sumber_frame(path_video)
+    if not cap.isOpened(): raise IOError(f"Video '{path_video}' tidak bisa dibuka.")
+    try:
+        lebar = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)); tinggi = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        jumlah_frame = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        info_video = {"lebar": lebar, "tinggi": tinggi, "jumlah_frame": jumlah_frame,
+                      "fps": cap.get(cv2.CAP_PROP_FPS),
+                      "lebar_proses": (lebar // 8) * 8, "tinggi_proses": (tinggi // 8) * 8}
+        if jumlah_frame > 0:
+            indeks_sampel = np.unique(np.linspace(0, jumlah_frame - 1, min(jumlah_sampel, jumlah_frame)).astype(int))
+        else:
+            indeks_sampel = np.arange(jumlah_sampel)  # Jumlah frame tidak diketahui: ambil frame awal
+        entri_cache = None
+        if cache_dct is not None:
+            entri_cache = cache_dct.buka(path_video, lebar, tinggi, info_video["lebar_proses"], info_video["tinggi_proses"])
+        sampel = []
+        for indeks in indeks_sampel:
+            if entri_cache is not None and entri_cache.ambil(int(indeks)) is not None:
+                sampel.append((int(indeks), None)); continue
+            cap.set(cv2.CAP_PROP_POS_FRAMES, int(indeks))
+            ret, frame = cap.read()
+            if not ret: break
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+            sampel.append((int(indeks), gray[:info_video["tinggi_proses"], :info_video["lebar_proses"]]))
+        return sampel, info_video
+    finally:
+        cap.release()
+
+def koefisien_frame_sampel(path_video, jumlah_sampel=JUMLAH_SAMPEL_DEFAULT, cache_dct=None):
+    """
+    Seperti baca_frame_sampel, tetapi langsung mengembalikan koefisien DCT tiap frame sampel.
+    Jika `cache_dct` (CacheKoefisienDCT) diberikan, frame yang sudah ada di cache tidak di-decode
+    maupun di-DCT ulang, dan frame yang baru dihitung ikut disimpan.
+    """
+    sampel, info_video = baca_frame_sampel(path_video, jumlah_sampel, cache_dct)
+    entri_cache = None
+    if cache_dct is not None:
+        entri_cache = cache_dct.buka(path_video, info_video["lebar"], info_video["tinggi"],
+                                     info_video["lebar_proses"], info_video["tinggi_proses"])
+    hasil = []
+    for indeks, gray in sampel:
+        koef = entri_cache.ambil(indeks) if entri_cache is not None else None
+        if koef is None:
+            koef = koefisien_dct_frame(gray)
+            if entri_cache is not None: entri_cache.simpan(indeks, koef)
+        hasil.append((indeks, koef))
+    if entri_cache is not None: entri_cache.tutup()
+    return hasil, info_video
+
+# --- Prediksi Distorsi Tanpa IDCT ---
+def sse_harapan_per_koefisien(koefisien_ac, delta):
+    """
+    Error kuantisasi kuadrat yang diharapkan per koefisien untuk bit payload acak:
+    50% koefisien sudah berparitas benar (error ke titik kisi terdekat), 50% harus
+    dipindah ke titik kisi tetangga (aturan yang sama dengan qim_embed_koefisien).
+    """
+    indeks = np.rint(koefisien_ac / delta)
+    error_tetap = indeks * delta - koefisien_ac
+    indeks_flip = indeks + np.where(indeks.astype(np.int64) % 2 == 0, 1.0, -1.0)
+    error_flip = indeks_flip * delta - koefisien_ac
+    return 0.5 * np.square(error_tetap, dtype=np.float64) + 0.5 * np.square(error_flip, dtype=np.float64)
+
+def sweep_frame(koefisien, delta_grid, koefisien_grid):
+    """
+    Untuk satu frame (koefisien DCT sudah dihitung), kembalikan array SSE harapan
+    berbentuk (len(delta_grid), len(koefisien_grid)) dengan asumsi seluruh blok membawa payload.
+    Jumlah kumulatif per indeks koefisien membuat semua jumlah koefisien dihitung sekaligus.
+    """
+    koefisien_ac = koefisien[:, 1:]
+    indeks_kolom = np.minimum(np.asarray(koefisien_grid), 63) - 1
+    hasil = np.empty((len(delta_grid), len(koefisien_grid)), dtype=np.float64)
+    for i, delta in enumerate(delta_grid):
+        sse_kumulatif = np.cumsum(sse_harapan_per_koefisien(koefisien_ac, delta).sum(axis=0))
+        hasil[i] = sse_kumulatif[indeks_kolom]
+    return hasil
+
+def jalankan_sweep_parameter(path_video, delta_grid=DELTA_GRID_DEFAULT, koefisien_grid=KOEFISIEN_GRID_DEFAULT,
+                             jumlah_sampel=JUMLAH_SAMPEL_DEFAULT, payload_bits=None, path_output=None, cache_dct=None):
+    """
+    Menghitung tabel kapasitas vs PSNR prediksi untuk grid (delta x jumlah koefisien AC) dari
+    frame sampel, memakai satu DCT maju per frame (tanpa embed/IDCT/encode).
+    PSNR prediksi adalah PSNR grayscale sebelum clipping, untuk frame yang terisi penuh payload.
+    `cache_dct` (CacheKoefisienDCT, opsional) membuat sweep ulang pada cover yang sama tanpa decode/DCT.
+    """
+    print("\n=== SWEEP PARAMETER QIM (DOMAIN DCT) ===")
+    print(f"  Video: '{path_video}'")
+    mulai = time.perf_counter()
+    sampel, info_video = koefisien_frame_sampel(path_video, jumlah_sampel, cache_dct)
+    if not sampel:
+        print("  Error: Tidak ada frame sampel yang terbaca."); return None
+    jumlah_piksel = info_video["lebar_proses"] * info_video["tinggi_proses"]
+    jumlah_blok = (info_video["lebar_proses"] // 8) * (info_video["tinggi_proses"] // 8)
+    sse_semua = np.stack([sweep_frame(koef, delta_grid, koefisien_grid) for _, koef in sampel])
+    psnr_semua = 10.0 * np.log10((255.0 ** 2) * jumlah_piksel / np.maximum(sse_semua, 1e-12))
+    durasi = time.perf_counter() - mulai
+
+    baris_tabel = []
+    for i, delta in enumerate(delta_grid):
+        for j, num_koef in enumerate(koefisien_grid):
+            kapasitas_frame = jumlah_blok * min(num_koef, 63)
+            baris = {
+                "delta": delta, "num_ac_coeffs": num_koef,
+                "kapasitas_bit_per_frame": kapasitas_frame,
+                "kapasitas_bit_video": kapasitas_frame * info_video["jumlah_frame"],
+                "psnr_prediksi_rata_rata_db": float(psnr_prediksi_dari_sse(sse_semua[:, i, j].mean(), jumlah_piksel)),
+                "psnr_prediksi_min_db": float(psnr_semua[:, i, j].min()),
+            }
+            if payload_bits:
+                baris["frame_dibutuhkan"] = -(-payload_bits // kapasitas_frame)
+                baris["muat"] = baris["frame_dibutuhkan"] <= info_video["jumlah_frame"]
+            baris_tabel.append(baris)
+
+    print(f"  Frame sampel: {len(sampel)} dari {info_video['jumlah_frame']} ({info_video['lebar_proses']}x{info_video['tinggi_proses']}), "
+          f"selesai dalam {durasi:.2f} detik")
+    print(f"  {'DELTA':>6} {'KOEF':>5} {'BIT/FRAME':>10} {'PSNR RATA2':>11} {'PSNR MIN':>9}" + ("  FRAME" if payload_bits else ""))
+    for baris in baris_tabel:
+        teks = (f"  {baris['delta']:>6} {baris['num_ac_coeffs']:>5} {baris['kapasitas_bit_per_frame']:>10} "
+                f"{baris['psnr_prediksi_rata_rata_db']:>9.2f}dB {baris['psnr_prediksi_min_db']:>7.2f}dB")
+        if payload_bits: teks += f"  {baris['frame_dibutuhkan']:>5}{'' if baris['muat'] else ' (tidak muat)'}"
+        print(teks)
+
+    hasil = {"video": path_video, "info_video": info_video, "frame_sampel": [i for i, _ in sampel],
+             "durasi_detik": durasi, "tabel": baris_tabel}
+    if path_output:
+        direktori = os.path.dirname(path_output)
+        if direktori: os.makedirs(direktori, exist_ok=True)
+        if path_output.endswith(".csv"):
+            with open(path_output, "w", newline="") as f:
+                penulis = csv.DictWriter(f, fieldnames=list(baris_tabel[0].keys()))
+                penulis.writeheader(); penulis.writerows(baris_tabel)
+        else:
+            with open(path_output, "w") as f:
+                json.dump(hasil, f, indent=2)
+        print(f"  Tabel sweep disimpan ke '{path_output}'.")
+    return hasil
+
+# --- Blok Utama untuk Menjalankan Sweep ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep parameter QIM (delta x koefisien AC) tanpa embed penuh.")
+    parser.add_argument("video", nargs="?", default=os.path.join("media", "input", "cover_1.mp4"))
+    parser.add_argument("--delta", nargs="+", type=float, default=list(DELTA_GRID_DEFAULT))
+    parser.add_argument("--koefisien", nargs="+", type=int, default=list(KOEFISIEN_GRID_DEFAULT))
+    parser.add_argument("--sampel", type=int, default=JUMLAH_SAMPEL_DEFAULT)
+    parser.add_argument("--payload-bits", type=int, default=None, help="Ukuran payload (bit) untuk menghitung frame yang dibutuhkan")
+    parser.add_argument("--output", default=os.path.join("media", "output", "sweep_parameter.json"), help="Path .json atau .csv")
+    parser.add_argument("--cache", default=None, help="Direktori cache koefisien DCT (misal media/cache)")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("SWEEP PARAMETER STEGANOGRAFI VIDEO (DCT-QIM)")
+    print("="*70)
+    cache_dct = CacheKoefisienDCT(args.cache) if args.cache else None
+    jalankan_sweep_parameter(args.video, args.delta, args.koefisien, args.sampel, args.payload_bits, args.output, cache_dct)
+    print("\nPROGRAM SELESAI")
+    print("="*70)
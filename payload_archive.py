@@ -0,0 +1,221 @@
+import os
+import zlib
+import argparse
+import cv2
+import numpy as np
+
+from config_and_setup import proses_frame_qim_dct, setup_kunci_ecc
+from embed_process import buat_payload_embed, embed_gambar_ke_video_final
+from extract_process import _SumberBitStego, _ekstraksi_dari_sumber_bit
+from frame_store import buka_sumber_frame
+from frame_sync import kapasitas_frame_bits
+from fec import bitstream_ke_array, array_ke_bitstream, dekode_repetisi
+from instrumentation import METRIK_NONAKTIF
+
+# --- Konfigurasi Arsip ---
+# Arsip multi-item: daftar isi (TOC) di frame pertama, lalu payload tiap item (format payload gambar biasa,
+# terenkripsi sendiri) mulai di batas frame, sehingga item k bisa dibaca dengan seek langsung ke frame-nya.
+# Header arsip (96 bit, diulang + voting mayoritas): magic (16) + versi (8) + jumlah item (16) +
+# panjang isi TOC dalam bit (24) + bit per frame saat embed (32).
+# Isi TOC (diulang + voting mayoritas) per item: frame mulai (32) + jumlah frame (32) + panjang payload (32) +
+# panjang nama (8) + nama UTF-8; diakhiri CRC-32 seluruh isi TOC (32).
+MAGIC_ARSIP = 0xA7C1
+VERSI_ARSIP = 1
+SALINAN_TOC = 3
+PANJANG_HEADER_ARSIP_BITS = 96
+TOTAL_HEADER_ARSIP_BITS = PANJANG_HEADER_ARSIP_BITS * SALINAN_TOC
+PANJANG_NAMA_MAKS = 255
+
+# --- TOC ---
+def _voting(bitstream, panjang):
+    salinan = bitstream_ke_array(bitstream[:panjang * SALINAN_TOC]).reshape(SALINAN_TOC, panjang)
+    return array_ke_bitstream(dekode_repetisi(salinan.T.reshape(-1), SALINAN_TOC))
+
+def _nama_item(path_item):
+    return os.path.basename(path_item).encode('utf-8')[:PANJANG_NAMA_MAKS]
+
+def buat_toc(daftar_item, bits_per_frame):
+    """TOC lengkap (header + isi, masing-masing diulang) untuk daftar dict item (nama, frame_mulai, jumlah_frame, panjang_bits)."""
+    isi = "".join(f"{item['frame_mulai']:032b}{item['jumlah_frame']:032b}{item['panjang_bits']:032b}{len(item['nama']):08b}"
+                  + "".join(f"{b:08b}" for b in item['nama']) for item in daftar_item)
+    isi += f"{zlib.crc32(isi.encode('ascii')) & 0xFFFFFFFF:032b}"
+    header = f"{MAGIC_ARSIP:016b}{VERSI_ARSIP:08b}{len(daftar_item):016b}{len(isi):024b}{bits_per_frame:032b}"
+    return header * SALINAN_TOC + isi * SALINAN_TOC
+
+def baca_header_arsip(bitstream):
+    """(jumlah_item, panjang_isi_toc, bits_per_frame) dari awal bitstream, atau None jika bukan arsip."""
+    if len(bitstream) < TOTAL_HEADER_ARSIP_BITS: return None
+    header = _voting(bitstream, PANJANG_HEADER_ARSIP_BITS)
+    if int(header[:16], 2) != MAGIC_ARSIP or int(header[16:24], 2) != VERSI_ARSIP: return None
+    return int(header[24:40], 2), int(header[40:64], 2), int(header[64:96], 2)
+
+def baca_toc(bitstream):
+    """
+    Mengurai TOC dari bitstream awal video (frame pertama, atau beberapa frame awal untuk TOC panjang).
+    Mengembalikan (daftar item, bits_per_frame) atau None jika bukan arsip / CRC TOC tidak cocok.
+    """
+    header = baca_header_arsip(bitstream)
+    if header is None: return None
+    jumlah_item, panjang_isi, bits_per_frame = header
+    if len(bitstream) < TOTAL_HEADER_ARSIP_BITS + panjang_isi * SALINAN_TOC: return None
+    isi = _voting(bitstream[TOTAL_HEADER_ARSIP_BITS:], panjang_isi)
+    if int(isi[-32:], 2) != zlib.crc32(isi[:-32].encode('ascii')) & 0xFFFFFFFF: return None
+    daftar_item = []; posisi = 0
+    for _ in range(jumlah_item):
+        frame_mulai, jumlah_frame, panjang_bits = (int(isi[posisi + i * 32:posisi + (i + 1) * 32], 2) for i in range(3))
+        panjang_nama = int(isi[posisi + 96:posisi + 104], 2); posisi += 104
+        nama = bytes(int(isi[posisi + i * 8:posisi + (i + 1) * 8], 2) for i in range(panjang_nama)); posisi += 8 * panjang_nama
+        daftar_item.append({"nama": nama.decode('utf-8', errors='replace'), "frame_mulai": frame_mulai,
+                            "jumlah_frame": jumlah_frame, "panjang_bits": panjang_bits})
+    return daftar_item, bits_per_frame
+
+def panjang_toc_bits(daftar_nama):
+    return TOTAL_HEADER_ARSIP_BITS + SALINAN_TOC * (sum(104 + 8 * len(nama) for nama in daftar_nama) + 32)
+
+# --- Penyusunan Payload Arsip ---
+def buat_payload_arsip(daftar_path_gambar, kunci_publik_ecc_penerima_bytes_compressed, bits_per_frame,
+                       metrik=METRIK_NONAKTIF, skema_fec=None, parameter_fec=None):
+    """
+    Menyusun bitstream arsip: TOC lalu payload tiap gambar (dienkripsi dengan kunci ephemeral sendiri).
+    TOC dan setiap item diisi hingga batas frame dengan bit acak, sehingga item mulai di frame baru.
+    Mengembalikan (bitstream, daftar item TOC) atau (None, None) jika gagal.
+    """
+    if not daftar_path_gambar: print("    Error: Arsip butuh minimal satu item."); return None, None
+    def isi_sampai_batas_frame(bits):
+        sisa = -len(bits) % bits_per_frame
+        return bits + array_ke_bitstream(np.unpackbits(np.frombuffer(os.urandom(-(-sisa // 8)), dtype=np.uint8))[:sisa])
+    daftar_nama = [_nama_item(path) for path in daftar_path_gambar]
+    frame_berikutnya = -(-panjang_toc_bits(daftar_nama) // bits_per_frame)
+    daftar_item = []; payload_item = []
+    for indeks, (path_gambar, nama) in enumerate(zip(daftar_path_gambar, daftar_nama)):
+        print(f"\n  [Arsip: Item {indeks} '{nama.decode('utf-8', errors='replace')}']")
+        payload = buat_payload_embed(path_gambar, kunci_publik_ecc_penerima_bytes_compressed, metrik, skema_fec, parameter_fec)
+        if payload is None: return None, None
+        jumlah_frame = -(-len(payload) // bits_per_frame)
+        daftar_item.append({"nama": nama, "frame_mulai": frame_berikutnya, "jumlah_frame": jumlah_frame, "panjang_bits": len(payload)})
+        payload_item.append(isi_sampai_batas_frame(payload))
+        frame_berikutnya += jumlah_frame
+    toc = isi_sampai_batas_frame(buat_toc(daftar_item, bits_per_frame))
+    bitstream = toc + "".join(payload_item)
+    print(f"\n    Arsip: {len(daftar_item)} item, TOC {len(toc) // bits_per_frame} frame, total {len(bitstream)} bits "
+          f"({frame_berikutnya} frame pembawa).")
+    return bitstream, [dict(item, nama=item["nama"].decode('utf-8', errors='replace')) for item in daftar_item]
+
+def embed_arsip_ke_video(path_video_input, daftar_path_gambar, path_video_output_base, delta_kuantisasi, num_ac_coeffs,
+                         kunci_publik_ecc_penerima_bytes_compressed, skema_fec=None, parameter_fec=None, metrik=None, **opsi_embed):
+    """
+    Embed beberapa gambar sebagai arsip ber-TOC ke satu cover. opsi_embed diteruskan ke
+    embed_gambar_ke_video_final (jumlah_worker, fourcc_output, ...). Mengembalikan (berhasil, daftar item TOC).
+    """
+    print(f"\n=== MENYUSUN ARSIP {len(daftar_path_gambar)} ITEM ===")
+    if delta_kuantisasi <= 0: print("    Error: Arsip butuh DELTA positif (offset item dihitung per frame)."); return False, None
+    if opsi_embed.get("sinkron_frame"): print("    Error: Arsip tidak bisa digabung dengan header sinkronisasi frame."); return False, None
+    cap = buka_sumber_frame(path_video_input)
+    if not cap.isOpened(): print(f"    Error: Video input '{path_video_input}' tidak bisa dibuka."); return False, None
+    lebar, tinggi = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    cap.release()
+    bits_per_frame = kapasitas_frame_bits(lebar, tinggi, num_ac_coeffs)
+    if bits_per_frame < panjang_toc_bits([_nama_item(path) for path in daftar_path_gambar]):
+        print("    Warning: TOC lebih panjang dari satu frame; TOC akan memakai beberapa frame awal.")
+    payload, daftar_item = buat_payload_arsip(daftar_path_gambar, kunci_publik_ecc_penerima_bytes_compressed, bits_per_frame,
+                                              metrik or METRIK_NONAKTIF, skema_fec, parameter_fec)
+    if payload is None: return False, None
+    berhasil, _, _ = embed_gambar_ke_video_final(path_video_input, f"arsip ({len(daftar_item)} item)", path_video_output_base,
+                                                 delta_kuantisasi, num_ac_coeffs, kunci_publik_ecc_penerima_bytes_compressed,
+                                                 metrik=metrik, payload_siap=payload, payload_ber_fec=bool(skema_fec),
+                                                 **opsi_embed)
+    return berhasil, daftar_item if berhasil else None
+
+# --- Ekstraksi Item ---
+def _buka_dan_baca_toc(path_stego_video, delta_kuantisasi, num_ac_coeffs, kunci_permutasi=None):
+    """(cap, processed_w, processed_h, daftar item, bits_per_frame) atau None; TOC dibaca mulai frame pertama."""
+    cap = buka_sumber_frame(path_stego_video)
+    if not cap.isOpened(): print(f"  Error: Tidak bisa membuka stego-video '{path_stego_video}'."); return None
+    processed_w = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) // 8) * 8
+    processed_h = (int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) // 8) * 8
+    bits = ""
+    while True:
+        ret, frame = cap.read()
+        if not ret: print("  Error: Video habis sebelum TOC arsip terbaca."); cap.release(); return None
+        bits += proses_frame_qim_dct(frame[0:processed_h, 0:processed_w], 'extract', delta_kuantisasi, num_ac_coeffs_to_use=num_ac_coeffs,
+                                     kunci_permutasi=kunci_permutasi)
+        header = baca_header_arsip(bits)
+        if header is None and len(bits) >= TOTAL_HEADER_ARSIP_BITS:
+            print("  Error: Video tidak berisi arsip multi-item (magic TOC tidak cocok)."); cap.release(); return None
+        if header is not None and len(bits) >= TOTAL_HEADER_ARSIP_BITS + header[1] * SALINAN_TOC: break
+    toc = baca_toc(bits)
+    if toc is None: print("  Error: CRC TOC arsip tidak cocok."); cap.release(); return None
+    daftar_item, bits_per_frame = toc
+    if bits_per_frame != kapasitas_frame_bits(processed_w, processed_h, num_ac_coeffs):
+        print(f"  Warning: Bit per frame saat embed ({bits_per_frame}) berbeda dari parameter ekstraksi; cek koefisien AC.")
+    return cap, processed_w, processed_h, daftar_item, bits_per_frame
+
+def daftar_isi_arsip(path_stego_video, delta_kuantisasi, num_ac_coeffs, kunci_permutasi=None):
+    """Daftar item arsip (nama, frame_mulai, jumlah_frame, panjang_bits) dari TOC, atau None."""
+    hasil = _buka_dan_baca_toc(path_stego_video, delta_kuantisasi, num_ac_coeffs, kunci_permutasi)
+    if hasil is None: return None
+    hasil[0].release()
+    return hasil[3]
+
+def ekstraksi_item_arsip(path_stego_video, indeks_item, path_gambar_output, delta_kuantisasi, num_ac_coeffs,
+                         kunci_privat_ecc_penerima, bits_untuk_dimensi=16, metrik=METRIK_NONAKTIF, kunci_permutasi=None):
+    """
+    Membaca TOC dari frame pertama, lalu seek (CAP_PROP_POS_FRAMES) langsung ke frame awal item
+    `indeks_item`; hanya frame pembawa item tersebut yang didekode.
+    """
+    print(f"\n=== MEMULAI EKSTRAKSI ITEM ARSIP #{indeks_item} ===")
+    print(f"  Stego Video: '{path_stego_video}'")
+    hasil = _buka_dan_baca_toc(path_stego_video, delta_kuantisasi, num_ac_coeffs, kunci_permutasi)
+    if hasil is None: return False
+    cap, processed_w, processed_h, daftar_item, _ = hasil
+    if not 0 <= indeks_item < len(daftar_item):
+        print(f"  Error: Item #{indeks_item} tidak ada (arsip berisi {len(daftar_item)} item)."); cap.release(); return False
+    item = daftar_item[indeks_item]
+    print(f"  Item '{item['nama']}': frame {item['frame_mulai']}..{item['frame_mulai'] + item['jumlah_frame'] - 1}, {item['panjang_bits']} bits.")
+    with metrik.tahap('seek'):
+        cap.set(cv2.CAP_PROP_POS_FRAMES, item['frame_mulai'])
+        posisi = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+        if posisi != item['frame_mulai']:
+            # Backend tanpa seek akurat: buka ulang lalu maju dengan grab (tanpa decode penuh).
+            cap.release(); cap = buka_sumber_frame(path_stego_video)
+            for _ in range(item['frame_mulai']):
+                if not cap.grab(): print("  Error: Video habis sebelum frame item."); cap.release(); return False
+    sumber_bit = _SumberBitStego(cap, processed_w, processed_h, delta_kuantisasi, num_ac_coeffs, metrik,
+                                 kunci_permutasi=kunci_permutasi)
+    return _ekstraksi_dari_sumber_bit(sumber_bit, path_gambar_output, kunci_privat_ecc_penerima, bits_untuk_dimensi, metrik)
+
+# --- Blok Utama ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Arsip multi-gambar ber-TOC dalam satu video cover.")
+    sub = parser.add_subparsers(dest="mode", required=True)
+    p_embed = sub.add_parser("embed"); p_embed.add_argument("video"); p_embed.add_argument("output")
+    p_embed.add_argument("gambar", nargs="+")
+    p_embed.add_argument("--fec", default=None, choices=["repetisi", "hamming74", "reed_solomon"])
+    p_daftar = sub.add_parser("daftar"); p_daftar.add_argument("video")
+    p_extract = sub.add_parser("extract"); p_extract.add_argument("video"); p_extract.add_argument("item", type=int)
+    p_extract.add_argument("output")
+    for p in (p_embed, p_daftar, p_extract):
+        p.add_argument("--delta", type=float, default=10)
+        p.add_argument("--koefisien", type=int, default=10)
+        p.add_argument("--kunci-permutasi", default=None, help="Rahasia bersama untuk urutan blok/koefisien berkunci")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("ARSIP MULTI-ITEM STEGANOGRAFI VIDEO (SHA3-ECC-AES)")
+    print("="*70)
+    bob_private_ecc, bob_public_key_bytes_compressed = setup_kunci_ecc()
+    if args.mode == "embed":
+        berhasil, daftar_item = embed_arsip_ke_video(args.video, args.gambar, args.output, args.delta, args.koefisien,
+                                                     bob_public_key_bytes_compressed, skema_fec=args.fec,
+                                                     kunci_permutasi=args.kunci_permutasi)
+    elif args.mode == "daftar":
+        daftar_item = daftar_isi_arsip(args.video, args.delta, args.koefisien, args.kunci_permutasi); berhasil = daftar_item is not None
+    else:
+        berhasil = ekstraksi_item_arsip(args.video, args.item, args.output, args.delta, args.koefisien, bob_private_ecc,
+                                        kunci_permutasi=args.kunci_permutasi)
+        daftar_item = None
+    for indeks, item in enumerate(daftar_item or []):
+        print(f"  #{indeks} {item['nama']}: frame {item['frame_mulai']} (+{item['jumlah_frame']}), {item['panjang_bits']} bits")
+    print(f"\n  Status: {'BERHASIL' if berhasil else 'GAGAL'}")
+    print("\nPROGRAM SELESAI")
+    print("="*70)
@@ -0,0 +1,75 @@
+import time
+
+# --- Event Progres ---
+# Fungsi inti menerima callback progres(event) dan batal(). Event berupa dict:
+#   jenis: "frame" (setiap frame pembawa), "selesai", atau "batal"
+#   tahap: "embed" atau "ekstraksi"
+#   frame, bit_selesai, bit_total (None jika belum diketahui, misal sebelum header payload terbaca)
+#   durasi_detik, frame_per_detik, bit_per_detik, eta_detik (None jika bit_total belum diketahui)
+#   berhasil: hanya pada event "selesai"
+# batal() diperiksa sebelum setiap frame; jika True job berhenti dan fungsi inti mengembalikan gagal.
+# Callback dipanggil dari thread job; konsumen GUI sebaiknya hanya memasukkan event ke antrean.
+
+class JobDibatalkan(RuntimeError):
+    """Job dihentikan karena callback batal() mengembalikan True."""
+
+class PelaporProgres:
+    """Menyusun event progres satu job (throughput dan ETA dari waktu mulai) dan memeriksa pembatalan."""
+    def __init__(self, tahap, progres=None, batal=None, bit_total=None):
+        self.tahap = tahap
+        self.progres = progres
+        self.batal = batal
+        self.bit_total = bit_total
+        self.frame = 0
+        self.bit_selesai = 0
+        self.mulai = time.perf_counter()
+
+    @property
+    def aktif(self):
+        """True jika ada konsumen progres (log per frame bisa dilewati)."""
+        return self.progres is not None
+
+    def _event(self, jenis, **tambahan):
+        durasi = time.perf_counter() - self.mulai
+        bit_per_detik = self.bit_selesai / durasi if durasi > 0 else 0.0
+        eta = None
+        if self.bit_total is not None and bit_per_detik > 0:
+            eta = max(self.bit_total - self.bit_selesai, 0) / bit_per_detik
+        return {"jenis": jenis, "tahap": self.tahap, "frame": self.frame, "bit_selesai": self.bit_selesai,
+                "bit_total": self.bit_total, "durasi_detik": durasi,
+                "frame_per_detik": self.frame / durasi if durasi > 0 else 0.0,
+                "bit_per_detik": bit_per_detik, "eta_detik": eta, **tambahan}
+
+    def kirim(self, jenis, **tambahan):
+        if self.progres is not None: self.progres(self._event(jenis, **tambahan))
+
+    def frame_selesai(self, bit_selesai):
+        self.frame += 1
+        self.bit_selesai = bit_selesai
+        self.kirim("frame")
+
+    def periksa_batal(self):
+        if self.batal is not None and self.batal():
+            self.kirim("batal")
+            raise JobDibatalkan(f"Job {self.tahap} dibatalkan.")
+
+    def selesai(self, berhasil):
+        self.kirim("selesai", berhasil=bool(berhasil))
+
+class SumberBitBerprogres:
+    """Membungkus sumber bit ekstraksi: memeriksa pembatalan dan melaporkan progres setiap frame."""
+    def __init__(self, sumber_bit, pelapor):
+        self.sumber_bit = sumber_bit
+        self.pelapor = pelapor
+        self.bit_terbaca = 0
+
+    def frame_berikutnya(self):
+        self.pelapor.periksa_batal()  # Sumber ditutup oleh pemanggil (try/finally) saat JobDibatalkan naik
+        bits = self.sumber_bit.frame_berikutnya()
+        if bits:
+            self.bit_terbaca += len(bits)
+            self.pelapor.frame_selesai(self.bit_terbaca)
+        return bits
+
+    def tutup(self):
+        self.sumber_bit.tutup()
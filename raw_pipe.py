@@ -0,0 +1,174 @@
+import sys
+import argparse
+import contextlib
+import numpy as np
+
+from config_and_setup import proses_frame_qim_dct, setup_kunci_ecc
+from embed_process import buat_payload_embed, output_bisa_diekstrak
+from extract_process import _ekstraksi_dari_sumber_bit
+from instrumentation import METRIK_NONAKTIF
+from frame_store import FORMAT_PIKSEL
+
+# Mode pipa: frame mentah (kompatibel dengan ffmpeg -f rawvideo) dibaca dari stdin dan frame stego
+# ditulis ke stdout, sehingga embed bisa diletakkan di antara proses decoder dan encoder tanpa file sementara:
+#   ffmpeg -i cover.mp4 -f rawvideo -pix_fmt bgr24 - \
+#     | python raw_pipe.py embed secret.png --lebar 1280 --tinggi 720 \
+#     | ffmpeg -f rawvideo -pix_fmt bgr24 -s 1280x720 -r 24 -i - -c:v ffv1 stego.mkv
+# Semua log ditulis ke stderr karena stdout dipakai untuk data frame.
+
+# --- Baca/Tulis Frame Mentah ---
+def buat_buffer_frame(lebar, tinggi, format_piksel):
+    """Buffer frame yang dialokasikan sekali dan dipakai ulang untuk setiap readinto."""
+    if format_piksel not in FORMAT_PIKSEL: raise ValueError(f"Format piksel tidak didukung: {format_piksel}")
+    kanal = FORMAT_PIKSEL[format_piksel]
+    return np.empty((tinggi, lebar) if kanal == 1 else (tinggi, lebar, kanal), dtype=np.uint8)
+
+def baca_frame_raw(stream, buffer):
+    """
+    Mengisi `buffer` dengan satu frame dari stream biner via readinto (tanpa salinan perantara).
+    Mengembalikan False jika stream habis tepat di batas frame; ValueError jika frame terpotong.
+    """
+    tampilan = memoryview(buffer).cast('B')
+    terisi = 0
+    while terisi < len(tampilan):
+        n = stream.readinto(tampilan[terisi:])
+        if not n: break
+        terisi += n
+    if terisi == 0: return False
+    if terisi < len(tampilan): raise ValueError(f"Frame terpotong: {terisi}/{len(tampilan)} bytes.")
+    return True
+
+# --- Embed dari Pipa ---
+def embed_pipa_raw(stream_input, stream_output, lebar, tinggi, format_piksel, path_gambar_rahasia,
+                   delta_kuantisasi, num_ac_coeffs, kunci_publik_ecc_penerima_bytes_compressed,
+                   metrik=METRIK_NONAKTIF, skema_fec=None, parameter_fec=None):
+    """
+    Embed payload ke frame mentah dari `stream_input` dan menulis frame stego (ukuran dan format sama)
+    ke `stream_output`. Area kelipatan 8 diganti luma stego (seperti embed ke file); frame setelah
+    payload selesai diteruskan apa adanya. Tanpa FEC, pipa dihentikan sebelum frame pertama yang bit payloadnya
+    rusak karena clipping (frame yang sudah ditulis tidak bisa ditarik kembali; exit status menandai output dibuang).
+    Mengembalikan True jika seluruh payload tersisipkan.
+    """
+    print(f"\n=== MEMULAI PROSES EMBEDDING GAMBAR KE VIDEO (PIPA RAW) ===")
+    print(f"  Gambar Rahasia: '{path_gambar_rahasia}'")
+    print(f"  Frame Input: {lebar}x{tinggi} {format_piksel}")
+    print(f"  Parameter: DELTA={delta_kuantisasi}, Koefisien AC per Blok={num_ac_coeffs}")
+    output_w, output_h = (lebar // 8) * 8, (tinggi // 8) * 8
+    if output_w == 0 or output_h == 0: print("    Error: Dimensi video terlalu kecil."); return False
+    try:
+        buffer = buat_buffer_frame(lebar, tinggi, format_piksel)
+    except ValueError as e:
+        print(f"    Error: {e}"); return False
+
+    total_payload_bitstream = buat_payload_embed(path_gambar_rahasia, kunci_publik_ecc_penerima_bytes_compressed,
+                                                 metrik, skema_fec, parameter_fec)
+    if total_payload_bitstream is None: return False
+    total_bits_to_embed = len(total_payload_bitstream)
+
+    print("\n  [Tahap Embedding 3: Menyisipkan Payload ke Frame dari Pipa]")
+    current_payload_bit_index = 0; frame_num = 0; bit_gagal = 0
+    area = buffer[:output_h, :output_w]
+    try:
+        while True:
+            with metrik.tahap('decode'):
+                if not baca_frame_raw(stream_input, buffer): break
+            frame_num += 1
+            if current_payload_bit_index < total_bits_to_embed:
+                info_frame = {}
+                _, stego_frame_gray_output, bits_embedded_this_frame = proses_frame_qim_dct(
+                    area, 'embed', delta_kuantisasi, total_payload_bitstream[current_payload_bit_index:],
+                    num_ac_coeffs_to_use=num_ac_coeffs, metrik=metrik, info_frame=info_frame)
+                # Tulis balik ke buffer yang sama (broadcast ke 3 kanal untuk bgr24).
+                area[...] = stego_frame_gray_output if area.ndim == 2 else stego_frame_gray_output[:, :, None]
+                current_payload_bit_index += bits_embedded_this_frame
+                bit_gagal += info_frame['bit_gagal']
+                if bit_gagal and not skema_fec:
+                    output_bisa_diekstrak(bit_gagal, False, "stdout"); return False
+                metrik.tambah('frame_embed')
+                print(f"    Frame {frame_num}: {bits_embedded_this_frame} bits disisipkan. Total disisipkan: "
+                      f"{current_payload_bit_index}/{total_bits_to_embed} (PSNR prediksi: {info_frame['psnr_prediksi']:.2f} dB)")
+            else:
+                metrik.tambah('frame_salin')
+            with metrik.tahap('encode'):
+                stream_output.write(memoryview(buffer).cast('B'))
+        stream_output.flush()
+    except ValueError as e:
+        print(f"    Error: {e}"); return False
+    except BrokenPipeError:
+        print("    Error: Proses tujuan menutup pipa sebelum semua frame ditulis."); return False
+
+    if current_payload_bit_index < total_bits_to_embed:
+        print(f"    Warning: Input selesai sebelum semua payload ({total_bits_to_embed} bits) disisipkan "
+              f"({current_payload_bit_index} bits)."); return False
+    output_bisa_diekstrak(bit_gagal, bool(skema_fec), "stdout")
+    print(f"  Proses embedding (pipa raw) selesai: {frame_num} frame diteruskan.")
+    return True
+
+# --- Ekstraksi dari Pipa ---
+class SumberBitRaw:
+    """Sumber bit per frame untuk _ekstraksi_dari_sumber_bit dari frame mentah di stream biner."""
+    def __init__(self, stream_input, lebar, tinggi, format_piksel, delta_kuantisasi, num_ac_coeffs, metrik=METRIK_NONAKTIF):
+        self.stream_input = stream_input
+        self.buffer = buat_buffer_frame(lebar, tinggi, format_piksel)
+        self.processed_w, self.processed_h = (lebar // 8) * 8, (tinggi // 8) * 8
+        self.delta_kuantisasi = delta_kuantisasi
+        self.num_ac_coeffs = num_ac_coeffs
+        self.metrik = metrik
+
+    def frame_berikutnya(self):
+        with self.metrik.tahap('decode'):
+            try:
+                if not baca_frame_raw(self.stream_input, self.buffer): return None
+            except ValueError as e:
+                print(f"    Warning: {e}"); return None
+        return proses_frame_qim_dct(self.buffer[:self.processed_h, :self.processed_w], 'extract', self.delta_kuantisasi,
+                                    num_ac_coeffs_to_use=self.num_ac_coeffs, metrik=self.metrik)
+
+    def tutup(self):
+        pass  # Stream milik pemanggil
+
+def ekstraksi_pipa_raw(stream_input, path_gambar_output, lebar, tinggi, format_piksel, delta_kuantisasi, num_ac_coeffs,
+                       kunci_privat_ecc_penerima, bits_untuk_dimensi=16, metrik=METRIK_NONAKTIF):
+    print(f"\n=== MEMULAI PROSES EKSTRAKSI GAMBAR DARI VIDEO (PIPA RAW) ===")
+    print(f"  Frame Input: {lebar}x{tinggi} {format_piksel}")
+    print(f"  Parameter: DELTA={delta_kuantisasi}, Koefisien AC per Blok={num_ac_coeffs}")
+    if lebar < 8 or tinggi < 8: print("  Error: Dimensi video terlalu kecil."); return False
+    try:
+        sumber_bit = SumberBitRaw(stream_input, lebar, tinggi, format_piksel, delta_kuantisasi, num_ac_coeffs, metrik)
+    except ValueError as e:
+        print(f"  Error: {e}"); return False
+    return _ekstraksi_dari_sumber_bit(sumber_bit, path_gambar_output, kunci_privat_ecc_penerima, bits_untuk_dimensi, metrik)
+
+# --- Blok Utama ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Embed/ekstraksi dengan frame mentah lewat stdin/stdout (ffmpeg -f rawvideo).")
+    sub = parser.add_subparsers(dest="mode", required=True)
+    p_embed = sub.add_parser("embed", help="stdin: frame cover mentah, stdout: frame stego mentah")
+    p_embed.add_argument("gambar")
+    p_embed.add_argument("--fec", default=None, choices=["repetisi", "hamming74", "reed_solomon"])
+    p_extract = sub.add_parser("extract", help="stdin: frame stego mentah, output: gambar hasil ekstraksi")
+    p_extract.add_argument("output")
+    for p in (p_embed, p_extract):
+        p.add_argument("--lebar", type=int, required=True)
+        p.add_argument("--tinggi", type=int, required=True)
+        p.add_argument("--pix-fmt", default="bgr24", choices=list(FORMAT_PIKSEL))
+        p.add_argument("--delta", type=float, default=10)
+        p.add_argument("--koefisien", type=int, default=10)
+    args = parser.parse_args()
+
+    stream_output = sys.stdout.buffer
+    with contextlib.redirect_stdout(sys.stderr):
+        print("="*70)
+        print("STEGANOGRAFI VIDEO MODE PIPA RAW (SHA3-ECC-AES)")
+        print("="*70)
+        bob_private_ecc, bob_public_key_bytes_compressed = setup_kunci_ecc()
+        if args.mode == "embed":
+            berhasil = embed_pipa_raw(sys.stdin.buffer, stream_output, args.lebar, args.tinggi, args.pix_fmt, args.gambar,
+                                      args.delta, args.koefisien, bob_public_key_bytes_compressed, skema_fec=args.fec)
+        else:
+            berhasil = ekstraksi_pipa_raw(sys.stdin.buffer, args.output, args.lebar, args.tinggi, args.pix_fmt,
+                                          args.delta, args.koefisien, bob_private_ecc)
+        print(f"\n  Status: {'BERHASIL' if berhasil else 'GAGAL'}")
+        print("\nPROGRAM SELESAI")
+        print("="*70)
+    sys.exit(0 if berhasil else 1)
@@ -0,0 +1,211 @@
+import os
+import json
+import argparse
+import cv2
+import numpy as np
+
+from config_and_setup import proses_frame_qim_dct, setup_kunci_ecc
+from embed_process import buat_payload_embed, output_bisa_diekstrak
+from frame_store import buka_sumber_frame, EKSTENSI_MANIFEST
+from segment_parallel import gabung_segmen_avi, CODEC_SEGMEN
+from fec import bitstream_ke_array, array_ke_bitstream
+from instrumentation import METRIK_NONAKTIF
+
+# --- Konfigurasi Checkpoint ---
+# Job embed panjang ditulis sebagai beberapa bagian FFV1; setelah setiap bagian selesai ditulis, checkpoint
+# (JSON, ditulis atomik) mencatat kursor payload, frame cover terakhir yang sudah di-commit, dan daftar bagian.
+# Payload terenkripsi (kunci ECC ephemeral, salt, nonce, ciphertext) disimpan sekali di samping checkpoint,
+# sehingga job yang dilanjutkan memakai kripto yang sama dan hanya frame yang belum di-commit yang diproses ulang.
+# Checkpoint juga mencatat apakah payload ber-FEC dan total bit yang tidak terbaca karena clipping, agar job yang
+# dilanjutkan tetap menolak output yang tidak bisa diekstrak.
+EKSTENSI_CHECKPOINT = ".checkpoint.json"
+EKSTENSI_PAYLOAD_CHECKPOINT = ".payload.npy"
+VERSI_CHECKPOINT = 1
+FRAME_PER_BAGIAN_DEFAULT = 500
+
+def _identitas_cover(path_video_input):
+    stat = os.stat(path_video_input)
+    return {"path": os.path.abspath(path_video_input), "ukuran": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+def _simpan_checkpoint(path_checkpoint, checkpoint):
+    # Tulis ke file sementara lalu os.replace agar checkpoint tidak pernah setengah jadi saat proses mati.
+    path_sementara = f"{path_checkpoint}.{os.getpid()}.tmp"
+    with open(path_sementara, "w") as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(path_sementara, path_checkpoint)
+
+def muat_checkpoint(path_checkpoint):
+    """Isi checkpoint (dict) atau None jika tidak ada / rusak."""
+    try:
+        with open(path_checkpoint) as f:
+            checkpoint = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    return checkpoint if checkpoint.get("versi") == VERSI_CHECKPOINT else None
+
+# --- Embed yang Bisa Dilanjutkan ---
+def embed_dengan_checkpoint(path_video_input, path_gambar_rahasia, path_video_output_base, delta_kuantisasi, num_ac_coeffs,
+                            kunci_publik_ecc_penerima_bytes_compressed, skema_fec=None, parameter_fec=None,
+                            frame_per_bagian=FRAME_PER_BAGIAN_DEFAULT, gabung=True, batas_frame_sesi=None,
+                            metrik=METRIK_NONAKTIF):
+    """
+    Embed seperti embed_gambar_ke_video_final, tetapi hasil ditulis per bagian dengan checkpoint
+    '<base>.checkpoint.json'. Jika checkpoint untuk cover dan parameter yang sama sudah ada, job dilanjutkan
+    dari frame terakhir yang di-commit dengan payload (dan kripto) yang sama; bagian baru ditambahkan.
+    batas_frame_sesi membatasi jumlah frame yang diproses pada pemanggilan ini (job dijeda, bisa dilanjutkan).
+    Di akhir, bagian disambung menjadi '<base>.avi' (gabung=True) atau disimpan sebagai manifest.
+    Mengembalikan (selesai, path_hasil_atau_checkpoint).
+    """
+    print(f"\n=== MEMULAI PROSES EMBEDDING GAMBAR KE VIDEO (DENGAN CHECKPOINT) ===")
+    print(f"  Gambar Rahasia: '{path_gambar_rahasia}'")
+    print(f"  Video Input: '{path_video_input}'")
+    print(f"  Parameter: DELTA={delta_kuantisasi}, Koefisien AC per Blok={num_ac_coeffs}, Frame per Bagian={frame_per_bagian}")
+    base_name_output, _ = os.path.splitext(path_video_output_base)
+    path_checkpoint = base_name_output + EKSTENSI_CHECKPOINT
+    path_payload = base_name_output + EKSTENSI_PAYLOAD_CHECKPOINT
+    direktori_output = os.path.dirname(base_name_output)
+    if direktori_output: os.makedirs(direktori_output, exist_ok=True)
+
+    cap = buka_sumber_frame(path_video_input)
+    if not cap.isOpened(): print(f"    Error: Video input '{path_video_input}' tidak bisa dibuka."); return False, None
+    frame_width_orig = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)); frame_height_orig = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    output_w, output_h = (frame_width_orig // 8) * 8, (frame_height_orig // 8) * 8
+    if output_w == 0 or output_h == 0: print("    Error: Dimensi video terlalu kecil."); cap.release(); return False, None
+
+    parameter_job = {"cover": _identitas_cover(path_video_input), "gambar": os.path.abspath(path_gambar_rahasia),
+                     "delta": delta_kuantisasi, "num_ac_coeffs": num_ac_coeffs, "lebar": output_w, "tinggi": output_h}
+    checkpoint = muat_checkpoint(path_checkpoint)
+    total_payload_bitstream = None
+    if checkpoint is not None:
+        if checkpoint["parameter"] != parameter_job:
+            print(f"    Error: Checkpoint '{path_checkpoint}' milik job lain (cover/gambar/parameter berbeda). "
+                  "Hapus checkpoint untuk memulai ulang."); cap.release(); return False, None
+        try:
+            bits = np.unpackbits(np.load(path_payload))[:checkpoint["total_bits"]]
+            total_payload_bitstream = array_ke_bitstream(bits)
+        except (OSError, ValueError) as e:
+            print(f"    Error: Payload checkpoint '{path_payload}' tidak terbaca: {e}"); cap.release(); return False, None
+        print(f"    Melanjutkan dari checkpoint: frame {checkpoint['frame_commit']}, payload {checkpoint['kursor_payload']}/"
+              f"{checkpoint['total_bits']} bits, {len(checkpoint['bagian'])} bagian.")
+    else:
+        total_payload_bitstream = buat_payload_embed(path_gambar_rahasia, kunci_publik_ecc_penerima_bytes_compressed,
+                                                     metrik, skema_fec, parameter_fec)
+        if total_payload_bitstream is None: cap.release(); return False, None
+        np.save(path_payload, np.packbits(bitstream_ke_array(total_payload_bitstream)))
+        checkpoint = {"versi": VERSI_CHECKPOINT, "parameter": parameter_job, "fps": fps,
+                      "total_bits": len(total_payload_bitstream), "kursor_payload": 0, "frame_commit": 0, "bagian": [],
+                      "payload_ber_fec": bool(skema_fec), "bit_gagal": 0}
+        _simpan_checkpoint(path_checkpoint, checkpoint)
+    total_bits_to_embed = checkpoint["total_bits"]
+
+    print("\n  [Tahap Embedding 3: Menyisipkan Payload per Bagian]")
+    if checkpoint["frame_commit"] > 0:
+        with metrik.tahap('seek'):
+            cap.set(cv2.CAP_PROP_POS_FRAMES, checkpoint["frame_commit"])
+            if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) != checkpoint["frame_commit"]:
+                # Backend tanpa seek akurat: buka ulang lalu maju dengan grab.
+                cap.release(); cap = buka_sumber_frame(path_video_input)
+                for _ in range(checkpoint["frame_commit"]):
+                    if not cap.grab(): print("    Error: Cover lebih pendek dari checkpoint."); cap.release(); return False, None
+    frame_sesi = 0; video_habis = False
+    fourcc = cv2.VideoWriter_fourcc(*CODEC_SEGMEN)
+    try:
+        while not video_habis and (batas_frame_sesi is None or frame_sesi < batas_frame_sesi):
+            path_bagian = f"{base_name_output}.part{len(checkpoint['bagian']):04d}.avi"
+            out = cv2.VideoWriter(path_bagian, fourcc, fps, (output_w, output_h), True)
+            if not out.isOpened(): print(f"    Error: Gagal VideoWriter {CODEC_SEGMEN} '{path_bagian}'."); return False, None
+            kursor = checkpoint["kursor_payload"]; jumlah_frame = 0; bit_gagal = 0
+            try:
+                while jumlah_frame < frame_per_bagian and (batas_frame_sesi is None or frame_sesi < batas_frame_sesi):
+                    with metrik.tahap('decode'):
+                        ret, frame = cap.read()
+                    if not ret: video_habis = True; break
+                    cropped = frame[0:output_h, 0:output_w]
+                    if kursor < total_bits_to_embed:
+                        info_frame = {}
+                        _, stego_gray, bits_embedded = proses_frame_qim_dct(
+                            cropped, 'embed', delta_kuantisasi, total_payload_bitstream[kursor:],
+                            num_ac_coeffs_to_use=num_ac_coeffs, metrik=metrik, info_frame=info_frame)
+                        kursor += bits_embedded; bit_gagal += info_frame['bit_gagal']
+                        frame_tulis = cv2.cvtColor(stego_gray, cv2.COLOR_GRAY2BGR)
+                        metrik.tambah('frame_embed')
+                    else:
+                        frame_tulis = cropped if cropped.ndim == 3 else cv2.cvtColor(cropped, cv2.COLOR_GRAY2BGR)
+                        metrik.tambah('frame_salin')
+                    with metrik.tahap('encode'):
+                        out.write(frame_tulis)
+                    jumlah_frame += 1; frame_sesi += 1
+            finally:
+                out.release()
+            if jumlah_frame == 0:
+                os.remove(path_bagian); break
+            # Commit: bagian sudah lengkap di disk, baru checkpoint dimajukan.
+            checkpoint["bagian"].append({"file": os.path.basename(path_bagian), "frame_mulai": checkpoint["frame_commit"],
+                                         "jumlah_frame": jumlah_frame})
+            checkpoint["frame_commit"] += jumlah_frame
+            checkpoint["kursor_payload"] = kursor
+            checkpoint["bit_gagal"] = checkpoint.get("bit_gagal", 0) + bit_gagal
+            _simpan_checkpoint(path_checkpoint, checkpoint)
+            metrik.tambah('bagian_commit')
+            print(f"    Bagian {len(checkpoint['bagian']) - 1} di-commit: frame sampai {checkpoint['frame_commit']}, "
+                  f"payload {kursor}/{total_bits_to_embed} bits.")
+    finally:
+        cap.release()
+
+    direktori_bagian = os.path.dirname(path_checkpoint)
+    daftar_path_bagian = [os.path.join(direktori_bagian, bagian["file"]) for bagian in checkpoint["bagian"]]
+    if not output_bisa_diekstrak(checkpoint.get("bit_gagal", 0), checkpoint.get("payload_ber_fec", False), base_name_output):
+        # Bagian yang sudah di-commit tidak bisa diperbaiki dengan melanjutkan job; semua hasil job dibuang.
+        for path in daftar_path_bagian + [path_checkpoint, path_payload]:
+            if os.path.exists(path): os.remove(path)
+        return False, None
+    if not video_habis:
+        print(f"  Job dijeda setelah {frame_sesi} frame; lanjutkan dengan memanggil ulang (checkpoint '{path_checkpoint}').")
+        return False, path_checkpoint
+    if checkpoint["kursor_payload"] < total_bits_to_embed:
+        print(f"  Proses embedding selesai, namun TIDAK semua data berhasil disisipkan "
+              f"({checkpoint['kursor_payload']}/{total_bits_to_embed} bits).")
+        return False, path_checkpoint
+
+    path_hasil = None
+    if gabung:
+        path_hasil = base_name_output + ".avi"
+        with metrik.tahap('gabung_segmen'):
+            if gabung_segmen_avi(daftar_path_bagian, path_hasil):
+                for path in daftar_path_bagian: os.remove(path)
+            else:
+                if os.path.exists(path_hasil): os.remove(path_hasil)
+                path_hasil = None
+    if path_hasil is None:
+        path_hasil = base_name_output + EKSTENSI_MANIFEST
+        with open(path_hasil, "w") as f:
+            json.dump({"versi": 1, "codec": CODEC_SEGMEN, "lebar": output_w, "tinggi": output_h, "fps": checkpoint["fps"],
+                       "segmen": checkpoint["bagian"]}, f, indent=2)
+    os.remove(path_checkpoint); os.remove(path_payload)
+    print(f"  Proses embedding (dengan checkpoint) selesai. Video output: '{path_hasil}'.")
+    return True, path_hasil
+
+# --- Blok Utama ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Embed per bagian dengan checkpoint (bisa dilanjutkan setelah proses mati).")
+    parser.add_argument("video"); parser.add_argument("gambar"); parser.add_argument("output")
+    parser.add_argument("--delta", type=float, default=10)
+    parser.add_argument("--koefisien", type=int, default=10)
+    parser.add_argument("--fec", default=None, choices=["repetisi", "hamming74", "reed_solomon"])
+    parser.add_argument("--frame-per-bagian", type=int, default=FRAME_PER_BAGIAN_DEFAULT)
+    parser.add_argument("--batas-frame", type=int, default=None, help="Jeda setelah N frame pada sesi ini")
+    parser.add_argument("--tanpa-gabung", action="store_true", help="Simpan sebagai manifest + bagian (tanpa sambung)")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("EMBED DENGAN CHECKPOINT (SHA3-ECC-AES)")
+    print("="*70)
+    bob_private_ecc, bob_public_key_bytes_compressed = setup_kunci_ecc()
+    selesai, path_hasil = embed_dengan_checkpoint(args.video, args.gambar, args.output, args.delta, args.koefisien,
+                                                  bob_public_key_bytes_compressed, skema_fec=args.fec,
+                                                  frame_per_bagian=args.frame_per_bagian, gabung=not args.tanpa_gabung,
+                                                  batas_frame_sesi=args.batas_frame)
+    print(f"\n  Status: {'SELESAI' if selesai else 'BELUM SELESAI'}" + (f" ('{path_hasil}')" if path_hasil else ""))
+    print("\nPROGRAM SELESAI")
+    print("="*70)
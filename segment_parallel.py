@@ -0,0 +1,211 @@
+import os
+import json
+import time
+import hashlib
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import cv2
+import numpy as np
+
+from config_and_setup import proses_frame_qim_dct, setup_kunci_ecc
+from embed_process import buat_payload_embed, output_bisa_diekstrak
+from frame_sync import bingkai_payload_sinkron, kapasitas_frame_bits
+from frame_store import buka_sumber_frame, EKSTENSI_MANIFEST
+from avi_container import baca_indeks_avi, sambung_avi
+from cache import UKURAN_CHUNK_HASH
+from instrumentation import METRIK_NONAKTIF
+
+# --- Konfigurasi Segmen ---
+JUMLAH_SEGMEN_DEFAULT = 4
+VERSI_MANIFEST = 1
+CODEC_SEGMEN = "FFV1"  # Intra-frame saja, sehingga segmen bisa disambung tanpa encode ulang
+
+# --- Rencana Segmen ---
+def rencana_segmen(jumlah_frame, jumlah_segmen, bits_per_frame, total_bits):
+    """
+    Membagi [0, jumlah_frame) menjadi rentang frame berurutan yang hampir sama panjang, masing-masing
+    dengan potongan payload [bit_awal, bit_akhir) sesuai kapasitas frame-nya.
+    """
+    batas = np.linspace(0, jumlah_frame, min(jumlah_segmen, jumlah_frame) + 1).astype(int)
+    rencana = []
+    for frame_mulai, frame_akhir in zip(batas[:-1], batas[1:]):
+        bit_awal = min(int(frame_mulai) * bits_per_frame, total_bits)
+        bit_akhir = min(int(frame_akhir) * bits_per_frame, total_bits)
+        rencana.append({"frame_mulai": int(frame_mulai), "frame_akhir": int(frame_akhir),
+                        "bit_awal": bit_awal, "bit_akhir": bit_akhir})
+    return rencana
+
+# --- Worker Segmen ---
+def _embed_segmen(tugas):
+    """
+    Worker: membaca rentang frame cover (seek ke frame_mulai), menyisipkan potongan payload, dan menulis
+    segmen FFV1 sendiri. Mengembalikan ringkasan segmen untuk manifest.
+    """
+    mulai = time.perf_counter()
+    cap = buka_sumber_frame(tugas["path_video_input"])
+    if not cap.isOpened(): raise IOError(f"Video input '{tugas['path_video_input']}' tidak bisa dibuka.")
+    output_w, output_h = tugas["output_w"], tugas["output_h"]
+    out = cv2.VideoWriter(tugas["path_segmen"], cv2.VideoWriter_fourcc(*CODEC_SEGMEN), tugas["fps"], (output_w, output_h), True)
+    if not out.isOpened(): cap.release(); raise IOError(f"Gagal VideoWriter {CODEC_SEGMEN} '{tugas['path_segmen']}'.")
+    payload = tugas["payload"]
+    bit_terpakai = 0; jumlah_frame = 0; psnr_prediksi = []; bit_gagal = 0
+    try:
+        if tugas["frame_mulai"] > 0:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, tugas["frame_mulai"])
+            if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) != tugas["frame_mulai"]:
+                raise IOError(f"Seek ke frame {tugas['frame_mulai']} gagal.")
+        for _ in range(tugas["frame_akhir"] - tugas["frame_mulai"]):
+            ret, frame = cap.read()
+            if not ret: break
+            cropped = frame[0:output_h, 0:output_w]
+            if bit_terpakai < len(payload):
+                info_frame = {}
+                _, stego_gray, bits_embedded = proses_frame_qim_dct(
+                    cropped, 'embed', tugas["delta"], payload[bit_terpakai:],
+                    num_ac_coeffs_to_use=tugas["num_ac_coeffs"], info_frame=info_frame)
+                bit_terpakai += bits_embedded
+                psnr_prediksi.append(info_frame['psnr_prediksi']); bit_gagal += info_frame['bit_gagal']
+                out.write(cv2.cvtColor(stego_gray, cv2.COLOR_GRAY2BGR))
+            else:
+                out.write(cropped if cropped.ndim == 3 else cv2.cvtColor(cropped, cv2.COLOR_GRAY2BGR))
+            jumlah_frame += 1
+    finally:
+        cap.release(); out.release()
+    sha = hashlib.sha256()
+    with open(tugas["path_segmen"], "rb") as f:
+        for chunk in iter(lambda: f.read(UKURAN_CHUNK_HASH), b""): sha.update(chunk)
+    return {"file": os.path.basename(tugas["path_segmen"]), "frame_mulai": tugas["frame_mulai"],
+            "jumlah_frame": jumlah_frame, "bit_disisipkan": bit_terpakai, "bit_diminta": len(payload), "bit_gagal": bit_gagal,
+            "ukuran_bytes": os.path.getsize(tugas["path_segmen"]), "sha256": sha.hexdigest(),
+            "psnr_prediksi_min_db": min(psnr_prediksi) if psnr_prediksi else None,
+            "durasi_detik": time.perf_counter() - mulai}
+
+def _hapus_segmen(daftar_tugas):
+    """Menghapus file segmen yang sudah (sebagian) ditulis worker saat embed per segmen gagal."""
+    for tugas in daftar_tugas:
+        if os.path.exists(tugas["path_segmen"]): os.remove(tugas["path_segmen"])
+
+# --- Penyambungan Segmen ---
+def gabung_segmen_avi(daftar_path_segmen, path_output):
+    """
+    Menyambung segmen AVI intra-frame (FFV1) menjadi satu AVI dengan menyalin chunk frame apa adanya
+    (tanpa decode/encode). Mengembalikan False jika segmen tidak seragam atau hasil melebihi batas AVI 1.0.
+    """
+    daftar_sumber = [(path,) + baca_indeks_avi(path) for path in daftar_path_segmen]
+    try:
+        sambung_avi(daftar_sumber, path_output)
+    except ValueError as e:
+        print(f"    Warning: {e} Video disimpan sebagai manifest segmen."); return False
+    return True
+
+# --- Embed Per Segmen ---
+def embed_segmen_paralel(path_video_input, path_gambar_rahasia, path_video_output_base, delta_kuantisasi, num_ac_coeffs,
+                         kunci_publik_ecc_penerima_bytes_compressed, jumlah_segmen=JUMLAH_SEGMEN_DEFAULT, jumlah_worker=None,
+                         skema_fec=None, parameter_fec=None, gabung=True, sinkron_frame=False, metrik=METRIK_NONAKTIF):
+    """
+    Membagi cover menjadi rentang frame, memberi tiap rentang potongan payload sendiri, dan membuat
+    segmen FFV1 secara paralel (satu proses per segmen). Segmen disambung menjadi '<base>.avi' (gabung=True)
+    atau dibiarkan sebagai '<base>.manifest.json' + segmen yang langsung bisa diekstraksi.
+    sinkron_frame=True menambahkan header sinkronisasi per frame (lihat frame_sync).
+    Mengembalikan (berhasil, path_video_stego).
+    """
+    print(f"\n=== MEMULAI PROSES EMBEDDING GAMBAR KE VIDEO (PER SEGMEN) ===")
+    print(f"  Gambar Rahasia: '{path_gambar_rahasia}'")
+    print(f"  Video Input: '{path_video_input}'")
+    print(f"  Parameter: DELTA={delta_kuantisasi}, Koefisien AC per Blok={num_ac_coeffs}, Segmen={jumlah_segmen}")
+    if delta_kuantisasi <= 0: print("    Error: DELTA harus positif untuk mode segmen."); return False, None
+    cap = buka_sumber_frame(path_video_input)
+    if not cap.isOpened(): print(f"    Error: Video input '{path_video_input}' tidak bisa dibuka."); return False, None
+    frame_width_orig = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)); frame_height_orig = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    fps = cap.get(cv2.CAP_PROP_FPS); jumlah_frame = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    output_w, output_h = (frame_width_orig // 8) * 8, (frame_height_orig // 8) * 8
+    if output_w == 0 or output_h == 0: print("    Error: Dimensi video terlalu kecil."); return False, None
+    if jumlah_frame <= 0: print("    Error: Jumlah frame cover tidak diketahui; mode segmen butuh jumlah frame."); return False, None
+
+    total_payload_bitstream = buat_payload_embed(path_gambar_rahasia, kunci_publik_ecc_penerima_bytes_compressed,
+                                                 metrik, skema_fec, parameter_fec)
+    if total_payload_bitstream is None: return False, None
+    bits_per_frame = kapasitas_frame_bits(output_w, output_h, num_ac_coeffs)
+    if sinkron_frame:
+        try: total_payload_bitstream = bingkai_payload_sinkron(total_payload_bitstream, bits_per_frame)
+        except ValueError as e: print(f"    Error: {e}"); return False, None
+    total_bits_to_embed = len(total_payload_bitstream)
+    if total_bits_to_embed > bits_per_frame * jumlah_frame:
+        print(f"    Error: Kapasitas cover ({bits_per_frame * jumlah_frame} bits) kurang dari payload ({total_bits_to_embed} bits).")
+        return False, None
+
+    print("\n  [Tahap Embedding 3: Menyisipkan Payload per Segmen]")
+    base_name_output, _ = os.path.splitext(path_video_output_base)
+    direktori_output = os.path.dirname(base_name_output)
+    if direktori_output: os.makedirs(direktori_output, exist_ok=True)
+    rencana = rencana_segmen(jumlah_frame, jumlah_segmen, bits_per_frame, total_bits_to_embed)
+    daftar_tugas = [{"path_video_input": path_video_input, "path_segmen": f"{base_name_output}.seg{i:03d}.avi",
+                     "frame_mulai": r["frame_mulai"], "frame_akhir": r["frame_akhir"],
+                     "payload": total_payload_bitstream[r["bit_awal"]:r["bit_akhir"]],
+                     "delta": delta_kuantisasi, "num_ac_coeffs": num_ac_coeffs,
+                     "output_w": output_w, "output_h": output_h, "fps": fps}
+                    for i, r in enumerate(rencana)]
+    jumlah_worker = jumlah_worker or min(len(daftar_tugas), os.cpu_count() or 1)
+    with metrik.tahap('segmen_paralel'):
+        try:
+            with ProcessPoolExecutor(max_workers=jumlah_worker, mp_context=multiprocessing.get_context("spawn")) as executor:
+                hasil_segmen = list(executor.map(_embed_segmen, daftar_tugas))
+        except (IOError, OSError) as e:
+            print(f"    Error: Segmen gagal dibuat: {e}"); _hapus_segmen(daftar_tugas); return False, None
+        except BaseException:
+            _hapus_segmen(daftar_tugas); raise
+    for i, segmen in enumerate(hasil_segmen):
+        print(f"    Segmen {i}: frame {segmen['frame_mulai']}..{segmen['frame_mulai'] + segmen['jumlah_frame'] - 1}, "
+              f"{segmen['bit_disisipkan']}/{segmen['bit_diminta']} bits, {segmen['ukuran_bytes']} bytes ({segmen['durasi_detik']:.2f} detik)")
+    if any(segmen["bit_disisipkan"] < segmen["bit_diminta"] for segmen in hasil_segmen):
+        print("  Proses embedding selesai, namun TIDAK semua data berhasil disisipkan (segmen lebih pendek dari rencana).")
+        _hapus_segmen(daftar_tugas); return False, None
+    if not output_bisa_diekstrak(sum(segmen["bit_gagal"] for segmen in hasil_segmen), bool(skema_fec), base_name_output):
+        _hapus_segmen(daftar_tugas); return False, None
+    metrik.tambah('segmen', len(hasil_segmen))
+
+    path_manifest = base_name_output + EKSTENSI_MANIFEST
+    manifest = {"versi": VERSI_MANIFEST, "codec": CODEC_SEGMEN, "lebar": output_w, "tinggi": output_h, "fps": fps,
+                "delta": delta_kuantisasi, "num_ac_coeffs": num_ac_coeffs, "total_bits": total_bits_to_embed,
+                "segmen": [{k: segmen[k] for k in ("file", "frame_mulai", "jumlah_frame", "ukuran_bytes", "sha256")}
+                           for segmen in hasil_segmen]}
+    path_segmen = [t["path_segmen"] for t in daftar_tugas]
+    if gabung:
+        actual_video_output_path = base_name_output + ".avi"
+        with metrik.tahap('gabung_segmen'):
+            tersambung = gabung_segmen_avi(path_segmen, actual_video_output_path)
+        if tersambung:
+            for path in path_segmen: os.remove(path)
+            print(f"  Proses embedding (per segmen) selesai. Video output: '{actual_video_output_path}'.")
+            return True, actual_video_output_path
+        if os.path.exists(actual_video_output_path): os.remove(actual_video_output_path)
+    with open(path_manifest, "w") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"  Proses embedding (per segmen) selesai. Manifest segmen: '{path_manifest}'.")
+    return True, path_manifest
+
+# --- Blok Utama ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Embed paralel per segmen frame (FFV1), disambung atau sebagai manifest.")
+    parser.add_argument("video"); parser.add_argument("gambar"); parser.add_argument("output")
+    parser.add_argument("--segmen", type=int, default=JUMLAH_SEGMEN_DEFAULT)
+    parser.add_argument("--worker", type=int, default=None)
+    parser.add_argument("--delta", type=float, default=10)
+    parser.add_argument("--koefisien", type=int, default=10)
+    parser.add_argument("--fec", default=None, choices=["repetisi", "hamming74", "reed_solomon"])
+    parser.add_argument("--tanpa-gabung", action="store_true", help="Simpan sebagai manifest + segmen (tanpa sambung)")
+    parser.add_argument("--sinkron", action="store_true", help="Header sinkronisasi per frame (ekstraksi akses acak)")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("EMBED PARALEL PER SEGMEN (SHA3-ECC-AES)")
+    print("="*70)
+    bob_private_ecc, bob_public_key_bytes_compressed = setup_kunci_ecc()
+    berhasil, path_hasil = embed_segmen_paralel(args.video, args.gambar, args.output, args.delta, args.koefisien,
+                                                bob_public_key_bytes_compressed, args.segmen, args.worker,
+                                                skema_fec=args.fec, gabung=not args.tanpa_gabung, sinkron_frame=args.sinkron)
+    print(f"\n  Status: {'BERHASIL' if berhasil else 'GAGAL'}" + (f" ('{path_hasil}')" if berhasil else ""))
+    print("\nPROGRAM SELESAI")
+    print("="*70)
@@ -0,0 +1,153 @@
+import sys
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from config_and_setup import serialisasi_kunci_publik_ecc_compressed, setup_kunci_ecc
+from embed_process import embed_gambar_ke_video_final
+from extract_process import ekstraksi_gambar_video_final, ekstraksi_sinkron
+
+# --- Log per Sesi ---
+# Fungsi inti mencetak progres dengan print(). Menukar sys.stdout per job tidak aman jika beberapa job berjalan
+# bersamaan di thread, jadi sys.stdout dipasang sekali dengan proxy yang meneruskan tulisan ke log sesi yang
+# aktif di konteks pemanggil (contextvars, terpisah per thread); tulisan di luar sesi tetap ke stdout asli.
+_sesi_aktif = contextvars.ContextVar("sesi_steganografi_aktif", default=None)
+_kunci_pasang_stdout = threading.Lock()
+
+class _StdoutPerSesi:
+    def __init__(self, stdout_asli):
+        self.stdout_asli = stdout_asli
+
+    def write(self, teks):
+        sesi = _sesi_aktif.get()
+        if sesi is None: return self.stdout_asli.write(teks)
+        return sesi._tulis_log(teks)
+
+    def flush(self):
+        sesi = _sesi_aktif.get()
+        if sesi is None: self.stdout_asli.flush()
+
+    def __getattr__(self, nama):
+        return getattr(self.stdout_asli, nama)  # encoding, isatty, fileno, ...
+
+def pasang_stdout_sesi():
+    """Memasang proxy stdout per sesi (idempoten); dipanggil otomatis saat sesi dengan log berjalan."""
+    with _kunci_pasang_stdout:
+        if not isinstance(sys.stdout, _StdoutPerSesi): sys.stdout = _StdoutPerSesi(sys.stdout)
+
+# --- Sesi Dasar ---
+class _SesiSteganografi:
+    """
+    Parameter QIM, kunci, log, dan metrik milik satu sesi. Satu sesi menjalankan satu job dalam satu waktu;
+    untuk job bersamaan buat satu sesi per job (tanpa state global bersama, aman di thread pool karena
+    NumPy/OpenCV melepas GIL selama DCT, decode, dan encode).
+    log: callable(baris) untuk log teks job; None = dicetak ke stdout seperti biasa.
+    progres/batal: callback event progres terstruktur dan pembatalan (progress.py) untuk setiap job sesi ini.
+    """
+    def __init__(self, delta_kuantisasi, num_ac_coeffs, log=None, kunci_permutasi=None, metrik=None, progres=None, batal=None):
+        self.delta_kuantisasi = delta_kuantisasi
+        self.num_ac_coeffs = num_ac_coeffs
+        self.log = log
+        self.kunci_permutasi = kunci_permutasi
+        self.metrik = metrik
+        self.progres = progres
+        self.batal = batal
+        self._sisa_log = ""
+        self._kunci_job = threading.Lock()
+
+    def _tulis_log(self, teks):
+        self._sisa_log += teks
+        *baris_lengkap, self._sisa_log = self._sisa_log.split("\n")
+        for baris in baris_lengkap: self.log(baris)
+        return len(teks)
+
+    def _jalankan(self, fungsi, *args, **kwargs):
+        if not self._kunci_job.acquire(blocking=False):
+            raise RuntimeError("Sesi sedang menjalankan job lain; buat sesi terpisah untuk job bersamaan.")
+        try:
+            if self.log is None: return fungsi(*args, **kwargs)
+            pasang_stdout_sesi()
+            token = _sesi_aktif.set(self)
+            try:
+                return fungsi(*args, **kwargs)
+            finally:
+                _sesi_aktif.reset(token)
+                if self._sisa_log: self.log(self._sisa_log); self._sisa_log = ""
+        finally:
+            self._kunci_job.release()
+
+# --- Sesi Embed ---
+class Embedder(_SesiSteganografi):
+    """
+    Sesi embed: kunci publik penerima (objek EC atau bytes terkompresi), DELTA, koefisien AC, dan opsi
+    embed_gambar_ke_video_final (skema_fec, fourcc_output, jumlah_worker, cache_dct, ...) yang dipakai
+    untuk setiap embed() sesi ini.
+    """
+    def __init__(self, kunci_publik_penerima, delta_kuantisasi, num_ac_coeffs, log=None, kunci_permutasi=None,
+                 metrik=None, progres=None, batal=None, **opsi_embed):
+        super().__init__(delta_kuantisasi, num_ac_coeffs, log, kunci_permutasi, metrik, progres, batal)
+        if not isinstance(kunci_publik_penerima, (bytes, bytearray)):
+            kunci_publik_penerima = serialisasi_kunci_publik_ecc_compressed(kunci_publik_penerima)
+        self.kunci_publik_penerima = bytes(kunci_publik_penerima)
+        self.opsi_embed = opsi_embed
+
+    def embed(self, path_video_input, path_gambar_rahasia, path_video_output_base, **opsi):
+        """Sama dengan embed_gambar_ke_video_final; opsi menimpa opsi sesi untuk job ini saja."""
+        return self._jalankan(embed_gambar_ke_video_final, path_video_input, path_gambar_rahasia, path_video_output_base,
+                              self.delta_kuantisasi, self.num_ac_coeffs, self.kunci_publik_penerima,
+                              metrik=self.metrik, kunci_permutasi=self.kunci_permutasi,
+                              **{"progres": self.progres, "batal": self.batal, **self.opsi_embed, **opsi})
+
+# --- Sesi Ekstraksi ---
+class Extractor(_SesiSteganografi):
+    """
+    Sesi ekstraksi: kunci privat penerima, DELTA, koefisien AC, dan opsi ekstraksi (cache_bit, jumlah_worker, ...).
+    """
+    def __init__(self, kunci_privat_penerima, delta_kuantisasi, num_ac_coeffs, log=None, kunci_permutasi=None,
+                 metrik=None, progres=None, batal=None, bits_untuk_dimensi=16, **opsi_ekstraksi):
+        super().__init__(delta_kuantisasi, num_ac_coeffs, log, kunci_permutasi, metrik, progres, batal)
+        self.kunci_privat_penerima = kunci_privat_penerima
+        self.bits_untuk_dimensi = bits_untuk_dimensi
+        self.opsi_ekstraksi = opsi_ekstraksi
+
+    def ekstrak(self, path_stego_video, path_gambar_output, **opsi):
+        """Sama dengan ekstraksi_gambar_video_final; opsi menimpa opsi sesi untuk job ini saja."""
+        return self._jalankan(ekstraksi_gambar_video_final, path_stego_video, path_gambar_output,
+                              self.delta_kuantisasi, self.num_ac_coeffs, self.kunci_privat_penerima, self.bits_untuk_dimensi,
+                              metrik=self.metrik, kunci_permutasi=self.kunci_permutasi,
+                              **{"progres": self.progres, "batal": self.batal, **self.opsi_ekstraksi, **opsi})
+
+    def ekstrak_sinkron(self, path_stego_video, path_gambar_output, jumlah_worker=1, frame_mulai=0, frame_akhir=None):
+        """Sama dengan ekstraksi_sinkron (payload dengan header sinkronisasi per frame)."""
+        return self._jalankan(ekstraksi_sinkron, path_stego_video, path_gambar_output, self.delta_kuantisasi,
+                              self.num_ac_coeffs, self.kunci_privat_penerima, self.bits_untuk_dimensi, jumlah_worker,
+                              frame_mulai, frame_akhir, metrik=self.metrik, kunci_permutasi=self.kunci_permutasi)
+
+# --- Blok Utama untuk Demonstrasi Job Bersamaan ---
+if __name__ == "__main__":
+    import os
+    print("="*70)
+    print("SESI EMBED/EKSTRAKSI BERSAMAAN (THREAD POOL)")
+    print("="*70)
+    input_dir = os.path.join("media", "input"); output_dir = os.path.join("media", "output")
+    os.makedirs(output_dir, exist_ok=True)
+    video_input_path = os.path.join(input_dir, "cover.mp4")
+    gambar_rahasia_path = os.path.join(input_dir, "ini_adalah_rahasia_grayscale.png")
+    bob_private_ecc, bob_public_key_bytes_compressed = setup_kunci_ecc()
+    if bob_private_ecc is None: sys.exit(1)
+
+    log_job = {}
+    def jalankan_job(nama):
+        log_job[nama] = []
+        embedder = Embedder(bob_public_key_bytes_compressed, 20, 10, log=log_job[nama].append)
+        base_output = os.path.join(output_dir, f"stego_sesi_{nama}")
+        if not embedder.embed(video_input_path, gambar_rahasia_path, base_output)[0]: return False
+        extractor = Extractor(bob_private_ecc, 20, 10, log=log_job[nama].append)
+        return extractor.ekstrak(base_output + ".avi", os.path.join(output_dir, f"extracted_sesi_{nama}.png"))
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        hasil = dict(zip(("a", "b"), executor.map(jalankan_job, ("a", "b"))))
+    for nama, berhasil in hasil.items():
+        print(f"  Job {nama}: {'BERHASIL' if berhasil else 'GAGAL'} ({len(log_job[nama])} baris log)")
+    print("\nPROGRAM SELESAI")
+    print("="*70)